@@ -6,16 +6,16 @@
 # @Filename: Actorkeys.py
 # @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
 
-import shutil
 import os
-import ssl
-import tempfile
-from io import BytesIO
-from urllib import urlopen
-from zipfile import ZipFile
+import sys
 
+from TUI.ActorkeysCache import ActorkeysCache
 
-__all__ = ['refreshActorkeys', 'getSTUIPath', 'getActorkeysPath']
+
+__all__ = ['refreshActorkeys', 'getSTUIPath', 'getActorkeysPath',
+           'getActorkeysCachePath', 'getActorkeysCache', 'initActorkeys']
+
+_actorkeys_cache = None
 
 
 def getSTUIPath():
@@ -25,32 +25,65 @@ def getSTUIPath():
 
 
 def getActorkeysPath():
-    """Returns the actorkeys path."""
+    """Returns the path of the (legacy) uncached copy of actorkeys."""
 
     return os.path.join(getSTUIPath(), 'actorkeys')
 
 
-def refreshActorkeys():
-    """Refreshes the internal copy of actorkeys."""
+def getActorkeysCachePath():
+    """Returns the path of the actorkeys cache."""
+
+    return os.path.join(getSTUIPath(), 'actorkeys-cache')
+
+
+def getActorkeysCache():
+    """Returns the actorkeys cache (an instance of TUI.ActorkeysCache.ActorkeysCache)."""
+
+    global _actorkeys_cache
+    if _actorkeys_cache is None:
+        _actorkeys_cache = ActorkeysCache(getActorkeysCachePath())
+    return _actorkeys_cache
+
 
-    # Get temporary file
-    tmp_path = tempfile.gettempdir()
-    uncompress_path = os.path.join(tmp_path, 'actorkeys-sdss5')
+def refreshActorkeys(source=None):
+    """Refreshes the cached copy of actorkeys; returns the new cache version.
 
-    if os.path.exists(uncompress_path):
-        shutil.rmtree(uncompress_path)
+    Blocks until done; use getActorkeysCache().startRefresh to refresh in the background.
+    The new copy is used the next time STUI starts.
 
-    # Download from GitHub
-    gcontext = ssl._create_unverified_context()
-    resp = urlopen("https://github.com/sdss/actorkeys/archive/refs/heads/sdss5.zip",
-                   context=gcontext)
-    myzip = ZipFile(BytesIO(resp.read()))
-    myzip.extractall(path=tmp_path)
+    Parameters
+    ----------
+    source
+        Where to get actorkeys: a URL or path of a zip file or the path of a directory.
+        If None, uses $STUI_ACTORKEYS_SOURCE, else the sdss5 branch on GitHub.
+    """
+
+    return getActorkeysCache().refresh(source=source)
+
+
+def initActorkeys():
+    """Makes actorkeys available at startup without waiting for the network.
+
+    Uses the cached precompiled copy of actorkeys, if any. Otherwise uses ~/.stui/actorkeys
+    (if present), else any copy already on $PYTHONPATH (worst case, the internal bundled copy),
+    and fills the cache in the background; the cache is used the next time STUI starts.
+    Call before any keyword dictionaries are loaded.
+
+    Returns True if the cached copy is used.
+    """
+
+    actorkeys_cache = getActorkeysCache()
+    try:
+        if actorkeys_cache.install():
+            return True
+    except Exception as ee:
+        sys.stdout.write('Failed using cached actorkeys: %s\n' % str(ee))
 
-    stui_path = getSTUIPath()
     actorkeys_path = getActorkeysPath()
     if os.path.exists(actorkeys_path):
-        shutil.rmtree(actorkeys_path)
-
-    shutil.copytree(os.path.join(uncompress_path, 'python', 'actorkeys'),
-                    actorkeys_path)
+        sys.path.insert(0, getSTUIPath())
+        actorkeys_cache.startRefresh(source=actorkeys_path)
+    else:
+        sys.stdout.write('No cached actorkeys; fetching them in the background\n')
+        actorkeys_cache.startRefresh()
+    return False
@@ -0,0 +1,473 @@
+#!/usr/bin/env python
+"""A versioned local cache of actorkeys with precompiled keyword dictionaries
+
+Each version of actorkeys is stored in its own directory <cacheDir>/<content hash>, containing:
+- actorkeys/: the actorkeys package (so "import actorkeys" works when the version directory is on sys.path)
+- keys.idx: the keyword dictionaries precompiled to code objects, serialized with marshal
+    (CacheFormat, Python bytecode magic number, dict of dictionary name: (md5 of source, code object))
+The content hash is the SHA-1 of the names and contents of all the keyword dictionaries.
+The file <cacheDir>/CURRENT holds the name of the current version directory.
+
+install puts the current version on sys.path and replaces opscore.protocols.keys.KeysDictionary.load
+with a function that evaluates the precompiled code (falling back to the original load
+for dictionaries that are not in the cache). Evaluating a code object avoids parsing and compiling
+each dictionary's source at startup.
+
+startRefresh downloads (or copies) actorkeys in a background thread, validates it
+(every dictionary must compile and construct a KeysDictionary), writes a new version directory
+and then switches CURRENT to it with an atomic rename. Startup never waits for the network;
+a refreshed cache is used the next time STUI starts.
+
+The source of actorkeys may be an http(s) or file URL of a zip file, the path of a zip file,
+or the path of a directory that contains actorkeys (as "actorkeys", "python/actorkeys"
+or directly, i.e. the directory is the actorkeys package). The default is DefSourceURL,
+overridden by the environment variable named by SourceEnvVar.
+The certificate of an https server is verified; if that fails then the refresh fails
+and the cached version remains in use.
+
+History:
+2026-10-18          Initial version.
+"""
+import hashlib
+import imp
+import importlib
+import marshal
+import os
+import shutil
+import ssl
+import sys
+import tempfile
+import threading
+import time
+import urllib2
+import zipfile
+from io import BytesIO
+
+__all__ = ["ActorkeysCache", "getDefaultSource"]
+
+DefSourceURL = "https://github.com/sdss/actorkeys/archive/refs/heads/sdss5.zip"
+SourceEnvVar = "STUI_ACTORKEYS_SOURCE"
+CacheFormat = 1
+CurrentFileName = "CURRENT"
+IndexFileName = "keys.idx"
+PackageName = "actorkeys"
+MaxVersions = 3 # maximum number of version directories to keep (including the current one)
+DownloadTimeout = 60 # sec
+
+def getDefaultSource():
+    """Return the default source of actorkeys: $STUI_ACTORKEYS_SOURCE if set, else DefSourceURL"""
+    return os.environ.get(SourceEnvVar) or DefSourceURL
+
+def _findPackageDir(rootDir):
+    """Return the actorkeys package directory in rootDir, or None if not found
+    """
+    for candDir in (
+        os.path.join(rootDir, PackageName),
+        os.path.join(rootDir, "python", PackageName),
+        rootDir,
+    ):
+        if os.path.isfile(os.path.join(candDir, "__init__.py")) \
+            and os.path.basename(os.path.normpath(candDir)) == PackageName:
+            return candDir
+    # search deeper, e.g. actorkeys-sdss5/python/actorkeys in a zip file from GitHub
+    for dirPath, dirNames, fileNames in os.walk(rootDir):
+        dirNames.sort()
+        if os.path.basename(dirPath) == PackageName and "__init__.py" in fileNames:
+            return dirPath
+    return None
+
+def _readSources(packageDir):
+    """Return a dict of keyword dictionary name: source for all dictionaries in an actorkeys package
+    """
+    sourceDict = dict()
+    for fileName in os.listdir(packageDir):
+        dictName, ext = os.path.splitext(fileName)
+        if ext != ".py" or dictName.startswith("_") or dictName.startswith("."):
+            continue
+        with open(os.path.join(packageDir, fileName), "rU") as dictFile:
+            sourceDict[dictName] = dictFile.read()
+    return sourceDict
+
+def _getContentHash(sourceDict):
+    """Return the content hash of a dict of keyword dictionary name: source"""
+    contentHash = hashlib.sha1()
+    for dictName in sorted(sourceDict):
+        contentHash.update("%s\0%d\0" % (dictName, len(sourceDict[dictName])))
+        contentHash.update(sourceDict[dictName])
+    return contentHash.hexdigest()
+
+def _compileSources(packageDir, sourceDict):
+    """Compile keyword dictionaries; return a dict of dictionary name: (md5 of source, code object)
+
+    packageDir is only used for the file names recorded in the code objects.
+
+    Raise RuntimeError if any dictionary does not compile or is not a KeysDictionary expression.
+    """
+    codeDict = dict()
+    for dictName, source in sourceDict.iteritems():
+        filePath = os.path.join(packageDir, dictName + ".py")
+        try:
+            code = compile(source, filePath, "eval")
+        except SyntaxError as e:
+            raise RuntimeError("Keyword dictionary %s does not compile: %s" % (dictName, e))
+        if "KeysDictionary" not in code.co_names:
+            raise RuntimeError("Keyword dictionary %s is not a KeysDictionary" % (dictName,))
+        codeDict[dictName] = (hashlib.md5(source).hexdigest(), code)
+    return codeDict
+
+def _getSymbols(keysDictionary=None):
+    """Return the global symbol table in which to evaluate a keyword dictionary
+
+    This matches the table used by opscore.protocols.keys.KeysDictionary.load: Key, KeysDictionary, ByName
+    and all value types in opscore.protocols.types.
+
+    Inputs:
+    - keysDictionary: replacement for KeysDictionary, or None to use the real one
+    """
+    import opscore.protocols.keys
+    import opscore.protocols.types
+    symbols = dict(
+        __builtins__ = __builtins__,
+        Key = opscore.protocols.keys.Key,
+        KeysDictionary = keysDictionary or opscore.protocols.keys.KeysDictionary,
+        ByName = opscore.protocols.types.ByName,
+    )
+    valueTypes = (opscore.protocols.types.ValueType, opscore.protocols.types.CompoundValueType)
+    for name, value in vars(opscore.protocols.types).iteritems():
+        if isinstance(value, type) and issubclass(value, valueTypes):
+            symbols[name] = value
+    return symbols
+
+def _writeFileAtomic(filePath, data):
+    """Write data to a file by writing a temporary file and renaming it"""
+    fileDesc, tempPath = tempfile.mkstemp(dir=os.path.dirname(filePath), prefix=".tmp")
+    try:
+        with os.fdopen(fileDesc, "wb") as outFile:
+            outFile.write(data)
+        try:
+            os.rename(tempPath, filePath)
+        except OSError:
+            # Windows cannot rename onto an existing file
+            os.remove(filePath)
+            os.rename(tempPath, filePath)
+    except Exception:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+
+
+class ActorkeysCache(object):
+    """A versioned cache of actorkeys with precompiled keyword dictionaries
+
+    Fields include:
+    - cacheDir: cache directory
+    - source: source of actorkeys for refresh (see module doc string)
+    - installedVersion: name of the version installed by install; None if none
+    - lastRefreshError: error message from the last refresh; None if it succeeded or none has finished
+    """
+    def __init__(self, cacheDir, source=None):
+        """Create an ActorkeysCache
+
+        Inputs:
+        - cacheDir: cache directory; created when needed
+        - source: source of actorkeys for refresh; if None then use getDefaultSource()
+        """
+        self.cacheDir = os.path.abspath(cacheDir)
+        self.source = source or getDefaultSource()
+        self.installedVersion = None
+        self.lastRefreshError = None
+        self._codeDict = dict()
+        self._origLoad = None
+        self._refreshThread = None
+
+    def getCurrentVersion(self):
+        """Return the name of the current version, or None if the cache is empty or damaged"""
+        try:
+            with open(os.path.join(self.cacheDir, CurrentFileName), "r") as currFile:
+                version = currFile.read().strip()
+        except (IOError, OSError):
+            return None
+        if not version or not os.path.isfile(os.path.join(self.cacheDir, version, IndexFileName)):
+            return None
+        return version
+
+    def getVersionDir(self, version):
+        """Return the directory of a version"""
+        return os.path.join(self.cacheDir, version)
+
+    def install(self):
+        """Use the current version: put it on sys.path and use its precompiled keyword dictionaries
+
+        Return True if installed, False if there is no usable cached version (in which case nothing changes).
+        Call before any keyword dictionaries are loaded.
+        """
+        version = self.getCurrentVersion()
+        if version is None:
+            return False
+        versionDir = self.getVersionDir(version)
+        try:
+            codeDict = self._readIndex(versionDir)
+        except Exception as e:
+            sys.stderr.write("Could not read actorkeys cache %r: %s\n" % (versionDir, e))
+            return False
+        self._codeDict = codeDict
+        if versionDir not in sys.path:
+            sys.path.insert(0, versionDir)
+        self.installedVersion = version
+
+        import opscore.protocols.keys
+        KeysDictionary = opscore.protocols.keys.KeysDictionary
+        if self._origLoad is None:
+            self._origLoad = KeysDictionary.load
+            KeysDictionary.load = staticmethod(self._loadKeysDictionary)
+        return True
+
+    @property
+    def isRefreshing(self):
+        """True if a refresh is running"""
+        return self._refreshThread is not None and self._refreshThread.isAlive()
+
+    def refresh(self, source=None):
+        """Fetch, validate and cache actorkeys, then make it the current version; return the version name
+
+        Runs in the calling thread; see also startRefresh. Raise RuntimeError (or an I/O error) on failure,
+        in which case the current version is unchanged.
+
+        Inputs:
+        - source: source of actorkeys; if None then use self.source
+        """
+        source = source or self.source
+        if not os.path.isdir(self.cacheDir):
+            os.makedirs(self.cacheDir)
+        workDir = tempfile.mkdtemp(dir=self.cacheDir, prefix=".new")
+        try:
+            packageDir = self._fetch(source, workDir)
+            sourceDict = _readSources(packageDir)
+            if not sourceDict:
+                raise RuntimeError("No keyword dictionaries found in %r" % (source,))
+            version = _getContentHash(sourceDict)
+            versionDir = self.getVersionDir(version)
+            # compile with file names in the cached copy, so tracebacks point to it
+            codeDict = _compileSources(os.path.join(versionDir, PackageName), sourceDict)
+            self._validate(codeDict)
+            if not os.path.isfile(os.path.join(versionDir, IndexFileName)):
+                newVersionDir = os.path.join(workDir, version)
+                shutil.copytree(packageDir, os.path.join(newVersionDir, PackageName))
+                self._writeIndex(newVersionDir, codeDict)
+                if os.path.exists(versionDir):
+                    # damaged version directory
+                    shutil.rmtree(versionDir)
+                try:
+                    os.rename(newVersionDir, versionDir)
+                except OSError:
+                    # another process cached the same version first
+                    if not os.path.isfile(os.path.join(versionDir, IndexFileName)):
+                        raise
+            else:
+                # touch it so it is not pruned
+                os.utime(versionDir, None)
+            _writeFileAtomic(os.path.join(self.cacheDir, CurrentFileName), version + "\n")
+        finally:
+            shutil.rmtree(workDir, ignore_errors=True)
+        self._prune(keepVersions=(version, self.installedVersion))
+        return version
+
+    def startRefresh(self, source=None, doneFunc=None):
+        """Refresh the cache in a background thread; a no-op (returning False) if a refresh is already running
+
+        Inputs:
+        - source: source of actorkeys; if None then use self.source
+        - doneFunc: function to call when done, or None; it receives two arguments:
+            the new version name (None on failure) and an error message (None on success).
+            Warning: doneFunc is called in the background thread.
+            Use (for instance) tuiModel.reactor.callFromThread to run code in the main thread.
+
+        Return True if a refresh was started.
+        """
+        if self.isRefreshing:
+            return False
+
+        def doRefresh():
+            version = None
+            errMsg = None
+            try:
+                version = self.refresh(source=source)
+                self.lastRefreshError = None
+            except Exception as e:
+                errMsg = "Could not refresh actorkeys from %r: %s" % (source or self.source, e)
+                self.lastRefreshError = errMsg
+            if doneFunc:
+                doneFunc(version, errMsg)
+
+        self._refreshThread = threading.Thread(target=doRefresh, name="actorkeys refresh")
+        self._refreshThread.daemon = True
+        self._refreshThread.start()
+        return True
+
+    def _fetch(self, source, workDir):
+        """Get actorkeys from source; return the path of a package directory
+        (which may be in source, if source is a directory, or in workDir)
+        """
+        if "://" not in source and os.path.isdir(source):
+            packageDir = _findPackageDir(source)
+        else:
+            if source.startswith("https:"):
+                if not hasattr(ssl, "create_default_context"):
+                    raise RuntimeError("Cannot verify the certificate of %r: Python is too old" % (source,))
+                dataFile = urllib2.urlopen(source, timeout=DownloadTimeout, context=ssl.create_default_context())
+                data = dataFile.read()
+            elif "://" in source:
+                dataFile = urllib2.urlopen(source, timeout=DownloadTimeout)
+                data = dataFile.read()
+            else:
+                with open(source, "rb") as dataFile:
+                    data = dataFile.read()
+            try:
+                zipFile = zipfile.ZipFile(BytesIO(data))
+            except zipfile.BadZipfile:
+                raise RuntimeError("%r is not a zip file" % (source,))
+            extractDir = os.path.join(workDir, "extract")
+            zipFile.extractall(path=extractDir)
+            packageDir = _findPackageDir(extractDir)
+        if packageDir is None:
+            raise RuntimeError("No actorkeys package found in %r" % (source,))
+        return packageDir
+
+    def _loadKeysDictionary(self, dictname, forceReload=False):
+        """Replacement for opscore.protocols.keys.KeysDictionary.load that uses precompiled code if available
+        """
+        import opscore.protocols.keys
+        KeysDictionary = opscore.protocols.keys.KeysDictionary
+        entry = self._codeDict.get(dictname)
+        if entry is None:
+            return self._origLoad(dictname, forceReload)
+        if not forceReload:
+            kdict = getattr(KeysDictionary, "registry", {}).get(dictname)
+            if kdict is not None:
+                return kdict
+        checksum, code = entry
+        try:
+            kdict = eval(code, _getSymbols())
+            if kdict.name != dictname:
+                raise RuntimeError("dictionary name is %r" % (kdict.name,))
+        except Exception as e:
+            sys.stderr.write("Cached keyword dictionary %s failed (%s); loading it from source\n" % (dictname, e))
+            return self._origLoad(dictname, forceReload)
+        kdict.filename = code.co_filename
+        kdict.checksum = checksum
+        return kdict
+
+    def _prune(self, keepVersions):
+        """Delete old version directories, keeping keepVersions and the MaxVersions most recently used"""
+        versionList = []
+        for name in os.listdir(self.cacheDir):
+            versionDir = os.path.join(self.cacheDir, name)
+            if name.startswith(".") or not os.path.isdir(versionDir):
+                continue
+            versionList.append((os.path.getmtime(versionDir), name))
+        versionList.sort(reverse=True)
+        for mtime, name in versionList[MaxVersions:]:
+            if name not in keepVersions:
+                shutil.rmtree(os.path.join(self.cacheDir, name), ignore_errors=True)
+
+    def _readIndex(self, versionDir):
+        """Read the index of a version; recompile and rewrite it if it is for a different version of Python
+        """
+        with open(os.path.join(versionDir, IndexFileName), "rb") as indexFile:
+            cacheFormat, magic, codeDict = marshal.loads(indexFile.read())
+        if cacheFormat != CacheFormat:
+            raise RuntimeError("Unknown cache format %r" % (cacheFormat,))
+        if magic != imp.get_magic():
+            packageDir = os.path.join(versionDir, PackageName)
+            codeDict = _compileSources(packageDir, _readSources(packageDir))
+            self._writeIndex(versionDir, codeDict)
+        return codeDict
+
+    def _validate(self, codeDict):
+        """Check that each keyword dictionary constructs a KeysDictionary of the right name,
+        if opscore is available
+
+        Dictionaries are evaluated in the same symbol table as KeysDictionary.load uses, but with a stand-in
+        for KeysDictionary, so that the registry of loaded dictionaries is not affected.
+        """
+        try:
+            importlib.import_module("opscore.protocols.keys")
+        except ImportError:
+            return
+        checkSymbols = _getSymbols(keysDictionary=lambda name, *args, **kargs: name)
+        for dictName, (checksum, code) in codeDict.iteritems():
+            try:
+                name = eval(code, dict(checkSymbols))
+            except Exception as e:
+                raise RuntimeError("Keyword dictionary %s is invalid: %s" % (dictName, e))
+            if name != dictName:
+                raise RuntimeError("Keyword dictionary %s has name %r" % (dictName, name))
+
+    def _writeIndex(self, versionDir, codeDict):
+        _writeFileAtomic(os.path.join(versionDir, IndexFileName),
+            marshal.dumps((CacheFormat, imp.get_magic(), codeDict)))
+
+    def __str__(self):
+        return "ActorkeysCache(%r; installedVersion=%s)" % (self.cacheDir, self.installedVersion)
+
+
+if __name__ == "__main__":
+    # build a fake actorkeys package, cache it from a directory and from a file URL, and install it
+    tempDir = tempfile.mkdtemp()
+    try:
+        srcDir = os.path.join(tempDir, "src", "python", PackageName)
+        os.makedirs(srcDir)
+        with open(os.path.join(srcDir, "__init__.py"), "w") as f:
+            f.write("")
+        with open(os.path.join(srcDir, "test.py"), "w") as f:
+            f.write("KeysDictionary('test', (1, 0), Key('Text', String()))\n")
+        zipPath = os.path.join(tempDir, "actorkeys.zip")
+        with zipfile.ZipFile(zipPath, "w") as zipFile:
+            zipFile.write(os.path.join(srcDir, "__init__.py"), "actorkeys-x/python/actorkeys/__init__.py")
+            zipFile.write(os.path.join(srcDir, "test.py"), "actorkeys-x/python/actorkeys/test.py")
+
+        cache = ActorkeysCache(os.path.join(tempDir, "cache"))
+        print "current version before refresh:", cache.getCurrentVersion()
+        print "refresh from directory:", cache.refresh(source=os.path.join(tempDir, "src"))
+        print "refresh from file URL:", cache.refresh(source="file://" + zipPath)
+
+        doneEvent = threading.Event()
+        def doneFunc(version, errMsg):
+            print "background refresh done: version=%s; errMsg=%s" % (version, errMsg)
+            doneEvent.set()
+        cache.startRefresh(source=os.path.join(tempDir, "nonexistent"), doneFunc=doneFunc)
+        doneEvent.wait(10)
+        print "current version:", cache.getCurrentVersion()
+
+        startTime = time.time()
+        codeDict = cache._readIndex(cache.getVersionDir(cache.getCurrentVersion()))
+        print "read index with %d dictionaries in %0.1f msec" % (len(codeDict), (time.time() - startTime) * 1000)
+
+        # load keyword dictionaries through the cache: all those in the actorkeys package, if available
+        # (checking that they match those loaded by the original KeysDictionary.load), else the fake one
+        try:
+            import opscore.protocols.keys
+        except ImportError:
+            print "opscore not available; not loading dictionaries"
+            raise SystemExit()
+        KeysDictionary = opscore.protocols.keys.KeysDictionary
+        try:
+            import actorkeys
+            realDir = os.path.dirname(os.path.abspath(actorkeys.__file__))
+            origDictDict = dict((dictName, KeysDictionary.load(dictName)) for dictName in _readSources(realDir))
+            print "refresh from actorkeys in %s: %s" % (realDir, cache.refresh(source=realDir))
+        except ImportError:
+            print "actorkeys not available; loading the fake dictionary"
+            origDictDict = dict(test=None)
+        print "install:", cache.install()
+        for dictName in sorted(origDictDict):
+            kdict = KeysDictionary.load(dictName, forceReload=True)
+            if not kdict.filename.startswith(cache.cacheDir):
+                raise RuntimeError("%s was not loaded from the cache" % (dictName,))
+            origDict = origDictDict[dictName]
+            if origDict is not None and \
+                (sorted(kdict.keys) != sorted(origDict.keys) or kdict.checksum != origDict.checksum):
+                raise RuntimeError("%s differs when loaded from the cache" % (dictName,))
+            print "loaded %s %s from the cache: %d keys" % (kdict.name, kdict.version, len(kdict.keys))
+    finally:
+        shutil.rmtree(tempDir)
@@ -28,6 +28,9 @@ History:
                     Sets time error using RO.Astro.Tm.setClockError(0) based on TAI reported by the TCC.
                     If the clock appears to be keeping UTC or TAI then the clock is assumed to be keeping that time perfectly.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Update the clock correction cached by TUI.Models.LogSource when the clock error
+                    or UTC-TAI changes.
+2026-10-18          Record the history of the keyword values in KeyHistoryList (see TUI.Models.KeyHistory).
 """
 import time
 import opscore.utility.timer
@@ -37,8 +40,18 @@ import RO.CnvUtil
 import RO.Constants
 import RO.PhysConst
 import TUI.Models
+import TUI.Models.LogSource
 import TUI.PlaySound
 
+# keyword values whose history is recorded (see TUI.Models.KeyHistory), so strip charts
+# can show data from before they were opened: a list of (actor, keyword, value index)
+KeyHistoryList = (
+    # TUI.Inst.GuideMonitor.BOSSMonitorWindow
+    ("boss", "SP1R0CCDTempRead", 0),
+    ("boss", "SP1B2CCDTempRead", 0),
+    ("boss", "SP1SecondaryDewarPress", 0),
+)
+
 class BackgroundKwds(object):
     """Processes various keywords that are handled in the background.
     
@@ -70,6 +83,14 @@ class BackgroundKwds(object):
         self.clockType = None # set to "UTC" or "TAI" if keeping that time system
 
         self.tccModel.utc_TAI.addCallback(self._utcMinusTAICallback, callNow=False)
+
+        for actor, keyName, keyInd in KeyHistoryList:
+            keyVar = getattr(TUI.Models.getModel(actor), keyName, None)
+            if keyVar is None:
+                self.tuiModel.logMsg("Cannot record history of %s.%s: unknown keyword" % (actor, keyName),
+                    severity = RO.Constants.sevWarning)
+                continue
+            self.tuiModel.keyHistory.addKeyVar(keyVar, keyInd)
     
         self.connection.addStateCallback(self.connCallback, callNow=True)
 
@@ -171,22 +192,29 @@ class BackgroundKwds(object):
         if abs(clockUTC - currUTC) < 3.0:
             # clock keeps accurate UTC (as well as we can figure); set time error to 0
             self.clockType = "UTC"
+            self._setClockError(0)
             self.tuiModel.logMsg("Your computer clock is keeping UTC")
         elif abs(clockUTC - currTAI) < 3.0:
             # clock keeps accurate TAI (as well as we can figure); set time error to UTC-TAI
             self.clockType = "TAI"
-            RO.Astro.Tm.setClockError(-utcMinusTAI)
+            self._setClockError(-utcMinusTAI)
             self.tuiModel.logMsg("Your computer clock is keeping TAI")
         else:
             # clock system unknown or not keeping accurate time; adjust based on current UTC
             self.clockType = None
             timeError = clockUTC - currUTC
-            RO.Astro.Tm.setClockError(timeError)
+            self._setClockError(timeError)
             self.tuiModel.logMsg(
                 "Your computer clock is off by = %f.1 seconds" % (timeError,),
                 severity = RO.Constants.sevWarning,
             )
 
+    def _setClockError(self, clockError):
+        """Set the clock error in RO.Astro.Tm and update the clock correction cached by LogSource
+        """
+        RO.Astro.Tm.setClockError(clockError)
+        TUI.Models.LogSource.updateTAIOffset()
+
     def _utcMinusTAICallback(self, keyVar):
         """Updates UTC-TAI in RO.Astro.Tm
         """
@@ -195,6 +223,7 @@ class BackgroundKwds(object):
         utcMinusTAI = keyVar[0]
         if utcMinusTAI is not None:
             RO.Astro.Tm.setUTCMinusTAI(utcMinusTAI)
+            TUI.Models.LogSource.updateTAIOffset()
             self.didSetUTCMinusTAI = True
                 
 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""Coalesce widget redraws: redraw each widget at most once per frame
+
+Many widgets used to redraw synchronously in keyword variable callbacks, so a burst of replies
+caused a burst of redundant redraws (e.g. rebuilding a whole table once per reply).
+Instead, a widget registers its redraw function with the FrameScheduler (a singleton)
+and its callbacks merely update internal state and mark the widget dirty:
+
+    self.redrawer = TUI.Base.FrameScheduler.FrameScheduler().register(self.redraw, wdg=self)
+    ...
+    def _fooCallback(self, keyVar):
+        # update internal state, then:
+        self.redrawer.markDirty()
+
+The first mark in a frame schedules the frame using Tk after_idle; when Tk is next idle
+(i.e. after all pending events, including the rest of the burst of replies, have been processed)
+every dirty widget is redrawn once.
+
+The scheduler counts marks and redraws, so one can see how many redraws were saved.
+
+History:
+2026-10-18          Initial version.
+"""
+import sys
+import traceback
+import weakref
+import Tkinter
+
+__all__ = ["FrameScheduler", "Redrawer"]
+
+class Redrawer(object):
+    """Redraw one widget via the FrameScheduler; construct using FrameScheduler.register
+
+    Fields include:
+    - name: name used for statistics
+    - numMarks: number of times markDirty was called
+    - numRedraws: number of redraws (including redrawNow)
+    - isDirty: True if a redraw is pending
+    """
+    def __init__(self, scheduler, redrawFunc, wdg, name):
+        self.scheduler = scheduler
+        self.redrawFunc = redrawFunc
+        self.wdg = wdg
+        self.name = name
+        self.numMarks = 0
+        self.numRedraws = 0
+        self.isDirty = False
+
+    def markDirty(self):
+        """Request a redraw at the next frame"""
+        self.numMarks += 1
+        self.scheduler.numMarks += 1
+        if not self.isDirty:
+            self.isDirty = True
+            self.scheduler._addDirty(self)
+
+    def redrawNow(self):
+        """Redraw now (e.g. the first time), cancelling any pending redraw"""
+        self.isDirty = False
+        self.numRedraws += 1
+        self.scheduler.numRedraws += 1
+        self.redrawFunc()
+
+    @property
+    def redrawsSaved(self):
+        """Number of marks that did not result in a separate redraw"""
+        return max(0, self.numMarks - self.numRedraws)
+
+    def __str__(self):
+        return "Redrawer(%s; %d marks, %d redraws)" % (self.name, self.numMarks, self.numRedraws)
+
+
+class FrameScheduler(object):
+    """Redraw dirty widgets at most once per frame. A singleton.
+
+    Fields include:
+    - numMarks: total number of calls to Redrawer.markDirty
+    - numRedraws: total number of redraws
+    - numFrames: number of frames run
+    """
+    def __new__(cls):
+        """Construct the singleton FrameScheduler if not already constructed
+        """
+        if hasattr(cls, 'self'):
+            return cls.self
+
+        cls.self = object.__new__(cls)
+        self = cls.self
+        self.numMarks = 0
+        self.numRedraws = 0
+        self.numFrames = 0
+        self._dirtyList = [] # Redrawers to redraw at the next frame
+        self._frameID = None # ID of pending after_idle call; None if none
+        self._redrawerSet = weakref.WeakSet() # all registered Redrawers, for statistics
+        return self
+
+    def __init__(self, *args, **kargs):
+        pass
+
+    def register(self, redrawFunc, wdg, name=None):
+        """Register a redraw function and return a Redrawer
+
+        Inputs:
+        - redrawFunc: function to redraw the widget; called with no arguments
+        - wdg: the widget (any Tkinter widget; used to schedule frames and to skip destroyed widgets)
+        - name: name for statistics; if None then use the class name of wdg
+
+        The scheduler only holds a weak reference to the returned Redrawer (except while it is dirty),
+        so keep a reference to it, e.g. as an attribute of the widget.
+        """
+        if name is None:
+            name = type(wdg).__name__
+        redrawer = Redrawer(self, redrawFunc, wdg, name)
+        self._redrawerSet.add(redrawer)
+        return redrawer
+
+    @property
+    def redrawsSaved(self):
+        """Total number of marks that did not result in a separate redraw"""
+        return max(0, self.numMarks - self.numRedraws)
+
+    def getStats(self):
+        """Return a list of (name, number of marks, number of redraws) for registered widgets,
+        combining widgets with the same name, sorted by decreasing number of redraws saved
+        """
+        statsDict = dict()
+        for redrawer in list(self._redrawerSet):
+            stats = statsDict.setdefault(redrawer.name, [0, 0])
+            stats[0] += redrawer.numMarks
+            stats[1] += redrawer.numRedraws
+        statsList = [(name, numMarks, numRedraws) for name, (numMarks, numRedraws) in statsDict.iteritems()]
+        statsList.sort(key=lambda stats: (stats[2] - stats[1], stats[0]))
+        return statsList
+
+    def reset(self):
+        """Reset statistics to 0"""
+        self.numMarks = 0
+        self.numRedraws = 0
+        self.numFrames = 0
+        for redrawer in list(self._redrawerSet):
+            redrawer.numMarks = 0
+            redrawer.numRedraws = 0
+
+    def runFrame(self):
+        """Redraw all dirty widgets now; called automatically when Tk is idle after a widget is marked dirty
+        """
+        self._frameID = None
+        dirtyList = self._dirtyList
+        self._dirtyList = []
+        if not dirtyList:
+            return
+        self.numFrames += 1
+        for redrawer in dirtyList:
+            if not redrawer.isDirty:
+                # redrawn by redrawNow since being marked
+                continue
+            try:
+                if not redrawer.wdg.winfo_exists():
+                    redrawer.isDirty = False
+                    continue
+                redrawer.redrawNow()
+            except Exception:
+                redrawer.isDirty = False
+                sys.stderr.write("Redraw of %s failed:\n" % (redrawer.name,))
+                traceback.print_exc(file=sys.stderr)
+
+    def _addDirty(self, redrawer):
+        """Add a newly dirty Redrawer and schedule a frame, if not already scheduled"""
+        self._dirtyList.append(redrawer)
+        if self._frameID is None:
+            try:
+                self._frameID = redrawer.wdg.after_idle(self.runFrame)
+            except Tkinter.TclError:
+                # widget destroyed; redraw now (runFrame skips destroyed widgets)
+                self.runFrame()
+
+    def __str__(self):
+        return "FrameScheduler(%d marks, %d redraws, %d frames)" % (self.numMarks, self.numRedraws, self.numFrames)
+
+
+if __name__ == "__main__":
+    root = Tkinter.Tk()
+    scheduler = FrameScheduler()
+
+    class TestWdg(Tkinter.Label):
+        def __init__(self, master):
+            Tkinter.Label.__init__(self, master, text="0")
+            self.value = 0
+            self.redrawer = scheduler.register(self.redraw, wdg=self)
+
+        def setValue(self, value):
+            self.value = value
+            self.redrawer.markDirty()
+
+        def redraw(self):
+            self["text"] = str(self.value)
+
+    testWdg = TestWdg(root)
+    testWdg.pack()
+
+    def burst(numLeft=20):
+        for i in range(100):
+            testWdg.setValue(testWdg.value + 1)
+        if numLeft > 1:
+            root.after(50, burst, numLeft - 1)
+        else:
+            root.after(100, report)
+
+    def report():
+        print scheduler, "redraws saved =", scheduler.redrawsSaved
+        for name, numMarks, numRedraws in scheduler.getStats():
+            print "%s: %d marks, %d redraws" % (name, numMarks, numRedraws)
+        root.quit()
+
+    root.after(100, burst)
+    root.mainloop()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Min/max decimation of a TUI.Base.TimeSeriesBuffer, for drawing long time series quickly
+
+Time is divided into buckets of fixed width (normally one pixel of the plot) aligned to multiples of
+the bucket width, and each bucket is represented by its minimum and maximum points (in time order;
+one point if they are the same point). This preserves the envelope of the data, including spikes,
+with at most 2 points per bucket.
+
+Because the buckets are aligned to fixed times, a bucket's points never change once a later point
+has arrived, so the decimated points of complete buckets are cached, and update only processes
+the points in the newest bucket (which is still receiving points) and the points added since
+the last update. Thus the cost of an update does not depend on how long the series is.
+When points are trimmed from the start of the buffer the cached points before the first remaining point
+are trimmed as well. The cache is reset if the bucket width changes (e.g. if the plot is resized).
+
+Points with non-finite values (e.g. NaN) are ignored. Times must not decrease (as for TimeSeriesBuffer).
+
+History:
+2026-10-18          Initial version.
+"""
+import numpy
+import TimeSeriesBuffer
+
+__all__ = ["MinMaxDecimator"]
+
+class MinMaxDecimator(object):
+    """Min/max decimation of a TUI.Base.TimeSeriesBuffer
+
+    Fields include:
+    - tsBuffer: the TimeSeriesBuffer being decimated
+    - bucketWidth: bucket width (in the units of time of tsBuffer), or None if not yet updated
+    """
+    def __init__(self, tsBuffer):
+        """Create a MinMaxDecimator
+
+        Inputs:
+        - tsBuffer: the TimeSeriesBuffer to decimate
+        """
+        self.tsBuffer = tsBuffer
+        self.bucketWidth = None
+        self._cache = TimeSeriesBuffer.TimeSeriesBuffer() # decimated points of complete buckets
+        self.clear()
+
+    def clear(self):
+        """Discard all cached data"""
+        self._cache.clear()
+        self._newestBucketInd = None # index of newest bucket; its points are in _newestData
+        self._newestData = (numpy.zeros(0), numpy.zeros(0))
+
+    def getData(self):
+        """Return (times, values) of the decimated points as of the most recent update, oldest first
+        """
+        cacheT, cacheY = self._cache.getData()
+        newestT, newestY = self._newestData
+        if len(newestT) == 0:
+            return cacheT, cacheY
+        return numpy.concatenate((cacheT, newestT)), numpy.concatenate((cacheY, newestY))
+
+    def update(self, bucketWidth):
+        """Update the decimated points from the points in tsBuffer
+
+        Inputs:
+        - bucketWidth: bucket width (in the units of time of tsBuffer); must be > 0
+        """
+        if bucketWidth <= 0:
+            raise RuntimeError("bucketWidth=%r must be > 0" % (bucketWidth,))
+        if bucketWidth != self.bucketWidth:
+            self.bucketWidth = float(bucketWidth)
+            self.clear()
+
+        tArr, yArr = self.tsBuffer.getData()
+        if len(tArr) == 0:
+            self.clear()
+            return
+        self._cache.trimBefore(tArr[0])
+
+        # process the points from the start of the newest bucket on
+        # (search a bit early and then filter on bucket index, in case of roundoff error)
+        if self._newestBucketInd is None:
+            startInd = 0
+        else:
+            startInd = int(numpy.searchsorted(tArr, (self._newestBucketInd - 0.5) * self.bucketWidth, side="left"))
+        tArr = tArr[startInd:]
+        yArr = yArr[startInd:]
+        bucketIndArr = numpy.floor(tArr / self.bucketWidth).astype(numpy.int64)
+        isUsable = numpy.isfinite(yArr)
+        if self._newestBucketInd is not None:
+            isUsable &= bucketIndArr >= self._newestBucketInd
+        if not isUsable.all():
+            tArr = tArr[isUsable]
+            yArr = yArr[isUsable]
+            bucketIndArr = bucketIndArr[isUsable]
+        if len(tArr) == 0:
+            self._newestData = (numpy.zeros(0), numpy.zeros(0))
+            return
+
+        decT, decY, numLast = self._decimate(tArr, yArr, bucketIndArr)
+        numComplete = len(decT) - numLast
+        if numComplete > 0:
+            self._cache.extend(decT[0:numComplete], decY[0:numComplete])
+        self._newestBucketInd = bucketIndArr[-1]
+        self._newestData = (decT[numComplete:], decY[numComplete:])
+
+    def _decimate(self, tArr, yArr, bucketIndArr):
+        """Decimate points into buckets
+
+        Inputs:
+        - tArr: times (not decreasing)
+        - yArr: values (all finite)
+        - bucketIndArr: bucket index of each point
+
+        Returns:
+        - decT: times of decimated points
+        - decY: values of decimated points
+        - numLast: number of decimated points in the last bucket (1 or 2)
+        """
+        startArr = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(bucketIndArr)) + 1))
+        countArr = numpy.diff(numpy.concatenate((startArr, [len(tArr)])))
+
+        # index of the first minimum and first maximum point in each bucket
+        minIndArr = self._findFirst(yArr == numpy.repeat(numpy.minimum.reduceat(yArr, startArr), countArr), startArr)
+        maxIndArr = self._findFirst(yArr == numpy.repeat(numpy.maximum.reduceat(yArr, startArr), countArr), startArr)
+
+        # min and max point of each bucket, in time order; omit the second if the same point
+        pairArr = numpy.empty((len(startArr), 2), dtype=numpy.int64)
+        pairArr[:, 0] = numpy.minimum(minIndArr, maxIndArr)
+        pairArr[:, 1] = numpy.maximum(minIndArr, maxIndArr)
+        useArr = numpy.ones(pairArr.shape, dtype=bool)
+        useArr[:, 1] = pairArr[:, 0] != pairArr[:, 1]
+        indArr = pairArr[useArr]
+        numLast = 2 if useArr[-1, 1] else 1
+        return tArr[indArr], yArr[indArr], numLast
+
+    @staticmethod
+    def _findFirst(isMatchArr, startArr):
+        """Return the index of the first True value in each bucket (each bucket must have one)"""
+        matchIndArr = numpy.flatnonzero(isMatchArr)
+        return matchIndArr[numpy.searchsorted(matchIndArr, startArr, side="left")]
+
+    def __len__(self):
+        return len(self._cache) + len(self._newestData[0])
+
+    def __str__(self):
+        return "MinMaxDecimator(%d points; bucketWidth=%s)" % (len(self), self.bucketWidth)
+
+
+if __name__ == "__main__":
+    tsBuffer = TimeSeriesBuffer.TimeSeriesBuffer()
+    decimator = MinMaxDecimator(tsBuffer)
+    tArr = numpy.arange(100000, dtype=float)
+    tsBuffer.extend(tArr, numpy.sin(tArr / 1000.0))
+    decimator.update(bucketWidth=100.0)
+    print decimator
+    tsBuffer.append(100000.5, 5.0)
+    tsBuffer.trimBefore(50000)
+    decimator.update(bucketWidth=100.0)
+    print decimator, decimator.getData()[1][-3:]
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""Replay a recording of hub traffic through the keyword dispatcher
+
+Unlike TestDispatcher, which dispatches small hand-written data sets, ReplayDispatcher
+replays a recording of real hub traffic (see TUI.Models.HubRecording and TUIModel.startRecording),
+at the original pace, faster or slower, or as fast as possible, and can seek to any time in the recording.
+This allows reproducing a whole night of load locally, e.g. to see how windows behave under real traffic.
+
+Replies that are due are dispatched in batches (at most maxBatchSize per batch, to keep the GUI responsive),
+with one timer per batch rather than one per reply.
+
+Usage: ReplayDispatcher.py recordingPath [speed]
+where speed is a multiple of real time, or 0 to replay as fast as possible (default 1).
+
+History:
+2026-10-18          Initial version.
+"""
+import time
+import opscore.utility.timer
+import TUI.Models.HubRecording
+import TUI.Models.TUIModel
+
+__all__ = ["ReplayDispatcher"]
+
+DefaultMaxBatchSize = 500
+
+class ReplayDispatcher(object):
+    """Replay a hub recording through the keyword dispatcher
+
+    Fields include:
+    - reader: the recording (a TUI.Models.HubRecording.HubRecordingReader)
+    - speed: replay speed as a multiple of real time, or None to replay as fast as possible
+    - numDispatched: number of replies dispatched
+    - maxLag: maximum time (sec) by which a reply was dispatched later than scheduled
+        (always 0 when replaying as fast as possible)
+    """
+    def __init__(self, filePath, speed=1.0, maxBatchSize=DefaultMaxBatchSize, doneFunc=None):
+        """Create a ReplayDispatcher; call start to start replaying
+
+        Inputs:
+        - filePath: path of hub recording
+        - speed: replay speed as a multiple of real time; None or 0 to replay as fast as possible
+        - maxBatchSize: maximum number of replies dispatched before returning to the event loop
+        - doneFunc: function to call (with this ReplayDispatcher as its sole argument)
+            when the end of the recording is reached; None if none
+        """
+        self.tuiModel = TUI.Models.TUIModel.Model(True)
+        self.dispatcher = self.tuiModel.dispatcher
+        self.reader = TUI.Models.HubRecording.HubRecordingReader(filePath)
+        self.maxBatchSize = int(maxBatchSize)
+        if self.maxBatchSize < 1:
+            raise RuntimeError("maxBatchSize=%r must be >= 1" % (maxBatchSize,))
+        self.doneFunc = doneFunc
+        self.speed = None
+        self.numDispatched = 0
+        self.maxLag = 0.0
+        self._timer = opscore.utility.timer.Timer()
+        self._isRunning = False
+        # replay clock: the reply received at _anchorRecTime is dispatched at wall-clock time _anchorWallTime
+        self._anchorRecTime = 0.0
+        self._anchorWallTime = 0.0
+        self._replyIter = None
+        self._nextReply = None # next (receive time, reply) to dispatch; None if at end
+        self.setSpeed(speed)
+        self.seek(None)
+
+    @property
+    def currTime(self):
+        """Receive time (unix sec) of the next reply to dispatch; None if at the end of the recording"""
+        if self._nextReply is None:
+            return None
+        return self._nextReply[0]
+
+    @property
+    def isRunning(self):
+        """True if replaying"""
+        return self._isRunning
+
+    def pause(self):
+        """Stop replaying; call resume to continue from the same point"""
+        self._isRunning = False
+        self._timer.cancel()
+
+    def resume(self):
+        """Continue replaying from the current point (a no-op if already running or at the end)"""
+        if self._isRunning or self._nextReply is None:
+            return
+        self._isRunning = True
+        self._setAnchor()
+        self._timer.start(0, self._dispatchDue)
+
+    def runAll(self):
+        """Dispatch all remaining replies immediately, without returning to the event loop
+
+        Useful for benchmarks that need no GUI updates. Return the number of replies dispatched.
+        """
+        self.pause()
+        dispatchReplyStr = self.dispatcher.dispatchReplyStr
+        numDispatched = 0
+        while self._nextReply is not None:
+            dispatchReplyStr(self._nextReply[1])
+            numDispatched += 1
+            self._nextReply = next(self._replyIter, None)
+        self.numDispatched += numDispatched
+        return numDispatched
+
+    def seek(self, recvTime):
+        """Move to the first reply received at or after recvTime (unix sec); if None, move to the start
+
+        Replies that are skipped are not dispatched, so keyword values may be stale until they are next
+        output (or refreshed).
+        """
+        self._replyIter = self.reader.iterReplies(startTime=recvTime)
+        self._nextReply = next(self._replyIter, None)
+        self._setAnchor()
+
+    def setSpeed(self, speed):
+        """Set replay speed as a multiple of real time; None or 0 to replay as fast as possible
+        """
+        if speed is not None:
+            speed = float(speed)
+            if speed < 0:
+                raise RuntimeError("speed=%r must be >= 0" % (speed,))
+            if speed == 0:
+                speed = None
+        currRecTime = None
+        if self._isRunning and self.speed is not None:
+            # keep the replay clock continuous
+            currRecTime = self._anchorRecTime + (time.time() - self._anchorWallTime) * self.speed
+        self.speed = speed
+        self._setAnchor(currRecTime)
+        if self._isRunning:
+            self._timer.start(0, self._dispatchDue)
+
+    def start(self, startTime=None):
+        """Start replaying at a given receive time (unix sec); if None, start at the beginning
+        """
+        self.pause()
+        self.seek(startTime)
+        self.resume()
+
+    def _dispatchDue(self):
+        """Dispatch replies that are due (at most maxBatchSize) and schedule the next batch
+        """
+        if not self._isRunning:
+            return
+        currWallTime = time.time()
+        speed = self.speed
+        dispatchReplyStr = self.dispatcher.dispatchReplyStr
+        if speed is None:
+            maxRecTime = None
+        else:
+            maxRecTime = self._anchorRecTime + (currWallTime - self._anchorWallTime) * speed
+            if self._nextReply is not None and self._nextReply[0] <= maxRecTime:
+                lag = (maxRecTime - self._nextReply[0]) / speed
+                self.maxLag = max(self.maxLag, lag)
+
+        numDispatched = 0
+        while self._nextReply is not None and numDispatched < self.maxBatchSize:
+            recvTime, replyStr = self._nextReply
+            if maxRecTime is not None and recvTime > maxRecTime:
+                break
+            dispatchReplyStr(replyStr)
+            numDispatched += 1
+            self._nextReply = next(self._replyIter, None)
+        self.numDispatched += numDispatched
+
+        if self._nextReply is None:
+            self._isRunning = False
+            if self.doneFunc:
+                self.doneFunc(self)
+            return
+        if speed is None:
+            delay = 0
+        else:
+            delay = max(0, self._anchorWallTime + ((self._nextReply[0] - self._anchorRecTime) / speed) - time.time())
+        self._timer.start(delay, self._dispatchDue)
+
+    def _setAnchor(self, recTime=None):
+        """Restart the replay clock at the current wall-clock time
+
+        Inputs:
+        - recTime: receive time to which the current wall-clock time corresponds;
+            if None then use the receive time of the next reply
+        """
+        self._anchorWallTime = time.time()
+        if recTime is None:
+            recTime = self.currTime or 0.0
+        self._anchorRecTime = recTime
+
+    def __str__(self):
+        return "ReplayDispatcher(%r; %d of %d replies dispatched)" % \
+            (self.reader.filePath, self.numDispatched, len(self.reader))
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print "Usage: ReplayDispatcher.py recordingPath [speed]"
+        sys.exit(1)
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    def doneFunc(replayDispatcher):
+        duration = time.time() - startTime
+        print "Replay finished: %s in %0.1f sec; max lag %0.3f sec" % (replayDispatcher, duration, replayDispatcher.maxLag)
+
+    replayDispatcher = ReplayDispatcher(sys.argv[1], speed=speed, doneFunc=doneFunc)
+    print "Replaying %s" % (replayDispatcher,)
+    startTime = time.time()
+    replayDispatcher.start()
+    replayDispatcher.tuiModel.reactor.run()
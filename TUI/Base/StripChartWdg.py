@@ -1,5 +1,25 @@
 """A specialization of RO.Wdg.StripChart that adds methods to trace keyVars
 
+Lines made by plotKeyVar store their data in a TUI.Base.TimeSeriesBuffer (preallocated NumPy arrays)
+instead of Python lists: each keyVar update appends one point to the buffer, old points are trimmed
+by moving the start of the buffer, and the matplotlib line is given views of the buffer (no copies).
+Use addPoints to add many points at once (e.g. history) to such a line.
+If the history of the plotted keyword value is recorded (see TUI.Models.KeyHistory)
+then plotKeyVar backfills the line with the recorded values in the time range.
+
+Once such a line has more than DecimatePointsPerPixel points per pixel of plot width, it is drawn
+using min/max decimation (see TUI.Base.MinMaxDecimator) with one bucket per pixel (at most 2 points per pixel).
+The decimated points are cached, so the cost of drawing a line does not grow with the time range
+or the rate of data. Specify decimate=False when constructing the widget to always draw every point.
+
+New data for plotKeyVar lines is drawn by blitting: the cached background of each subplot with new data
+(axes, grid, legend and constant lines, as saved by RO.Wdg.StripChartWdg after each full draw)
+is restored and only that subplot's data lines are drawn on it. A full redraw is only done
+when the time axis is updated (every updateInterval seconds) or the y limits change (autoscaling).
+Bursts of new data are coalesced (see TUI.Base.FrameScheduler), and blits and full redraws
+are each limited to maxFrameRate frames per second (DefMaxFrameRate by default), so several strip charts
+receiving rapid data do not saturate the Tk event loop.
+
 History:
 2010-10-01  ROwen
 2010-12-23  Backward-incompatible changes:
@@ -7,35 +27,224 @@ History:
             - plotKeyVar no longer takes a "name" argument; use label if you want a name that shows up in legends.
 2012-05-31  Return line from plotKeyVar.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          plotKeyVar stores data in a TUI.Base.TimeSeriesBuffer and updates the line once per frame.
+                    Added addPoints and getBuffer; clear and removeLine handle such lines.
+2026-10-18          Draw long plotKeyVar lines using min/max decimation; added decimate argument.
+2026-10-18          Draw new plotKeyVar data by blitting the subplots with new data onto their cached background,
+                    at no more than maxFrameRate frames/sec; added maxFrameRate argument.
+2026-10-18          plotKeyVar backfills the line from the key history (see TUI.Models.KeyHistory);
+                    added backfill argument.
 """
+import time
+import numpy
 import RO.Wdg.StripChartWdg
+from RO.TkUtil import Timer
+import TUI.Base.FrameScheduler
+import TUI.Models
+import MinMaxDecimator
+import TimeSeriesBuffer
 
 TimeConverter = RO.Wdg.StripChartWdg.TimeConverter
 
+# decimate plotKeyVar lines that have more than this many points per pixel of plot width
+DecimatePointsPerPixel = 2
+
+# default maximum rate at which a strip chart is redrawn (frames/sec)
+DefMaxFrameRate = 5.0
+
 class StripChartWdg(RO.Wdg.StripChartWdg.StripChartWdg):
-    def plotKeyVar(self, subplotInd, keyVar, keyInd=0, func=None, **kargs):
+    def __init__(self, master, timeRange=3600, *args, **kargs):
+        """Create a StripChartWdg
+
+        Inputs are as for RO.Wdg.StripChartWdg.StripChartWdg, plus:
+        - decimate: if True then draw long plotKeyVar lines using min/max decimation
+        - maxFrameRate: maximum rate at which the chart is redrawn (frames/sec); if None then DefMaxFrameRate.
+            Limits blitting new data and full redraws (updateInterval is increased if necessary).
+        """
+        self._decimate = bool(kargs.pop("decimate", True))
+        maxFrameRate = kargs.pop("maxFrameRate", None)
+        if maxFrameRate is None:
+            maxFrameRate = DefMaxFrameRate
+        if maxFrameRate <= 0:
+            raise RuntimeError("maxFrameRate=%r must be > 0" % (maxFrameRate,))
+        self._minFrameInterval = 1.0 / float(maxFrameRate)
+        self._lastBlitTime = 0
+        self._bufferTimeRange = float(timeRange)
+        self._cnvTimeFunc = kargs.get("cnvTimeFunc") or TimeConverter(useUTC=False)
+        self._mplDaysPerSec = (self._cnvTimeFunc(1000.0) - self._cnvTimeFunc(0.0)) / 1000.0
+        self._bufferDict = dict() # dict of line: TimeSeriesBuffer for lines made by plotKeyVar
+        self._decimatorDict = dict() # dict of line: MinMaxDecimator for lines made by plotKeyVar
+        self._dirtyLineSet = set() # lines made by plotKeyVar whose new data has not been drawn
+        self._bufferRedrawer = TUI.Base.FrameScheduler.FrameScheduler().register(
+            self._blitBufferedLines, wdg=self, name="StripChartWdg")
+        self._blitTimer = Timer()
+        RO.Wdg.StripChartWdg.StripChartWdg.__init__(self, master, timeRange, *args, **kargs)
+        self.updateInterval = max(self.updateInterval, self._minFrameInterval)
+
+    def addPoints(self, line, yArr, tArr):
+        """Add many points to a line made by plotKeyVar
+
+        Inputs:
+        - line: line returned by plotKeyVar
+        - yArr: values (a sequence or array)
+        - tArr: times (unix seconds, e.g. from time.time()); must not decrease and must not be earlier
+            than the last point on the line
+        """
+        tArr = numpy.asarray(tArr, dtype=numpy.float64)
+        if len(tArr) == 0:
+            return
+        # the time converter is linear, so convert all times at once
+        t0 = tArr[0]
+        mplDaysArr = self._cnvTimeFunc(t0) + (tArr - t0) * self._mplDaysPerSec
+        self._bufferDict[line].extend(mplDaysArr, yArr)
+        self._lineChanged(line)
+
+    def clear(self):
+        """Clear data in all non-constant lines"""
+        RO.Wdg.StripChartWdg.StripChartWdg.clear(self)
+        for line, tsBuffer in self._bufferDict.iteritems():
+            tsBuffer.clear()
+            self._lineChanged(line)
+        for decimator in self._decimatorDict.itervalues():
+            decimator.clear()
+
+    def getBuffer(self, line):
+        """Return the TimeSeriesBuffer of a line made by plotKeyVar (times are in matplotlib days)"""
+        return self._bufferDict[line]
+
+    def plotKeyVar(self, subplotInd, keyVar, keyInd=0, func=None, backfill=True, **kargs):
         """Plot one value of one keyVar
-        
+
         Inputs:
         - subplotInd: index of line on Subplot
         - keyVar: keyword variable to plot
         - keyInd: index of keyword variable to plot
         - func: function to transform the value; note that func will never receive None;
             if func is None then the data is not transformed
+        - backfill: if True and the history of this value is recorded (see TUI.Models.KeyHistory)
+            then show the recorded values in the time range
         **kargs: keyword arguments for StripChartWdg.addLine
         """
         line = self.addLine(subplotInd=subplotInd, **kargs)
-        
+        tsBuffer = TimeSeriesBuffer.TimeSeriesBuffer()
+        self._bufferDict[line] = tsBuffer
+        if self._decimate:
+            self._decimatorDict[line] = MinMaxDecimator.MinMaxDecimator(tsBuffer)
+
+        if backfill:
+            endTime = time.time()
+            histData = TUI.Models.getModel("tui").keyHistory.read(keyVar, keyInd,
+                startTime=endTime - self._bufferTimeRange, endTime=endTime)
+            if histData is not None and len(histData[0]) > 0:
+                tArr, yArr = histData
+                if func is not None:
+                    yArr = [func(y) for y in yArr]
+                self.addPoints(line, yArr, tArr)
+
         if func is None:
             func = lambda x: x
-        
-        def callFunc(keyVar, line=line, keyInd=keyInd, func=func):
+
+        def callFunc(keyVar, line=line, tsBuffer=tsBuffer, keyInd=keyInd, func=func):
             if not keyVar.isCurrent or not keyVar.isGenuine:
                 return
             val = keyVar[keyInd]
             if val is None:
                 return
-            line.addPoint(func(val))
-        
+            tsBuffer.append(self._cnvTimeFunc(time.time()), func(val))
+            self._lineChanged(line)
+
         keyVar.addCallback(callFunc, callNow=False)
         return line
+
+    def removeLine(self, line):
+        """Remove an existing line"""
+        self._bufferDict.pop(line, None)
+        self._decimatorDict.pop(line, None)
+        self._dirtyLineSet.discard(line)
+        return RO.Wdg.StripChartWdg.StripChartWdg.removeLine(self, line)
+
+    def _autoscaleY(self, subplot):
+        """Autoscale the y axis of a subplot, if autoscaling is on; return True if the y limits changed"""
+        if not subplot.get_autoscaley_on():
+            return False
+        oldYLim = tuple(subplot.get_ylim())
+        subplot.relim()
+        subplot.autoscale_view(scalex=False, scaley=True)
+        return tuple(subplot.get_ylim()) != oldYLim
+
+    def _blitBufferedLines(self):
+        """Draw new data of plotKeyVar lines by blitting; called by the frame scheduler
+
+        If called sooner than 1/maxFrameRate after the previous blit, try again when that time is up.
+        If the y limits of a subplot change (or no background has been saved yet) then request a full redraw
+        instead of blitting.
+        """
+        if not self._dirtyLineSet:
+            return
+        waitSec = self._lastBlitTime + self._minFrameInterval - time.time()
+        if waitSec > 0:
+            if not self._blitTimer.isActive:
+                self._blitTimer.start(waitSec, self._bufferRedrawer.markDirty)
+            return
+        self._lastBlitTime = time.time()
+
+        dirtyLineSet, self._dirtyLineSet = self._dirtyLineSet, set()
+        subplotSet = set()
+        for line in dirtyLineSet:
+            self._setLineData(line)
+            subplotSet.add(line.subplot)
+        if not self.winfo_ismapped():
+            # RO.Wdg.StripChartWdg redraws everything when the widget is mapped
+            return
+
+        needFullDraw = False
+        for subplot in subplotSet:
+            if self._autoscaleY(subplot) or subplot._scwBackground is None:
+                needFullDraw = True
+        if needFullDraw:
+            # the draw event handler saves the new backgrounds and blits the data lines
+            self.canvas.draw_idle()
+            return
+        for subplot in subplotSet:
+            self.canvas.restore_region(subplot._scwBackground)
+            for scwLine in subplot._scwLines:
+                subplot.draw_artist(scwLine.line2d)
+            self.canvas.blit(subplot.bbox)
+
+    def _getLineData(self, line):
+        """Return (times, values) to draw for a line made by plotKeyVar: decimated if long, else all points
+        """
+        tsBuffer = self._bufferDict[line]
+        decimator = self._decimatorDict.get(line)
+        if decimator is None:
+            return tsBuffer.getData()
+        numPixels = int(line.subplot.bbox.width)
+        if numPixels < 1 or len(tsBuffer) <= numPixels * DecimatePointsPerPixel:
+            return tsBuffer.getData()
+        decimator.update(bucketWidth=self._bufferTimeRange * self._mplDaysPerSec / numPixels)
+        return decimator.getData()
+
+    def _lineChanged(self, line):
+        """Note that a line made by plotKeyVar has new data, to be drawn at the next frame"""
+        self._dirtyLineSet.add(line)
+        self._bufferRedrawer.markDirty()
+
+    def _setLineData(self, line):
+        """Give a line made by plotKeyVar its current data (decimated if long)"""
+        line.line2d.set_data(*self._getLineData(line))
+
+    def _updateTimeAxis(self):
+        """Trim old data from plotKeyVar lines and update their data, then update the time axis
+        (which does a full redraw, if visible); calls itself every updateInterval seconds
+        """
+        if self._bufferDict:
+            minMPLDays = self._cnvTimeFunc(time.time() - self._bufferTimeRange)
+            subplotSet = set()
+            for line, tsBuffer in self._bufferDict.iteritems():
+                tsBuffer.trimBefore(minMPLDays)
+                self._setLineData(line)
+                subplotSet.add(line.subplot)
+            self._dirtyLineSet.clear()
+            for subplot in subplotSet:
+                self._autoscaleY(subplot)
+        RO.Wdg.StripChartWdg.StripChartWdg._updateTimeAxis(self)
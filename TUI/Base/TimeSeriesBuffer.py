@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""A time series of (time, value) points in preallocated NumPy ring buffers
+
+Times and values are float64 arrays. The buffers are mirrored: each point is written twice,
+at ring index i and i + capacity, so the most recent points are always contiguous and getData returns
+views of the buffers, without copying. Appending is O(1) (extend writes slices) and trimming old points
+is O(log n) (a binary search) because it just moves the start of the window.
+
+If the buffer is full it doubles in size (up to maxCapacity, if specified); once at maxCapacity,
+each new point replaces the oldest. Times must not decrease (trimBefore relies on the times being sorted).
+
+Views returned by getData remain valid (their data is not overwritten) until the buffer is trimmed,
+cleared or full at maxCapacity.
+
+History:
+2026-10-18          Initial version.
+"""
+import numpy
+
+__all__ = ["TimeSeriesBuffer"]
+
+DefCapacity = 1024
+
+class TimeSeriesBuffer(object):
+    """A time series of (time, value) points in preallocated NumPy ring buffers
+
+    Fields include:
+    - capacity: number of points that fit without growing
+    - maxCapacity: maximum capacity, or None if unlimited
+    """
+    def __init__(self, capacity=DefCapacity, maxCapacity=None):
+        """Create a TimeSeriesBuffer
+
+        Inputs:
+        - capacity: initial capacity (number of points)
+        - maxCapacity: maximum capacity; if None then unlimited
+        """
+        capacity = int(capacity)
+        if capacity < 1:
+            raise RuntimeError("capacity=%r must be >= 1" % (capacity,))
+        if maxCapacity is not None:
+            maxCapacity = int(maxCapacity)
+            if maxCapacity < capacity:
+                raise RuntimeError("maxCapacity=%r must be >= capacity=%r" % (maxCapacity, capacity))
+        self.maxCapacity = maxCapacity
+        self._allocate(capacity)
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the buffers"""
+        return self._tBuf.nbytes + self._yBuf.nbytes
+
+    def append(self, t, y):
+        """Append one point
+
+        Inputs:
+        - t: time; must not be less than the time of the previous point
+        - y: value
+        """
+        if self._size == self.capacity:
+            self._grow(self._size + 1)
+        head = self._head
+        capacity = self.capacity
+        self._tBuf[head] = self._tBuf[head + capacity] = t
+        self._yBuf[head] = self._yBuf[head + capacity] = y
+        head += 1
+        self._head = 0 if head == capacity else head
+        if self._size < capacity:
+            self._size += 1
+
+    def clear(self):
+        """Remove all points (keeping the current capacity)"""
+        self._head = 0
+        self._size = 0
+
+    def extend(self, tArr, yArr):
+        """Append many points
+
+        Inputs:
+        - tArr: times (a sequence or array); must not decrease and must not be less than the time of the last point
+        - yArr: values (a sequence or array of the same length as tArr)
+        """
+        tArr = numpy.asarray(tArr, dtype=numpy.float64).ravel()
+        yArr = numpy.asarray(yArr, dtype=numpy.float64).ravel()
+        if len(tArr) != len(yArr):
+            raise RuntimeError("len(tArr)=%d != len(yArr)=%d" % (len(tArr), len(yArr)))
+        numNew = len(tArr)
+        if numNew == 0:
+            return
+        if self._size + numNew > self.capacity:
+            self._grow(self._size + numNew)
+        capacity = self.capacity
+        if numNew > capacity:
+            # at maxCapacity; only the newest points fit
+            tArr = tArr[-capacity:]
+            yArr = yArr[-capacity:]
+            self._head = (self._head + numNew - capacity) % capacity
+            numNew = capacity
+        # write the points at ring indices [head, end) (contiguous, since the buffers are twice capacity long),
+        # then mirror them: indices below capacity to +capacity, the rest (if any) to -capacity
+        head = self._head
+        end = head + numNew
+        numLow = min(end, capacity) - head
+        for buf, dataArr in ((self._tBuf, tArr), (self._yBuf, yArr)):
+            buf[head:end] = dataArr
+            buf[head + capacity:head + numLow + capacity] = dataArr[0:numLow]
+            if end > capacity:
+                buf[0:end - capacity] = dataArr[numLow:]
+        self._head = end % capacity
+        self._size = min(self._size + numNew, capacity)
+
+    def getData(self):
+        """Return (times, values) as read-only views (no data is copied), oldest first"""
+        end = self._head + self.capacity
+        start = end - self._size
+        tView = self._tBuf[start:end]
+        yView = self._yBuf[start:end]
+        tView.flags.writeable = False
+        yView.flags.writeable = False
+        return tView, yView
+
+    def getFirstTime(self):
+        """Return the time of the oldest point, or None if empty"""
+        if self._size == 0:
+            return None
+        return self._tBuf[self._head + self.capacity - self._size]
+
+    def getLastTime(self):
+        """Return the time of the newest point, or None if empty"""
+        if self._size == 0:
+            return None
+        return self._tBuf[self._head + self.capacity - 1]
+
+    def trimBefore(self, minTime):
+        """Remove all points whose time is less than minTime; return the number of points removed
+        """
+        if self._size == 0 or self.getFirstTime() >= minTime:
+            return 0
+        end = self._head + self.capacity
+        numToRemove = int(numpy.searchsorted(self._tBuf[end - self._size:end], minTime, side="left"))
+        self._size -= numToRemove
+        return numToRemove
+
+    def _allocate(self, capacity):
+        """Allocate new empty buffers"""
+        self.capacity = capacity
+        self._tBuf = numpy.zeros(2 * capacity, dtype=numpy.float64)
+        self._yBuf = numpy.zeros(2 * capacity, dtype=numpy.float64)
+        self._head = 0 # ring index at which the next point is written
+        self._size = 0 # number of points
+
+    def _grow(self, minCapacity):
+        """Grow to at least minCapacity points (by doubling), but no more than maxCapacity
+        """
+        newCapacity = self.capacity
+        while newCapacity < minCapacity:
+            newCapacity *= 2
+        if self.maxCapacity is not None:
+            newCapacity = min(newCapacity, self.maxCapacity)
+        if newCapacity <= self.capacity:
+            return
+        tData, yData = self.getData()
+        tData = tData.copy()
+        yData = yData.copy()
+        self._allocate(newCapacity)
+        self.extend(tData, yData)
+
+    def __len__(self):
+        return self._size
+
+    def __str__(self):
+        return "TimeSeriesBuffer(%d points; capacity=%d)" % (self._size, self.capacity)
+
+
+if __name__ == "__main__":
+    tsBuffer = TimeSeriesBuffer(capacity=4, maxCapacity=8)
+    for i in range(6):
+        tsBuffer.append(i, i * 10)
+    print tsBuffer, tsBuffer.getData()
+    tsBuffer.extend(range(6, 12), range(60, 120, 10))
+    print tsBuffer, tsBuffer.getData()
+    print "trimmed", tsBuffer.trimBefore(7.5), tsBuffer.getData()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+"""Suspend the keyword variable callbacks of hidden windows and resynchronize them when shown
+
+Widgets in hidden windows normally keep processing every keyword variable callback, redrawing
+windows nobody is looking at. When enabled, the WindowSuspender (a singleton) suspends
+the callbacks owned by the widgets of each window in the TUI toplevel set (tlSet) while that window
+is withdrawn or iconified. When the window is shown again, each suspended callback is called once,
+with the arguments of its most recent suspended call (normally just the keyword variable,
+which then has its current value), so the window resynchronizes from the current keyword values.
+
+A callback is owned by a widget if it is a method of the widget (possibly wrapped, e.g. by functools.partial
+or TUI.Models.ChangeFilter.onChange), or a closure over the widget or one of its methods,
+or a function with such a default argument (e.g. the adapters made by keyVar.addValueCallback
+and addValueListCallback, as in keyVar.addValueCallback(wdg.set)).
+Other callbacks (e.g. those of models, or plain functions) are never suspended.
+
+Windows that must process every callback even while hidden (e.g. to play sounds
+or accumulate history) opt out by calling keepActive with their window name, usually in addWindow:
+
+    tlSet.createToplevel(name=WindowName, ...)
+    TUI.Base.WindowSuspender.keepActive(WindowName)
+
+History:
+2026-10-18          Initial version.
+"""
+import collections
+import sys
+import traceback
+import Tkinter
+import TUI.Models.CallbackProfiler
+
+__all__ = ["WindowSuspender", "WindowStats", "keepActive", "getOwnerWdg"]
+
+_keepActiveNames = set() # names of windows whose callbacks are never suspended
+
+def keepActive(windowName):
+    """Never suspend the callbacks of the specified window (a name in the TUI toplevel set)"""
+    _keepActiveNames.add(windowName)
+
+def getOwnerWdg(func):
+    """Return the Tk widget that owns a callback function, or None if not owned by a widget
+    """
+    for i in range(4):
+        owner = getattr(func, "im_self", None)
+        if isinstance(owner, Tkinter.Misc):
+            return owner
+        innerFunc = getattr(func, "func", None) # functools.partial and callback wrappers
+        if innerFunc is not None:
+            func = innerFunc
+            continue
+        # a closure over a widget or a method of a widget, or a function whose default arguments
+        # include one (e.g. the adapters made by keyVar.addValueCallback and addValueListCallback)
+        valueList = []
+        for cell in getattr(func, "func_closure", None) or ():
+            try:
+                valueList.append(cell.cell_contents)
+            except ValueError:
+                continue
+        valueList += getattr(func, "func_defaults", None) or ()
+        for value in valueList:
+            owner = _getValueOwner(value)
+            if owner is not None:
+                return owner
+        return None
+    return None
+
+def _getValueOwner(value):
+    """Return the Tk widget that is, or owns, a value captured by a callback function, or None
+
+    The value may be a widget, a method of a widget, or a list or tuple of these
+    (in which case the owner of the first item that has one is returned).
+    """
+    itemList = value if isinstance(value, (list, tuple)) else (value,)
+    for item in itemList:
+        if isinstance(item, Tkinter.Misc):
+            return item
+        owner = getattr(item, "im_self", None)
+        if isinstance(owner, Tkinter.Misc):
+            return owner
+    return None
+
+
+class WindowStats(object):
+    """Suspension state and statistics for one window
+
+    Fields:
+    - windowName: name of window in the TUI toplevel set
+    - isSuspended: True if callbacks are suspended
+    - numSuspended: number of callback calls suspended
+    - numResynced: number of callbacks called to resynchronize the window
+    """
+    __slots__ = ("windowName", "isSuspended", "numSuspended", "numResynced", "_pendingDict")
+
+    def __init__(self, windowName):
+        self.windowName = windowName
+        self.isSuspended = False
+        self.numSuspended = 0
+        self.numResynced = 0
+        # dict of id(callback wrapper): (callback wrapper, args, keyword args) of most recent suspended call
+        self._pendingDict = collections.OrderedDict()
+
+    def __str__(self):
+        return "%s: %d callbacks suspended, %d resynced" % (self.windowName, self.numSuspended, self.numResynced)
+
+
+class _SuspendableCallback(object):
+    """A callback wrapper that defers calls while its window is suspended
+
+    Compares equal to the function it wraps, so keyVar.removeCallback(callFunc) works.
+    """
+    __slots__ = ("func", "windowStats")
+
+    def __init__(self, func, windowStats):
+        self.func = func
+        self.windowStats = windowStats
+
+    def __call__(self, *args, **kargs):
+        windowStats = self.windowStats
+        if windowStats.isSuspended:
+            windowStats.numSuspended += 1
+            windowStats._pendingDict[id(self)] = (self, args, kargs)
+            return
+        return self.func(*args, **kargs)
+
+    def __eq__(self, other):
+        if isinstance(other, _SuspendableCallback):
+            other = other.func
+        return self.func == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.func)
+
+
+class WindowSuspender(object):
+    """Suspend the keyword variable callbacks of hidden windows. A singleton.
+
+    Fields include:
+    - isEnabled: True if suspending callbacks of hidden windows
+    """
+    def __new__(cls, tuiModel):
+        """Construct the singleton WindowSuspender if not already constructed
+
+        Inputs:
+        - tuiModel: the TUI model (TUI.Models.TUIModel.Model); must not be headless
+        """
+        if hasattr(cls, 'self'):
+            return cls.self
+
+        cls.self = object.__new__(cls)
+        self = cls.self
+        self.dispatcher = tuiModel.dispatcher
+        self.tlSet = tuiModel.tlSet
+        self.tkRoot = tuiModel.tkRoot
+        self.isEnabled = False
+        self._isBound = False
+        self._statsDict = {} # dict of window name: WindowStats
+        return self
+
+    def __init__(self, *args, **kargs):
+        pass
+
+    def disable(self):
+        """Stop suspending: resynchronize suspended windows and restore the original callback functions"""
+        self.isEnabled = False
+        for windowStats in self._statsDict.values():
+            self._resume(windowStats)
+        for keyVar in self._iterKeyVars():
+            callbacks = keyVar._callbacks
+            for ind, func in enumerate(callbacks):
+                holder, innerFunc = self._getHolder(func)
+                if isinstance(innerFunc, _SuspendableCallback):
+                    if holder is None:
+                        callbacks[ind] = innerFunc.func
+                    else:
+                        holder.func = innerFunc.func
+
+    def enable(self):
+        """Start suspending callbacks of hidden windows, including windows that are hidden now
+        """
+        self.isEnabled = True
+        if not self._isBound:
+            self.tkRoot.bind_class("Toplevel", "<Map>", self._mapEvent, add="+")
+            self.tkRoot.bind_class("Toplevel", "<Unmap>", self._unmapEvent, add="+")
+            self._isBound = True
+        windowDict = self._getWindowDict()
+        hiddenNames = [windowName for tlPath, windowName in windowDict.iteritems()
+            if self.tkRoot.nametowidget(tlPath).wm_state() in ("withdrawn", "iconic")]
+        if hiddenNames:
+            self._wrapCallbacks(windowDict)
+            for windowName in hiddenNames:
+                self._suspend(windowName)
+
+    def getNumSuspended(self):
+        """Return the total number of callback calls suspended"""
+        return sum(windowStats.numSuspended for windowStats in self._statsDict.itervalues())
+
+    def getStats(self):
+        """Return a list of WindowStats, most suspended callbacks first"""
+        statsList = self._statsDict.values()
+        statsList.sort(key=lambda windowStats: windowStats.numSuspended, reverse=True)
+        return statsList
+
+    def reset(self):
+        """Reset all statistics to 0"""
+        for windowStats in self._statsDict.itervalues():
+            windowStats.numSuspended = 0
+            windowStats.numResynced = 0
+
+    def _getHolder(self, func):
+        """Return (profiler wrapper or None, function it wraps (or func if not wrapped by the profiler))
+
+        Suspendable wrappers go inside callback profiler wrappers, so the profiler's statistics
+        are not split and the profiler can still restore its callbacks.
+        """
+        if isinstance(func, TUI.Models.CallbackProfiler._ProfiledCallback):
+            return func, func.func
+        return None, func
+
+    def _getWindowDict(self):
+        """Return a dict of toplevel path: window name for windows that may be suspended"""
+        windowDict = dict()
+        for windowName in self.tlSet.getNames(""):
+            if windowName in _keepActiveNames:
+                continue
+            windowDict[str(self.tlSet.getToplevel(windowName))] = windowName
+        return windowDict
+
+    def _getWindowStats(self, windowName):
+        windowStats = self._statsDict.get(windowName)
+        if windowStats is None:
+            windowStats = WindowStats(windowName)
+            self._statsDict[windowName] = windowStats
+        return windowStats
+
+    def _iterKeyVars(self):
+        """Iterate over all keyword variables known to the dispatcher"""
+        for keyVarList in self.dispatcher.keyVarListDict.itervalues():
+            for keyVar in keyVarList:
+                yield keyVar
+
+    def _mapEvent(self, evt):
+        """Handle <Map> of a toplevel: resynchronize its window if suspended"""
+        windowStats = self._statsDict.get(self._getWindowDict().get(str(evt.widget)))
+        if windowStats is not None:
+            self._resume(windowStats)
+
+    def _resume(self, windowStats):
+        """Stop suspending a window's callbacks and call each suspended callback once"""
+        if not windowStats.isSuspended:
+            return
+        windowStats.isSuspended = False
+        pendingDict, windowStats._pendingDict = windowStats._pendingDict, collections.OrderedDict()
+        for wrapper, args, kargs in pendingDict.itervalues():
+            windowStats.numResynced += 1
+            try:
+                wrapper.func(*args, **kargs)
+            except Exception:
+                sys.stderr.write("Callback %r failed while resynchronizing window %s\n" % \
+                    (wrapper.func, windowStats.windowName))
+                traceback.print_exc(file=sys.stderr)
+
+    def _suspend(self, windowName):
+        """Suspend a window's callbacks (callbacks must already be wrapped)"""
+        if windowName in _keepActiveNames:
+            return
+        self._getWindowStats(windowName).isSuspended = True
+
+    def _unmapEvent(self, evt):
+        """Handle <Unmap> of a toplevel: suspend its window's callbacks"""
+        if not self.isEnabled:
+            return
+        windowDict = self._getWindowDict()
+        windowName = windowDict.get(str(evt.widget))
+        if windowName is None:
+            return
+        # wrap now, to include callbacks registered since the last time
+        self._wrapCallbacks(windowDict)
+        self._suspend(windowName)
+
+    def _wrapCallbacks(self, windowDict):
+        """Wrap all callbacks owned by widgets in the specified windows
+
+        Inputs:
+        - windowDict: dict of toplevel path: window name, as returned by _getWindowDict
+        """
+        for keyVar in self._iterKeyVars():
+            callbacks = keyVar._callbacks
+            for ind, func in enumerate(callbacks):
+                holder, innerFunc = self._getHolder(func)
+                if isinstance(innerFunc, _SuspendableCallback):
+                    continue
+                wdg = getOwnerWdg(innerFunc)
+                if wdg is None:
+                    continue
+                try:
+                    windowName = windowDict.get(str(wdg.winfo_toplevel()))
+                except Tkinter.TclError:
+                    # widget destroyed
+                    continue
+                if windowName is None:
+                    continue
+                wrapper = _SuspendableCallback(innerFunc, self._getWindowStats(windowName))
+                if holder is None:
+                    callbacks[ind] = wrapper
+                else:
+                    holder.func = wrapper
+
+    def __str__(self):
+        return "WindowSuspender(isEnabled=%s; %d suspended calls)" % (self.isEnabled, self.getNumSuspended())
+
+
+if __name__ == "__main__":
+    import RO.Wdg
+    import TUI.Base.TestDispatcher
+    import TUI.Models
+
+    testDispatcher = TUI.Base.TestDispatcher.TestDispatcher("tcc", delay=0.1)
+    tuiModel = testDispatcher.tuiModel
+    tccModel = TUI.Models.getModel("tcc")
+
+    class AxePosWdg(Tkinter.Label):
+        def __init__(self, master):
+            Tkinter.Label.__init__(self, master)
+            tccModel.axePos.addCallback(self._axePosCallback, callNow=False)
+
+        def _axePosCallback(self, keyVar):
+            print "AxePosWdg: AxePos =", keyVar.valueList
+            self["text"] = str(keyVar.valueList)
+
+    # callbacks registered with addValueCallback and addValueListCallback are owned by their widget
+    testLabel = RO.Wdg.StrLabel(tuiModel.tkRoot)
+    for addFuncName, callArg in (
+        ("addValueCallback", testLabel.set),
+        ("addValueListCallback", [testLabel.set]),
+        ("addValueListCallback", (testLabel.set, testLabel.set)),
+    ):
+        getattr(tccModel.axePos, addFuncName)(callArg, callNow=False)
+        adapterFunc = tccModel.axePos._callbacks[-1]
+        ownerWdg = getOwnerWdg(adapterFunc)
+        tccModel.axePos.removeCallback(adapterFunc)
+        if ownerWdg is not testLabel:
+            raise RuntimeError("%s callback owner is %r; expected %r" % (addFuncName, ownerWdg, testLabel))
+        print "%s callback is owned by its widget" % (addFuncName,)
+    testLabel.destroy()
+
+    tuiModel.tlSet.createToplevel(name="Test.AxePos", defGeom="+100+100", wdgFunc=AxePosWdg, visible=True)
+    suspender = WindowSuspender(tuiModel)
+    suspender.enable()
+    tuiModel.tkRoot.update()
+
+    def hide():
+        tuiModel.tlSet.getToplevel("Test.AxePos").withdraw()
+        tuiModel.tkRoot.update()
+        for az in (10, 20, 30):
+            testDispatcher.dispatch("AxePos=%0.1f, 45, 0" % (az,))
+        print "Hidden:", suspender.getStats()[0]
+        tuiModel.tkRoot.after(500, show)
+
+    def show():
+        print "Showing window; expect one callback with AxePos = 30"
+        tuiModel.tlSet.makeVisible("Test.AxePos")
+        tuiModel.tkRoot.update()
+        print "Shown:", suspender.getStats()[0]
+
+    tuiModel.tkRoot.after(500, hide)
+    tuiModel.reactor.run()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""Headless STUI: connect to the hub and watch, log, archive and record keywords without a GUI
+
+Builds the same dispatcher, log source, actor models and background tasks as STUI,
+but on a plain Twisted reactor with no Tk (see TUI.Models.TUIModel headless mode).
+This is much lighter than running a full STUI, so it is suitable for a telemetry or logging daemon.
+
+Usage: runtuidaemon.py [options]; run with --help for the options. For example:
+    runtuidaemon.py --progID APO --username watcher --watch tcc.axePos --watch mcp.ffsStatus \\
+        --archive ~/stuilog --record ~/stuilog/hub.hubrec --keyHistory ~/stuilog/keyhistory
+The password is read from $STUI_PASSWORD, if set, else prompted for.
+
+Unless --quiet is specified, every log entry is printed to stdout.
+If the connection fails or is lost, the daemon reconnects after --retry seconds (unless --retry is 0,
+in which case the daemon exits). Stop the daemon with ^C or SIGTERM.
+
+Code that wants its own headless process can call setUp and then run the reactor:
+    import TUI.Daemon # sets the RO.Comm framework to "twisted", so import this first
+    tuiModel = TUI.Daemon.setUp()
+    ...add keyword variable callbacks...
+    tuiModel.dispatcher.connection.connect(progID=..., username=..., password=..., host=..., port=...)
+    tuiModel.reactor.run()
+
+History:
+2026-10-18          Initial version.
+2026-10-18          Added --keyHistory option to record key history (see TUI.Models.KeyHistory).
+"""
+import argparse
+import getpass
+import os
+import sys
+import time
+
+import RO.Comm.Generic
+RO.Comm.Generic.setFramework("twisted")
+
+import opscore.actor.keyvar
+import RO.Constants
+import TUI.Actorkeys
+import TUI.BackgroundTasks
+import TUI.Models
+import TUI.Models.ChangeFilter
+import TUI.Models.TUIModel
+import TUI.Version
+
+__all__ = ["setUp", "getKeyVar", "watchKeyVar", "Daemon", "main"]
+
+DefHubHost = "hub25m.apo.nmsu.edu"
+DefHubPort = 9877
+DefRetryInterval = 30.0 # sec
+PasswordEnvVar = "STUI_PASSWORD"
+
+_backgroundHandler = None # background tasks (a TUI.BackgroundTasks.BackgroundKwds), once set up
+
+def setUp(testMode=False):
+    """Make actorkeys available and create the headless TUI model and background tasks; return the TUI model
+
+    Inputs:
+    - testMode: if True, use a null connection (see TUI.Base.TestDispatcher)
+    """
+    global _backgroundHandler
+    TUI.Actorkeys.initActorkeys()
+    tuiModel = TUI.Models.TUIModel.Model(testMode=testMode, headless=True)
+    if _backgroundHandler is None:
+        _backgroundHandler = TUI.BackgroundTasks.BackgroundKwds()
+    return tuiModel
+
+def getKeyVar(keyName):
+    """Return the keyword variable for keyName, a string of the form actor.keyword (case-insensitive)
+
+    Raise RuntimeError if the keyword is not found.
+    """
+    actor, sep, keyword = keyName.partition(".")
+    if not (actor and keyword):
+        raise RuntimeError("Keyword %r must have the form actor.keyword" % (keyName,))
+    model = TUI.Models.getModel(actor)
+    for keyVar in vars(model).itervalues():
+        if isinstance(keyVar, opscore.actor.keyvar.KeyVar) and keyVar.name.lower() == keyword.lower():
+            return keyVar
+    raise RuntimeError("Keyword %r not found" % (keyName,))
+
+def watchKeyVar(keyVar, outFile=sys.stdout):
+    """Print the value of a keyword variable whenever it changes
+
+    Each line has the form: <UTC date and time> <actor>.<keyword>=<values>,
+    followed by " (not current)" if the value is not current.
+    """
+    def printValue(keyVar):
+        valueStr = ", ".join(str(val) for val in keyVar.valueList)
+        currStr = "" if keyVar.isCurrent else " (not current)"
+        outFile.write("%s %s.%s=%s%s\n" % (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+            keyVar.actor, keyVar.name, valueStr, currStr))
+        outFile.flush()
+    keyVar.addCallback(TUI.Models.ChangeFilter.onChange(printValue), callNow=False)
+
+
+class Daemon(object):
+    """Connect to the hub, reconnecting when the connection is lost, and shut down cleanly
+
+    Fields include:
+    - tuiModel: the (headless) TUI model
+    - retryInterval: interval before reconnecting (sec); if 0 then stop the reactor
+        when the connection fails or is lost
+    """
+    def __init__(self, tuiModel, progID, username, password, host, port, retryInterval=DefRetryInterval):
+        self.tuiModel = tuiModel
+        self.connection = tuiModel.getConnection()
+        self.retryInterval = float(retryInterval)
+        self._connArgs = dict(progID=progID, username=username, password=password, host=host, port=port)
+        self._isShuttingDown = False
+        self._wasConnected = False
+        self._retryCall = None
+        self.connection.addStateCallback(self._connCallback, callNow=False)
+        tuiModel.reactor.addSystemEventTrigger("before", "shutdown", self._shutdown)
+
+    def connect(self):
+        """Connect to the hub"""
+        self._retryCall = None
+        self.tuiModel.logMsg("Connecting to %s:%s" % (self._connArgs["host"], self._connArgs["port"]))
+        self.connection.connect(**self._connArgs)
+
+    def _connCallback(self, conn):
+        """Connection state callback: reconnect (or stop) if the connection fails or is lost"""
+        if conn.isConnected:
+            self._wasConnected = True
+            return
+        if self._isShuttingDown or not conn.mayConnect:
+            return
+        if self.retryInterval <= 0:
+            self.tuiModel.logMsg("Connection %s; exiting" % ("lost" if self._wasConnected else "failed",),
+                severity=RO.Constants.sevError)
+            self.tuiModel.reactor.stop()
+            return
+        if self._retryCall is None:
+            self.tuiModel.logMsg("Not connected; retrying in %0.0f seconds" % (self.retryInterval,),
+                severity=RO.Constants.sevWarning)
+            self._retryCall = self.tuiModel.reactor.callLater(self.retryInterval, self.connect)
+
+    def _shutdown(self):
+        """Disconnect and close the recording, key history and log archive (if any)"""
+        self._isShuttingDown = True
+        if self._retryCall is not None and self._retryCall.active():
+            self._retryCall.cancel()
+        self.tuiModel.stopRecording()
+        self.tuiModel.keyHistory.stop()
+        self.tuiModel.logSource.stopArchive()
+        if self.connection.isConnected:
+            self.connection.disconnect()
+
+
+def main(argv=None):
+    """Run the headless STUI daemon
+
+    Inputs:
+    - argv: command-line arguments (excluding the program name); if None then use sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(
+        description="Headless %s: connect to the hub and watch, log, archive and record keywords" % \
+            (TUI.Version.ApplicationName,),
+    )
+    parser.add_argument("--host", default=DefHubHost, help="hub host (default %(default)s)")
+    parser.add_argument("--port", type=int, default=DefHubPort, help="hub port (default %(default)s)")
+    parser.add_argument("--progID", help="program ID (required unless --test)")
+    parser.add_argument("--username", default=getpass.getuser(), help="user name (default %(default)s)")
+    parser.add_argument("--watch", action="append", default=[], metavar="ACTOR.KEYWORD",
+        help="print the value of this keyword whenever it changes; may be repeated")
+    parser.add_argument("--archive", metavar="DIR", help="archive all log entries in this directory")
+    parser.add_argument("--archiveNights", type=int, help="number of nights of log archive to keep (default all)")
+    parser.add_argument("--record", metavar="PATH", help="record hub traffic to this new file")
+    parser.add_argument("--keyHistory", metavar="DIR",
+        help="record the history of keyword values shown in strip charts in this directory "
+        "(keeping --archiveNights nights)")
+    parser.add_argument("--retry", type=float, default=DefRetryInterval,
+        help="interval before reconnecting (sec); 0 to exit instead (default %(default)s)")
+    parser.add_argument("--quiet", action="store_true", help="do not print log entries")
+    parser.add_argument("--test", action="store_true", help="test mode: do not connect to the hub")
+    args = parser.parse_args(argv)
+    if not (args.progID or args.test):
+        parser.error("--progID is required")
+
+    tuiModel = setUp(testMode=args.test)
+    # test mode prints log entries by default
+    tuiModel.logSource.removeCallback(TUI.Models.TUIModel.logToStdOut, doRaise=False)
+    if not args.quiet:
+        tuiModel.logSource.addCallback(TUI.Models.TUIModel.logToStdOut)
+    try:
+        for keyName in args.watch:
+            watchKeyVar(getKeyVar(keyName))
+    except RuntimeError as e:
+        parser.error(str(e))
+    if args.archive:
+        tuiModel.logSource.startArchive(
+            archiveDir = os.path.expanduser(args.archive),
+            maxNights = args.archiveNights,
+        )
+    if args.record:
+        tuiModel.startRecording(os.path.expanduser(args.record))
+    if args.keyHistory:
+        tuiModel.keyHistory.start(
+            historyDir = os.path.expanduser(args.keyHistory),
+            maxNights = args.archiveNights,
+        )
+
+    tuiModel.logMsg("%s %s (headless) running on %s" % \
+        (TUI.Version.ApplicationName, TUI.Version.VersionName, TUI.Models.TUIModel.getPlatform()))
+    if not args.test:
+        password = os.environ.get(PasswordEnvVar)
+        if password is None:
+            password = getpass.getpass("Password for %s: " % (args.progID,))
+        daemon = Daemon(
+            tuiModel = tuiModel,
+            progID = args.progID,
+            username = args.username,
+            password = password,
+            host = args.host,
+            port = args.port,
+            retryInterval = args.retry,
+        )
+        tuiModel.reactor.callWhenRunning(daemon.connect)
+    tuiModel.reactor.run()
+
+
+if __name__ == "__main__":
+    main()
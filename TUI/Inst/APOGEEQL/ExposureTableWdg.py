@@ -12,11 +12,15 @@ History:
                     Added title that includes the plate ID.
                     Added exposure type to title.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Redraw the table at most once per frame using TUI.Base.FrameScheduler,
+                    instead of in every callback.
+                    Bug fix: the exposureData callback was registered twice.
 """
 import math
 import Tkinter
 import RO.Constants
 import RO.Wdg
+import TUI.Base.FrameScheduler
 import TUI.Models
 import DataObjects
 
@@ -30,6 +34,7 @@ class ExposureTableWdg(Tkinter.Frame):
         """Create an exposure table
         """
         Tkinter.Frame.__init__(self, master)
+        self.redrawer = TUI.Base.FrameScheduler.FrameScheduler().register(self.redraw, wdg=self)
 
         self.expDataList = DataObjects.DataList(
             sharedName = "plateIDExpType",
@@ -41,7 +46,6 @@ class ExposureTableWdg(Tkinter.Frame):
         )
 
         qlModel = TUI.Models.getModel("apogeeql")
-        qlModel.exposureData.addCallback(self._exposureDataCallback)
         
         self.headerWdg = RO.Wdg.Text(
             master = self,
@@ -69,7 +73,7 @@ class ExposureTableWdg(Tkinter.Frame):
 
         qlModel.exposureData.addCallback(self._exposureDataCallback)
         qlModel.predictedExposure.addCallback(self._predictedExposureCallback)
-        self.redraw()
+        self.redrawer.redrawNow()
     
     def _predictedExposureCallback(self, keyVar):
         """New predictedExposure seen
@@ -78,7 +82,7 @@ class ExposureTableWdg(Tkinter.Frame):
             return
         self.predExpDataList.addItem(DataObjects.PredExpData(keyVar))
         self.expDataList.sharedValue = self.predExpDataList.sharedValue
-        self.redraw()
+        self.redrawer.markDirty()
     
     def _exposureDataCallback(self, keyVar):
         """New exposureData seen
@@ -87,7 +91,7 @@ class ExposureTableWdg(Tkinter.Frame):
             return
         self.expDataList.addItem(DataObjects.ExpData(keyVar))
         self.predExpDataList.sharedValue = self.expDataList.sharedValue
-        self.redraw()
+        self.redrawer.markDirty()
 
     
     def redraw(self):
@@ -24,12 +24,15 @@ History:
                     My code to make sure the range included estNExp had no effect.
 2012-06-04 ROwen    Removed unused import
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Redraw the graph at most once per frame using TUI.Base.FrameScheduler,
+                    instead of in every callback. The target S/N line is now drawn as soon as it changes.
 """
 import Tkinter
 import numpy
 import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import RO.Wdg
+import TUI.Base.FrameScheduler
 import TUI.Models
 import DataObjects
 
@@ -115,6 +118,7 @@ class SNRGraphWdg(Tkinter.Frame):
         self.snrGoalLine = HVLine(self.axes, isHoriz=True, color="green")
         self.estReadsLine = HVLine(self.axes, isHoriz=False, color="green")
         self.axes.set_title("S/N^2 at H=12.0 vs. UTR Read")
+        self.redrawer = TUI.Base.FrameScheduler.FrameScheduler().register(self.canvas.draw, wdg=self)
         
         qlModel.exposureData.addCallback(self._exposureDataCallback)
         qlModel.snrAxisRange.addCallback(self._snrAxisRangeCallback)
@@ -128,6 +132,7 @@ class SNRGraphWdg(Tkinter.Frame):
             self.snrGoalLine.clear()
         else:
             self.snrGoalLine.show(snrGoal**2)
+        self.redrawer.markDirty()
             
     def _snrAxisRangeCallback(self, keyVar):
         """snrAxisRange has been updated
@@ -135,7 +140,7 @@ class SNRGraphWdg(Tkinter.Frame):
         if None in keyVar:
             return
         self.axes.set_ylim(keyVar[0]**2, keyVar[1]**2, auto=False)
-        self.canvas.draw()
+        self.redrawer.markDirty()
 
     def _utrDataCallback(self, keyVar):
         """utrData keyVar callback
@@ -186,7 +191,7 @@ class SNRGraphWdg(Tkinter.Frame):
 #         print "fitSnrSqArr=", fitSnrSqArr
         self.fitLine.set_data(fitReadNumArr, fitSnrSqArr)
 
-        self.canvas.draw()
+        self.redrawer.markDirty()
 
 
 if __name__ == '__main__':
@@ -1,9 +1,14 @@
 #!/usr/bin/env python
 """Display status of BOSS ICC
+
+History:
+2026-10-18          Keep this window's keyword callbacks active while hidden (see TUI.Base.WindowSuspender)
+                    to play exposure sounds.
 """
 import Tkinter
 import RO.Wdg
 import BOSSStatus
+import TUI.Base.WindowSuspender
 
 _HelpURL = None
 WindowName = "Inst.BOSS"
@@ -18,6 +23,7 @@ def addWindow(tlSet, visible=False):
         resizable = False,
         wdgFunc = BOSSStatus.BOSSStatusConfigWdg,
     )
+    TUI.Base.WindowSuspender.keepActive(WindowName)
 
 
 if __name__ == '__main__':
@@ -5,11 +5,14 @@ History:
 2012-04-23 Elena Malanushenko, converted from a script to a window by Russell Owen
 2012-06-04 ROwen    Fix clear button.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Keep this window's keyword callbacks active while hidden (see TUI.Base.WindowSuspender)
+                    to accumulate history.
 """
 import Tkinter
 import matplotlib
 import RO.Wdg
 import TUI.Base.StripChartWdg
+import TUI.Base.WindowSuspender
 import TUI.Models
 
 WindowName = "Inst.BOSS Monitor"
@@ -24,6 +27,7 @@ def addWindow(tlSet):
         resizable = True,
         wdgFunc = BOSSTemperatureMonitorWdg,
     )
+    TUI.Base.WindowSuspender.keepActive(WindowName)
 
 class BOSSTemperatureMonitorWdg(Tkinter.Frame):
     def __init__(self, master, timeRange=1800, width=8, height=4):
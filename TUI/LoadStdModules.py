@@ -1,68 +1,108 @@
+"""Load the standard windows
+
+Generated by genLoadStdModules.py; do not edit.
+
+loadAll(lazy=True) creates the windows listed in _LazyWindowList without importing their modules:
+each module is imported, and its widget built, when its window is first shown
+(see TUI.WindowModuleUtil.addLazyWindow). This speeds up startup (see bench/benchStartup.py).
+Windows that must do work while hidden (e.g. play sounds, accumulate history or save state)
+are always loaded at startup.
+
+History:
+2026-10-18          Added lazy loading of windows.
+"""
 import TUI.Models.TUIModel
-import TUI.TUIMenu.AboutWindow
 import TUI.TUIMenu.ConnectWindow
 import TUI.TUIMenu.DownloadsWindow
 import TUI.TUIMenu.LogWindow
 import TUI.TUIMenu.PreferencesWindow
-import TUI.TUIMenu.PythonWindow
-import TUI.TUIMenu.UsersWindow
 import TUI.Inst.APOGEE.APOGEEWindow
 # import TUI.Inst.APOGEEQL.APOGEEQLWindow
 import TUI.Inst.BOSS.BOSSWindow
-# import TUI.Inst.Guide.FocusPlotWindow
-# import TUI.Inst.Guide.GuideWindow
 import TUI.Inst.GuideMonitor.BOSSMonitorWindow
-# import TUI.Inst.GuideMonitor.FluxMonitorWindow
-# import TUI.Inst.GuideMonitor.FocusMonitorWindow
-# import TUI.Inst.GuideMonitor.GuideMonitorWindow
-# import TUI.Inst.GuideMonitor.ScaleMonitorWindow
-# import TUI.Inst.GuideMonitor.SeeingMonitorWindow
 import TUI.Misc.Alerts.AlertsWindow
-import TUI.Misc.Interlocks.InterlocksWindow
-import TUI.Misc.MCP.MCPWindow
 import TUI.Misc.MessageWindow
 import TUI.TCC.FiducialsWdg.FiducialsWindow
-import TUI.TCC.FocalPlaneWindow
-import TUI.TCC.FocusWindow
-import TUI.TCC.MirrorStatusWindow
-import TUI.TCC.NudgerWindow
 import TUI.TCC.OffsetWdg.OffsetWindow
-import TUI.TCC.SkyWindow
 import TUI.TCC.SlewWdg.SlewWindow
 import TUI.TCC.StatusWdg.StatusWindow
+import TUI.WindowModuleUtil
 
+# windows that may be loaded lazily: a list of (module name, window name, createToplevel keyword arguments),
+# captured from the modules' addWindow functions by genLoadStdModules.py
+_LazyWindowList = (
+    ("TUI.TUIMenu.AboutWindow", "STUI.About STUI",
+        dict(resizable=False, visible=False)),
+    ("TUI.TUIMenu.CallbackProfileWindow", "STUI.Callback Profile",
+        dict(defGeom="760x300+0+722", resizable=True, visible=False)),
+    ("TUI.TUIMenu.CmdLatencyWindow", "STUI.Command Latency",
+        dict(defGeom="560x250+0+722", resizable=True, visible=False)),
+    ("TUI.TUIMenu.PythonWindow", "STUI.Python",
+        dict(defGeom="+0+507", visible=False)),
+    ("TUI.TUIMenu.UsersWindow", "STUI.Users",
+        dict(defGeom="300x125+0+722", resizable=True, visible=False)),
+    ("TUI.Misc.Interlocks.InterlocksWindow", "Misc.Interlocks",
+        dict(defGeom="+350+350", resizable=False, visible=False)),
+    ("TUI.Misc.MCP.MCPWindow", "Misc.MCP",
+        dict(defGeom="+676+280", resizable=False, visible=False)),
+    ("TUI.TCC.FocalPlaneWindow", "TCC.Focal Plane",
+        dict(defGeom="201x201+636+22", defVisible=True)),
+    ("TUI.TCC.FocusWindow", "TCC.Secondary Focus",
+        dict(defGeom="+240+507", resizable=False, visible=True)),
+    ("TUI.TCC.MirrorStatusWindow", "TCC.Mirror Status",
+        dict(defGeom="+434+22", resizable=False, visible=False)),
+    ("TUI.TCC.NudgerWindow", "TCC.Nudger",
+        dict(defGeom="+50+507", resizable=False, visible=False)),
+    ("TUI.TCC.SkyWindow", "TCC.Sky",
+        dict(defGeom="201x201+434+22", defVisible=True)),
+)
+_LazyWindowDict = dict((moduleName, (windowName, kargs)) for moduleName, windowName, kargs in _LazyWindowList)
 
-def loadAll():
+def loadAll(lazy=False):
+    """Load the standard windows
+
+    Inputs:
+    - lazy: if True, windows in _LazyWindowList are loaded when first shown
+    """
     tuiModel = TUI.Models.TUIModel.Model()
     tlSet = tuiModel.tlSet
-    TUI.TUIMenu.AboutWindow.addWindow(tlSet)
+
+    def addWindow(moduleName):
+        if lazy:
+            windowName, kargs = _LazyWindowDict[moduleName]
+            TUI.WindowModuleUtil.addLazyWindow(
+                tlSet = tlSet,
+                moduleName = moduleName,
+                windowName = windowName,
+                logFunc = tuiModel.logMsg,
+            **kargs)
+        else:
+            module = __import__(moduleName, globals(), locals(), "addWindow")
+            module.addWindow(tlSet)
+
+    addWindow("TUI.TUIMenu.AboutWindow")
+    addWindow("TUI.TUIMenu.CallbackProfileWindow")
+    addWindow("TUI.TUIMenu.CmdLatencyWindow")
     TUI.TUIMenu.ConnectWindow.addWindow(tlSet)
     TUI.TUIMenu.DownloadsWindow.addWindow(tlSet)
     TUI.TUIMenu.LogWindow.addWindow(tlSet)
     TUI.TUIMenu.PreferencesWindow.addWindow(tlSet)
-    TUI.TUIMenu.PythonWindow.addWindow(tlSet)
-    TUI.TUIMenu.UsersWindow.addWindow(tlSet)
+    addWindow("TUI.TUIMenu.PythonWindow")
+    addWindow("TUI.TUIMenu.UsersWindow")
     TUI.Inst.APOGEE.APOGEEWindow.addWindow(tlSet)
     # TUI.Inst.APOGEEQL.APOGEEQLWindow.addWindow(tlSet)
     TUI.Inst.BOSS.BOSSWindow.addWindow(tlSet)
-    # TUI.Inst.Guide.FocusPlotWindow.addWindow(tlSet)
-    # TUI.Inst.Guide.GuideWindow.addWindow(tlSet)
     TUI.Inst.GuideMonitor.BOSSMonitorWindow.addWindow(tlSet)
-    # TUI.Inst.GuideMonitor.FluxMonitorWindow.addWindow(tlSet)
-    # TUI.Inst.GuideMonitor.FocusMonitorWindow.addWindow(tlSet)
-    # TUI.Inst.GuideMonitor.GuideMonitorWindow.addWindow(tlSet)
-    # TUI.Inst.GuideMonitor.ScaleMonitorWindow.addWindow(tlSet)
-    # TUI.Inst.GuideMonitor.SeeingMonitorWindow.addWindow(tlSet)
     TUI.Misc.Alerts.AlertsWindow.addWindow(tlSet)
-    TUI.Misc.Interlocks.InterlocksWindow.addWindow(tlSet)
-    TUI.Misc.MCP.MCPWindow.addWindow(tlSet)
+    addWindow("TUI.Misc.Interlocks.InterlocksWindow")
+    addWindow("TUI.Misc.MCP.MCPWindow")
     TUI.Misc.MessageWindow.addWindow(tlSet)
     TUI.TCC.FiducialsWdg.FiducialsWindow.addWindow(tlSet)
-    TUI.TCC.FocalPlaneWindow.addWindow(tlSet)
-    TUI.TCC.FocusWindow.addWindow(tlSet)
-    TUI.TCC.MirrorStatusWindow.addWindow(tlSet)
-    TUI.TCC.NudgerWindow.addWindow(tlSet)
+    addWindow("TUI.TCC.FocalPlaneWindow")
+    addWindow("TUI.TCC.FocusWindow")
+    addWindow("TUI.TCC.MirrorStatusWindow")
+    addWindow("TUI.TCC.NudgerWindow")
     TUI.TCC.OffsetWdg.OffsetWindow.addWindow(tlSet)
-    TUI.TCC.SkyWindow.addWindow(tlSet)
+    addWindow("TUI.TCC.SkyWindow")
     TUI.TCC.SlewWdg.SlewWindow.addWindow(tlSet)
     TUI.TCC.StatusWdg.StatusWindow.addWindow(tlSet)
@@ -64,10 +64,18 @@ This is the main routine that calls everything else.
                     Modified to only show the version name, not version date, in the log at startup.
 2013-09-04 ROwen    Use application name instead of TUI in several places.
 2014-02-12 ROwen    Added a call to reopen script windows.
+2026-10-18          Load some windows lazily (when first shown) to speed up startup.
+2026-10-18          Record a startup timeline if run with --profile-startup; see TUI.StartupProfiler.
+2026-10-18          Use precompiled actorkeys from TUI.ActorkeysCache and never download them at startup:
+                    if the cache is empty, use the legacy or bundled copy and fill the cache in the background.
+2026-10-18          Suspend keyword callbacks of hidden windows; see TUI.Base.WindowSuspender.
 """
 import os
 import sys
 import time
+import TUI.StartupProfiler
+# start profiling as early as possible, if requested (runtui.py starts it even earlier)
+TUI.StartupProfiler.startFromArgv()
 import Tkinter
 import numpy
 
@@ -82,7 +90,9 @@ matplotlib.rc("legend", fontsize="medium") # default is large, which is too big
 import RO.Comm.Generic
 RO.Comm.Generic.setFramework("tk")
 
+import TUI.Actorkeys
 import TUI.Base.ScriptLoader
+import TUI.Base.WindowSuspender
 import TUI.BackgroundTasks
 import TUI.LoadStdModules
 import TUI.MenuBar
@@ -91,7 +101,6 @@ import TUI.Models
 from TUI.Models.TUIModel import getPlatform
 import TUI.WindowModuleUtil
 import TUI.Version
-from TUI.Actorkeys import getActorkeysPath, refreshActorkeys, getSTUIPath
 
 # hack for pyinstaller 1.3
 sys.executable = os.path.abspath(sys.executable)
@@ -99,6 +108,8 @@ sys.executable = os.path.abspath(sys.executable)
 def runTUI():
     """Run TUI.
     """
+    span = TUI.StartupProfiler.span
+
     # Hide the Tk root; must do this before setting up preferences (which is done by the tui model).
     tkRoot = Tkinter.Tk()
     tkRoot.withdraw()
@@ -108,24 +119,19 @@ def runTUI():
     except Tkinter.TclError:
         pass
 
-    # Update location of actorkeys. We respect any $PYTHONPATH already existing and
-    # append the downloaded actorkeys to it. Worst case, will revert to the internal
-    # bundled copy.
-    actorkeys_path = getActorkeysPath()
-    try:
-        if not os.path.exists(actorkeys_path):
-            sys.stdout.write('Downloading actorkeys ... ')
-            refreshActorkeys()
-    except Exception as ee:
-        sys.stdout.write('Failed downloading actorkeys %s' % str(ee))
-    else:
-        sys.path.insert(0, getSTUIPath())
+    # use cached actorkeys; never wait for the network
+    with span("actorkeys"):
+        TUI.Actorkeys.initActorkeys()
+    TUI.StartupProfiler.instrumentKeysDictionary()
 
     # create and obtain the TUI model
-    tuiModel = TUI.Models.getModel("tui")
+    with span("TUI model"):
+        tuiModel = TUI.Models.getModel("tui")
+    TUI.StartupProfiler.instrumentTLSet(tuiModel.tlSet)
 
     # set up background tasks
-    backgroundHandler = TUI.BackgroundTasks.BackgroundKwds()
+    with span("BackgroundKwds"):
+        backgroundHandler = TUI.BackgroundTasks.BackgroundKwds()
 
     # get locations to look for windows
     addPathList = TUI.TUIPaths.getAddPaths()
@@ -133,21 +139,29 @@ def runTUI():
     # add additional paths to sys.path
     sys.path += addPathList
 
-    TUI.LoadStdModules.loadAll()
+    with span("LoadStdModules.loadAll"):
+        TUI.LoadStdModules.loadAll(lazy=True)
 
     # load additional windows modules
     for winPath in addPathList:
-        TUI.WindowModuleUtil.loadWindows(
-            path = winPath,
-            tlSet = tuiModel.tlSet,
-            logFunc = tuiModel.logMsg,
-        )
+        with span("loadWindows %s" % (winPath,)):
+            TUI.WindowModuleUtil.loadWindows(
+                path = winPath,
+                tlSet = tuiModel.tlSet,
+                logFunc = tuiModel.logMsg,
+            )
 
     # load scripts
-    TUI.Base.ScriptLoader.reopenScriptWindows()
+    with span("reopenScriptWindows"):
+        TUI.Base.ScriptLoader.reopenScriptWindows()
 
     # add the main menu
-    TUI.MenuBar.MenuBar()
+    with span("MenuBar"):
+        TUI.MenuBar.MenuBar()
+
+    # suspend keyword callbacks of hidden windows
+    with span("WindowSuspender"):
+        TUI.Base.WindowSuspender.WindowSuspender(tuiModel).enable()
 
     tuiModel.logMsg(
         "%s %s: ready to connect" % (TUI.Version.ApplicationName, TUI.Version.VersionName)
@@ -157,6 +171,7 @@ def runTUI():
     sys.stdout.write("%s %s running on %s started %s\n" % \
         (TUI.Version.ApplicationName, TUI.Version.VersionName, platformStr, startTimeStr))
 
+    TUI.StartupProfiler.stopWhenIdle(tkRoot, logFunc=tuiModel.logMsg)
     tuiModel.reactor.run()
 
 if __name__ == "__main__":
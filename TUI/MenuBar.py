@@ -49,6 +49,7 @@ History:
                     Switched from RO.Alg.GenericCallback to functools.partial.
                     Added attribute appname.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Refresh actorkeys in the background and log the result.
 """
 
 import functools
@@ -277,12 +278,21 @@ class MenuBar(object):
                 self.tuiModel.tkRoot.destroy()
 
     def doRefreshActorkeys(self):
-        """Redownloads actorkeys."""
+        """Refresh the actorkeys cache in the background; the new actorkeys are used when STUI is restarted
+        """
+        def doneFunc(version, errMsg):
+            # called in the refresh thread
+            if errMsg:
+                self.tuiModel.reactor.callFromThread(self.tuiModel.logMsg, errMsg, severity=RO.Constants.sevError)
+            else:
+                self.tuiModel.reactor.callFromThread(self.tuiModel.logMsg,
+                    "Refreshed actorkeys (version %s); restart %s to use them" % (version[:8], self.appName))
 
-        try:
-            TUI.Actorkeys.refreshActorkeys()
-        except:
-            pass
+        actorkeysCache = TUI.Actorkeys.getActorkeysCache()
+        if actorkeysCache.startRefresh(doneFunc=doneFunc):
+            self.tuiModel.logMsg("Refreshing actorkeys from %s" % (actorkeysCache.source,))
+        else:
+            self.tuiModel.logMsg("Already refreshing actorkeys", severity=RO.Constants.sevWarning)
 
     def doRefresh(self):
         """Refresh all automatic variables.
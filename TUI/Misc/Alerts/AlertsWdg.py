@@ -34,6 +34,8 @@ History:
 2011-05-03 ROwen    Added code to work around ticket #1161: keys reports a value of None when a list is empty.
 2011-06-13 ROwen    Made automatic status command a refresh command, for proper logging.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Redisplay active alerts and rules at most once per frame using TUI.Base.FrameScheduler,
+                    instead of in every callback.
 """
 import re
 import sys
@@ -44,6 +46,7 @@ import SimpleDialog
 import RO.Constants
 import RO.Wdg
 import RO.Wdg.WdgPrefs
+import TUI.Base.FrameScheduler
 import TUI.Base.Wdg
 import TUI.Models
 import TUI.PlaySound
@@ -286,6 +289,9 @@ class AlertsWdg(Tkinter.Frame):
         Tkinter.Frame.__init__(self, master)
         
         self.tuiModel = TUI.Models.getModel("tui")
+        frameScheduler = TUI.Base.FrameScheduler.FrameScheduler()
+        self.alertsRedrawer = frameScheduler.register(self.displayActiveAlerts, wdg=self, name="AlertsWdg.activeAlerts")
+        self.rulesRedrawer = frameScheduler.register(self.displayRules, wdg=self, name="AlertsWdg.rules")
 
         # dictionary of alertInfo.alertID: alertInfo for current alerts
         self.alertDict = {}
@@ -412,8 +418,8 @@ class AlertsWdg(Tkinter.Frame):
         
         self._doShowHideDisabledAlerts()
         self._doShowHideDisableRules()
-        self.displayActiveAlerts()
-        self.displayRules()
+        self.alertsRedrawer.redrawNow()
+        self.rulesRedrawer.redrawNow()
 
     def addAlertDisableRule(self, wdg=None):
         """Add a new alert disable rule, using a dialog box for input.
@@ -656,7 +662,7 @@ class AlertsWdg(Tkinter.Frame):
         
         if not self._statusCmdRunning() and self._needStatus():
             self.tuiModel.reactor.callLater(0.5, self._getStatus)
-        self.displayActiveAlerts()
+        self.alertsRedrawer.markDirty()
 
     def _alertCallback(self, keyVar):
 #         print "_alertCallback(%s)" % (keyVar,)
@@ -672,7 +678,7 @@ class AlertsWdg(Tkinter.Frame):
             del(self.alertDict[newAlertInfo.alertID])
         else:
             self.alertDict[newAlertInfo.alertID] = newAlertInfo
-        self.displayActiveAlerts()
+        self.alertsRedrawer.markDirty()
         if newAlertInfo.isEnabled \
             and not newAlertInfo.isAcknowledged \
             and newAlertInfo.severity not in ("ok", "info"):
@@ -696,7 +702,7 @@ class AlertsWdg(Tkinter.Frame):
                     continue
                 disabledInfo = DisableRule(alertID, severity, issuer)
                 self.ruleDict[disabledInfo.disabledID] = disabledInfo
-        self.displayRules()
+        self.rulesRedrawer.markDirty()
 
     def _downInstrumentsCallback(self, keyVar):
 #         print "_downInstrumentsCallback(%s)" % (keyVar,)
@@ -708,7 +714,7 @@ class AlertsWdg(Tkinter.Frame):
                 continue
             downInst = DownInstrument(instName)
             self.downInstDict[downInst.disabledID] = downInst
-        self.displayRules()
+        self.rulesRedrawer.markDirty()
     
     def _doShowHideDisableRules(self, wdg=None):
         doShow = self.disableRulesShowHideWdg.getBool()
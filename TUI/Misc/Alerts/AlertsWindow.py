@@ -4,8 +4,11 @@
 History:
 2009-07-22 ROwen
 2009-08-25 ROwen    Improved default window size.
+2026-10-18          Keep this window's keyword callbacks active while hidden (see TUI.Base.WindowSuspender)
+                    to play alert sounds.
 """
 import AlertsWdg
+import TUI.Base.WindowSuspender
 
 
 _WindowTitle = "Misc.Alerts"
@@ -19,6 +22,7 @@ def addWindow(tlSet):
         visible = True,
         wdgFunc = AlertsWdg.AlertsWdg,
     )
+    TUI.Base.WindowSuspender.keepActive(_WindowTitle)
 
 
 if __name__ == "__main__":
@@ -32,6 +32,8 @@ History:
 2014-06-07 ROwen    Made _fixFocus more robust; it supports navigation keys in the upper pane,
                     blocks more characters from event_generate when switching to the lower pane,
                     and prints more useful information if event_generate fails.
+2026-10-18          Keep this window's keyword callbacks active while hidden (see TUI.Base.WindowSuspender)
+                    to accumulate messages and play sounds.
 """
 import re
 import sys
@@ -40,6 +42,7 @@ import Tkinter
 import RO.Wdg
 from RO.StringUtil import strFromException
 import opscore.actor.keyvar
+import TUI.Base.WindowSuspender
 import TUI.Models.TUIModel
 import TUI.PlaySound
 
@@ -54,6 +57,7 @@ def addWindow(tlSet):
         visible = True,
         wdgFunc = MessageWdg,
     )
+    TUI.Base.WindowSuspender.keepActive(WindowName)
 
 def replace_non_ascii(string):
     return ''.join(char if ord(char) < 128 else 'x' for char in string)
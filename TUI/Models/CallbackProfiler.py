@@ -0,0 +1,309 @@
+"""Profile keyword variable callbacks
+
+When enabled, CallbackProfiler wraps each callback function registered with any keyword variable
+known to the dispatcher. The wrapper counts calls and times a sample of them
+(every sampleInterval'th call; all calls by default). It records statistics
+per (actor, keyword, callback name, window): number of calls, estimated total wall time and maximum wall time.
+Callbacks with the same name in the same window (e.g. the same method of several instances of a widget)
+share statistics, and no references to callback functions are retained.
+Callbacks registered after the profiler is enabled are wrapped at the next sweep (every SweepInterval seconds).
+Disabling the profiler restores the original callback functions.
+
+The overhead is a Python function call and two calls to time.time per timed callback
+(about a microsecond), so the profiler may be left enabled.
+
+History:
+2026-10-18          Initial version.
+2026-10-18          getCallbackName and getWindowName see through nested callback wrappers
+                    (e.g. those of TUI.Base.WindowSuspender and TUI.Models.ChangeFilter).
+2026-10-18          Do not import Tkinter, so headless processes (see TUIModel) need not load Tk.
+"""
+import sys
+import time
+import opscore.utility.timer
+
+__all__ = ["CallbackProfiler", "CallbackStats", "getCallbackName", "getWindowName"]
+
+SweepInterval = 10.0 # interval between sweeps for newly registered callbacks (sec)
+
+def _getBaseFunc(func):
+    """Return the function wrapped by functools.partial and callback wrappers (which have a func attribute)"""
+    while hasattr(func, "func"):
+        func = func.func
+    return func
+
+def getCallbackName(func):
+    """Return a short name for a callback function, e.g. "SkyWdg._axePosCallback" for a method
+    or "TUI.Models.TUIModel.logToStdOut" for a function
+    """
+    baseFunc = _getBaseFunc(func)
+    owner = getattr(baseFunc, "im_self", None)
+    funcName = getattr(baseFunc, "__name__", None)
+    if owner is not None:
+        return "%s.%s" % (type(owner).__name__, funcName)
+    if funcName is not None:
+        return "%s.%s" % (getattr(baseFunc, "__module__", "?"), funcName)
+    return repr(baseFunc)
+
+def getWindowName(func):
+    """Return the title of the window containing the widget that owns a callback function,
+    or "" if the callback is not a method of a widget (or the widget has been destroyed)
+    """
+    # do not import Tkinter, so a headless process need not load it; if it is not loaded there are no widgets
+    Tkinter = sys.modules.get("Tkinter")
+    if Tkinter is None:
+        return ""
+    baseFunc = _getBaseFunc(func)
+    owner = getattr(baseFunc, "im_self", None)
+    if isinstance(owner, Tkinter.Misc):
+        try:
+            return owner.winfo_toplevel().title()
+        except Tkinter.TclError:
+            pass
+    return ""
+
+
+class CallbackStats(object):
+    """Statistics for one callback (identified by name and window) of one keyword variable
+
+    Fields:
+    - actor: actor
+    - keyName: keyword name
+    - callbackName: short name of the callback function (see getCallbackName)
+    - windowName: title of window containing the widget that owns the callback, or "" if none
+    - numCalls: number of calls
+    - numTimed: number of calls that were timed
+    - timedSec: total wall time of the timed calls (sec)
+    - maxSec: maximum wall time of a timed call (sec)
+    """
+    __slots__ = ("actor", "keyName", "callbackName", "windowName", "numCalls", "numTimed", "timedSec", "maxSec")
+
+    def __init__(self, actor, keyName, callbackName, windowName):
+        self.actor = actor
+        self.keyName = keyName
+        self.callbackName = callbackName
+        self.windowName = windowName
+        self.reset()
+
+    @property
+    def meanSec(self):
+        """Mean wall time per call (sec); 0 if no calls timed"""
+        if self.numTimed == 0:
+            return 0.0
+        return self.timedSec / self.numTimed
+
+    @property
+    def totSec(self):
+        """Estimated total wall time of all calls (sec)"""
+        return self.meanSec * self.numCalls
+
+    def reset(self):
+        """Reset the statistics to 0"""
+        self.numCalls = 0
+        self.numTimed = 0
+        self.timedSec = 0.0
+        self.maxSec = 0.0
+
+    def __str__(self):
+        return "%s.%s %s: %d calls, total %0.3f sec, mean %0.1f usec, max %0.1f usec" % \
+            (self.actor, self.keyName, self.callbackName, self.numCalls, self.totSec,
+            self.meanSec * 1e6, self.maxSec * 1e6)
+
+
+class _ProfiledCallback(object):
+    """A callback wrapper that records CallbackStats
+
+    Compares equal to the function it wraps, so addCallback and removeCallback
+    work the same whether or not callbacks are wrapped.
+    """
+    __slots__ = ("func", "stats", "profiler")
+
+    def __init__(self, func, stats, profiler):
+        self.func = func
+        self.stats = stats
+        self.profiler = profiler
+
+    def __call__(self, *args, **kargs):
+        stats = self.stats
+        stats.numCalls += 1
+        if stats.numCalls % self.profiler.sampleInterval != 0:
+            return self.func(*args, **kargs)
+        startTime = time.time()
+        try:
+            return self.func(*args, **kargs)
+        finally:
+            duration = time.time() - startTime
+            stats.numTimed += 1
+            stats.timedSec += duration
+            if duration > stats.maxSec:
+                stats.maxSec = duration
+
+    def __eq__(self, other):
+        if isinstance(other, _ProfiledCallback):
+            other = other.func
+        return self.func == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.func)
+
+
+class CallbackProfiler(object):
+    """Profile keyword variable callbacks. A singleton.
+
+    Fields include:
+    - isEnabled: True if profiling
+    - sampleInterval: time one call in sampleInterval for each callback; set using setSampleInterval
+    - startTime: time at which profiling was enabled or statistics were last reset (unix sec);
+        None if never enabled
+    """
+    def __new__(cls, dispatcher):
+        """Construct the singleton CallbackProfiler if not already constructed
+
+        Inputs:
+        - dispatcher: keyword dispatcher; an instance of opscore.actor.cmdkeydispatcher.CmdKeyVarDispatcher
+        """
+        if hasattr(cls, 'self'):
+            return cls.self
+
+        cls.self = object.__new__(cls)
+        self = cls.self
+        self.dispatcher = dispatcher
+        self.isEnabled = False
+        self.sampleInterval = 1
+        self.startTime = None
+        # dict of (actor, keyword name, callback name, window name): CallbackStats
+        self._statsDict = {}
+        self._sweepTimer = opscore.utility.timer.Timer()
+        return self
+
+    def __init__(self, *args, **kargs):
+        pass
+
+    def disable(self):
+        """Stop profiling and restore the original callback functions (statistics are retained)"""
+        self.isEnabled = False
+        self._sweepTimer.cancel()
+        for keyVar in self._iterKeyVars():
+            callbacks = keyVar._callbacks
+            for ind, func in enumerate(callbacks):
+                if isinstance(func, _ProfiledCallback):
+                    callbacks[ind] = func.func
+
+    def dumpStats(self, filePath, maxNum=None):
+        """Write statistics to a text file (tab-separated), most costly first
+
+        Inputs:
+        - filePath: path of file to write
+        - maxNum: maximum number of callbacks to write; None for all
+        """
+        with open(filePath, "w") as outFile:
+            outFile.write("# callback statistics from %s to %s\n" % (self._formatTime(self.startTime),
+                self._formatTime(time.time())))
+            outFile.write("actor\tkeyword\tcallback\twindow\tcalls\ttotal sec\tmean usec\tmax usec\n")
+            for stats in self.getStats(maxNum=maxNum):
+                outFile.write("%s\t%s\t%s\t%s\t%d\t%0.6f\t%0.1f\t%0.1f\n" % (stats.actor, stats.keyName,
+                    stats.callbackName, stats.windowName, stats.numCalls, stats.totSec,
+                    stats.meanSec * 1e6, stats.maxSec * 1e6))
+
+    def enable(self):
+        """Start profiling: wrap all callbacks now and new callbacks every SweepInterval seconds"""
+        if self.startTime is None:
+            self.startTime = time.time()
+        self.isEnabled = True
+        self.sweep()
+
+    def getStats(self, sortKey="totSec", maxNum=None):
+        """Return a list of CallbackStats for callbacks that have been called, largest first
+
+        Inputs:
+        - sortKey: name of CallbackStats field or property by which to sort,
+            e.g. "totSec", "maxSec", "meanSec" or "numCalls"
+        - maxNum: maximum number of items to return; None for all
+        """
+        statsList = [stats for stats in self._statsDict.itervalues() if stats.numCalls > 0]
+        statsList.sort(key=lambda stats: getattr(stats, sortKey), reverse=True)
+        if maxNum is not None:
+            statsList = statsList[0:maxNum]
+        return statsList
+
+    def reset(self):
+        """Reset all statistics to 0"""
+        for stats in self._statsDict.itervalues():
+            stats.reset()
+        self.startTime = time.time()
+
+    def setSampleInterval(self, sampleInterval):
+        """Set the sampling interval: time one call in sampleInterval for each callback (all calls are counted)
+        """
+        sampleInterval = int(sampleInterval)
+        if sampleInterval < 1:
+            raise RuntimeError("sampleInterval=%r must be >= 1" % (sampleInterval,))
+        self.sampleInterval = sampleInterval
+
+    def sweep(self):
+        """Wrap newly registered callbacks (if enabled); called automatically every SweepInterval seconds
+        """
+        self._sweepTimer.cancel()
+        if not self.isEnabled:
+            return
+        statsDict = self._statsDict
+        for keyVar in self._iterKeyVars():
+            callbacks = keyVar._callbacks
+            for ind, func in enumerate(callbacks):
+                if isinstance(func, _ProfiledCallback):
+                    continue
+                statsKey = (keyVar.actor, keyVar.name, getCallbackName(func), getWindowName(func))
+                stats = statsDict.get(statsKey)
+                if stats is None:
+                    stats = CallbackStats(*statsKey)
+                    statsDict[statsKey] = stats
+                callbacks[ind] = _ProfiledCallback(func, stats, self)
+        self._sweepTimer.start(SweepInterval, self.sweep)
+
+    def _formatTime(self, unixTime):
+        if unixTime is None:
+            return "?"
+        return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(unixTime))
+
+    def _iterKeyVars(self):
+        """Iterate over all keyword variables known to the dispatcher"""
+        for keyVarList in self.dispatcher.keyVarListDict.itervalues():
+            for keyVar in keyVarList:
+                yield keyVar
+
+    def __str__(self):
+        return "CallbackProfiler(isEnabled=%s; %d callbacks)" % (self.isEnabled, len(self._statsDict))
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import TUI.Base.TestDispatcher
+
+    testDispatcher = TUI.Base.TestDispatcher.TestDispatcher("tcc", delay=0.1)
+    tuiModel = testDispatcher.tuiModel
+    tccModel = TUI.Models.getModel("tcc")
+
+    def slowCallback(keyVar):
+        time.sleep(0.001)
+    tccModel.axePos.addCallback(slowCallback)
+
+    profiler = CallbackProfiler(tuiModel.dispatcher)
+    profiler.enable()
+    for i in range(100):
+        testDispatcher.dispatch("AxePos=%0.1f, 45, NaN" % (i,))
+    # removeCallback must still work with wrapped callbacks
+    tccModel.axePos.removeCallback(slowCallback)
+    testDispatcher.dispatch("AxePos=0, 45, NaN")
+    for stats in profiler.getStats(maxNum=10):
+        print stats
+    profiler.disable()
+    fileDesc, filePath = tempfile.mkstemp()
+    os.close(fileDesc)
+    profiler.dumpStats(filePath)
+    with open(filePath, "r") as inFile:
+        print inFile.read()
+    os.remove(filePath)
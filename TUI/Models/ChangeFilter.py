@@ -0,0 +1,209 @@
+"""Skip keyword variable callbacks when nothing has changed
+
+Some actors output status keywords repeatedly with identical values (e.g. the TCC outputs AxePos
+and AzStat, and the MCP outputs its ab_* PLC bits, many times a minute). Each repeat
+normally calls every callback of the keyword variable. This module offers two opt-in ways to skip
+such repeats; a value is "unchanged" if its values, isCurrent and isGenuine all match the last delivery:
+
+- Per callback: register onChange(callFunc) instead of callFunc; the wrapper calls callFunc
+    only if the keyword variable has changed since the wrapper last called it.
+    keyVar.removeCallback(callFunc) still works.
+- Per model: suppressUnchanged(model, keyNames) wraps every callback of the named keyword variables
+    of a model (present and future) as onChange does, so each callback is skipped when the keyword variable
+    has not changed since that callback was last called. A newly added callback is always called
+    the first time (e.g. by addCallback(callFunc, callNow=True)), even if the keyword variable is unchanged.
+    Only use this for keywords whose callbacks never need repeats
+    (e.g. not for keywords plotted by strip charts, which add a point for every value).
+
+Counts of delivered and elided (skipped) callbacks are kept per keyword; see getStats.
+
+History:
+2026-10-18          Initial version.
+2026-10-18          Bug fix: suppressUnchanged did not skip repeats (KeyVar.set does not call _doCallbacks)
+                    and did skip the initial call of callbacks added with callNow=True;
+                    it now wraps each callback of the keyword variables as onChange does.
+"""
+import opscore.actor.keyvar
+
+__all__ = ["ElisionStats", "onChange", "suppressUnchanged", "getStats", "getNumElided", "resetStats"]
+
+# dict of (actor, keyword name): ElisionStats
+_statsDict = {}
+
+class ElisionStats(object):
+    """Counts of delivered and elided callbacks for one keyword variable
+
+    Each wrapped callback (see onChange and suppressUnchanged) counts separately.
+    """
+    __slots__ = ("actor", "keyName", "numDelivered", "numElided")
+
+    def __init__(self, actor, keyName):
+        self.actor = actor
+        self.keyName = keyName
+        self.numDelivered = 0
+        self.numElided = 0
+
+    def __str__(self):
+        return "%s.%s: %d delivered, %d elided" % (self.actor, self.keyName, self.numDelivered, self.numElided)
+
+
+def _getKeyStats(keyVar):
+    statsKey = (keyVar.actor, keyVar.name)
+    stats = _statsDict.get(statsKey)
+    if stats is None:
+        stats = ElisionStats(*statsKey)
+        _statsDict[statsKey] = stats
+    return stats
+
+def _getKeyState(keyVar):
+    """Return the state of a keyword variable that determines whether it has changed"""
+    return (tuple(keyVar.valueList), keyVar.isCurrent, keyVar.isGenuine)
+
+def _stateEqual(state1, state2):
+    """Return True if two keyword variable states are equal, treating NaN values as equal to each other"""
+    if state1 == state2:
+        return True
+    if state2 is None or state1[1:] != state2[1:] or len(state1[0]) != len(state2[0]):
+        return False
+    for val1, val2 in zip(state1[0], state2[0]):
+        if val1 != val2 and not (val1 != val1 and val2 != val2):
+            return False
+    return True
+
+
+class _OnChangeCallback(object):
+    """A callback wrapper that only calls its function when the keyword variable has changed
+
+    Compares equal to the function it wraps, so keyVar.removeCallback(callFunc) works.
+    """
+    __slots__ = ("func", "_stateDict")
+
+    def __init__(self, func):
+        self.func = func
+        self._stateDict = {} # dict of id(keyVar): state at last delivery
+
+    def __call__(self, keyVar, *args, **kargs):
+        state = _getKeyState(keyVar)
+        stats = _getKeyStats(keyVar)
+        if _stateEqual(state, self._stateDict.get(id(keyVar))):
+            stats.numElided += 1
+            return
+        self._stateDict[id(keyVar)] = state
+        stats.numDelivered += 1
+        return self.func(keyVar, *args, **kargs)
+
+    def __eq__(self, other):
+        if isinstance(other, _OnChangeCallback):
+            other = other.func
+        return self.func == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.func)
+
+
+class _OnChangeAddCallback(object):
+    """Replacement for keyVar.addCallback that wraps each new callback as onChange does
+    """
+    __slots__ = ("addCallback",)
+
+    def __init__(self, keyVar):
+        self.addCallback = keyVar.addCallback
+
+    def __call__(self, callFunc, *args, **kargs):
+        if callFunc is not None and not isinstance(callFunc, _OnChangeCallback):
+            callFunc = _OnChangeCallback(callFunc)
+        return self.addCallback(callFunc, *args, **kargs)
+
+
+def onChange(callFunc):
+    """Return a keyword variable callback that calls callFunc only when the keyword variable has changed
+
+    Usage: keyVar.addCallback(onChange(callFunc))
+    """
+    return _OnChangeCallback(callFunc)
+
+def suppressUnchanged(model, keyNames):
+    """Skip all callbacks of the specified keyword variables of a model when they have not changed
+
+    Inputs:
+    - model: an actor model (an instance of opscore.actor.model.Model)
+    - keyNames: a collection of keyword names (case-insensitive), or a function that takes
+        a lowercase keyword name and returns True if unchanged values should be suppressed
+
+    Return the number of keyword variables affected (ones already suppressed are not counted again).
+    """
+    if callable(keyNames):
+        keyNameFilter = keyNames
+    else:
+        keyNameSet = set(keyName.lower() for keyName in keyNames)
+        keyNameFilter = lambda keyName: keyName in keyNameSet
+    numSuppressed = 0
+    for keyVar in vars(model).values():
+        if not isinstance(keyVar, opscore.actor.keyvar.KeyVar) or not keyNameFilter(keyVar.name.lower()):
+            continue
+        if isinstance(keyVar.addCallback, _OnChangeAddCallback):
+            continue
+        keyVar._callbacks = [func if isinstance(func, _OnChangeCallback) else _OnChangeCallback(func)
+            for func in keyVar._callbacks]
+        keyVar.addCallback = _OnChangeAddCallback(keyVar)
+        numSuppressed += 1
+    return numSuppressed
+
+def getStats(minElided=1):
+    """Return a list of ElisionStats for keywords with at least minElided elided callbacks,
+    most elided first
+    """
+    statsList = [stats for stats in _statsDict.itervalues() if stats.numElided >= minElided]
+    statsList.sort(key=lambda stats: stats.numElided, reverse=True)
+    return statsList
+
+def getNumElided():
+    """Return the total number of elided callbacks"""
+    return sum(stats.numElided for stats in _statsDict.itervalues())
+
+def resetStats():
+    """Reset all counts to 0"""
+    for stats in _statsDict.itervalues():
+        stats.numDelivered = 0
+        stats.numElided = 0
+
+
+if __name__ == "__main__":
+    # dispatch repeated values through a real KeyVar
+    import opscore.protocols.keys as protoKeys
+    import opscore.protocols.types as protoTypes
+
+    class TestModel(object):
+        def __init__(self):
+            self.ab_I1_L0 = opscore.actor.keyvar.KeyVar("mcp", protoKeys.Key("ab_I1_L0", protoTypes.Int()))
+            self.other = opscore.actor.keyvar.KeyVar("mcp", protoKeys.Key("other", protoTypes.Int()))
+    model = TestModel()
+    keyVar = model.ab_I1_L0
+
+    valueList1 = []
+    keyVar.addCallback(lambda keyVar: valueList1.append(keyVar[0]), callNow=False)
+    assert suppressUnchanged(model, lambda keyName: keyName.startswith("ab_")) == 1
+    for val in (1, 1, 1, 2, 2, 1):
+        keyVar.set([val])
+    assert valueList1 == [1, 2, 1], "valueList1=%s" % (valueList1,)
+
+    # a callback added later gets its initial call even though the value is unchanged
+    valueList2 = []
+    def callFunc2(keyVar):
+        valueList2.append(keyVar[0])
+    keyVar.addCallback(callFunc2, callNow=True)
+    keyVar.set([1])
+    assert valueList2 == [1], "valueList2=%s" % (valueList2,)
+    keyVar.setNotCurrent()
+    assert valueList2 == [1, 1], "valueList2=%s" % (valueList2,)
+    keyVar.removeCallback(callFunc2)
+    keyVar.set([3])
+    assert valueList2 == [1, 1], "valueList2=%s" % (valueList2,)
+    assert valueList1 == [1, 2, 1, 1, 3], "valueList1=%s" % (valueList1,)
+
+    for stats in getStats(minElided=0):
+        print stats
+    print "ChangeFilter test passed"
@@ -0,0 +1,397 @@
+"""Track the lifecycle of hub commands and keep latency statistics
+
+CmdTracker pairs the cmds actor's CmdQueued and CmdDone keywords by the hub's unique command ID
+and records the time from queued to done (as seen by this program) for each command.
+The set of running commands is bounded: the oldest running command is dropped when there
+are more than maxCmds, and commands running longer than timeout are dropped by sweep
+(which is called whenever a command is queued). Dropped commands are counted as timed out.
+The most recently dropped commands (up to maxCmds) are remembered, so that if CmdDone arrives
+for one of them after all, cmdDone still returns its cmdInfo (but no latency is recorded).
+
+Latency statistics are kept per actor and per (actor, command verb), where the verb is
+the first word of the command string. Each is a LatencyHistogram: a streaming histogram
+with logarithmically spaced bins, from which percentiles (e.g. p50, p95, p99) are estimated
+to within the bin resolution, using fixed memory no matter how many commands are recorded.
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import bisect
+import collections
+import math
+import time
+
+__all__ = ["CmdStats", "CmdTracker", "LatencyHistogram", "getVerb"]
+
+DefaultMaxCmds = 10000
+DefaultTimeout = 7200.0 # sec; some commands (e.g. sop scripts) run for over an hour
+DefaultResolution = 0.02 # fractional width of latency histogram bins
+DefaultMinLatency = 0.001 # sec; smaller latencies are recorded in the first bin
+
+def getVerb(cmdStr):
+    """Return the command verb: the first word of a command string, in lowercase ("" if none)
+    """
+    wordList = cmdStr.split(None, 1)
+    if not wordList:
+        return ""
+    return wordList[0].lower()
+
+
+class LatencyHistogram(object):
+    """Streaming histogram of latencies with logarithmically spaced bins
+
+    Bin i holds latencies in the range [minLatency * (1 + resolution)**i, minLatency * (1 + resolution)**(i+1)),
+    except that bin 0 also holds all smaller latencies. Percentiles are estimated as the geometric center
+    of the bin in which they fall (limited to the range of recorded latencies), so the fractional error
+    is at most about resolution/2.
+
+    Fields:
+    - count: number of latencies recorded
+    - totLatency: sum of all latencies (sec)
+    - minLatency: minimum latency recorded (sec); None if count == 0
+    - maxLatency: maximum latency recorded (sec); None if count == 0
+    """
+    def __init__(self, resolution=DefaultResolution, minLatency=DefaultMinLatency):
+        """Create a LatencyHistogram
+
+        Inputs:
+        - resolution: fractional width of each bin; must be > 0
+        - minLatency: lower edge of bin 1 (sec); must be > 0
+        """
+        if resolution <= 0:
+            raise RuntimeError("resolution=%r must be > 0" % (resolution,))
+        if minLatency <= 0:
+            raise RuntimeError("minLatency=%r must be > 0" % (minLatency,))
+        self._binMinLatency = float(minLatency)
+        self._logBinWidth = math.log1p(resolution)
+        self._binDict = {} # dict of bin index: number of latencies in that bin
+        self.reset()
+
+    def add(self, latency):
+        """Record a latency (sec); negative latencies are recorded as 0
+        """
+        latency = max(latency, 0.0)
+        if latency <= self._binMinLatency:
+            binInd = 0
+        else:
+            binInd = int(math.log(latency / self._binMinLatency) / self._logBinWidth)
+        self._binDict[binInd] = self._binDict.get(binInd, 0) + 1
+        self.count += 1
+        self.totLatency += latency
+        if self.count == 1:
+            self.minLatency = latency
+            self.maxLatency = latency
+        else:
+            self.minLatency = min(self.minLatency, latency)
+            self.maxLatency = max(self.maxLatency, latency)
+
+    @property
+    def meanLatency(self):
+        """Mean latency (sec); None if count == 0"""
+        if self.count == 0:
+            return None
+        return self.totLatency / self.count
+
+    def getPercentile(self, pct):
+        """Return the estimated latency (sec) at a given percentile (0-100); None if count == 0
+        """
+        return self.getPercentiles([pct])[0]
+
+    def getPercentiles(self, pctList):
+        """Return a list of estimated latencies (sec), one per percentile (0-100) in pctList
+
+        Returns a list of None if count == 0.
+        """
+        if self.count == 0:
+            return [None] * len(pctList)
+        binIndList = sorted(self._binDict.iterkeys())
+        cumCountList = []
+        cumCount = 0
+        for binInd in binIndList:
+            cumCount += self._binDict[binInd]
+            cumCountList.append(cumCount)
+
+        retList = []
+        for pct in pctList:
+            # the rank (1-based) of the latency at this percentile
+            rank = max(1, int(math.ceil(self.count * min(max(pct, 0.0), 100.0) / 100.0)))
+            binInd = binIndList[bisect.bisect_left(cumCountList, rank)]
+            if binInd == 0:
+                latency = self.minLatency
+            else:
+                latency = self._binMinLatency * math.exp((binInd + 0.5) * self._logBinWidth)
+            retList.append(min(max(latency, self.minLatency), self.maxLatency))
+        return retList
+
+    def reset(self):
+        """Discard all recorded latencies"""
+        self._binDict.clear()
+        self.count = 0
+        self.totLatency = 0.0
+        self.minLatency = None
+        self.maxLatency = None
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        if self.count == 0:
+            return "LatencyHistogram(count=0)"
+        p50, p95, p99 = self.getPercentiles((50, 95, 99))
+        return "LatencyHistogram(count=%d; p50=%0.3f, p95=%0.3f, p99=%0.3f, max=%0.3f sec)" % \
+            (self.count, p50, p95, p99, self.maxLatency)
+
+
+class CmdStats(object):
+    """Latency statistics for the commands to one actor, or one verb of one actor
+
+    Fields:
+    - actor: actor
+    - verb: command verb, or None if these are statistics for all commands to the actor
+    - latencyHist: latency from queued to done of each completed command (a LatencyHistogram)
+    - numFailed: number of commands that completed with failure
+    - numTimedOut: number of commands dropped (no CmdDone seen within the timeout)
+    """
+    def __init__(self, actor, verb=None):
+        self.actor = actor
+        self.verb = verb
+        self.latencyHist = LatencyHistogram()
+        self.numFailed = 0
+        self.numTimedOut = 0
+
+    @property
+    def numDone(self):
+        """Number of completed commands"""
+        return self.latencyHist.count
+
+    def __str__(self):
+        name = self.actor if self.verb is None else "%s %s" % (self.actor, self.verb)
+        return "CmdStats(%s: %s; numFailed=%d, numTimedOut=%d)" % \
+            (name, self.latencyHist, self.numFailed, self.numTimedOut)
+
+
+class CmdTracker(object):
+    """Track running commands and keep latency statistics by actor and command verb
+
+    Fields include:
+    - maxCmds: maximum number of running commands tracked
+    - timeout: time (sec) after which a running command is dropped by sweep
+    - numQueued: number of commands queued
+    - numDone: number of queued commands that completed
+    - numTimedOut: number of commands dropped because they ran longer than timeout
+        or because more than maxCmds commands were running
+    """
+    def __init__(self, maxCmds=DefaultMaxCmds, timeout=DefaultTimeout):
+        """Create a CmdTracker
+
+        Inputs:
+        - maxCmds: maximum number of running commands tracked; must be >= 1
+        - timeout: time (sec) after which a running command is dropped by sweep; must be > 0
+        """
+        self.maxCmds = int(maxCmds)
+        if self.maxCmds < 1:
+            raise RuntimeError("maxCmds=%r must be >= 1" % (maxCmds,))
+        self.timeout = float(timeout)
+        if self.timeout <= 0:
+            raise RuntimeError("timeout=%r must be > 0" % (timeout,))
+        # dict of unique command ID: (cmdInfo, queued time), oldest first
+        self._runningDict = collections.OrderedDict()
+        # dict of unique command ID: cmdInfo for the most recently dropped commands, oldest first
+        self._droppedDict = collections.OrderedDict()
+        self._actorStatsDict = {} # dict of actor: CmdStats
+        self._verbStatsDict = {} # dict of (actor, verb): CmdStats
+        self.reset()
+
+    def cmdQueued(self, cmdInfo, queuedTime=None):
+        """Start tracking a command
+
+        Inputs:
+        - cmdInfo: command information; an object with fields uniqueCmdID, actor and cmdStr
+            (e.g. a TUI.Models.LogSource.CmdInfo)
+        - queuedTime: time at which the command was queued (unix sec); if None then use the current time
+
+        Also sweeps out commands that have been running longer than timeout.
+        """
+        if queuedTime is None:
+            queuedTime = time.time()
+        self.sweep(queuedTime)
+        runningDict = self._runningDict
+        oldData = runningDict.pop(cmdInfo.uniqueCmdID, None)
+        if oldData:
+            # the hub reused a command ID (e.g. it restarted); treat the old command as timed out
+            self._timedOut(oldData[0])
+        self._droppedDict.pop(cmdInfo.uniqueCmdID, None)
+        runningDict[cmdInfo.uniqueCmdID] = (cmdInfo, queuedTime)
+        self.numQueued += 1
+        while len(runningDict) > self.maxCmds:
+            self._dropped(runningDict.popitem(last=False)[1][0])
+
+    def cmdDone(self, uniqueCmdID, didFail=False, doneTime=None):
+        """Stop tracking a command and record its latency
+
+        Inputs:
+        - uniqueCmdID: unique command ID assigned by the hub
+        - didFail: True if the command failed
+        - doneTime: time at which the command finished (unix sec); if None then use the current time
+
+        Return (cmdInfo, latency (sec)); (cmdInfo, None) if the command was recently dropped
+        (see sweep and maxCmds), in which case no latency is recorded; or (None, None) if the command
+        is not known (e.g. it was queued before tracking began).
+        """
+        data = self._runningDict.pop(uniqueCmdID, None)
+        if data is None:
+            return (self._droppedDict.pop(uniqueCmdID, None), None)
+        if doneTime is None:
+            doneTime = time.time()
+        cmdInfo, queuedTime = data
+        latency = doneTime - queuedTime
+        self.numDone += 1
+        for cmdStats in self._getCmdStatsList(cmdInfo):
+            cmdStats.latencyHist.add(latency)
+            if didFail:
+                cmdStats.numFailed += 1
+        return (cmdInfo, latency)
+
+    def getCmdInfo(self, uniqueCmdID):
+        """Return cmdInfo for a running command, or None if not being tracked"""
+        data = self._runningDict.get(uniqueCmdID)
+        if data is None:
+            return None
+        return data[0]
+
+    def getRunningCmds(self):
+        """Return a list of (cmdInfo, queued time (unix sec)) for all tracked running commands, oldest first"""
+        return self._runningDict.values()
+
+    def getStats(self, byVerb=False):
+        """Return latency statistics as a list of CmdStats, sorted by actor (and verb)
+
+        Inputs:
+        - byVerb: if True, return statistics for each (actor, verb), else for each actor
+        """
+        statsDict = self._verbStatsDict if byVerb else self._actorStatsDict
+        return [statsDict[key] for key in sorted(statsDict.iterkeys())]
+
+    def getActorStats(self, actor):
+        """Return latency statistics (a CmdStats) for one actor, or None if no commands seen"""
+        return self._actorStatsDict.get(actor)
+
+    def getVerbStats(self, actor, verb):
+        """Return latency statistics (a CmdStats) for one actor and verb, or None if no commands seen"""
+        return self._verbStatsDict.get((actor, verb))
+
+    def reset(self):
+        """Discard all statistics (but keep tracking running commands)"""
+        self._actorStatsDict.clear()
+        self._verbStatsDict.clear()
+        self.numQueued = 0
+        self.numDone = 0
+        self.numTimedOut = 0
+
+    def sweep(self, currTime=None):
+        """Drop commands that have been running longer than timeout; return a list of their cmdInfo
+
+        Inputs:
+        - currTime: current time (unix sec); if None then use the current time
+        """
+        if currTime is None:
+            currTime = time.time()
+        minQueuedTime = currTime - self.timeout
+        runningDict = self._runningDict
+        timedOutList = []
+        # commands are ordered by queued time, so stop at the first command that has not timed out
+        while runningDict:
+            uniqueCmdID, (cmdInfo, queuedTime) = next(runningDict.iteritems())
+            if queuedTime >= minQueuedTime:
+                break
+            del runningDict[uniqueCmdID]
+            self._dropped(cmdInfo)
+            timedOutList.append(cmdInfo)
+        return timedOutList
+
+    def _getCmdStatsList(self, cmdInfo):
+        """Return [actor CmdStats, (actor, verb) CmdStats] for a command, creating them as needed
+        """
+        actor = cmdInfo.actor
+        actorStats = self._actorStatsDict.get(actor)
+        if actorStats is None:
+            actorStats = CmdStats(actor)
+            self._actorStatsDict[actor] = actorStats
+        verb = getVerb(cmdInfo.cmdStr)
+        verbStats = self._verbStatsDict.get((actor, verb))
+        if verbStats is None:
+            verbStats = CmdStats(actor, verb)
+            self._verbStatsDict[(actor, verb)] = verbStats
+        return [actorStats, verbStats]
+
+    def _dropped(self, cmdInfo):
+        """Stop tracking a running command that has not finished: count it as timed out
+        and remember it in case CmdDone arrives after all
+        """
+        self._timedOut(cmdInfo)
+        droppedDict = self._droppedDict
+        droppedDict[cmdInfo.uniqueCmdID] = cmdInfo
+        while len(droppedDict) > self.maxCmds:
+            droppedDict.popitem(last=False)
+
+    def _timedOut(self, cmdInfo):
+        """Record that a command was dropped without seeing CmdDone"""
+        self.numTimedOut += 1
+        for cmdStats in self._getCmdStatsList(cmdInfo):
+            cmdStats.numTimedOut += 1
+
+    def __len__(self):
+        """Return the number of running commands being tracked"""
+        return len(self._runningDict)
+
+    def __str__(self):
+        return "CmdTracker(%d running; %d queued, %d done, %d timed out)" % \
+            (len(self._runningDict), self.numQueued, self.numDone, self.numTimedOut)
+
+
+if __name__ == "__main__":
+    import random
+
+    class _CmdInfo(object):
+        def __init__(self, uniqueCmdID, actor, cmdStr):
+            self.uniqueCmdID = uniqueCmdID
+            self.actor = actor
+            self.cmdStr = cmdStr
+
+    print "Testing LatencyHistogram against exact percentiles"
+    hist = LatencyHistogram()
+    latencyList = [random.lognormvariate(0, 2) for i in range(100000)]
+    for latency in latencyList:
+        hist.add(latency)
+    latencyList.sort()
+    for pct, estLatency in zip((50, 95, 99, 100), hist.getPercentiles((50, 95, 99, 100))):
+        exactLatency = latencyList[max(0, int(math.ceil(len(latencyList) * pct / 100.0)) - 1)]
+        err = abs(estLatency - exactLatency) / exactLatency
+        print "p%s: estimate=%0.4f; exact=%0.4f; fractional error=%0.4f" % (pct, estLatency, exactLatency, err)
+        if err > DefaultResolution:
+            print "Error: fractional error too large"
+
+    print "Testing CmdTracker"
+    tracker = CmdTracker(maxCmds=3, timeout=100)
+    tracker.cmdQueued(_CmdInfo(1, "tcc", "track 10, 20 icrs"), queuedTime=0)
+    tracker.cmdQueued(_CmdInfo(2, "tcc", "offset arc 0.1, 0"), queuedTime=1)
+    tracker.cmdQueued(_CmdInfo(3, "boss", "exposure science itime=900"), queuedTime=2)
+    tracker.cmdDone(2, doneTime=3)
+    tracker.cmdDone(3, didFail=True, doneTime=905)
+    tracker.cmdDone(99, doneTime=905) # not tracked; ignored
+    tracker.cmdQueued(_CmdInfo(4, "tcc", "track 10, 20 icrs"), queuedTime=150) # times out command 1
+    for i in range(5, 10):
+        tracker.cmdQueued(_CmdInfo(i, "apogee", "expose time=10"), queuedTime=150 + i)
+    print tracker
+    # commands 1 (swept) and 4-6 (over maxCmds) were dropped; only the last maxCmds dropped are remembered
+    cmdInfo, latency = tracker.cmdDone(6, doneTime=200)
+    print "late CmdDone of dropped command 6: cmdStr=%r; latency=%s" % (cmdInfo and cmdInfo.cmdStr, latency)
+    if cmdInfo is None or latency is not None or tracker.cmdDone(6) != (None, None) \
+        or tracker.cmdDone(1) != (None, None) or tracker.numDone != 2:
+        print "Error: unexpected result for dropped or unknown commands"
+    for cmdStats in tracker.getStats() + tracker.getStats(byVerb=True):
+        print cmdStats
+    if (tracker.numDone, tracker.numTimedOut, len(tracker)) != (2, 4, 3):
+        print "Error: unexpected counts"
@@ -18,6 +18,8 @@ or register ROWdg widgets to automatically display updating values.
                     Added methods getBaseURL and getFullURL.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
 2016-06-01 EM       Changed getBaseURL to get httpHost  and httpPort from preferences
+2026-10-18          getBaseURL uses the hub's httpRoot host and port 80 if the TUI model is headless
+                    (has no preferences).
 """
 __all__ = ["Model"]
 
@@ -26,6 +28,7 @@ import opscore.actor.model as actorModel
 import TUI.Models
 
 _theModel = None
+DefHTTPPort = 80 # HTTP port used by getBaseURL if there are no preferences (headless)
 
 def Model():
     global _theModel
@@ -42,6 +45,11 @@ class _Model (actorModel.Model):
         """
         host, hostRootDir = self.httpRoot[0:2]
         Prefs = TUI.Models.getModel("tui").prefs
+        if Prefs is None:
+            # headless: no preferences
+            if None in (host, hostRootDir):
+                return None
+            return "http://%s:%s%s" % (host, DefHTTPPort, hostRootDir)
         httpHost=Prefs.getPrefVar("httpHost").getValueStr()
         httpPort=Prefs.getPrefVar("httpPort").getValueStr()
         
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+"""Record hub traffic to a file and read it back
+
+A recording holds every reply line received from the hub, with the time it was received.
+TUIModel writes one while the "Record Hub Traffic" preference is set (see TUIModel.startRecording);
+TUI.Base.ReplayDispatcher feeds a recording back through the keyword dispatcher.
+
+File format: the magic string RecordingMagic followed by one record per reply:
+a RecordHeader (receive time as unix seconds, length of the reply) followed by the reply
+as received (unicode replies are encoded as UTF-8).
+Records are appended in order of receipt, so receive times never decrease.
+
+HubRecordingReader scans the record headers when opened (reading in large chunks)
+and keeps a sparse index of (receive time, file offset), one per IndexInterval records,
+which it bisects to seek by time or reply index.
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import bisect
+import os
+import struct
+import time
+
+__all__ = ["HubRecordingReader", "HubRecordingWriter"]
+
+DefaultFlushInterval = 1.0 # maximum interval between flushes to disk (sec)
+# number of records between entries in the sparse index kept by HubRecordingReader
+IndexInterval = 1000
+# size of chunks read when scanning a recording (bytes)
+ScanChunkSize = 1024 * 1024
+# suffix for recording files
+RecordingSuffix = ".hubrec"
+
+# magic string at the start of every recording
+RecordingMagic = "STUIREC1"
+# reply record: receive time (unix sec), length of reply (bytes); followed by the reply
+RecordHeader = struct.Struct("<dI")
+
+
+class HubRecordingWriter(object):
+    """Append hub replies to a recording file
+
+    Data is buffered and written to disk at least every flushInterval seconds (if replies are being added),
+    and when flush or close is called.
+
+    Fields include:
+    - filePath: path of recording file
+    - numReplies: number of replies recorded by this writer
+    """
+    def __init__(self, filePath, flushInterval=DefaultFlushInterval):
+        """Create a new recording file; raise RuntimeError if the file exists
+
+        Inputs:
+        - filePath: path of recording file; its directory is created if it does not exist
+        - flushInterval: maximum interval between flushes to disk (sec)
+        """
+        self.filePath = os.path.abspath(filePath)
+        if os.path.exists(self.filePath):
+            raise RuntimeError("Recording %r already exists" % (self.filePath,))
+        self.flushInterval = float(flushInterval)
+        fileDir = os.path.dirname(self.filePath)
+        if not os.path.isdir(fileDir):
+            os.makedirs(fileDir)
+        self._file = open(self.filePath, "wb")
+        self._file.write(RecordingMagic)
+        self._dataList = []
+        self._lastFlushTime = time.time()
+        self.numReplies = 0
+
+    def append(self, replyStr, recvTime=None):
+        """Record a reply
+
+        Inputs:
+        - replyStr: the reply, as received from the hub (without a final newline)
+        - recvTime: time at which the reply was received (unix sec); if None then use the current time
+        """
+        if self._file is None:
+            raise RuntimeError("Recording %r is closed" % (self.filePath,))
+        if recvTime is None:
+            recvTime = time.time()
+        if isinstance(replyStr, unicode):
+            replyStr = replyStr.encode("utf-8")
+        self._dataList.append(RecordHeader.pack(recvTime, len(replyStr)))
+        self._dataList.append(replyStr)
+        self.numReplies += 1
+        if recvTime - self._lastFlushTime >= self.flushInterval:
+            self.flush()
+
+    def close(self):
+        """Flush and close the file; safe to call more than once"""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def flush(self):
+        """Write buffered replies to disk"""
+        if self._dataList:
+            self._file.write("".join(self._dataList))
+            self._dataList = []
+        self._file.flush()
+        self._lastFlushTime = time.time()
+
+    @property
+    def isOpen(self):
+        return self._file is not None
+
+    def __str__(self):
+        return "HubRecordingWriter(%r; %d replies)" % (self.filePath, self.numReplies)
+
+
+class HubRecordingReader(object):
+    """Read a hub recording
+
+    Fields include:
+    - filePath: path of recording file
+    - numReplies: number of replies in the recording
+    - startTime: receive time of the first reply (unix sec); None if the recording is empty
+    - endTime: receive time of the last reply (unix sec); None if the recording is empty
+
+    A truncated final record (e.g. the recording was being written when read) is ignored.
+    """
+    def __init__(self, filePath):
+        """Open a recording and index it; raise RuntimeError if it is not a recording
+        """
+        self.filePath = os.path.abspath(filePath)
+        self._file = open(self.filePath, "rb")
+        if self._file.read(len(RecordingMagic)) != RecordingMagic:
+            self._file.close()
+            raise RuntimeError("%r is not a hub recording" % (self.filePath,))
+        self._indexTimes = [] # receive time of every IndexInterval'th record
+        self._indexOffsets = [] # file offset of every IndexInterval'th record
+        self.numReplies = 0
+        self.startTime = None
+        self.endTime = None
+        self._endOffset = len(RecordingMagic)
+        self._scan()
+
+    def close(self):
+        """Close the file"""
+        self._file.close()
+
+    def findTime(self, recvTime):
+        """Return the index of the first reply received at or after recvTime (numReplies if none)
+        """
+        if not self._indexTimes:
+            return 0
+        blockInd = max(0, bisect.bisect_left(self._indexTimes, recvTime) - 1)
+        replyInd = blockInd * IndexInterval
+        for replyTime, replyStr in self._iterFrom(blockInd):
+            if replyTime >= recvTime:
+                return replyInd
+            replyInd += 1
+        return replyInd
+
+    def iterReplies(self, startTime=None, startInd=None):
+        """Return an iterator over (receive time (unix sec), reply (a str)) for replies in the recording
+
+        Inputs:
+        - startTime: receive time of first reply to return; if None, start at the beginning
+        - startInd: index of first reply to return (0 is the first reply); overrides startTime
+
+        The iterator does not notice replies appended after the recording was opened.
+        """
+        if startInd is None:
+            startInd = 0 if startTime is None else self.findTime(startTime)
+        startInd = max(0, startInd)
+        blockInd, numToSkip = divmod(startInd, IndexInterval)
+        if blockInd >= len(self._indexOffsets):
+            return iter(())
+        replyIter = self._iterFrom(blockInd)
+        for i in xrange(numToSkip):
+            next(replyIter, None)
+        return replyIter
+
+    def _iterFrom(self, blockInd):
+        """Iterate over (receive time, reply) starting from the first reply in an index block
+        """
+        recFile = self._file
+        offset = self._indexOffsets[blockInd]
+        endOffset = self._endOffset
+        headerSize = RecordHeader.size
+        unpackFrom = RecordHeader.unpack_from
+        while offset < endOffset:
+            # read in chunks (the file may be shared by more than one iterator, so always seek)
+            recFile.seek(offset)
+            chunk = recFile.read(min(ScanChunkSize, endOffset - offset))
+            chunkLen = len(chunk)
+            pos = 0
+            while pos + headerSize <= chunkLen:
+                recvTime, replyLen = unpackFrom(chunk, pos)
+                dataEnd = pos + headerSize + replyLen
+                if dataEnd > chunkLen:
+                    break
+                yield recvTime, chunk[pos + headerSize:dataEnd]
+                pos = dataEnd
+            if pos == 0:
+                # a single record is larger than the chunk size
+                recvTime, replyLen = unpackFrom(chunk, 0)
+                recFile.seek(offset + headerSize)
+                yield recvTime, recFile.read(replyLen)
+                pos = headerSize + replyLen
+            offset += pos
+
+    def _scan(self):
+        """Scan the record headers to set numReplies, startTime, endTime and the sparse index
+        """
+        recFile = self._file
+        headerSize = RecordHeader.size
+        unpackFrom = RecordHeader.unpack_from
+        fileSize = os.fstat(recFile.fileno()).st_size
+        offset = len(RecordingMagic)
+        numReplies = 0
+        isTruncated = False
+        while not isTruncated:
+            recFile.seek(offset)
+            chunk = recFile.read(ScanChunkSize)
+            pos = 0
+            # a record may extend beyond the chunk; only its header need be in the chunk
+            while pos + headerSize <= len(chunk):
+                recvTime, replyLen = unpackFrom(chunk, pos)
+                recordLen = headerSize + replyLen
+                if offset + pos + recordLen > fileSize:
+                    isTruncated = True
+                    break
+                if numReplies % IndexInterval == 0:
+                    self._indexTimes.append(recvTime)
+                    self._indexOffsets.append(offset + pos)
+                if self.startTime is None:
+                    self.startTime = recvTime
+                self.endTime = recvTime
+                numReplies += 1
+                pos += recordLen
+            if pos == 0:
+                break
+            offset += pos
+        self.numReplies = numReplies
+        self._endOffset = offset
+
+    def __len__(self):
+        return self.numReplies
+
+    def __str__(self):
+        return "HubRecordingReader(%r; %d replies)" % (self.filePath, self.numReplies)
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    tempDir = tempfile.mkdtemp()
+    try:
+        filePath = os.path.join(tempDir, "test" + RecordingSuffix)
+        print "Writing", filePath
+        writer = HubRecordingWriter(filePath)
+        numReplies = 12345
+        for i in range(numReplies):
+            writer.append("me.me %d tcc : Text=\"reply %d\"" % (i, i) + ("x" * (i % 7)), recvTime=1000.0 + i * 0.1)
+        writer.append("big 0 tcc i Text=\"%s\"" % ("y" * (ScanChunkSize * 2),), recvTime=1000.0 + numReplies * 0.1)
+        numReplies += 1
+        writer.close()
+        # add a truncated record, as if the file were still being written
+        with open(filePath, "ab") as f:
+            f.write(RecordHeader.pack(5000.0, 100) + "partial")
+
+        reader = HubRecordingReader(filePath)
+        print reader, "startTime=%s; endTime=%s" % (reader.startTime, reader.endTime)
+        if len(reader) != numReplies:
+            print "Error: numReplies=%s != %s" % (len(reader), numReplies)
+        replyList = list(reader.iterReplies())
+        if len(replyList) != numReplies or replyList[-1][1][0:3] != "big":
+            print "Error: iterReplies returned %d replies" % (len(replyList),)
+        for startTime in (0, 1000.05, 1000.0 + 5432 * 0.1, 2000.0, 3000.0):
+            startInd = reader.findTime(startTime)
+            expectedInd = next((ind for ind, (recvTime, replyStr) in enumerate(replyList)
+                if recvTime >= startTime), len(replyList))
+            firstReply = next(reader.iterReplies(startTime=startTime), (None, None))
+            print "findTime(%s) = %s; first reply = %s" % (startTime, startInd, firstReply[1] and firstReply[1][0:30])
+            if startInd != expectedInd:
+                print "Error: expected %s" % (expectedInd,)
+        reader.close()
+    finally:
+        shutil.rmtree(tempDir)
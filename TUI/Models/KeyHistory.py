@@ -0,0 +1,413 @@
+#!/usr/bin/env python
+"""Persistent on-disk history of keyword values, so strip charts can show data from before they were opened
+
+A KeyHistoryRecorder (owned by the TUI model; see TUIModel.keyHistory) records the values of selected
+keyword variables in the background, whether or not any window shows them (see TUI.BackgroundTasks
+for the standard list). While recording is started (see the "Record Key History" preference)
+each new value is appended to a history directory, from which strip charts backfill
+their time range when a line is created (see TUI.Base.StripChartWdg.plotKeyVar).
+
+A series is one value of one keyword variable, named <actor>.<keyword>.<value index> (see getSeriesName).
+The history directory has one subdirectory per night (YYYY-MM-DD; see TUI.Models.LogArchive.getNightName)
+holding one or more files per series: <series name>_<part>.dat, where part is a 3-digit counter
+(a new part is started each time a KeyHistoryWriter starts writing the series that night,
+so a file only ever has one writer). Each file is the magic string DataMagic followed by fixed-size records
+(unix time, value) in time order, so a file is its own time index: KeyHistoryReader memory-maps the file
+and finds the records in a time range by binary search, without reading any other records.
+
+Values are recorded as float64, so only numeric values can be recorded.
+
+History:
+2026-10-18          Initial version.
+"""
+import errno
+import glob
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+import traceback
+
+import numpy
+import RO.Constants
+import LogArchive
+
+__all__ = ["KeyHistoryReader", "KeyHistoryRecorder", "KeyHistoryWriter", "getSeriesName"]
+
+DefaultFlushInterval = 1.0 # maximum interval between flushes to disk (sec)
+
+DataSuffix = ".dat"
+# magic string at the start of every data file
+DataMagic = "STUIKEY1"
+# data record: unix time, value
+DataRecord = struct.Struct("<dd")
+DataDType = numpy.dtype([("t", "<f8"), ("y", "<f8")])
+
+_NightRE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def getSeriesName(actor, keyword, keyInd=0):
+    """Return the name of the series for one value of a keyword variable: <actor>.<keyword>.<keyInd>
+    """
+    return "%s.%s.%d" % (actor, keyword, keyInd)
+
+def _getNightNames(historyDir):
+    """Return a sorted list of the names of nights in a history directory"""
+    try:
+        names = os.listdir(historyDir)
+    except OSError:
+        return []
+    return sorted(name for name in names
+        if _NightRE.match(name) and os.path.isdir(os.path.join(historyDir, name)))
+
+def _getDataPaths(historyDir, nightName, seriesName):
+    """Return a sorted list of the data files of one series for one night"""
+    nightDir = os.path.join(historyDir, nightName)
+    try:
+        fileNames = os.listdir(nightDir)
+    except OSError:
+        return []
+    fileRE = re.compile(r"^%s_\d{3}%s$" % (re.escape(seriesName), re.escape(DataSuffix)))
+    return sorted(os.path.join(nightDir, name) for name in fileNames if fileRE.match(name))
+
+def _readDataFile(path, startTime, endTime):
+    """Read the records of one data file in the time range [startTime, endTime)
+
+    Inputs:
+    - path: path of data file
+    - startTime: unix time of start of range; if None then from the first record
+    - endTime: unix time of end of range; if None then to the last record
+
+    Returns a numpy array (of dtype DataDType) of records; it is a copy, not a view of the file.
+    Raise RuntimeError if the file is not a key history data file.
+    """
+    with open(path, "rb") as dataFile:
+        numRecords = (os.fstat(dataFile.fileno()).st_size - len(DataMagic)) // DataRecord.size
+        if numRecords <= 0:
+            return numpy.zeros(0, dtype=DataDType)
+        # map only complete records
+        dataMap = mmap.mmap(dataFile.fileno(), len(DataMagic) + (numRecords * DataRecord.size),
+            access=mmap.ACCESS_READ)
+        try:
+            if dataMap[0:len(DataMagic)] != DataMagic:
+                raise RuntimeError("%s is not a key history data file" % (path,))
+            recArr = numpy.frombuffer(dataMap, dtype=DataDType, count=numRecords, offset=len(DataMagic))
+            startInd = 0 if startTime is None else numpy.searchsorted(recArr["t"], startTime, side="left")
+            endInd = numRecords if endTime is None else numpy.searchsorted(recArr["t"], endTime, side="left")
+            retArr = recArr[startInd:endInd].copy()
+            del recArr # release the buffer before closing the map
+        finally:
+            dataMap.close()
+    return retArr
+
+
+class KeyHistoryReader(object):
+    """Read series from a key history directory
+    """
+    def __init__(self, historyDir):
+        """Create a KeyHistoryReader
+
+        Inputs:
+        - historyDir: key history directory
+
+        Raise RuntimeError if historyDir is not a directory.
+        """
+        if not os.path.isdir(historyDir):
+            raise RuntimeError("key history directory %r not found" % (historyDir,))
+        self.historyDir = historyDir
+
+    def getSeriesNames(self):
+        """Return a sorted list of the names of all series in the history"""
+        seriesNameSet = set()
+        for nightName in _getNightNames(self.historyDir):
+            for path in glob.glob(os.path.join(self.historyDir, nightName, "*_???" + DataSuffix)):
+                seriesNameSet.add(os.path.basename(path).rsplit("_", 1)[0])
+        return sorted(seriesNameSet)
+
+    def read(self, seriesName, startTime=None, endTime=None):
+        """Read the values of a series in the time range [startTime, endTime)
+
+        Inputs:
+        - seriesName: name of series (see getSeriesName)
+        - startTime: unix time of start of range; if None then from the oldest value
+        - endTime: unix time of end of range; if None then to the newest value
+
+        Returns (times, values): two numpy float64 arrays, sorted by time; both are empty if no data
+        """
+        # a night's files may hold values from before the night began (if the clock was set back),
+        # so also read the night before the start
+        firstNight = None if startTime is None else LogArchive.getNightName(startTime - (24 * 3600))
+        endNight = None if endTime is None else LogArchive.getNightName(endTime)
+        recArrList = []
+        for nightName in _getNightNames(self.historyDir):
+            if firstNight is not None and nightName < firstNight:
+                continue
+            if endNight is not None and nightName > endNight:
+                break
+            for path in _getDataPaths(self.historyDir, nightName, seriesName):
+                recArr = _readDataFile(path, startTime, endTime)
+                if len(recArr) > 0:
+                    recArrList.append(recArr)
+        if not recArrList:
+            return numpy.zeros(0), numpy.zeros(0)
+        recArr = numpy.concatenate(recArrList)
+        if len(recArrList) > 1 and numpy.any(numpy.diff(recArr["t"]) < 0):
+            # files from more than one writer overlap in time
+            recArr = recArr[numpy.argsort(recArr["t"], kind="mergesort")]
+        return recArr["t"].copy(), recArr["y"].copy()
+
+
+class KeyHistoryWriter(object):
+    """Append values of series to a key history directory
+
+    Data is buffered and written to disk at least every flushInterval seconds (if values are being added),
+    and when flush or close is called.
+    """
+    def __init__(self, historyDir, flushInterval=DefaultFlushInterval, maxNights=None):
+        """Create a KeyHistoryWriter
+
+        Inputs:
+        - historyDir: key history directory; created if it does not exist
+        - flushInterval: maximum interval between flushes to disk (sec)
+        - maxNights: if not None then each time a new night begins, delete all but the newest maxNights nights
+        """
+        self.historyDir = os.path.abspath(historyDir)
+        if not os.path.isdir(self.historyDir):
+            os.makedirs(self.historyDir)
+        self.flushInterval = float(flushInterval)
+        self.maxNights = maxNights
+        self.nightName = None
+        self.numValues = 0 # number of values appended
+        self._fileDict = {} # dict of series name: open data file for the current night
+        self._pendingDict = {} # dict of series name: list of data records not yet written
+        self._lastTimeDict = {} # dict of series name: time of most recent value
+        self._lastFlushTime = time.time()
+
+    def append(self, seriesName, unixTime, value):
+        """Append a value to a series
+
+        Inputs:
+        - seriesName: name of series (see getSeriesName)
+        - unixTime: unix time of value; if earlier than the previous value of the series
+            (e.g. because the clock was set back) then the time of the previous value is used
+        - value: value (a float)
+        """
+        unixTime = max(unixTime, self._lastTimeDict.get(seriesName, unixTime))
+        self._lastTimeDict[seriesName] = unixTime
+        nightName = LogArchive.getNightName(unixTime)
+        if nightName != self.nightName:
+            self._startNight(nightName)
+        self._pendingDict.setdefault(seriesName, []).append(DataRecord.pack(unixTime, value))
+        self.numValues += 1
+        if unixTime - self._lastFlushTime >= self.flushInterval:
+            self.flush()
+
+    def close(self):
+        """Flush and close all files"""
+        self.flush()
+        for dataFile in self._fileDict.itervalues():
+            dataFile.close()
+        self._fileDict = {}
+
+    def flush(self):
+        """Write buffered data to disk"""
+        pendingDict, self._pendingDict = self._pendingDict, {}
+        for seriesName, recordList in pendingDict.iteritems():
+            dataFile = self._fileDict.get(seriesName)
+            if dataFile is None:
+                dataFile = self._openFile(seriesName)
+            dataFile.write("".join(recordList))
+            dataFile.flush()
+        self._lastFlushTime = time.time()
+
+    def purge(self, maxNights):
+        """Delete all but the newest maxNights nights (never deleting the night being written)
+
+        Return a list of the names of nights deleted.
+        """
+        nightNames = _getNightNames(self.historyDir)
+        purgeNights = [night for night in nightNames[0:max(0, len(nightNames) - maxNights)]
+            if night != self.nightName]
+        for nightName in purgeNights:
+            shutil.rmtree(os.path.join(self.historyDir, nightName))
+        return purgeNights
+
+    def _openFile(self, seriesName):
+        """Start a new data file for a series for the current night; return the open file
+
+        The file is created exclusively, so if another writer (e.g. another instance of STUI)
+        creates the same part first, the next part is used instead.
+        """
+        nightDir = os.path.join(self.historyDir, self.nightName)
+        try:
+            os.makedirs(nightDir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        parts = [int(os.path.basename(path)[-len(DataSuffix) - 3:-len(DataSuffix)])
+            for path in _getDataPaths(self.historyDir, self.nightName, seriesName)]
+        part = max(parts) + 1 if parts else 0
+        openFlags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        while True:
+            if part > 999:
+                raise RuntimeError("too many data files for series %s on night %s" % (seriesName, self.nightName))
+            try:
+                fd = os.open(os.path.join(nightDir, "%s_%03d%s" % (seriesName, part, DataSuffix)), openFlags, 0666)
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+                part += 1
+        dataFile = os.fdopen(fd, "wb")
+        dataFile.write(DataMagic)
+        self._fileDict[seriesName] = dataFile
+        return dataFile
+
+    def _startNight(self, nightName):
+        """Close the files of the current night (if any) and start a new night"""
+        self.close()
+        self.nightName = nightName
+        if self.maxNights is not None:
+            self.purge(self.maxNights)
+
+
+class KeyHistoryRecorder(object):
+    """Record values of keyword variables to a key history directory in the background
+
+    Keyword variables are added with addKeyVar; their values are only recorded while recording is started.
+
+    Fields include:
+    - writer: the KeyHistoryWriter, or None if not recording
+    """
+    def __init__(self, logFunc=None):
+        """Create a KeyHistoryRecorder
+
+        Inputs:
+        - logFunc: function to log a message, with arguments (msgStr, severity);
+            if None then errors are printed to stderr
+        """
+        self.logFunc = logFunc
+        self.writer = None
+        self._seriesNameSet = set() # names of series that are recorded
+
+    @property
+    def isRecording(self):
+        return self.writer is not None
+
+    def addKeyVar(self, keyVar, keyInd=0):
+        """Record one value of a keyword variable (a no-op if already recorded)
+
+        Inputs:
+        - keyVar: keyword variable
+        - keyInd: index of value to record; the value must be numeric (other values are ignored)
+        """
+        seriesName = getSeriesName(keyVar.actor, keyVar.name, keyInd)
+        if seriesName in self._seriesNameSet:
+            return
+        self._seriesNameSet.add(seriesName)
+
+        def callFunc(keyVar, seriesName=seriesName, keyInd=keyInd):
+            if self.writer is None or not keyVar.isCurrent or not keyVar.isGenuine:
+                return
+            try:
+                value = float(keyVar[keyInd])
+            except (TypeError, ValueError):
+                return
+            try:
+                self.writer.append(seriesName, time.time(), value)
+            except Exception as e:
+                self.stop()
+                self._logError("Could not record key history; recording stopped: %s" % (e,))
+        keyVar.addCallback(callFunc, callNow=False)
+
+    def isRecorded(self, keyVar, keyInd=0):
+        """Return True if one value of a keyword variable is recorded (whether or not recording is started)"""
+        return getSeriesName(keyVar.actor, keyVar.name, keyInd) in self._seriesNameSet
+
+    def read(self, keyVar, keyInd=0, startTime=None, endTime=None):
+        """Read the recorded values of one value of a keyword variable in the time range [startTime, endTime)
+
+        Inputs:
+        - keyVar: keyword variable
+        - keyInd: index of value
+        - startTime: unix time of start of range; if None then from the oldest value
+        - endTime: unix time of end of range; if None then to the newest value
+
+        Returns (times, values) as for KeyHistoryReader.read,
+        or None if not recording or the value is not recorded.
+        """
+        if self.writer is None or not self.isRecorded(keyVar, keyInd):
+            return None
+        try:
+            self.writer.flush()
+            reader = KeyHistoryReader(self.writer.historyDir)
+            return reader.read(getSeriesName(keyVar.actor, keyVar.name, keyInd), startTime, endTime)
+        except Exception as e:
+            self._logError("Could not read key history: %s" % (e,))
+            return None
+
+    def start(self, historyDir, maxNights=None):
+        """Start recording to a key history directory
+
+        Inputs:
+        - historyDir: key history directory; created if it does not exist
+        - maxNights: if not None then each time a new night begins, delete all but the newest maxNights nights
+
+        If already recording to historyDir then just update maxNights, else stop recording first.
+        """
+        if self.writer is not None:
+            if self.writer.historyDir == os.path.abspath(historyDir):
+                self.writer.maxNights = maxNights
+                return
+            self.stop()
+        self.writer = KeyHistoryWriter(historyDir, maxNights=maxNights)
+
+    def stop(self):
+        """Stop recording (if recording)"""
+        writer, self.writer = self.writer, None
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    def _logError(self, msgStr):
+        if self.logFunc:
+            self.logFunc(msgStr, severity=RO.Constants.sevWarning)
+        else:
+            sys.stderr.write(msgStr + "\n")
+            traceback.print_exc(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    import calendar
+    import tempfile
+
+    historyDir = tempfile.mkdtemp()
+    try:
+        writer = KeyHistoryWriter(historyDir)
+        startTime = calendar.timegm((2026, 10, 18, 12, 0, 0, 0, 0, 0))
+        seriesName = getSeriesName("boss", "SP1R0CCDTempRead", 0)
+        for i in range(24 * 360):
+            unixTime = startTime + (i * 10) # every 10 seconds for a day, spanning two nights
+            writer.append(seriesName, unixTime, -120.0 + (i % 100) * 0.01)
+        writer.close()
+
+        reader = KeyHistoryReader(historyDir)
+        print "series:", reader.getSeriesNames()
+        tArr, yArr = reader.read(seriesName, startTime + 3600, startTime + 3600 * 12)
+        print "read %d values from %s to %s" % (len(tArr), time.ctime(tArr[0]), time.ctime(tArr[-1]))
+
+        # two writers (e.g. two instances of STUI) writing the same series each get their own files
+        seriesName = getSeriesName("boss", "SP1R0CCDTempRead", 1)
+        writerList = [KeyHistoryWriter(historyDir) for i in range(2)]
+        for i in range(100):
+            writerList[i % 2].append(seriesName, startTime + i, float(i))
+        for writer in writerList:
+            writer.close()
+        tArr, yArr = reader.read(seriesName)
+        print "read %d of 100 values written by two writers; in order: %s" % (len(tArr), list(yArr) == range(100))
+    finally:
+        shutil.rmtree(historyDir)
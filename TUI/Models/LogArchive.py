@@ -0,0 +1,760 @@
+#!/usr/bin/env python
+"""Persistent on-disk archive of log entries
+
+LogSource only holds the most recent log entries in memory. If archiving is enabled
+(see LogSource.startArchive) then every log entry is also appended to an archive on disk,
+which log windows and scripts can read using LogArchiveReader.
+
+The archive is a directory of segments. Each segment is a pair of files:
+- <night>_<part>.log: log entries, appended as compact binary records
+- <night>_<part>.idx: an index of fixed-size records (entry number, TAI, offset in the .log file),
+    one per entry, which readers memory-map and bisect to seek by entry number or TAI in O(log n)
+where night is the date (YYYY-MM-DD) of the start of the observing night and part is a 3-digit counter.
+A new segment is started each night, each time a segment exceeds maxSegmentBytes,
+and each time a LogArchiveWriter is opened (so a segment only ever has one writer).
+
+Archive entry numbers increase monotonically across segments and sessions;
+they are not the same as the entry numbers used by LogSource.
+
+Segments are append-only, but a finished night may be compacted: its segments are merged
+into one, optionally discarding entries below a given severity (see LogArchiveWriter.compact).
+Compaction replaces the .log and .idx files of a segment separately, so readers check that the last
+index record matches the log file and, if not, rebuild the index in memory from the log file.
+Old nights may be deleted (see LogArchiveWriter.purge).
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import bisect
+import glob
+import mmap
+import os
+import struct
+import time
+
+import LogStore
+
+__all__ = ["ArchiveEntry", "LogArchiveReader", "LogArchiveWriter", "getNightName"]
+
+DefaultMaxSegmentBytes = 64 * 1024 * 1024
+DefaultFlushInterval = 1.0 # maximum interval between flushes to disk (sec)
+# UTC hour at which a new night begins (local noon at APO, which is on MST = UTC-7)
+NightStartHour = 19
+
+LogSuffix = ".log"
+IndexSuffix = ".idx"
+TempSuffix = ".tmp"
+
+# magic string at the start of every .log file
+LogMagic = "STUILOG1"
+# log entry record: record length (bytes, including this header), entry number, unixTime, taiSec,
+# severity, cmdID, length of actor, length of cmdr, length of msgStr; followed by actor, cmdr and msgStr
+# (all encoded as UTF-8)
+RecordHeader = struct.Struct("<IqddbiHHI")
+# index record: entry number, taiSec, offset of log entry record in .log file
+IndexRecord = struct.Struct("<qdQ")
+
+ActorTagPrefix = "act_"
+CmdrTagPrefix = "cmdr_"
+
+def getNightName(taiSec):
+    """Return the name of the night (YYYY-MM-DD) containing a given TAI (Python seconds)
+
+    The night is named by the UTC date at its start; see NightStartHour.
+    """
+    return time.strftime("%Y-%m-%d", time.gmtime(taiSec - (NightStartHour * 3600)))
+
+def _getSegmentNames(archiveDir):
+    """Return a sorted list of segment names (<night>_<part>) in an archive directory"""
+    logPaths = glob.glob(os.path.join(archiveDir, "????-??-??_???" + LogSuffix))
+    return sorted(os.path.basename(logPath)[:-len(LogSuffix)] for logPath in logPaths)
+
+def _splitSegmentName(segmentName):
+    """Return (nightName, part) for a segment name"""
+    nightName, partStr = segmentName.split("_")
+    return nightName, int(partStr)
+
+def _isReplaced(fileObj, path):
+    """Return True if the file at path is not the open file fileObj (e.g. it has been replaced or removed)
+    """
+    try:
+        return os.fstat(fileObj.fileno()).st_ino != os.stat(path).st_ino
+    except OSError:
+        return True
+
+def _toUnicode(val):
+    """Return val as unicode; str is assumed to be UTF-8 (or Latin-1 if that fails)"""
+    if isinstance(val, unicode):
+        return val
+    try:
+        return val.decode("utf-8")
+    except UnicodeDecodeError:
+        return val.decode("latin-1")
+
+def _fromUTF8(val):
+    """Decode UTF-8; return str if the result is ASCII (as log messages usually are), else unicode"""
+    try:
+        val.decode("ascii")
+        return val
+    except UnicodeDecodeError:
+        return val.decode("utf-8")
+
+
+class ArchiveEntry(object):
+    """A log entry read from the archive
+
+    Fields are the same as TUI.Models.LogSource.LogEntry (except keywords), plus:
+    - seq: archive entry number
+    - taiSec: TAI (Python seconds) at which the entry was logged
+    cmdInfo is always None, since it is not archived.
+    """
+    __slots__ = ("seq", "unixTime", "taiSec", "severity", "cmdID", "actor", "cmdr", "msgStr")
+
+    def __init__(self, seq, unixTime, taiSec, severity, cmdID, actor, cmdr, msgStr):
+        self.seq = seq
+        self.unixTime = unixTime
+        self.taiSec = taiSec
+        self.severity = severity
+        self.cmdID = cmdID
+        self.actor = actor
+        self.cmdr = cmdr
+        self.msgStr = msgStr
+
+    @property
+    def cmdInfo(self):
+        return None
+
+    @property
+    def isKeys(self):
+        return self.actor.startswith("keys")
+
+    @property
+    def tags(self):
+        tags = []
+        if self.cmdr:
+            tags.append(CmdrTagPrefix + self.cmdr.lower())
+        if self.actor:
+            tags.append(ActorTagPrefix + self.actor.lower())
+        return tags
+
+    @property
+    def taiTimeStr(self):
+        return LogStore.getTimeStr(self.taiSec)
+
+    def getStr(self):
+        """Return log entry formatted for log window
+        """
+        return "%s %s\n" % (self.taiTimeStr, self.msgStr)
+
+    def __repr__(self):
+        return "ArchiveEntry(seq=%r, msgStr=%r, severity=%r, actor=%r, cmdr=%r, cmdID=%r)" % \
+            (self.seq, self.msgStr, self.severity, self.actor, self.cmdr, self.cmdID)
+
+
+class _IndexColumn(object):
+    """A read-only sequence view of one field of a segment's index, for use with bisect
+    """
+    def __init__(self, segment, fieldInd):
+        self.segment = segment
+        self.fieldInd = fieldInd
+
+    def __getitem__(self, ind):
+        return self.segment.getIndexRecord(ind)[self.fieldInd]
+
+    def __len__(self):
+        return self.segment.numEntries
+
+
+class _Segment(object):
+    """Read access to one segment of an archive
+    """
+    def __init__(self, archiveDir, name):
+        self.name = name
+        self.logPath = os.path.join(archiveDir, name + LogSuffix)
+        self.idxPath = os.path.join(archiveDir, name + IndexSuffix)
+        self.numEntries = 0
+        self._idxSize = None # size of .idx file when last read
+        self._idxFile = None
+        self._idxMap = None # memory map of the index, or str if the index was rebuilt from the log file
+        self._logFile = None
+        self.seqColumn = _IndexColumn(self, 0)
+        self.taiColumn = _IndexColumn(self, 1)
+        self.refresh()
+
+    def close(self):
+        """Close files; the segment may be reopened by calling refresh"""
+        self._closeIndexMap()
+        for fileObj in (self._idxFile, self._logFile):
+            if fileObj is not None:
+                fileObj.close()
+        self._idxFile = None
+        self._logFile = None
+        self._idxSize = None
+        self.numEntries = 0
+
+    @property
+    def firstSeq(self):
+        return self.getIndexRecord(0)[0]
+
+    @property
+    def lastSeq(self):
+        return self.getIndexRecord(self.numEntries - 1)[0]
+
+    @property
+    def firstTAI(self):
+        return self.getIndexRecord(0)[1]
+
+    def getIndexRecord(self, ind):
+        """Return index record ind: (entry number, taiSec, offset)"""
+        if not 0 <= ind < self.numEntries:
+            raise IndexError("index %s out of range" % (ind,))
+        return IndexRecord.unpack_from(self._idxMap, ind * IndexRecord.size)
+
+    def readEntry(self, ind):
+        """Read entry ind of this segment; return an ArchiveEntry
+
+        Raise RuntimeError if the log file is inconsistent with the index.
+        """
+        seq, taiSec, offset = self.getIndexRecord(ind)
+        self._logFile.seek(offset)
+        headerData = self._logFile.read(RecordHeader.size)
+        if len(headerData) != RecordHeader.size:
+            raise RuntimeError("log entry %s is truncated in %s" % (seq, self.logPath))
+        recLen, recSeq, unixTime, recTAI, severity, cmdID, actorLen, cmdrLen, msgLen = \
+            RecordHeader.unpack(headerData)
+        if recSeq != seq:
+            raise RuntimeError("index of %s is inconsistent: expected entry %s; found %s" % \
+                (self.logPath, seq, recSeq))
+        data = self._logFile.read(recLen - RecordHeader.size)
+        if len(data) != actorLen + cmdrLen + msgLen:
+            raise RuntimeError("log entry %s is truncated in %s" % (seq, self.logPath))
+        return ArchiveEntry(
+            seq = seq,
+            unixTime = unixTime,
+            taiSec = recTAI,
+            severity = severity,
+            cmdID = cmdID,
+            actor = _fromUTF8(data[0:actorLen]),
+            cmdr = _fromUTF8(data[actorLen:actorLen + cmdrLen]),
+            msgStr = _fromUTF8(data[actorLen + cmdrLen:]),
+        )
+
+    def readRecordData(self, ind):
+        """Read the raw log record for entry ind of this segment; return (severity, record data)
+        """
+        offset = self.getIndexRecord(ind)[2]
+        self._logFile.seek(offset)
+        recData = self._logFile.read(RecordHeader.size)
+        recLen, severity = RecordHeader.unpack(recData)[0:5:4]
+        recData += self._logFile.read(recLen - RecordHeader.size)
+        if len(recData) != recLen:
+            raise RuntimeError("log entry at offset %s is truncated in %s" % (offset, self.logPath))
+        return severity, recData
+
+    def refresh(self):
+        """Update numEntries (and the index) if the segment has grown or its files have been replaced
+
+        If the index does not match the log file (e.g. because compaction was interrupted
+        after replacing only one of them) then the index is rebuilt from the log file.
+        """
+        if (self._logFile is not None and _isReplaced(self._logFile, self.logPath)) \
+            or (self._idxFile is not None and _isReplaced(self._idxFile, self.idxPath)):
+            self.close()
+        try:
+            idxSize = os.path.getsize(self.idxPath)
+        except OSError:
+            idxSize = 0
+        if idxSize == self._idxSize and self._logFile is not None:
+            return
+        self._closeIndexMap()
+        if self._logFile is None:
+            self._logFile = open(self.logPath, "rb")
+        numEntries = idxSize // IndexRecord.size
+        if numEntries > 0:
+            if self._idxFile is None:
+                self._idxFile = open(self.idxPath, "rb")
+            # map only complete records
+            self._idxMap = mmap.mmap(self._idxFile.fileno(), numEntries * IndexRecord.size,
+                access=mmap.ACCESS_READ)
+        self.numEntries = numEntries
+        self._idxSize = idxSize
+        if numEntries > 0 and not self._isLastIndexRecordValid():
+            self._closeIndexMap()
+            self._idxMap = self._readIndexFromLog()
+            self.numEntries = len(self._idxMap) // IndexRecord.size
+
+    def _closeIndexMap(self):
+        """Close the memory map of the index, if any"""
+        if isinstance(self._idxMap, mmap.mmap):
+            self._idxMap.close()
+        self._idxMap = None
+
+    def _isLastIndexRecordValid(self):
+        """Return True if the last index record refers to a complete log entry with the same entry number
+
+        Entry numbers increase through the log file, so if the last index record is valid
+        then so are the others.
+        """
+        seq, taiSec, offset = self.getIndexRecord(self.numEntries - 1)
+        self._logFile.seek(offset)
+        headerData = self._logFile.read(RecordHeader.size)
+        if len(headerData) != RecordHeader.size:
+            return False
+        recLen, recSeq = RecordHeader.unpack(headerData)[0:2]
+        return recSeq == seq and offset + recLen <= os.fstat(self._logFile.fileno()).st_size
+
+    def _readIndexFromLog(self):
+        """Read every complete entry in the log file; return the index records as a str
+        """
+        logSize = os.fstat(self._logFile.fileno()).st_size
+        indexList = []
+        offset = len(LogMagic)
+        while offset + RecordHeader.size <= logSize:
+            self._logFile.seek(offset)
+            recLen, seq, unixTime, taiSec = RecordHeader.unpack(self._logFile.read(RecordHeader.size))[0:4]
+            if recLen < RecordHeader.size or offset + recLen > logSize:
+                break
+            indexList.append(IndexRecord.pack(seq, taiSec, offset))
+            offset += recLen
+        return "".join(indexList)
+
+
+class LogArchiveReader(object):
+    """Read log entries from an archive
+
+    Seeking by entry number or TAI bisects the segments and then the memory-mapped index of one segment,
+    so it is O(log n) and does not read the log files.
+
+    Call refresh to see entries added since the reader was created (or last refreshed).
+    """
+    def __init__(self, archiveDir):
+        """Create a LogArchiveReader
+
+        Inputs:
+        - archiveDir: archive directory
+
+        Raise RuntimeError if archiveDir is not a directory.
+        """
+        if not os.path.isdir(archiveDir):
+            raise RuntimeError("log archive directory %r not found" % (archiveDir,))
+        self.archiveDir = archiveDir
+        self._segmentDict = {} # dict of segment name: _Segment (including empty segments)
+        self._segmentList = [] # nonempty segments, in order
+        self.refresh()
+
+    def close(self):
+        """Close all files"""
+        for segment in self._segmentDict.itervalues():
+            segment.close()
+        self._segmentDict = {}
+        self._segmentList = []
+
+    @property
+    def firstSeq(self):
+        """Entry number of the oldest archived entry (0 if none)"""
+        if not self._segmentList:
+            return 0
+        return self._segmentList[0].firstSeq
+
+    @property
+    def nextSeq(self):
+        """Entry number after that of the newest archived entry (0 if none)"""
+        if not self._segmentList:
+            return 0
+        return self._segmentList[-1].lastSeq + 1
+
+    def findSeq(self, seq):
+        """Return the archive entry number of the oldest entry with entry number >= seq,
+        or nextSeq if there is no such entry
+        """
+        segInd, ind = self._findPos(seq, isTAI=False)
+        return self._getSeqAtPos(segInd, ind)
+
+    def findTAI(self, taiSec):
+        """Return the archive entry number of the oldest entry logged at or after taiSec (Python seconds),
+        or nextSeq if there is no such entry
+        """
+        segInd, ind = self._findPos(taiSec, isTAI=True)
+        return self._getSeqAtPos(segInd, ind)
+
+    def getEntry(self, seq):
+        """Return the entry with archive entry number seq (an ArchiveEntry)
+
+        Raise IndexError if there is no such entry (e.g. it was removed by compaction).
+        """
+        segInd, ind = self._findPos(seq, isTAI=False)
+        if segInd >= len(self._segmentList) or self._segmentList[segInd].getIndexRecord(ind)[0] != seq:
+            raise IndexError("archive entry %s not found" % (seq,))
+        return self._segmentList[segInd].readEntry(ind)
+
+    def getEntries(self, startSeq, maxEntries):
+        """Return a list of up to maxEntries entries (ArchiveEntry objects)
+        starting with the oldest entry whose entry number >= startSeq
+        """
+        retList = []
+        for entry in self.iterEntries(startSeq=startSeq):
+            if len(retList) >= maxEntries:
+                break
+            retList.append(entry)
+        return retList
+
+    def iterEntries(self, startSeq=None, startTAI=None, endTAI=None):
+        """Iterate over entries (ArchiveEntry objects), oldest first
+
+        Inputs:
+        - startSeq: archive entry number at which to start; if None then start at startTAI
+        - startTAI: TAI (Python seconds) at which to start; ignored if startSeq is not None;
+            if startSeq and startTAI are both None then start with the oldest entry
+        - endTAI: stop before the first entry logged at or after this TAI; if None then continue to the end
+        """
+        if startSeq is not None:
+            segInd, ind = self._findPos(startSeq, isTAI=False)
+        elif startTAI is not None:
+            segInd, ind = self._findPos(startTAI, isTAI=True)
+        else:
+            segInd, ind = 0, 0
+        for segment in self._segmentList[segInd:]:
+            for entryInd in xrange(ind, segment.numEntries):
+                if endTAI is not None and segment.getIndexRecord(entryInd)[1] >= endTAI:
+                    return
+                yield segment.readEntry(entryInd)
+            ind = 0
+
+    def search(self, query, startSeq=None, startTAI=None, endTAI=None, maxHits=None):
+        """Return a list of archive entry numbers of entries that match a query, oldest first
+
+        Inputs:
+        - query: an object with a matches(entry) method that returns True if an ArchiveEntry matches,
+            such as a TUI.Models.LogTextIndex.LogQuery
+        - startSeq, startTAI, endTAI: range of entries to search; see iterEntries
+        - maxHits: maximum number of entry numbers to return; if None then no limit
+
+        The archive has no text index, so every entry in the range is read and tested;
+        use startTAI and endTAI (which are found by bisection) to limit the search.
+        """
+        retList = []
+        for entry in self.iterEntries(startSeq=startSeq, startTAI=startTAI, endTAI=endTAI):
+            if query.matches(entry):
+                retList.append(entry.seq)
+                if maxHits is not None and len(retList) >= maxHits:
+                    break
+        return retList
+
+    def refresh(self):
+        """Find new and removed segments and new entries in existing segments
+        """
+        segmentNames = _getSegmentNames(self.archiveDir)
+        nameSet = set(segmentNames)
+        for name in self._segmentDict.keys():
+            if name not in nameSet:
+                self._segmentDict.pop(name).close()
+        for name in segmentNames:
+            segment = self._segmentDict.get(name)
+            try:
+                if segment is None:
+                    self._segmentDict[name] = _Segment(self.archiveDir, name)
+                else:
+                    segment.refresh()
+            except (IOError, OSError):
+                # segment was removed (e.g. by compaction or purge) after it was listed
+                segment = self._segmentDict.pop(name, None)
+                if segment:
+                    segment.close()
+        # ignore segments whose entries are also in an earlier segment;
+        # these are left over from a compaction that was interrupted before they were removed
+        self._segmentList = []
+        for name in segmentNames:
+            segment = self._segmentDict.get(name)
+            if segment is None or segment.numEntries == 0:
+                continue
+            if self._segmentList and segment.firstSeq <= self._segmentList[-1].lastSeq:
+                continue
+            self._segmentList.append(segment)
+
+    def _findPos(self, val, isTAI):
+        """Return (segment index, entry index) of the oldest entry whose entry number (or TAI) >= val
+
+        If there is no such entry then return (len(self._segmentList), 0).
+        """
+        if isTAI:
+            segKeys = [segment.firstTAI for segment in self._segmentList]
+        else:
+            segKeys = [segment.firstSeq for segment in self._segmentList]
+        segInd = max(0, bisect.bisect_right(segKeys, val) - 1)
+        while segInd < len(self._segmentList):
+            segment = self._segmentList[segInd]
+            column = segment.taiColumn if isTAI else segment.seqColumn
+            ind = bisect.bisect_left(column, val)
+            if ind < segment.numEntries:
+                return segInd, ind
+            segInd += 1
+        return len(self._segmentList), 0
+
+    def _getSeqAtPos(self, segInd, ind):
+        """Return the entry number of the entry at a position returned by _findPos"""
+        if segInd >= len(self._segmentList):
+            return self.nextSeq
+        return self._segmentList[segInd].getIndexRecord(ind)[0]
+
+    def __len__(self):
+        return sum(segment.numEntries for segment in self._segmentList)
+
+
+class LogArchiveWriter(object):
+    """Append log entries to an archive
+
+    Data is buffered and written to disk at least every flushInterval seconds (if entries are being added),
+    and when flush or close is called. Index records are only written after the corresponding log entries
+    have been flushed, so readers never see index records for unwritten entries.
+    """
+    def __init__(self,
+        archiveDir,
+        maxSegmentBytes = DefaultMaxSegmentBytes,
+        flushInterval = DefaultFlushInterval,
+        maxNights = None,
+    ):
+        """Create a LogArchiveWriter
+
+        Inputs:
+        - archiveDir: archive directory; created if it does not exist
+        - maxSegmentBytes: maximum size of a segment's log file (bytes); a new segment is started when exceeded
+        - flushInterval: maximum interval between flushes to disk (sec)
+        - maxNights: if not None then each time a new night begins, delete all but the newest maxNights nights
+        """
+        self.archiveDir = os.path.abspath(archiveDir)
+        if not os.path.isdir(self.archiveDir):
+            os.makedirs(self.archiveDir)
+        self.maxSegmentBytes = int(maxSegmentBytes)
+        self.flushInterval = float(flushInterval)
+        self.maxNights = maxNights
+        self.nightName = None
+        self.segmentName = None
+        self._logFile = None
+        self._idxFile = None
+        self._logBytes = 0 # size of the current log file (bytes), including buffered data
+        self._pendingIndexList = [] # index records for entries not yet flushed
+        self._lastFlushTime = time.time()
+
+        reader = LogArchiveReader(self.archiveDir)
+        try:
+            self.nextSeq = reader.nextSeq
+        finally:
+            reader.close()
+
+    def append(self, unixTime, taiSec, severity, actor, cmdr, cmdID, msgStr):
+        """Append a log entry; return its archive entry number
+
+        Inputs are as for TUI.Models.LogSource.LogEntry, plus:
+        - unixTime: unix time at which the entry was logged
+        - taiSec: TAI (Python seconds) at which the entry was logged
+        """
+        nightName = getNightName(taiSec)
+        if nightName != self.nightName or self._logBytes >= self.maxSegmentBytes:
+            self._startSegment(nightName)
+
+        actorData = _toUnicode(actor or "").encode("utf-8")
+        cmdrData = _toUnicode(cmdr or "").encode("utf-8")
+        msgData = _toUnicode(msgStr).encode("utf-8")
+        recLen = RecordHeader.size + len(actorData) + len(cmdrData) + len(msgData)
+        seq = self.nextSeq
+        self._logFile.write(RecordHeader.pack(recLen, seq, unixTime, taiSec, severity, int(cmdID),
+            len(actorData), len(cmdrData), len(msgData)))
+        self._logFile.write(actorData)
+        self._logFile.write(cmdrData)
+        self._logFile.write(msgData)
+        self._pendingIndexList.append(IndexRecord.pack(seq, taiSec, self._logBytes))
+        self._logBytes += recLen
+        self.nextSeq += 1
+
+        if unixTime - self._lastFlushTime >= self.flushInterval:
+            self.flush()
+        return seq
+
+    def close(self):
+        """Flush and close the current segment"""
+        self._closeSegment()
+
+    def compact(self, nightName, minSeverity=None):
+        """Merge all segments for a night into one segment, optionally discarding low-severity entries
+
+        Inputs:
+        - nightName: name of night (YYYY-MM-DD); must not be the night currently being written
+        - minSeverity: if not None then discard entries whose severity < minSeverity
+
+        Entry numbers are retained. The new segment is written to temporary files
+        that then replace the first of the old segments: first the log file, then the index file;
+        the other old segments are then deleted. An interrupted compaction loses no data:
+        readers rebuild an index that does not match its log file and ignore duplicated entries,
+        and compacting the night again finishes the job.
+
+        Return the number of entries in the compacted segment.
+        Raise RuntimeError if nightName is the night being written.
+        """
+        if nightName == self.nightName:
+            raise RuntimeError("cannot compact night %s: it is being written" % (nightName,))
+        segmentNames = [name for name in _getSegmentNames(self.archiveDir)
+            if _splitSegmentName(name)[0] == nightName]
+        if not segmentNames:
+            return 0
+        newName = segmentNames[0]
+        newLogPath = os.path.join(self.archiveDir, newName + LogSuffix)
+        newIdxPath = os.path.join(self.archiveDir, newName + IndexSuffix)
+        tempLogPath = newLogPath + TempSuffix
+        tempIdxPath = newIdxPath + TempSuffix
+
+        numEntries = 0
+        lastSeq = None
+        segments = [_Segment(self.archiveDir, name) for name in segmentNames]
+        try:
+            with open(tempLogPath, "wb") as logFile, open(tempIdxPath, "wb") as idxFile:
+                logFile.write(LogMagic)
+                offset = len(LogMagic)
+                for segment in segments:
+                    for ind in xrange(segment.numEntries):
+                        seq, taiSec = segment.getIndexRecord(ind)[0:2]
+                        if lastSeq is not None and seq <= lastSeq:
+                            # already copied (left over from an interrupted compaction)
+                            continue
+                        lastSeq = seq
+                        severity, recData = segment.readRecordData(ind)
+                        if minSeverity is not None and severity < minSeverity:
+                            continue
+                        logFile.write(recData)
+                        idxFile.write(IndexRecord.pack(seq, taiSec, offset))
+                        offset += len(recData)
+                        numEntries += 1
+        finally:
+            for segment in segments:
+                segment.close()
+
+        os.rename(tempLogPath, newLogPath)
+        os.rename(tempIdxPath, newIdxPath)
+        for name in segmentNames[1:]:
+            self._removeSegment(name)
+        return numEntries
+
+    def flush(self):
+        """Write buffered data to disk"""
+        if self._logFile is None:
+            return
+        self._logFile.flush()
+        if self._pendingIndexList:
+            self._idxFile.write("".join(self._pendingIndexList))
+            self._pendingIndexList = []
+        self._idxFile.flush()
+        self._lastFlushTime = time.time()
+
+    def purge(self, maxNights):
+        """Delete all but the newest maxNights nights (never deleting the night being written)
+
+        Return a list of the names of nights deleted.
+        """
+        nightNames = sorted(set(_splitSegmentName(name)[0] for name in _getSegmentNames(self.archiveDir)))
+        purgeNights = [night for night in nightNames[0:max(0, len(nightNames) - maxNights)]
+            if night != self.nightName]
+        purgeSet = set(purgeNights)
+        for name in _getSegmentNames(self.archiveDir):
+            if _splitSegmentName(name)[0] in purgeSet:
+                self._removeSegment(name)
+        return purgeNights
+
+    def rotate(self):
+        """Start a new segment (for the current night)"""
+        if self.nightName is not None:
+            self._startSegment(self.nightName)
+
+    def _closeSegment(self):
+        """Flush and close the current segment, if any"""
+        if self._logFile is None:
+            return
+        self.flush()
+        self._logFile.close()
+        self._idxFile.close()
+        self._logFile = None
+        self._idxFile = None
+        self.segmentName = None
+
+    def _removeSegment(self, name):
+        """Delete the files of a segment"""
+        for suffix in (LogSuffix, IndexSuffix):
+            path = os.path.join(self.archiveDir, name + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _startSegment(self, nightName):
+        """Close the current segment (if any) and start a new one for the specified night
+        """
+        self._closeSegment()
+        isNewNight = nightName != self.nightName
+        parts = [_splitSegmentName(name)[1] for name in _getSegmentNames(self.archiveDir)
+            if _splitSegmentName(name)[0] == nightName]
+        part = max(parts) + 1 if parts else 0
+        if part > 999:
+            raise RuntimeError("too many segments for night %s" % (nightName,))
+        self.nightName = nightName
+        self.segmentName = "%s_%03d" % (nightName, part)
+        self._logFile = open(os.path.join(self.archiveDir, self.segmentName + LogSuffix), "wb")
+        self._idxFile = open(os.path.join(self.archiveDir, self.segmentName + IndexSuffix), "wb")
+        self._logFile.write(LogMagic)
+        self._logBytes = len(LogMagic)
+        if isNewNight and self.maxNights is not None:
+            self.purge(self.maxNights)
+
+
+if __name__ == "__main__":
+    import calendar
+    import shutil
+    import tempfile
+
+    archiveDir = tempfile.mkdtemp()
+    try:
+        writer = LogArchiveWriter(archiveDir, maxSegmentBytes=2000)
+        startTAI = calendar.timegm((2026, 10, 18, 12, 0, 0, 0, 0, 0))
+        for i in range(200):
+            taiSec = startTAI + (i * 600) # 10 minutes apart, spanning two nights
+            writer.append(taiSec, taiSec, i % 3 - 1, "tcc", "apo.joe", i, "entry %d" % (i,))
+        writer.close()
+
+        reader = LogArchiveReader(archiveDir)
+        print "%d entries in %d segments" % (len(reader), len(reader._segmentList))
+        print "entry 57 =", reader.getEntry(57)
+        seq = reader.findTAI(startTAI + 6000)
+        print "first entry at or after startTAI + 6000 sec is", seq, reader.getEntry(seq).getStr(),
+        reader.close()
+
+        # save the old index of the first segment of the night and the files of the second
+        nightNames = [name for name in _getSegmentNames(archiveDir) if name.startswith("2026-10-18")]
+        savedDict = dict()
+        for path in [os.path.join(archiveDir, nightNames[0] + IndexSuffix)] \
+            + [os.path.join(archiveDir, nightNames[1] + suffix) for suffix in (LogSuffix, IndexSuffix)]:
+            with open(path, "rb") as f:
+                savedDict[path] = f.read()
+
+        writer = LogArchiveWriter(archiveDir)
+        print "compacted night 2026-10-18 to %d entries" % (writer.compact("2026-10-18", minSeverity=0),)
+        writer.close()
+        reader = LogArchiveReader(archiveDir)
+        print "%d entries in %d segments; entries 0-4 =" % (len(reader), len(reader._segmentList))
+        for entry in reader.getEntries(0, 4):
+            print entry
+        compactedSeqs = [entry.seq for entry in reader.iterEntries()]
+
+        # restore the saved files, as if compaction had been interrupted after replacing the first log file
+        for path, data in savedDict.iteritems():
+            with open(path, "wb") as f:
+                f.write(data)
+        reader.refresh()
+        if [entry.seq for entry in reader.iterEntries()] != compactedSeqs:
+            print "Error: interrupted compaction not handled by the reader"
+        reader.close()
+        writer = LogArchiveWriter(archiveDir)
+        writer.compact("2026-10-18", minSeverity=0)
+        writer.close()
+        reader = LogArchiveReader(archiveDir)
+        if [entry.seq for entry in reader.iterEntries()] != compactedSeqs:
+            print "Error: interrupted compaction not finished by compacting again"
+        reader.close()
+    finally:
+        shutil.rmtree(archiveDir)
@@ -0,0 +1,136 @@
+"""Shared cache of log filter results
+
+Log windows often use the same filter settings. Rather than have each window test every log entry
+against its own copy of the filter, a window asks the FilterCache for the entry numbers
+that match a filter, identified by a canonical filter key (any hashable object that
+fully describes the filter, e.g. ("severity", 0)).
+
+Each cached result is a sorted list of matching entry numbers plus the newest entry number tested.
+Results are updated incrementally when queried: newly appended entries are tested
+and discarded entries are trimmed, so an update costs O(new entries), not O(history).
+A filter's candidate entry numbers (e.g. from TUI.Models.LogIndex) are only used
+when its result is computed from scratch. The least recently used results are dropped when
+more than maxResults filters are cached.
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import bisect
+import collections
+
+__all__ = ["FilterCache"]
+
+DefaultMaxResults = 20
+
+class _FilterResult(object):
+    """The cached result of one filter
+    """
+    __slots__ = ("filterFunc", "getCandidateSeqs", "seqList", "lastSeq")
+
+    def __init__(self, filterFunc, getCandidateSeqs):
+        self.filterFunc = filterFunc
+        self.getCandidateSeqs = getCandidateSeqs
+        self.seqList = [] # sorted entry numbers of matching entries
+        self.lastSeq = -1 # entry number of newest entry tested
+
+
+class FilterCache(object):
+    """Cache of log filter results, shared by all log windows
+
+    Fields include:
+    - numHits: number of queries answered from an existing result (which may have been updated)
+    - numMisses: number of queries that required testing all entries
+    - numTested: number of entries tested by filter functions
+    """
+    def __init__(self, entryList, maxResults=DefaultMaxResults):
+        """Create a FilterCache
+
+        Inputs:
+        - entryList: the log entries (a TUI.Models.LogStore.LogStore)
+        - maxResults: maximum number of filter results to cache
+        """
+        self.entryList = entryList
+        self.maxResults = int(maxResults)
+        if self.maxResults < 1:
+            raise RuntimeError("maxResults=%r must be >= 1" % (maxResults,))
+        self._resultDict = collections.OrderedDict() # filter key: _FilterResult, least recently used first
+        self.resetStats()
+
+    def clear(self):
+        """Discard all cached results"""
+        self._resultDict.clear()
+
+    def getSeqs(self, filterKey, filterFunc, getCandidateSeqs=None, minSeq=None):
+        """Return a sorted list of entry numbers of the log entries that match a filter
+
+        Inputs:
+        - filterKey: canonical key for the filter; filters with equal keys must accept the same entries
+        - filterFunc: filter function: takes a log entry and returns True if it matches;
+            only used if the result for filterKey is not cached
+        - getCandidateSeqs: a function that takes no arguments and returns a sorted list of entry numbers
+            that includes every entry filterFunc accepts (it may include others), or None to test all entries;
+            only used if the result for filterKey is not cached, and then only to compute the result
+            from scratch (incremental updates test the new entries directly)
+        - minSeq: if not None then only return entry numbers >= minSeq
+        """
+        result = self._resultDict.pop(filterKey, None)
+        if result is None:
+            self.numMisses += 1
+            result = _FilterResult(filterFunc, getCandidateSeqs)
+        else:
+            self.numHits += 1
+        self._resultDict[filterKey] = result
+        while len(self._resultDict) > self.maxResults:
+            self._resultDict.popitem(last=False)
+
+        self._updateResult(result)
+        if minSeq is None:
+            return result.seqList[:]
+        return result.seqList[bisect.bisect_left(result.seqList, minSeq):]
+
+    def resetStats(self):
+        """Reset numHits, numMisses and numTested to 0"""
+        self.numHits = 0
+        self.numMisses = 0
+        self.numTested = 0
+
+    def _updateResult(self, result):
+        """Bring a result up to date: forget discarded entries and test new ones
+        """
+        entryList = self.entryList
+        firstSeq = entryList.firstSeq
+        if result.seqList and result.seqList[0] < firstSeq:
+            del result.seqList[0:bisect.bisect_left(result.seqList, firstSeq)]
+
+        startSeq = max(result.lastSeq + 1, firstSeq)
+        endSeq = entryList.nextSeq
+        if startSeq >= endSeq:
+            return
+        if result.getCandidateSeqs is None or result.lastSeq >= firstSeq:
+            # test the new entries directly; getting candidates costs O(history)
+            seqIter = xrange(startSeq, endSeq)
+        else:
+            candidateSeqs = result.getCandidateSeqs()
+            seqIter = candidateSeqs[bisect.bisect_left(candidateSeqs, startSeq):]
+        # accumulate new matches separately so the result is unchanged if filterFunc raises an exception
+        filterFunc = result.filterFunc
+        newSeqList = []
+        numTested = 0
+        for seq in seqIter:
+            if seq >= endSeq:
+                break
+            numTested += 1
+            if filterFunc(entryList.getEntry(seq)):
+                newSeqList.append(seq)
+        self.numTested += numTested
+        result.seqList += newSeqList
+        result.lastSeq = endSeq - 1
+
+    def __len__(self):
+        return len(self._resultDict)
+
+    def __str__(self):
+        return "FilterCache(%d results; %d hits, %d misses; %d entries tested)" % \
+            (len(self._resultDict), self.numHits, self.numMisses, self.numTested)
@@ -0,0 +1,198 @@
+"""Secondary indexes for log entries
+
+LogIndex keeps a posting list (an increasing list of entry numbers) for each actor, commander,
+severity and (commander, command ID), so that log windows can find matching entries
+without testing every entry in TUI.Models.LogSource.
+
+Entry numbers are those assigned by TUI.Models.LogStore.LogStore.
+Posting lists are trimmed as old entries are discarded from the log.
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import array
+import bisect
+import heapq
+
+__all__ = ["LogIndex", "PostingList", "intersectSeqs", "unionSeqs"]
+
+# number of discarded entries between full sweeps of all posting lists
+DefaultTrimInterval = 5000
+
+class PostingList(object):
+    """An increasing list of entry numbers that can be trimmed from the front
+    """
+    __slots__ = ("_seqArr", "_start")
+
+    def __init__(self, typeCode="l"):
+        """Create a PostingList
+
+        Inputs:
+        - typeCode: array type code for entry numbers; use "i" to save memory
+            if entry numbers will never exceed 2**31 - 1
+        """
+        self._seqArr = array.array(typeCode)
+        self._start = 0 # index of first valid item in _seqArr
+
+    def append(self, seq):
+        """Append an entry number; it must be larger than any already in the list"""
+        if self._seqArr and self._seqArr[-1] >= seq:
+            return
+        self._seqArr.append(seq)
+
+    def getSeqs(self, minSeq):
+        """Return a list of entry numbers >= minSeq"""
+        start = bisect.bisect_left(self._seqArr, minSeq, self._start)
+        return self._seqArr[start:].tolist()
+
+    def trim(self, minSeq):
+        """Discard entry numbers < minSeq"""
+        self._start = bisect.bisect_left(self._seqArr, minSeq, self._start)
+        if self._start > len(self._seqArr) // 2:
+            # compact; this is amortized O(1) per discarded entry
+            del self._seqArr[0:self._start]
+            self._start = 0
+
+    def __len__(self):
+        return len(self._seqArr) - self._start
+
+
+class LogIndex(object):
+    """Posting-list indexes of log entries by actor, commander, severity and (commander, command ID)
+
+    Commands synthesized from cmds.CmdQueued and cmds.CmdDone (entries with a cmdInfo)
+    are indexed under the actor of the command as well as the actor of the entry.
+    """
+    def __init__(self, trimInterval=DefaultTrimInterval):
+        """Create a LogIndex
+
+        Inputs:
+        - trimInterval: number of discarded entries between full trims of all posting lists
+            (queries always ignore discarded entries; trimming only frees memory)
+        """
+        self.trimInterval = int(trimInterval)
+        self._actorDict = {}
+        self._cmdrDict = {}
+        self._severityDict = {}
+        self._cmdDict = {}
+        self._minSeq = 0
+        self._lastTrimSeq = 0
+
+    def addEntry(self, seq, actor, cmdr, severity, cmdID, cmdInfo=None):
+        """Add an entry to the indexes
+
+        Inputs:
+        - seq: entry number; must be larger than that of any previously added entry
+        - actor, cmdr, severity, cmdID, cmdInfo: fields of the log entry;
+            see TUI.Models.LogSource.LogEntry
+        """
+        self._getPostingList(self._actorDict, actor).append(seq)
+        if cmdInfo is not None and cmdInfo.actor != actor:
+            self._getPostingList(self._actorDict, cmdInfo.actor).append(seq)
+        self._getPostingList(self._cmdrDict, cmdr).append(seq)
+        self._getPostingList(self._severityDict, severity).append(seq)
+        self._getPostingList(self._cmdDict, (cmdr, int(cmdID))).append(seq)
+
+    def clear(self):
+        """Remove all entries from the indexes"""
+        for postingDict in (self._actorDict, self._cmdrDict, self._severityDict, self._cmdDict):
+            postingDict.clear()
+
+    def getActors(self):
+        """Return a list of all actors in the index (including some whose entries may all be discarded)"""
+        return self._actorDict.keys()
+
+    def getCmdrs(self):
+        """Return a list of all commanders in the index (including some whose entries may all be discarded)"""
+        return self._cmdrDict.keys()
+
+    def getSeqsByActors(self, actors):
+        """Return a sorted list of entry numbers for entries from or to any of the specified actors"""
+        return self._getUnion(self._actorDict, actors)
+
+    def getSeqsByCmd(self, cmdr, cmdID):
+        """Return a sorted list of entry numbers for a given commander and command ID"""
+        return self._getUnion(self._cmdDict, [(cmdr, int(cmdID))])
+
+    def getSeqsByCmdrs(self, cmdrs):
+        """Return a sorted list of entry numbers for entries from any of the specified commanders"""
+        return self._getUnion(self._cmdrDict, cmdrs)
+
+    def getSeqsByMinSeverity(self, minSeverity):
+        """Return a sorted list of entry numbers for entries with severity >= minSeverity"""
+        severities = [sev for sev in self._severityDict.iterkeys() if sev >= minSeverity]
+        return self._getUnion(self._severityDict, severities)
+
+    def trim(self, minSeq):
+        """Note that entries with entry number < minSeq have been discarded
+
+        Queries ignore those entries immediately; posting lists are trimmed
+        once every trimInterval discarded entries, and empty lists are deleted.
+        """
+        self._minSeq = max(self._minSeq, minSeq)
+        if self._minSeq - self._lastTrimSeq < self.trimInterval:
+            return
+        self._lastTrimSeq = self._minSeq
+        for postingDict in (self._actorDict, self._cmdrDict, self._severityDict, self._cmdDict):
+            for key, postingList in postingDict.items():
+                postingList.trim(self._minSeq)
+                if not postingList:
+                    del postingDict[key]
+
+    def _getPostingList(self, postingDict, key):
+        """Return the posting list for a given key, creating it if necessary"""
+        postingList = postingDict.get(key)
+        if postingList is None:
+            postingList = PostingList()
+            postingDict[key] = postingList
+        return postingList
+
+    def _getUnion(self, postingDict, keys):
+        """Return a sorted list of entry numbers in any of the posting lists for the specified keys"""
+        seqLists = []
+        for key in keys:
+            postingList = postingDict.get(key)
+            if postingList:
+                seqLists.append(postingList.getSeqs(self._minSeq))
+        return unionSeqs(seqLists)
+
+
+def intersectSeqs(seqListA, seqListB):
+    """Return a sorted list of the entry numbers in both of two sorted lists
+    """
+    if len(seqListA) > len(seqListB):
+        seqListA, seqListB = seqListB, seqListA
+    if not seqListA:
+        return []
+    if len(seqListB) > 8 * len(seqListA):
+        # one list is much shorter; bisect into the longer list
+        retList = []
+        start = 0
+        for seq in seqListA:
+            start = bisect.bisect_left(seqListB, seq, start)
+            if start >= len(seqListB):
+                break
+            if seqListB[start] == seq:
+                retList.append(seq)
+        return retList
+    setB = set(seqListB)
+    return [seq for seq in seqListA if seq in setB]
+
+def unionSeqs(seqLists):
+    """Return a sorted list of the entry numbers in any of a collection of sorted lists
+    (entry numbers that appear in more than one list are only returned once)
+    """
+    seqLists = [seqList for seqList in seqLists if seqList]
+    if not seqLists:
+        return []
+    if len(seqLists) == 1:
+        return list(seqLists[0])
+    retList = []
+    lastSeq = None
+    for seq in heapq.merge(*seqLists):
+        if seq != lastSeq:
+            retList.append(seq)
+            lastSeq = seq
+    return retList
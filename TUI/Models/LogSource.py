@@ -20,22 +20,53 @@ History:
 2014-03-24 ROwen    Implemented enhancement request #2020 by increasing maxEntries from 40000 to 100000.
 2015-09-22 ROwen    Added __repr__ to LogEntry, for debugging purposes .
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Store entries in a compact columnar ring buffer (TUI.Models.LogStore) instead of a deque
+                    of LogEntry objects; entryList and lastEntry now hold LogEntryView objects.
+                    Parsed keywords are no longer retained; LogEntryView.keywords re-parses msgStr on demand.
+                    Added index field: posting-list indexes by actor, cmdr, severity and (cmdr, cmdID)
+                    (a TUI.Models.LogIndex.LogIndex), and method getEntries.
+                    Added batched delivery of new entries: see addBatchCallback, batchInterval and batchStats.
+                    Added filterCache field: filter results shared by all log windows
+                    (a TUI.Models.LogFilterCache.FilterCache).
+                    Added optional on-disk archive of all log entries: see startArchive, stopArchive,
+                    getArchiveReader and TUI.Models.LogArchive.
+                    Added textIndex field: a full-text index of log messages, and method search.
+                    LogEntry stores TAI as a float (taiSec) and formats taiTimeStr on demand.
+                    getTAISec uses a cached clock correction; call updateTAIOffset when the clock correction changes.
+                    Replaced cmdDict with cmdTracker: a bounded tracker of running commands that also keeps
+                    command latency statistics per actor and verb (a TUI.Models.CmdTracker.CmdTracker).
+                    CmdDone is logged for commands the tracker dropped (e.g. after its timeout)
+                    if it remembers them (see CmdTracker).
 """
+import os
+import sys
 import time
-import collections
+import traceback
 
 import opscore.protocols.messages
+import opscore.protocols.parser
 import opscore.actor.keyvar
+import opscore.utility.timer
 import RO.AddCallback
 import RO.Astro.Tm
 import RO.Constants
 import TUI.Models
 import TUI.Version
+import CmdTracker
+import LogArchive
+import LogFilterCache
+import LogIndex
+import LogStore
+import LogTextIndex
 
-__all__ = ["LogEntry", "LogSource"]
+__all__ = ["BatchStats", "LogEntry", "LogSource", "getTAISec", "updateTAIOffset"]
 
 DefaultMaxEntries = 50000 # default # of max entries in LogSource
 
+# TAI - unix time (sec), including the correction for any known error in the computer's clock;
+# None until first needed; see getTAISec and updateTAIOffset
+_TAIOffset = None
+
 class CmdInfo(object):
     """Data for synthesized command messages
     """
@@ -75,12 +106,66 @@ class CmdInfo(object):
         return "%s %d %s %s" % (self.cmdr, self.cmdID, self.actor, self.cmdStr)
 
 
+class BatchStats(object):
+    """Statistics for batched delivery of log entries (see LogSource.addBatchCallback)
+
+    Fields:
+    - numBatches: number of batches delivered
+    - numEntries: number of entries delivered
+    - maxBatchSize: maximum number of entries in one batch
+    - totLatency: sum over all batches of the delay (sec) added by batching to the oldest entry in the batch
+    - maxLatency: maximum delay (sec) added by batching
+    """
+    def __init__(self):
+        self.reset()
+
+    def addBatch(self, batchSize, latency):
+        """Record delivery of one batch
+
+        Inputs:
+        - batchSize: number of entries in the batch
+        - latency: delay (sec) between logging the oldest entry in the batch and delivering the batch
+        """
+        self.numBatches += 1
+        self.numEntries += batchSize
+        self.maxBatchSize = max(self.maxBatchSize, batchSize)
+        self.totLatency += latency
+        self.maxLatency = max(self.maxLatency, latency)
+
+    @property
+    def meanBatchSize(self):
+        """Mean number of entries per batch (0 if no batches)"""
+        if self.numBatches == 0:
+            return 0.0
+        return self.numEntries / float(self.numBatches)
+
+    @property
+    def meanLatency(self):
+        """Mean delay (sec) added by batching to the oldest entry of each batch (0 if no batches)"""
+        if self.numBatches == 0:
+            return 0.0
+        return self.totLatency / self.numBatches
+
+    def reset(self):
+        """Reset all statistics to 0"""
+        self.numBatches = 0
+        self.numEntries = 0
+        self.maxBatchSize = 0
+        self.totLatency = 0.0
+        self.maxLatency = 0.0
+
+    def __str__(self):
+        return "%d batches, %d entries; batch size mean=%0.1f, max=%d; latency mean=%0.3f, max=%0.3f sec" % \
+            (self.numBatches, self.numEntries, self.meanBatchSize, self.maxBatchSize, self.meanLatency, self.maxLatency)
+
+
 class LogEntry(object):
     """Data for one log entry
 
     Fields include:
     - unixTime: date (unix seconds) that LogEntry was created
-    - taiTimeStr: TAI time as a string HH:MM:SS at which LogEntry was created
+    - taiSec: TAI (Python seconds) at which LogEntry was created
+    - taiTimeStr: TAI time as a string HH:MM:SS at which LogEntry was created (computed on demand)
     - msgStr: the message string
     - actor: actor who sent the reply or to whom the command was sent
     - severity: one of the RO.Constants.sevX constants
@@ -101,9 +186,7 @@ class LogEntry(object):
         cmdInfo = None,
     ):
         self.unixTime = time.time()
-        currPythonSeconds = RO.Astro.Tm.getCurrPySec(self.unixTime)
-        currTAITuple= time.gmtime(currPythonSeconds - RO.Astro.Tm.getUTCMinusTAI())
-        self.taiTimeStr = time.strftime("%H:%M:%S", currTAITuple)
+        self.taiSec = getTAISec(self.unixTime)
         self.msgStr = msgStr
         self.actor = actor
         self.severity = severity
@@ -114,6 +197,10 @@ class LogEntry(object):
         self.cmdInfo = cmdInfo
         self.isKeys = self.actor.startswith("keys") or (self.cmdInfo and self.cmdInfo.actor.startswith("keys"))
 
+    @property
+    def taiTimeStr(self):
+        return LogStore.getTimeStr(self.taiSec)
+
     def getStr(self):
         """Return log entry formatted for log window
         """
@@ -124,6 +211,26 @@ class LogEntry(object):
             (self.msgStr, self.severity, self.actor, self.cmdr, self.cmdID, self.keywords, self.tags, self.cmdInfo)
 
 
+def getTAISec(unixTime):
+    """Return TAI as Python seconds (suitable for time.gmtime) for a given unix time,
+    corrected for any known error in the computer's clock.
+
+    Uses a cached correction, which is computed when first needed and by updateTAIOffset.
+    """
+    if _TAIOffset is None:
+        updateTAIOffset()
+    return unixTime + _TAIOffset
+
+def updateTAIOffset():
+    """Update the cached correction used by getTAISec
+
+    Call this whenever RO.Astro.Tm.setClockError or RO.Astro.Tm.setUTCMinusTAI is called.
+    """
+    global _TAIOffset
+    unixTime = time.time()
+    _TAIOffset = RO.Astro.Tm.getCurrPySec(unixTime) - unixTime - RO.Astro.Tm.getUTCMinusTAI()
+
+
 class LogSource(RO.AddCallback.BaseMixin):
     """Repository of messages from the dispatcher, designed for logging. A singleton.
 
@@ -131,22 +238,43 @@ class LogSource(RO.AddCallback.BaseMixin):
     - addCallback(func, callNow): register a callback function;
       whenever a log entry is added the function will be called with this LogSource as the sole argument
 
+    Also supports batched callbacks, which are more efficient when messages arrive in bursts:
+    - addBatchCallback(func): register a batch callback function;
+      it will be called with a list of new log entries (LogEntryView objects) at most once per batchInterval
+
     Useful attributes:
-    - entryList: an ordered collection of LogEntry objects
-    - lastEntry: the last entry added; None until the first entry is added
+    - entryList: an ordered collection of log entries (a TUI.Models.LogStore.LogStore);
+        iterating over it or indexing it returns TUI.Models.LogStore.LogEntryView objects,
+        which have the same fields as LogEntry but are only valid until the entry is discarded
+    - lastEntry: the last entry added (a LogEntryView); None until the first entry is added
+    - index: indexes of the entries in entryList by actor, cmdr, severity and (cmdr, cmdID)
+        (a TUI.Models.LogIndex.LogIndex); its queries return sorted entry numbers;
+        use getEntries to convert these to log entries
+    - textIndex: full-text index of the messages in entryList (a TUI.Models.LogTextIndex.TextIndex);
+        use search to query it
+    - filterCache: cache of filter results, keyed by canonical filter description and shared by
+        all log windows (a TUI.Models.LogFilterCache.FilterCache); see its numHits and numMisses fields
+    - batchInterval: minimum interval between calls to batch callback functions (sec);
+        if 0 then each new entry is delivered immediately as a batch of one; set using setBatchInterval
+    - batchStats: statistics about batched delivery (a BatchStats)
+    - cmdTracker: tracker of running commands, with latency statistics per actor and command verb
+        (a TUI.Models.CmdTracker.CmdTracker)
+    - archive: writer for the on-disk archive of all log entries (a TUI.Models.LogArchive.LogArchiveWriter),
+        or None if not archiving; see startArchive
 
     Each LogEntry has the following tags:
     - act_<LogEntry.actor>
     - cmdr_<LogEntry.cmdr>
     """
-    ActorTagPrefix = "act_"
-    CmdrTagPrefix = "cmdr_"
-    def __new__(cls, dispatcher, maxEntries=DefaultMaxEntries):
+    ActorTagPrefix = LogStore.ActorTagPrefix
+    CmdrTagPrefix = LogStore.CmdrTagPrefix
+    def __new__(cls, dispatcher, maxEntries=DefaultMaxEntries, batchInterval=0):
         """Construct the singleton LogSource if not already constructed
 
         Inputs:
         - dispatcher: message dispatcher; an instance of opscore.actor.cmdkeydispatcher.CmdKeyVarDispatcher
         - maxEntries: the maximum number of entries saved (older entries are removed)
+        - batchInterval: minimum interval between calls to batch callback functions (sec)
         """
         if hasattr(cls, 'self'):
             return cls.self
@@ -155,10 +283,22 @@ class LogSource(RO.AddCallback.BaseMixin):
         self = cls.self
 
         RO.AddCallback.BaseMixin.__init__(self)
-        self.entryList = collections.deque()
-        # dictionary of hub unique command ID: CmdInfo
-        # used to keep track of running commands so I can turn cmds.CmdDone into real information
-        self.cmdDict = {}
+        self._replyParser = opscore.protocols.parser.ReplyParser()
+        self.entryList = LogStore.LogStore(maxEntries, keywordsFunc=self._parseKeywords)
+        self.index = LogIndex.LogIndex()
+        self.textIndex = LogTextIndex.TextIndex()
+        self.filterCache = LogFilterCache.FilterCache(self.entryList)
+        self.batchInterval = 0.0
+        self.setBatchInterval(batchInterval)
+        self.batchStats = BatchStats()
+        self._batchFuncList = []
+        # entry numbers of entries not yet delivered to batch callback functions
+        self._pendingSeqList = []
+        self._pendingStartTime = 0.0 # time at which the first pending entry was logged
+        self._batchTimer = opscore.utility.timer.Timer()
+        self.archive = None
+        # tracks running commands so I can turn cmds.CmdDone into real information, and records latencies
+        self.cmdTracker = CmdTracker.CmdTracker()
         self.lastEntry = None
         self.maxEntries = int(maxEntries)
         self.dispatcher = dispatcher
@@ -174,18 +314,19 @@ class LogSource(RO.AddCallback.BaseMixin):
     def _cmdDoneCallback(self, keyVar):
         """Handle cmds cmdDone keyword
 
-        Delete self.cmdDict entry (if present) and create a CmdDone log entry with cmdInfo.
+        Stop tracking the command (if tracked) and create a CmdDone log entry with cmdInfo.
+        Commands recently dropped by the tracker (e.g. by CmdTracker.sweep) are still logged;
+        commands that were never tracked are ignored.
         """
         if None in keyVar:
             return
-        cmdInfo = self.cmdDict.pop(keyVar[0], None)
-        if not cmdInfo:
-            return
-
         completionCode = keyVar[1]
         if completionCode is not None:
             completionCode = completionCode.upper()
         severity = opscore.actor.keyvar.MsgCodeSeverity.get(completionCode, RO.Constants.sevWarning)
+        cmdInfo = self.cmdTracker.cmdDone(keyVar[0], didFail=(severity >= RO.Constants.sevError))[0]
+        if not cmdInfo:
+            return
 
         self.logMsg(
             msgStr = "CmdDone: %s" % (cmdInfo,),
@@ -199,7 +340,7 @@ class LogSource(RO.AddCallback.BaseMixin):
     def _cmdQueuedCallback(self, keyVar):
         """Handle cmds cmdQueued keyword
 
-        Create a self.cmdDict entry and a CmdStarted log entry with cmdInfo.
+        Start tracking the command and create a CmdStarted log entry with cmdInfo.
         """
         if None in keyVar:
             return
@@ -212,7 +353,7 @@ class LogSource(RO.AddCallback.BaseMixin):
             myCmdr = self.dispatcher.connection.getCmdr(),
         )
 
-        self.cmdDict[cmdInfo.uniqueCmdID] = cmdInfo
+        self.cmdTracker.cmdQueued(cmdInfo)
         self.logMsg(
             msgStr = "CmdStarted: %s" % (cmdInfo,),
             severity = RO.Constants.sevNormal,
@@ -222,6 +363,100 @@ class LogSource(RO.AddCallback.BaseMixin):
             cmdInfo = cmdInfo,
         )
 
+    def addBatchCallback(self, func):
+        """Register a function to be called with new log entries
+
+        Inputs:
+        - func: a function that takes one argument: a list of new log entries (LogEntryView objects),
+            oldest first; it is called at most once every batchInterval seconds
+        """
+        if func not in self._batchFuncList:
+            self._batchFuncList.append(func)
+
+    def removeBatchCallback(self, func, doRaise=True):
+        """Remove a batch callback function
+
+        Inputs:
+        - func: function to remove
+        - doRaise: if True, raise ValueError if func is not registered
+
+        Return True if func was removed, False otherwise
+        """
+        if func in self._batchFuncList:
+            self._batchFuncList.remove(func)
+            if not self._batchFuncList:
+                self._batchTimer.cancel()
+                self._pendingSeqList = []
+            return True
+        if doRaise:
+            raise ValueError("Batch callback %r not found" % (func,))
+        return False
+
+    def startArchive(self, archiveDir, maxNights=None):
+        """Start appending all log entries to an on-disk archive (see TUI.Models.LogArchive)
+
+        Inputs:
+        - archiveDir: archive directory; created if it does not exist
+        - maxNights: if not None then delete all but the newest maxNights nights as each new night begins
+
+        If already archiving to archiveDir then just update maxNights, else stop archiving first.
+        """
+        archiveDir = os.path.abspath(archiveDir)
+        if self.archive:
+            if self.archive.archiveDir == archiveDir:
+                self.archive.maxNights = maxNights
+                return
+            self.stopArchive()
+        self.archive = LogArchive.LogArchiveWriter(archiveDir, maxNights=maxNights)
+
+    def stopArchive(self):
+        """Stop archiving log entries (if archiving)"""
+        archive, self.archive = self.archive, None
+        if archive:
+            archive.close()
+
+    def search(self, query):
+        """Return a sorted list of entry numbers of log entries that match a query
+
+        Inputs:
+        - query: a query string (see TUI.Models.LogTextIndex for the syntax)
+            or a parsed query (a TUI.Models.LogTextIndex.LogQuery)
+
+        Raise RuntimeError if the query string is invalid.
+        To search the on-disk archive use getArchiveReader().search(LogTextIndex.LogQuery(queryStr)).
+        """
+        if not isinstance(query, LogTextIndex.LogQuery):
+            query = LogTextIndex.LogQuery(query)
+        return query.getSeqs(self.entryList, self.index, self.textIndex)
+
+    def setBatchInterval(self, batchInterval):
+        """Set the minimum interval between calls to batch callback functions (sec)
+
+        If 0 then each new entry is delivered to batch callback functions immediately, as a batch of one.
+        """
+        batchInterval = float(batchInterval)
+        if batchInterval < 0:
+            raise RuntimeError("batchInterval=%r must be >= 0" % (batchInterval,))
+        self.batchInterval = batchInterval
+
+    def getArchiveReader(self):
+        """Return a reader for the on-disk archive (a TUI.Models.LogArchive.LogArchiveReader)
+
+        The reader includes all entries logged so far. Raise RuntimeError if not archiving.
+        """
+        if not self.archive:
+            raise RuntimeError("Not archiving log entries")
+        self.archive.flush()
+        return LogArchive.LogArchiveReader(self.archive.archiveDir)
+
+    def getEntries(self, seqList):
+        """Return a list of log entries (LogEntryView objects) given a sorted list of entry numbers
+
+        Entry numbers for entries that have been discarded are ignored.
+        """
+        firstSeq = self.entryList.firstSeq
+        return [self.entryList.getEntry(seq) for seq in seqList if seq >= firstSeq]
+
     def logEntryFromLogMsg(self,
         msgStr,
         severity=RO.Constants.sevNormal,
@@ -243,17 +478,7 @@ class LogSource(RO.AddCallback.BaseMixin):
             warning: this is not KeyVars from the model; it is lower-level data
         - cmdInfo: CmdInfo object (only for synthesized command log entries)
         """
-        # strip keys. from keys.<actor>
-#         if actor and actor.startswith("keys."):
-#             actor = actor[5:]
-
-        # demote severity of normal messages from cmds actor to debug
-        if actor == "cmds" and severity == RO.Constants.sevNormal:
-            severity = RO.Constants.sevDebug
-
-        # get default cmdr dynamically since it might change each time user connects to hub
-        if cmdr is None:
-            cmdr = self.dispatcher.connection.getCmdr()
+        severity, cmdr = self._getSeverityAndCmdr(severity=severity, actor=actor, cmdr=cmdr)
 
         if keywords is None:
             keywords = opscore.protocols.messages.Keywords()
@@ -295,19 +520,102 @@ class LogSource(RO.AddCallback.BaseMixin):
         - cmdr: commander; defaults to self
         - cmdID: command ID (an integer)
         - keywords: parsed keywords (an opscore.protocols.messages.Keywords);
-            warning: this is not KeyVars from the model; it is lower-level data
+            ignored, to save memory: the keywords field of the log entry re-parses msgStr on demand
         - cmdInfo: CmdInfo object (only for synthesized command log entries)
         """
-        self.lastEntry = self.logEntryFromLogMsg(
+        severity, cmdr = self._getSeverityAndCmdr(severity=severity, actor=actor, cmdr=cmdr)
+        unixTime = time.time()
+        taiSec = getTAISec(unixTime)
+        seq = self.entryList.append(
             msgStr = msgStr,
             severity = severity,
             actor = actor,
             cmdr = cmdr,
             cmdID = cmdID,
-            keywords = keywords,
+            unixTime = unixTime,
+            taiSec = taiSec,
+            cmdInfo = cmdInfo,
+        )
+        self.index.addEntry(
+            seq = seq,
+            actor = actor,
+            cmdr = cmdr,
+            severity = severity,
+            cmdID = cmdID,
             cmdInfo = cmdInfo,
         )
-        self.entryList.append(self.lastEntry)
-        if len(self.entryList) > self.maxEntries:
-            self.entryList.popleft()
+        self.index.trim(self.entryList.firstSeq)
+        self.textIndex.addEntry(seq, msgStr)
+        self.textIndex.trim(self.entryList.firstSeq)
+        if self.archive:
+            try:
+                self.archive.append(
+                    unixTime = unixTime,
+                    taiSec = taiSec,
+                    severity = severity,
+                    actor = actor,
+                    cmdr = cmdr,
+                    cmdID = cmdID,
+                    msgStr = msgStr,
+                )
+            except Exception:
+                # stop archiving rather than fail on every message; do not log, to avoid recursion
+                sys.stderr.write("%s could not archive log entry; archiving stopped\n" % (self,))
+                traceback.print_exc(file=sys.stderr)
+                self.archive = None
+        self.lastEntry = self.entryList.getEntry(seq)
         self._doCallbacks()
+
+        if self._batchFuncList:
+            if not self._pendingSeqList:
+                self._pendingStartTime = unixTime
+            self._pendingSeqList.append(seq)
+            if self.batchInterval <= 0:
+                self._doBatchCallbacks()
+            elif not self._batchTimer.isActive:
+                self._batchTimer.start(self.batchInterval, self._doBatchCallbacks)
+
+    def _doBatchCallbacks(self):
+        """Call batch callback functions with pending log entries and update batchStats
+        """
+        seqList = self._pendingSeqList
+        self._pendingSeqList = []
+        entryList = self.getEntries(seqList)
+        if not entryList:
+            return
+        self.batchStats.addBatch(batchSize=len(entryList), latency=time.time() - self._pendingStartTime)
+        for func in self._batchFuncList[:]:
+            try:
+                func(entryList)
+            except Exception:
+                sys.stderr.write("%s batch callback %s failed\n" % (self, func))
+                traceback.print_exc(file=sys.stderr)
+
+    def _getSeverityAndCmdr(self, severity, actor, cmdr):
+        """Return severity and cmdr adjusted for logging
+
+        - Demote severity of normal messages from the cmds actor to debug
+        - Replace cmdr=None with my commander ID
+        """
+        # strip keys. from keys.<actor>
+#         if actor and actor.startswith("keys."):
+#             actor = actor[5:]
+
+        # demote severity of normal messages from cmds actor to debug
+        if actor == "cmds" and severity == RO.Constants.sevNormal:
+            severity = RO.Constants.sevDebug
+
+        # get default cmdr dynamically since it might change each time user connects to hub
+        if cmdr is None:
+            cmdr = self.dispatcher.connection.getCmdr()
+        return severity, cmdr
+
+    def _parseKeywords(self, msgStr):
+        """Parse the keywords of a logged message; return empty Keywords if the message cannot be parsed
+
+        Used to reconstruct LogEntryView.keywords, since parsed keywords are not stored.
+        """
+        try:
+            return self._replyParser.parse(msgStr).keywords
+        except Exception:
+            return opscore.protocols.messages.Keywords()
@@ -0,0 +1,486 @@
+"""Compact storage for log entries
+
+LogStore is a fixed-capacity ring buffer that keeps each field of a log entry in its own typed array
+(a "columnar" store), with actor and commander names interned as small integers
+and message text packed into a single shared byte arena. Compared to a deque of full LogEntry objects
+this uses a small fraction of the memory and creates almost no garbage for the collector to scan.
+
+Entries are identified by a sequence number (entry number) that starts at 0 and increases
+by one for each entry ever added, so it remains valid (and unique) as old entries are discarded.
+
+LogStore hands out LogEntryView objects: lightweight read-only views of one entry
+that support the same fields and methods as TUI.Models.LogSource.LogEntry.
+
+This module deliberately uses only the standard library, so it may be tested and benchmarked
+without the rest of TUI.
+
+History:
+2026-10-18          Initial version.
+                    Added getTimeStr, which memoizes formatted timestamps per whole second.
+"""
+import array
+import math
+import time
+
+__all__ = ["LogStore", "LogEntryView", "getTimeStr"]
+
+# default size of message arena per entry (bytes); hub replies average well under this
+DefaultArenaBytesPerEntry = 256
+
+ActorTagPrefix = "act_"
+CmdrTagPrefix = "cmdr_"
+
+# bits in the flags column
+_IsUnicodeFlag = 0x01
+
+# appended to messages that are truncated to fit in the message arena
+TruncatedMarker = "...[truncated]"
+
+# maximum number of entries in the timestamp cache used by getTimeStr
+MaxTimeStrCacheSize = 10000
+# dict of whole Python seconds: "HH:MM:SS"
+_TimeStrCache = {}
+
+def getTimeStr(pySec):
+    """Return a time (Python seconds) formatted as "HH:MM:SS"
+
+    Log entries arrive many per second, so the result is memoized per whole second.
+    """
+    wholeSec = int(math.floor(pySec))
+    timeStr = _TimeStrCache.get(wholeSec)
+    if timeStr is None:
+        if len(_TimeStrCache) >= MaxTimeStrCacheSize:
+            _TimeStrCache.clear()
+        timeStr = time.strftime("%H:%M:%S", time.gmtime(wholeSec))
+        _TimeStrCache[wholeSec] = timeStr
+    return timeStr
+
+class _InternTable(object):
+    """Map strings (or None) to small integer IDs and back
+    """
+    def __init__(self):
+        self._idDict = {}
+        self._strList = []
+
+    def getID(self, strVal):
+        """Return the ID for strVal, adding it if new"""
+        strID = self._idDict.get(strVal)
+        if strID is None:
+            strID = len(self._strList)
+            self._idDict[strVal] = strID
+            self._strList.append(strVal)
+        return strID
+
+    def findID(self, strVal):
+        """Return the ID for strVal, or None if strVal has never been seen"""
+        return self._idDict.get(strVal)
+
+    def getStr(self, strID):
+        """Return the string for a given ID"""
+        return self._strList[strID]
+
+    def __len__(self):
+        return len(self._strList)
+
+
+class LogEntryView(object):
+    """A read-only view of one entry in a LogStore
+
+    Has the same fields and methods as TUI.Models.LogSource.LogEntry, plus:
+    - seq: entry number in the store
+
+    A view is only valid while its entry is still in the store;
+    accessing a field of a discarded entry raises RuntimeError.
+    """
+    __slots__ = ("_store", "seq")
+
+    def __init__(self, store, seq):
+        self._store = store
+        self.seq = seq
+
+    @property
+    def unixTime(self):
+        return self._store.getUnixTime(self.seq)
+
+    @property
+    def taiTimeStr(self):
+        return self._store.getTAITimeStr(self.seq)
+
+    @property
+    def msgStr(self):
+        return self._store.getMsgStr(self.seq)
+
+    @property
+    def actor(self):
+        return self._store.getActor(self.seq)
+
+    @property
+    def severity(self):
+        return self._store.getSeverity(self.seq)
+
+    @property
+    def cmdr(self):
+        return self._store.getCmdr(self.seq)
+
+    @property
+    def cmdID(self):
+        return self._store.getCmdID(self.seq)
+
+    @property
+    def keywords(self):
+        return self._store.getKeywords(self.seq)
+
+    @property
+    def tags(self):
+        return self._store.getTags(self.seq)
+
+    @property
+    def cmdInfo(self):
+        return self._store.getCmdInfo(self.seq)
+
+    @property
+    def isKeys(self):
+        return self._store.getIsKeys(self.seq)
+
+    def getStr(self):
+        """Return log entry formatted for log window
+        """
+        return "%s %s\n" % (self.taiTimeStr, self.msgStr)
+
+    def __eq__(self, other):
+        return isinstance(other, LogEntryView) and other._store is self._store and other.seq == self.seq
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self._store), self.seq))
+
+    def __repr__(self):
+        return "LogEntryView(seq=%r, msgStr=%r, severity=%r, actor=%r, cmdr=%r, cmdID=%r, tags=%r, cmdInfo=%r)" % \
+            (self.seq, self.msgStr, self.severity, self.actor, self.cmdr, self.cmdID, self.tags, self.cmdInfo)
+
+
+class LogStore(object):
+    """Fixed-capacity columnar ring buffer of log entries
+
+    Useful attributes:
+    - maxEntries: maximum number of entries (older entries are discarded)
+    - arenaSize: size of the message arena (bytes); if full, older entries are discarded;
+        longer messages are truncated (at a UTF-8 character boundary) and end with TruncatedMarker
+    - firstSeq: entry number of the oldest retained entry
+    - nextSeq: entry number that the next added entry will receive
+
+    Supports len(), iteration (oldest first) and indexing (including negative indices);
+    all of these return LogEntryView objects.
+    """
+    def __init__(self,
+        maxEntries,
+        arenaSize = None,
+        keywordsFunc = None,
+    ):
+        """Create a LogStore
+
+        Inputs:
+        - maxEntries: the maximum number of entries saved (older entries are removed)
+        - arenaSize: size of message arena, in bytes; if None then maxEntries * DefaultArenaBytesPerEntry
+        - keywordsFunc: function that takes a message string and returns its parsed keywords;
+            used to reconstruct LogEntryView.keywords on demand (parsed keywords are not stored);
+            if None then the keywords field is always None
+        """
+        self.maxEntries = int(maxEntries)
+        if self.maxEntries < 1:
+            raise RuntimeError("maxEntries=%r must be positive" % (maxEntries,))
+        if arenaSize is None:
+            arenaSize = self.maxEntries * DefaultArenaBytesPerEntry
+        self.arenaSize = int(arenaSize)
+        if self.arenaSize < 1:
+            raise RuntimeError("arenaSize=%r must be positive" % (arenaSize,))
+        self._keywordsFunc = keywordsFunc
+
+        numRows = self.maxEntries
+        self._unixTimeArr = array.array("d", [0.0]) * numRows
+        self._taiSecArr = array.array("d", [0.0]) * numRows
+        self._severityArr = array.array("b", [0]) * numRows
+        self._cmdIDArr = array.array("l", [0]) * numRows
+        self._actorIDArr = array.array("i", [0]) * numRows
+        self._cmdrIDArr = array.array("i", [0]) * numRows
+        self._msgStartArr = array.array("L", [0]) * numRows
+        self._msgLenArr = array.array("L", [0]) * numRows
+        self._flagsArr = array.array("B", [0]) * numRows
+
+        self._arena = bytearray(self.arenaSize)
+        self._arenaHead = 0 # index of next byte to write
+        self._arenaUsed = 0 # number of bytes used by retained entries
+
+        self._actorTable = _InternTable()
+        self._cmdrTable = _InternTable()
+        # dict of (cmdrID, actorID): tags list
+        self._tagsDict = {}
+        # dict of entry number: CmdInfo, for the few entries that have one
+        self._cmdInfoDict = {}
+
+        self.firstSeq = 0
+        self.nextSeq = 0
+
+    def append(self,
+        msgStr,
+        severity,
+        actor,
+        cmdr,
+        cmdID,
+        unixTime,
+        taiSec,
+        cmdInfo = None,
+    ):
+        """Add an entry, discarding old entries as needed to make room, and return its entry number
+
+        Inputs:
+        - msgStr: the message string (a str or unicode)
+        - severity: one of the RO.Constants.sevX constants
+        - actor: actor who sent the reply or to whom the command was sent
+        - cmdr: commander ID
+        - cmdID: command ID (an integer)
+        - unixTime: date (unix seconds) at which the entry was created
+        - taiSec: TAI at which the entry was created, as Python seconds (for formatting taiTimeStr)
+        - cmdInfo: CmdInfo object (only for synthesized command log entries)
+        """
+        flags = 0
+        if isinstance(msgStr, unicode):
+            msgBytes = msgStr.encode("utf-8")
+            flags |= _IsUnicodeFlag
+        else:
+            msgBytes = msgStr
+        if len(msgBytes) > self.arenaSize:
+            msgBytes = _truncateMsg(msgBytes, self.arenaSize)
+        msgLen = len(msgBytes)
+
+        if self.nextSeq - self.firstSeq >= self.maxEntries:
+            self._discardOldest()
+        while self._arenaUsed + msgLen > self.arenaSize:
+            self._discardOldest()
+
+        seq = self.nextSeq
+        row = seq % self.maxEntries
+        self._unixTimeArr[row] = unixTime
+        self._taiSecArr[row] = taiSec
+        self._severityArr[row] = severity
+        self._cmdIDArr[row] = int(cmdID)
+        self._actorIDArr[row] = self._actorTable.getID(actor)
+        self._cmdrIDArr[row] = self._cmdrTable.getID(cmdr)
+        self._msgStartArr[row] = self._writeMsg(msgBytes)
+        self._msgLenArr[row] = msgLen
+        self._flagsArr[row] = flags
+        if cmdInfo is not None:
+            self._cmdInfoDict[seq] = cmdInfo
+        self.nextSeq += 1
+        return seq
+
+    def clear(self):
+        """Discard all entries (entry numbers are not reused)
+        """
+        self._arenaHead = 0
+        self._arenaUsed = 0
+        self._cmdInfoDict.clear()
+        self.firstSeq = self.nextSeq
+
+    def findActorID(self, actor):
+        """Return the interned ID of an actor, or None if that actor has never been seen"""
+        return self._actorTable.findID(actor)
+
+    def findCmdrID(self, cmdr):
+        """Return the interned ID of a commander, or None if that commander has never been seen"""
+        return self._cmdrTable.findID(cmdr)
+
+    def getActor(self, seq):
+        return self._actorTable.getStr(self._actorIDArr[self._getRow(seq)])
+
+    def getActorID(self, seq):
+        return self._actorIDArr[self._getRow(seq)]
+
+    def getCmdID(self, seq):
+        return self._cmdIDArr[self._getRow(seq)]
+
+    def getCmdInfo(self, seq):
+        self._getRow(seq)
+        return self._cmdInfoDict.get(seq)
+
+    def getCmdr(self, seq):
+        return self._cmdrTable.getStr(self._cmdrIDArr[self._getRow(seq)])
+
+    def getCmdrID(self, seq):
+        return self._cmdrIDArr[self._getRow(seq)]
+
+    def getEntry(self, seq):
+        """Return a LogEntryView for a given entry number
+
+        Raise IndexError if the entry is not in the store.
+        """
+        if not self.firstSeq <= seq < self.nextSeq:
+            raise IndexError("entry %s not in store (range %s-%s)" % (seq, self.firstSeq, self.nextSeq - 1))
+        return LogEntryView(self, seq)
+
+    def getIsKeys(self, seq):
+        actor = self.getActor(seq)
+        if actor and actor.startswith("keys"):
+            return True
+        cmdInfo = self._cmdInfoDict.get(seq)
+        return bool(cmdInfo and cmdInfo.actor.startswith("keys"))
+
+    def getKeywords(self, seq):
+        if self._keywordsFunc is None:
+            self._getRow(seq)
+            return None
+        return self._keywordsFunc(self.getMsgStr(seq))
+
+    def getMemoryUsage(self):
+        """Return the approximate number of bytes used by the fixed-size parts of the store
+
+        Excludes interned strings and CmdInfo objects, which are few and small.
+        """
+        arrList = (
+            self._unixTimeArr, self._taiSecArr, self._severityArr, self._cmdIDArr,
+            self._actorIDArr, self._cmdrIDArr, self._msgStartArr, self._msgLenArr, self._flagsArr,
+        )
+        return sum(len(arr) * arr.itemsize for arr in arrList) + len(self._arena)
+
+    def getMsgStr(self, seq):
+        row = self._getRow(seq)
+        start = self._msgStartArr[row]
+        end = start + self._msgLenArr[row]
+        if end <= self.arenaSize:
+            msgBytes = bytes(self._arena[start:end])
+        else:
+            msgBytes = bytes(self._arena[start:] + self._arena[0:end - self.arenaSize])
+        if self._flagsArr[row] & _IsUnicodeFlag:
+            return msgBytes.decode("utf-8", "replace")
+        return msgBytes
+
+    def getSeverity(self, seq):
+        return self._severityArr[self._getRow(seq)]
+
+    def getTags(self, seq):
+        """Return the Tk text tags for an entry: cmdr_<cmdr> and act_<actor>, if cmdr and actor are not blank
+
+        Warning: the returned list is shared by all entries with the same cmdr and actor; do not modify it.
+        """
+        row = self._getRow(seq)
+        tagKey = (self._cmdrIDArr[row], self._actorIDArr[row])
+        tags = self._tagsDict.get(tagKey)
+        if tags is None:
+            cmdr = self._cmdrTable.getStr(tagKey[0])
+            actor = self._actorTable.getStr(tagKey[1])
+            tags = []
+            if cmdr:
+                tags.append(CmdrTagPrefix + cmdr.lower())
+            if actor:
+                tags.append(ActorTagPrefix + actor.lower())
+            self._tagsDict[tagKey] = tags
+        return tags
+
+    def getTAISec(self, seq):
+        return self._taiSecArr[self._getRow(seq)]
+
+    def getTAITimeStr(self, seq):
+        return getTimeStr(self._taiSecArr[self._getRow(seq)])
+
+    def getUnixTime(self, seq):
+        return self._unixTimeArr[self._getRow(seq)]
+
+    def _discardOldest(self):
+        """Discard the oldest entry
+        """
+        if self.firstSeq >= self.nextSeq:
+            raise RuntimeError("Bug: no entries to discard")
+        row = self.firstSeq % self.maxEntries
+        self._arenaUsed -= self._msgLenArr[row]
+        self._cmdInfoDict.pop(self.firstSeq, None)
+        self.firstSeq += 1
+
+    def _getRow(self, seq):
+        """Return the row index for a given entry number
+
+        Raise RuntimeError if the entry has been discarded (or not yet added).
+        """
+        if not self.firstSeq <= seq < self.nextSeq:
+            raise RuntimeError("log entry %s has been discarded" % (seq,))
+        return seq % self.maxEntries
+
+    def _writeMsg(self, msgBytes):
+        """Write a message to the arena, wrapping around as needed, and return its start index
+        """
+        msgLen = len(msgBytes)
+        start = self._arenaHead
+        end = start + msgLen
+        if end <= self.arenaSize:
+            self._arena[start:end] = msgBytes
+        else:
+            numAtEnd = self.arenaSize - start
+            self._arena[start:] = msgBytes[0:numAtEnd]
+            self._arena[0:msgLen - numAtEnd] = msgBytes[numAtEnd:]
+        self._arenaHead = end % self.arenaSize
+        self._arenaUsed += msgLen
+        return start
+
+    def __getitem__(self, ind):
+        numEntries = self.nextSeq - self.firstSeq
+        if ind < 0:
+            ind += numEntries
+        if not 0 <= ind < numEntries:
+            raise IndexError("index out of range")
+        return LogEntryView(self, self.firstSeq + ind)
+
+    def __iter__(self):
+        # iterate over a snapshot of the entry numbers (but skip entries discarded during iteration)
+        for seq in xrange(self.firstSeq, self.nextSeq):
+            if seq >= self.firstSeq:
+                yield LogEntryView(self, seq)
+
+    def __len__(self):
+        return self.nextSeq - self.firstSeq
+
+
+def _truncateMsg(msgBytes, maxLen):
+    """Truncate UTF-8 encoded msgBytes to maxLen bytes, ending with TruncatedMarker
+
+    The cut is moved back to the start of a character, so the result is valid UTF-8 if msgBytes is.
+    """
+    endInd = max(0, maxLen - len(TruncatedMarker))
+    # back up over at most 3 continuation bytes (0x80-0xBF) to the start of a multi-byte character
+    for i in range(3):
+        if endInd <= 0 or endInd >= len(msgBytes) or not 0x80 <= ord(msgBytes[endInd]) <= 0xBF:
+            break
+        endInd -= 1
+    return (msgBytes[0:endInd] + TruncatedMarker)[0:maxLen]
+
+
+if __name__ == "__main__":
+    store = LogStore(maxEntries=5, arenaSize=60)
+    for i in range(8):
+        store.append(
+            msgStr = "tcc %d i AxePos=%d" % (i, i),
+            severity = 0,
+            actor = "tcc",
+            cmdr = "apo.me",
+            cmdID = i,
+            unixTime = time.time(),
+            taiSec = time.time() - 35,
+        )
+    print "len=%s; firstSeq=%s; nextSeq=%s" % (len(store), store.firstSeq, store.nextSeq)
+    for entry in store:
+        print repr(entry)
+
+    longMsg = u"x" + (u"\xe9" * 40)
+    store.append(
+        msgStr = longMsg,
+        severity = 0,
+        actor = "tcc",
+        cmdr = "apo.me",
+        cmdID = 8,
+        unixTime = time.time(),
+        taiSec = time.time() - 35,
+    )
+    msgStr = store[-1].msgStr
+    if not msgStr.endswith(TruncatedMarker) or not longMsg.startswith(msgStr[0:-len(TruncatedMarker)]):
+        print "Error: long message truncated to %r" % (msgStr,)
+    print "long message truncated to %r" % (msgStr,)
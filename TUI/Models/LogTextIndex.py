@@ -0,0 +1,314 @@
+"""Full-text index and queries for log entries
+
+TextIndex is an inverted index: for each token (word) that appears in any log message
+it keeps a posting list of the entry numbers of the messages that contain it.
+LogSource updates it as entries are logged and trimmed.
+
+LogQuery parses a query string and finds matching entries using a TextIndex and a LogIndex.
+A query is a sequence of terms, which must all match (AND is implied, but may be written),
+optionally separated into alternatives by OR (AND binds more tightly than OR). Terms include:
+- word: a message that contains word as a token (case is ignored); tokens are sequences of letters,
+    digits and underscores that start with a letter or underscore, such as keyword names and most values
+- word*: a message that contains a token starting with word
+- "some text", or any term that is not a single token (e.g. AxisErr=0x801 or 12.5):
+    a message that contains the text as whole words, i.e. not preceded or followed by a letter,
+    digit or underscore (case is ignored)
+- actor:name: an entry from or to the specified actor
+- cmdr:name: an entry from the specified commander
+- sev:name or severity:name: an entry with at least the specified severity (debug, normal, warning or error)
+- NOT term or -term: the term must not match
+For example: actor:tcc AND AxisErr
+
+Queries are answered from posting lists, except that text terms are checked against candidate messages
+(those that contain every token in the text, or every message if the text contains no tokens).
+
+History:
+2026-10-18          Initial version.
+"""
+import re
+
+import RO.Constants
+import LogIndex
+
+__all__ = ["LogQuery", "TextIndex", "tokenize"]
+
+# maximum length of an indexed token; longer tokens (rare) are matched as text
+MaxTokenLen = 40
+# dict of query field name: _Term field
+FieldNameDict = dict(actor="actor", cmdr="cmdr", sev="sev", severity="sev")
+DefaultTrimInterval = 5000
+
+_TokenRE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_TokenCharRE = re.compile(r"[A-Za-z0-9_]")
+_QueryTermRE = re.compile(r'-?(?:[A-Za-z]+:)?"[^"]*"?|\S+')
+
+def tokenize(msgStr):
+    """Return the set of indexable tokens in a message, in lowercase
+    """
+    return set(token for token in _TokenRE.findall(msgStr.lower()) if len(token) <= MaxTokenLen)
+
+def _isToken(text):
+    """Return True if text is a single indexable token (in lowercase)"""
+    tokenMatch = _TokenRE.match(text)
+    return len(text) <= MaxTokenLen and tokenMatch is not None and tokenMatch.end() == len(text)
+
+
+class TextIndex(object):
+    """Inverted index of the tokens in log messages
+    """
+    def __init__(self, trimInterval=DefaultTrimInterval):
+        """Create a TextIndex
+
+        Inputs:
+        - trimInterval: number of discarded entries between full trims of all posting lists
+            (queries always ignore discarded entries; trimming only frees memory)
+        """
+        self.trimInterval = int(trimInterval)
+        self._tokenDict = {} # dict of token: posting list
+        self._minSeq = 0
+        self._lastTrimSeq = 0
+
+    def addEntry(self, seq, msgStr):
+        """Add an entry to the index
+
+        Inputs:
+        - seq: entry number; must be larger than that of any previously added entry
+        - msgStr: message
+        """
+        tokenDict = self._tokenDict
+        for token in tokenize(msgStr):
+            postingList = tokenDict.get(token)
+            if postingList is None:
+                postingList = LogIndex.PostingList("i")
+                tokenDict[token] = postingList
+            postingList.append(seq)
+
+    def clear(self):
+        """Remove all entries from the index"""
+        self._tokenDict.clear()
+
+    def getSeqs(self, token):
+        """Return a sorted list of entry numbers for entries that contain a token (in lowercase)"""
+        postingList = self._tokenDict.get(token)
+        if not postingList:
+            return []
+        return postingList.getSeqs(self._minSeq)
+
+    def getSeqsByPrefix(self, prefix):
+        """Return a sorted list of entry numbers for entries that contain a token starting with prefix
+        (in lowercase)
+        """
+        return LogIndex.unionSeqs([postingList.getSeqs(self._minSeq)
+            for token, postingList in self._tokenDict.iteritems() if token.startswith(prefix)])
+
+    def trim(self, minSeq):
+        """Note that entries with entry number < minSeq have been discarded
+
+        Queries ignore those entries immediately; posting lists are trimmed
+        once every trimInterval discarded entries, and empty lists are deleted.
+        """
+        self._minSeq = max(self._minSeq, minSeq)
+        if self._minSeq - self._lastTrimSeq < self.trimInterval:
+            return
+        self._lastTrimSeq = self._minSeq
+        tokenDict = self._tokenDict
+        for token, postingList in tokenDict.items():
+            postingList.trim(self._minSeq)
+            if not postingList:
+                del tokenDict[token]
+
+    def __len__(self):
+        """Return the number of distinct tokens"""
+        return len(self._tokenDict)
+
+
+class _Term(object):
+    """One term of a query
+
+    Fields:
+    - field: one of "actor", "cmdr", "sev", "prefix", "token" or "text"
+    - value: actor or commander name, minimum severity, prefix, token or text (all in lowercase except severity)
+    - isNegated: if True, the term must not match
+    """
+    def __init__(self, field, value, isNegated):
+        self.field = field
+        self.value = value
+        self.isNegated = isNegated
+        if field == "text":
+            # match whole words: do not allow a token character just before or after value
+            # if value starts or ends with a token character
+            regExp = re.escape(value)
+            if _TokenCharRE.match(value[0]):
+                regExp = r"(?<![a-z0-9_])" + regExp
+            if _TokenCharRE.match(value[-1]):
+                regExp += r"(?![a-z0-9_])"
+            self._textRE = re.compile(regExp)
+
+    def getSeqs(self, entryList, logIndex, textIndex, candidateSeqs=None):
+        """Return a sorted list of entry numbers of entries that match this term (ignoring isNegated)
+
+        Inputs:
+        - entryList, logIndex, textIndex: see LogQuery.getSeqs
+        - candidateSeqs: sorted list of entry numbers that are of interest, or None if all are;
+            used to reduce the number of messages that must be checked for text terms
+        """
+        if self.field == "actor":
+            return logIndex.getSeqsByActors([actor for actor in logIndex.getActors()
+                if actor and actor.lower() == self.value])
+        elif self.field == "cmdr":
+            return logIndex.getSeqsByCmdrs([cmdr for cmdr in logIndex.getCmdrs()
+                if cmdr and cmdr.lower() == self.value])
+        elif self.field == "sev":
+            return logIndex.getSeqsByMinSeverity(self.value)
+        elif self.field == "prefix":
+            return textIndex.getSeqsByPrefix(self.value)
+        elif self.field == "token":
+            return textIndex.getSeqs(self.value)
+
+        # text: check candidates that contain all tokens in the text
+        for token in tokenize(self.value):
+            tokenSeqs = textIndex.getSeqs(token)
+            if candidateSeqs is None:
+                candidateSeqs = tokenSeqs
+            else:
+                candidateSeqs = LogIndex.intersectSeqs(candidateSeqs, tokenSeqs)
+            if not candidateSeqs:
+                return []
+        if candidateSeqs is None:
+            candidateSeqs = xrange(entryList.firstSeq, entryList.nextSeq)
+        firstSeq = entryList.firstSeq
+        textSearch = self._textRE.search
+        return [seq for seq in candidateSeqs
+            if seq >= firstSeq and textSearch(entryList.getMsgStr(seq).lower())]
+
+    def matches(self, entry):
+        """Return True if a log entry matches this term (ignoring isNegated)
+
+        Inputs:
+        - entry: a log entry, e.g. a TUI.Models.LogStore.LogEntryView or TUI.Models.LogArchive.ArchiveEntry
+        """
+        if self.field == "actor":
+            return ((entry.actor or "").lower() == self.value) \
+                or bool(entry.cmdInfo and entry.cmdInfo.actor.lower() == self.value)
+        elif self.field == "cmdr":
+            return (entry.cmdr or "").lower() == self.value
+        elif self.field == "sev":
+            return entry.severity >= self.value
+        elif self.field == "prefix":
+            return any(token.startswith(self.value) for token in tokenize(entry.msgStr))
+        elif self.field == "token":
+            return self.value in tokenize(entry.msgStr)
+        return self._textRE.search(entry.msgStr.lower()) is not None
+
+    def __repr__(self):
+        return "_Term(%r, %r, isNegated=%r)" % (self.field, self.value, self.isNegated)
+
+
+class LogQuery(object):
+    """A parsed log query; see the module doc string for the syntax
+    """
+    def __init__(self, queryStr):
+        """Parse a query
+
+        Raise RuntimeError if the query is empty or invalid.
+        """
+        self.queryStr = queryStr
+        # list of alternatives, each a list of _Term that must all match
+        self.orList = [[]]
+        isNegated = False
+        needTerm = False # True if the previous word was an operator that must be followed by a term
+        for termStr in _QueryTermRE.findall(queryStr):
+            if termStr in ("OR", "AND"):
+                if isNegated or needTerm or not self.orList[-1]:
+                    raise RuntimeError("misplaced %s in query %r" % (termStr, queryStr))
+                if termStr == "OR":
+                    self.orList.append([])
+                needTerm = True
+                continue
+            if termStr == "NOT":
+                if isNegated:
+                    raise RuntimeError("misplaced NOT in query %r" % (queryStr,))
+                isNegated = True
+                continue
+            if termStr.startswith("-") and len(termStr) > 1:
+                isNegated = not isNegated
+                termStr = termStr[1:]
+            self.orList[-1].append(self._parseTerm(termStr, isNegated))
+            isNegated = False
+            needTerm = False
+        if isNegated or needTerm or not self.orList[-1]:
+            raise RuntimeError("incomplete query %r" % (queryStr,))
+
+    def getSeqs(self, entryList, logIndex, textIndex):
+        """Return a sorted list of entry numbers of entries that match the query
+
+        Inputs:
+        - entryList: log entries (a TUI.Models.LogStore.LogStore)
+        - logIndex: index of entryList by actor, etc. (a TUI.Models.LogIndex.LogIndex)
+        - textIndex: text index of entryList (a TextIndex)
+        """
+        return LogIndex.unionSeqs([self._getAndSeqs(andList, entryList, logIndex, textIndex)
+            for andList in self.orList])
+
+    def matches(self, entry):
+        """Return True if a log entry matches the query (without using any index)
+        """
+        for andList in self.orList:
+            if all(term.matches(entry) != term.isNegated for term in andList):
+                return True
+        return False
+
+    def _getAndSeqs(self, andList, entryList, logIndex, textIndex):
+        """Return a sorted list of entry numbers of entries that match all terms in andList
+        """
+        posTerms = [term for term in andList if not term.isNegated]
+        negTerms = [term for term in andList if term.isNegated]
+        # evaluate indexed terms first, since they are fast and reduce the candidates for text terms
+        posTerms.sort(key=lambda term: term.field == "text")
+        seqList = None
+        for term in posTerms:
+            termSeqs = term.getSeqs(entryList, logIndex, textIndex, candidateSeqs=seqList)
+            seqList = termSeqs if seqList is None else LogIndex.intersectSeqs(seqList, termSeqs)
+            if not seqList:
+                return []
+        if seqList is None:
+            seqList = range(entryList.firstSeq, entryList.nextSeq)
+        for term in negTerms:
+            negSeqSet = set(term.getSeqs(entryList, logIndex, textIndex, candidateSeqs=seqList))
+            seqList = [seq for seq in seqList if seq not in negSeqSet]
+        return seqList
+
+    def _parseTerm(self, termStr, isNegated):
+        """Parse one term (with any leading "-" removed); return a _Term
+        """
+        field = None
+        fieldMatch = re.match(r"([A-Za-z]+):(.+)$", termStr)
+        if fieldMatch and fieldMatch.group(1).lower() in FieldNameDict:
+            field = FieldNameDict[fieldMatch.group(1).lower()]
+            termStr = fieldMatch.group(2)
+        if termStr.startswith('"'):
+            termStr = termStr[1:]
+            if termStr.endswith('"'):
+                termStr = termStr[:-1]
+            isQuoted = True
+        else:
+            isQuoted = False
+        value = termStr.lower()
+        if not value:
+            raise RuntimeError("empty term in query %r" % (self.queryStr,))
+
+        if field == "sev":
+            severity = RO.Constants.NameSevDict.get(value)
+            if severity is None:
+                raise RuntimeError("unknown severity %r in query %r" % (termStr, self.queryStr))
+            return _Term("sev", severity, isNegated)
+        elif field:
+            return _Term(field, value, isNegated)
+        elif not isQuoted and value.endswith("*") and _isToken(value[:-1]):
+            return _Term("prefix", value[:-1], isNegated)
+        elif not isQuoted and _isToken(value):
+            return _Term("token", value, isNegated)
+        return _Term("text", value, isNegated)
+
+    def __str__(self):
+        return self.queryStr
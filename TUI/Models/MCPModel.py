@@ -3,10 +3,13 @@
 
 2013-08-23 ROwen    Added apogeeGangLabelDict in lieu of figure out how to access labelHelp from an opscore Key
 2014-12-18 ROwen    Reemoved unused import.
+2026-10-18          Skip callbacks of the ab_* PLC bits when their values have not changed
+                    (the MCP outputs them repeatedly); see TUI.Models.ChangeFilter.
 """
 __all__ = ["Model"]
 
 import opscore.actor.model as actorModel
+import ChangeFilter
 
 _theModel = None
 
@@ -32,3 +35,4 @@ class _Model (actorModel.Model):
            "36": "Podium: 1M",
            "52": "Podium: 1M FPI",
        }
+       ChangeFilter.suppressUnchanged(self, lambda keyName: keyName.startswith("ab_"))
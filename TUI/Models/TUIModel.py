@@ -12,6 +12,10 @@ Includes the following items:
 Note: the model must be created after the Tkinter root
 has been created. Otherwise you will get a Tkinter error.
 
+Headless mode (Model(headless=True)) builds the dispatcher, log source and actor models
+on a plain Twisted reactor without Tk: tkRoot, prefs and tlSet are None and no sounds are played.
+Call RO.Comm.Generic.setFramework("twisted") before creating a headless model. See TUI.Daemon.
+
 Most items are defined and loaded when the model is created.
 However, "tlSet" is empty to start; use this object to add
 windows to the application (so their geometry is recorded).
@@ -63,37 +67,60 @@ History:
 2011-08-16 ROwen    Added logFunc.
 2013-07-19 ROwen    Replaced getLoginExtra function with getPlatform.
 2013-10-22 ROwen    Implement ticket #1802: increase # of log windows from 5 to 10.
+2026-10-18          Added LogBatchInterval global: log windows receive new log entries in batches
+                    if the "Batch Log Updates" preference is set.
+                    Archive log entries to disk if the "Archive Log" preference is set.
+                    Added hub traffic recording: see startRecording, stopRecording and the hubRecorder field;
+                    record automatically if the "Record Hub Traffic" preference is set.
+                    Made logToStdOut a module-level function, so test code can remove it from the log source.
+                    Added callbackProfiler field: an opt-in profiler of keyword variable callbacks.
+                    Added headless mode: Model(headless=True) does not use Tk; added headless field.
+                    Added keyHistory field (a TUI.Models.KeyHistory.KeyHistoryRecorder);
+                    record key history if the "Record Key History" preference is set.
 """
+import os
 import platform
 import sys
+import time
 import traceback
-import twisted.internet.tksupport
 import RO.Comm
 import RO.Comm.HubConnection
 import RO.Constants
 import RO.OS
-import RO.TkUtil
-import RO.Wdg
 import opscore.actor.model
 import opscore.actor.cmdkeydispatcher
-import Tkinter
 import TUI.TUIPaths
-import TUI.TUIPrefs
 import TUI.Version
+import CallbackProfiler
+import HubRecording
+import KeyHistory
 import LogSource
 
 MaxLogWindows = 10
+# minimum interval between deliveries of new entries to log windows (sec), if "Batch Log Updates" is set
+LogBatchInterval = 0.05
+LogArchiveDirName = "%s_logarchive" % (TUI.Version.ApplicationName.lower(),)
+HubTrafficDirName = "%s_hubtraffic" % (TUI.Version.ApplicationName.lower(),)
+KeyHistoryDirName = "%s_keyhistory" % (TUI.Version.ApplicationName.lower(),)
 
 class Model(object):
-    def __new__(cls, testMode=False):
+    def __new__(cls, testMode=False, headless=False):
         if hasattr(cls, 'self'):
             return cls.self
 
         cls.self = object.__new__(cls)
         self = cls.self
 
-        self.tkRoot = Tkinter.Frame().winfo_toplevel()
-        twisted.internet.tksupport.install(self.tkRoot)
+        # Tk is only imported when not headless, so a headless process need not load it
+        self.headless = bool(headless)
+        if self.headless:
+            import twisted.internet.reactor
+            self.tkRoot = None
+        else:
+            import Tkinter
+            import twisted.internet.tksupport
+            self.tkRoot = Tkinter.Frame().winfo_toplevel()
+            twisted.internet.tksupport.install(self.tkRoot)
         self.reactor = twisted.internet.reactor
     
         platformStr = getPlatform()
@@ -121,15 +148,47 @@ class Model(object):
         # log source
         self.logSource = LogSource.LogSource(self.dispatcher)
         if testMode:
-            def logToStdOut(logSource):
-                print logSource.lastEntry.getStr(), # final comma prevents extra newlines
             self.logSource.addCallback(logToStdOut)
         
         # function to log a message
         self.logFunc = self.logSource.logMsg
+
+        # profiler of keyword variable callbacks (disabled until enabled)
+        self.callbackProfiler = CallbackProfiler.CallbackProfiler(self.dispatcher)
+
+        # recorder of hub traffic (a TUI.Models.HubRecording.HubRecordingWriter), or None if not recording
+        self.hubRecorder = None
+
+        # recorder of the history of selected keyword values, for strip charts (not recording until started)
+        self.keyHistory = KeyHistory.KeyHistoryRecorder(logFunc=self.logMsg)
     
+        if self.headless:
+            # no preferences or windows; the caller configures archiving and recording directly
+            self.prefs = None
+            self.tlSet = None
+            return self
+
+        import RO.Wdg
+        import TUI.TUIPrefs
+
         # TUI preferences
         self.prefs = TUI.TUIPrefs.TUIPrefs()
+
+        # deliver new log entries to log windows in batches, if wanted
+        self.prefs.getPrefVar("Batch Log Updates").addCallback(self._updLogBatching, callNow=False)
+        self._updLogBatching()
+
+        # archive log entries to disk, if wanted
+        if not testMode:
+            for prefName in ("Archive Log", "Log Archive Dir", "Log Archive Nights"):
+                self.prefs.getPrefVar(prefName).addCallback(self._updLogArchive, callNow=False)
+            self._updLogArchive()
+            for prefName in ("Record Hub Traffic", "Log Archive Dir"):
+                self.prefs.getPrefVar(prefName).addCallback(self._updHubRecording, callNow=False)
+            self._updHubRecording()
+            for prefName in ("Record Key History", "Log Archive Dir", "Log Archive Nights"):
+                self.prefs.getPrefVar(prefName).addCallback(self._updKeyHistory, callNow=False)
+            self._updKeyHistory()
         
         # TUI window (topLevel) set;
         # this starts out empty; others add windows to it
@@ -149,6 +208,95 @@ class Model(object):
     def __init__(self, *args, **kargs):
         pass
         
+    def _updLogBatching(self, *args):
+        """Set the interval at which new log entries are delivered to log windows, based on preferences
+        """
+        doBatch = self.prefs.getPrefVar("Batch Log Updates").getValue()
+        self.logSource.setBatchInterval(LogBatchInterval if doBatch else 0)
+
+    def _updLogArchive(self, *args):
+        """Start or stop archiving log entries to disk, based on preferences
+        """
+        doArchive = self.prefs.getPrefVar("Archive Log").getValue()
+        archiveDir = self.prefs.getPrefVar("Log Archive Dir").getValue()
+        if not (doArchive and archiveDir):
+            self.logSource.stopArchive()
+            return
+        try:
+            self.logSource.startArchive(
+                archiveDir = os.path.join(archiveDir, LogArchiveDirName),
+                maxNights = self.prefs.getPrefVar("Log Archive Nights").getValue(),
+            )
+        except Exception as e:
+            self.logSource.stopArchive()
+            self.logMsg("Could not archive log: %s" % (e,), severity=RO.Constants.sevWarning)
+
+    def _updHubRecording(self, *args):
+        """Start or stop recording hub traffic, based on preferences
+
+        A new recording file is started each time recording is enabled or the directory changes.
+        """
+        doRecord = self.prefs.getPrefVar("Record Hub Traffic").getValue()
+        archiveDir = self.prefs.getPrefVar("Log Archive Dir").getValue()
+        if not (doRecord and archiveDir):
+            self.stopRecording()
+            return
+        recordingDir = os.path.join(os.path.abspath(archiveDir), HubTrafficDirName)
+        if self.hubRecorder and os.path.dirname(self.hubRecorder.filePath) == recordingDir:
+            return
+        fileName = time.strftime("%Y-%m-%dT%H%M%S", time.gmtime()) + HubRecording.RecordingSuffix
+        try:
+            self.startRecording(os.path.join(recordingDir, fileName))
+        except Exception as e:
+            self.stopRecording()
+            self.logMsg("Could not record hub traffic: %s" % (e,), severity=RO.Constants.sevWarning)
+
+    def _updKeyHistory(self, *args):
+        """Start or stop recording key history, based on preferences
+        """
+        doRecord = self.prefs.getPrefVar("Record Key History").getValue()
+        archiveDir = self.prefs.getPrefVar("Log Archive Dir").getValue()
+        if not (doRecord and archiveDir):
+            self.keyHistory.stop()
+            return
+        try:
+            self.keyHistory.start(
+                historyDir = os.path.join(archiveDir, KeyHistoryDirName),
+                maxNights = self.prefs.getPrefVar("Log Archive Nights").getValue(),
+            )
+        except Exception as e:
+            self.keyHistory.stop()
+            self.logMsg("Could not record key history: %s" % (e,), severity=RO.Constants.sevWarning)
+
+    def _recordReply(self, sock, replyStr):
+        """Connection read callback: record one reply from the hub
+        """
+        if not self.hubRecorder:
+            return
+        try:
+            self.hubRecorder.append(replyStr)
+        except Exception as e:
+            self.stopRecording()
+            self.logMsg("Could not record hub traffic; recording stopped: %s" % (e,), severity=RO.Constants.sevWarning)
+
+    def startRecording(self, filePath):
+        """Start recording all replies from the hub (with their receive times) to a new file
+
+        Stops any current recording first. See TUI.Models.HubRecording for the format
+        and TUI.Base.ReplayDispatcher to replay a recording.
+        Raise RuntimeError if the file already exists.
+        """
+        self.stopRecording()
+        self.hubRecorder = HubRecording.HubRecordingWriter(filePath)
+        self.getConnection().addReadCallback(self._recordReply)
+
+    def stopRecording(self):
+        """Stop recording hub traffic (if recording)"""
+        hubRecorder, self.hubRecorder = self.hubRecorder, None
+        if hubRecorder:
+            self.getConnection().removeReadCallback(self._recordReply)
+            hubRecorder.close()
+
     def getConnection(self):
         """Return the network connection, an RO.Comm.HubConnection object.
         """
@@ -206,6 +354,10 @@ class Model(object):
             if doTraceback:
                 traceback.print_exc(file=sys.stderr)
 
+def logToStdOut(logSource):
+    """Print the most recent log entry; a LogSource callback used in test mode"""
+    print logSource.lastEntry.getStr(), # final comma prevents extra newlines
+
 def getBaseHelpURL():
     """Return the file URL to the base directory for help"""
     # set up the base URL for TUI help
@@ -22,6 +22,7 @@ Gets the sounds from TUI preferences.
                     Also changed the sound for invalid keys to Serious Alert from Critical Alert.
 2010-03-12 ROwen    Changed to use Models.getModel.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Play nothing if the TUI model is headless (has no preferences).
 """
 import TUI.Models
 
@@ -34,6 +35,9 @@ def _playSound(name):
     global _Prefs, _PlaySoundsPref
     if _Prefs is None:
         _Prefs = TUI.Models.getModel("tui").prefs
+        if _Prefs is None:
+            # headless
+            return
         _PlaySoundsPref = _Prefs.getPrefVar("Play Sounds")
     if _PlaySoundsPref.getValue():
         _Prefs.getPrefVar(name).play()
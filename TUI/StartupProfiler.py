@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""Record a hierarchical timeline of STUI startup and save it as a Chrome trace or speedscope file
+
+Enable by running STUI with --profile-startup[=path] (see startFromArgv). Records:
+- each import that loads one or more new modules (category "import"), nested by import
+- each phase of TUI.Main.runTUI (category "startup"; see span)
+- the creation of each window (category "window"), including lazily loaded windows
+    when they are first shown (see instrumentTLSet and TUI.WindowModuleUtil.LazyWdg)
+- the loading of each keyword dictionary (category "keys"; see instrumentKeysDictionary)
+
+Profiling stops, and the timeline is written, once the Tk event loop is first idle (see stopWhenIdle).
+View a Chrome trace in chrome://tracing or https://ui.perfetto.dev; view a speedscope file
+at https://www.speedscope.app. The format is chosen by file name: a name ending in ".speedscope.json"
+gives a speedscope file; any other name gives a Chrome trace.
+
+Only events on the main thread are recorded. The overhead when not profiling is negligible:
+span returns a shared do-nothing object.
+
+History:
+2026-10-18          Initial version.
+"""
+import __builtin__
+import json
+import os
+import sys
+import thread
+import time
+
+__all__ = ["StartupProfiler", "startFromArgv", "start", "stop", "stopWhenIdle", "span",
+    "instrumentTLSet", "instrumentKeysDictionary", "isProfiling"]
+
+ArgName = "--profile-startup"
+DefFileName = "stuiStartup.trace.json"
+SpeedscopeSuffix = ".speedscope.json"
+
+_profiler = None # the active StartupProfiler, if any
+
+
+class _NullSpan(object):
+    """A span that does nothing; returned by span when not profiling"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+_nullSpan = _NullSpan()
+
+
+class _Span(object):
+    """A timed span of the active profiler; use as a context manager"""
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.profiler.begin(self.name, self.category)
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.end()
+        return False
+
+
+class StartupProfiler(object):
+    """Record a timeline of nested spans
+
+    Fields include:
+    - filePath: path of output file
+    - fileFormat: "chrome" or "speedscope"
+    - startTime: time at which profiling started (unix sec)
+    - eventList: list of completed spans: (name, category, start time, end time),
+        where times are relative to startTime (sec)
+    """
+    def __init__(self, filePath, fileFormat=None):
+        """Create a StartupProfiler; call install to record imports
+
+        Inputs:
+        - filePath: path of output file
+        - fileFormat: "chrome" or "speedscope"; if None then "speedscope" if filePath ends with SpeedscopeSuffix,
+            else "chrome"
+        """
+        if fileFormat is None:
+            fileFormat = "speedscope" if filePath.endswith(SpeedscopeSuffix) else "chrome"
+        if fileFormat not in ("chrome", "speedscope"):
+            raise RuntimeError("Unknown fileFormat %r" % (fileFormat,))
+        self.filePath = os.path.abspath(filePath)
+        self.fileFormat = fileFormat
+        self.startTime = time.time()
+        self.eventList = []
+        self._stack = [] # list of (name, category, start time) for open spans
+        self._threadID = thread.get_ident()
+        self._origImport = None
+
+    def begin(self, name, category="startup"):
+        """Start a span; spans must be ended in the reverse order in which they were begun"""
+        self._stack.append((name, category, time.time() - self.startTime))
+
+    def end(self):
+        """End the most recently begun span"""
+        name, category, startTime = self._stack.pop()
+        self.eventList.append((name, category, startTime, time.time() - self.startTime))
+
+    def install(self):
+        """Start recording imports"""
+        if self._origImport is not None:
+            return
+        self._origImport = __builtin__.__import__
+        __builtin__.__import__ = self._import
+
+    def uninstall(self):
+        """Stop recording imports"""
+        if self._origImport is None:
+            return
+        __builtin__.__import__ = self._origImport
+        self._origImport = None
+
+    def write(self):
+        """Write the timeline to filePath (closing any open spans first)"""
+        while self._stack:
+            self.end()
+        if self.fileFormat == "speedscope":
+            data = self._getSpeedscopeData()
+        else:
+            data = self._getChromeData()
+        with open(self.filePath, "w") as outFile:
+            json.dump(data, outFile)
+
+    def _getChromeData(self):
+        """Return the timeline in Chrome trace event format"""
+        pid = os.getpid()
+        traceEvents = [dict(name="process_name", ph="M", pid=pid, tid=1, args=dict(name="STUI startup"))]
+        for name, category, startTime, endTime in self.eventList:
+            traceEvents.append(dict(
+                name = name,
+                cat = category,
+                ph = "X",
+                ts = startTime * 1e6,
+                dur = (endTime - startTime) * 1e6,
+                pid = pid,
+                tid = 1,
+            ))
+        return dict(traceEvents=traceEvents, displayTimeUnit="ms")
+
+    def _getSpeedscopeData(self):
+        """Return the timeline in speedscope's evented profile format"""
+        frameIndDict = dict() # dict of frame name: index in frameList
+        frameList = []
+        markList = [] # list of (sort key, event)
+        for name, category, startTime, endTime in self.eventList:
+            frameName = "%s: %s" % (category, name)
+            frameInd = frameIndDict.get(frameName)
+            if frameInd is None:
+                frameInd = len(frameList)
+                frameIndDict[frameName] = frameInd
+                frameList.append(dict(name=frameName))
+            startMS = startTime * 1000.0
+            endMS = endTime * 1000.0
+            # at equal times: close before open; open outer spans first; close inner spans first
+            markList.append(((startMS, 1, -endMS), dict(type="O", frame=frameInd, at=startMS)))
+            markList.append(((endMS, 0, -startMS), dict(type="C", frame=frameInd, at=endMS)))
+        markList.sort(key=lambda mark: mark[0])
+        endValue = max([0] + [endTime * 1000.0 for name, category, startTime, endTime in self.eventList])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": dict(frames=frameList),
+            "profiles": [dict(
+                type = "evented",
+                name = "STUI startup",
+                unit = "milliseconds",
+                startValue = 0,
+                endValue = endValue,
+                events = [event for sortKey, event in markList],
+            )],
+            "name": "STUI startup",
+            "exporter": "TUI.StartupProfiler",
+        }
+
+    def _import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        """Replacement for __import__ that records imports that load new modules"""
+        if (name in sys.modules and not fromlist) or thread.get_ident() != self._threadID:
+            # already imported (or not the main thread)
+            return self._origImport(name, globals, locals, fromlist, level)
+        numModules = len(sys.modules)
+        stackLen = len(self._stack)
+        self._stack.append((name, "import", time.time() - self.startTime))
+        try:
+            return self._origImport(name, globals, locals, fromlist, level)
+        finally:
+            # the span may have been closed if the profiler was written during the import
+            if len(self._stack) > stackLen:
+                if len(sys.modules) > numModules:
+                    self.end()
+                else:
+                    self._stack.pop()
+
+    def __str__(self):
+        return "StartupProfiler(%r; %d events)" % (self.filePath, len(self.eventList))
+
+
+def startFromArgv(argv=None):
+    """Start profiling if ArgName (--profile-startup or --profile-startup=path) is in argv
+
+    Inputs:
+    - argv: list of command-line arguments; if None then use sys.argv.
+        The profiling argument is removed from argv.
+
+    Return the profiler, or None if not profiling
+    """
+    if argv is None:
+        argv = sys.argv
+    for ind, arg in enumerate(argv):
+        if arg == ArgName or arg.startswith(ArgName + "="):
+            del argv[ind]
+            filePath = arg[len(ArgName) + 1:] or DefFileName
+            return start(filePath)
+    return None
+
+def start(filePath, fileFormat=None):
+    """Start profiling (including imports); return the profiler
+
+    If already profiling, return the active profiler.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler(filePath, fileFormat=fileFormat)
+        _profiler.install()
+    return _profiler
+
+def stop():
+    """Stop profiling and write the timeline; return the path of the file, or None if not profiling
+    """
+    global _profiler
+    profiler = _profiler
+    if profiler is None:
+        return None
+    _profiler = None
+    profiler.uninstall()
+    profiler.write()
+    return profiler.filePath
+
+def stopWhenIdle(tkWdg, logFunc=None):
+    """Stop profiling and write the timeline once the Tk event loop is idle
+    and all pending events have been processed; a no-op if not profiling
+
+    Inputs:
+    - tkWdg: any Tk widget
+    - logFunc: function to call with a message when the timeline has been written, or None
+    """
+    if _profiler is None:
+        return
+
+    def doStop():
+        with span("first update"):
+            tkWdg.update()
+        try:
+            filePath = stop()
+        except Exception as e:
+            msgStr = "Could not write startup profile: %s" % (e,)
+        else:
+            msgStr = "Wrote startup profile to %r" % (filePath,)
+        sys.stdout.write(msgStr + "\n")
+        if logFunc:
+            logFunc(msgStr)
+
+    tkWdg.after_idle(doStop)
+
+def isProfiling():
+    """Return True if profiling"""
+    return _profiler is not None
+
+def span(name, category="startup"):
+    """Return a context manager that records a span of the given name, if profiling
+    """
+    if _profiler is None:
+        return _nullSpan
+    return _Span(_profiler, name, category)
+
+def instrumentTLSet(tlSet):
+    """Record the creation of each window created by tlSet.createToplevel, if profiling
+    """
+    if _profiler is None:
+        return
+    createToplevel = tlSet.createToplevel
+
+    def timedCreateToplevel(name, *args, **kargs):
+        with span(name, "window"):
+            return createToplevel(name, *args, **kargs)
+    tlSet.createToplevel = timedCreateToplevel
+
+def instrumentKeysDictionary():
+    """Record the loading of each keyword dictionary, if profiling
+    """
+    if _profiler is None:
+        return
+    import opscore.protocols.keys
+    KeysDictionary = opscore.protocols.keys.KeysDictionary
+    load = KeysDictionary.load
+
+    def timedLoad(dictname, *args, **kargs):
+        with span(dictname, "keys"):
+            return load(dictname, *args, **kargs)
+    KeysDictionary.load = staticmethod(timedLoad)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for suffix in (".trace.json", SpeedscopeSuffix):
+        fileDesc, filePath = tempfile.mkstemp(suffix=suffix)
+        os.close(fileDesc)
+        start(filePath)
+        with span("outer"):
+            import xml.dom.minidom # recorded as an import span the first time
+            xml.dom.minidom.parseString("<outer><inner/></outer>")
+            with span("inner"):
+                time.sleep(0.01)
+        print "Profiled %d events" % (len(_profiler.eventList),)
+        stop()
+        with open(filePath, "r") as inFile:
+            data = json.load(inFile)
+        print filePath, sorted(data.keys())
+        os.remove(filePath)
@@ -36,6 +36,8 @@ History:
 2009-07-19 ROwen    Updated for new opscore PVT handling.
 2009-09-14 ROwen    Added WindowName variable; tweaked default geometry.
 2010-03-12 ROwen    Changed to use Models.getModel.
+2026-10-18          Only call the axePos and tccPos callbacks when the values change
+                    (the TCC outputs them repeatedly); see TUI.Models.ChangeFilter.
 """
 import Tkinter
 import tkFont
@@ -44,6 +46,7 @@ import RO.MathUtil
 import RO.Wdg
 import RO.CanvasUtil
 import TUI.Models
+import TUI.Models.ChangeFilter
 
 WindowName = "TCC.Focal Plane"
 _HelpPage = "Telescope/FocalPlaneWin.html"
@@ -271,8 +274,8 @@ class FocalPlaneWdg (Tkinter.Frame):
         self.tccModel.inst.addValueCallback(self.instNameWdg.set)
         self.tccModel.objInstAng.addValueCallback(self.userAxis.setAng, cnvFunc=RO.CnvUtil.posFromPVT)
         self.tccModel.spiderInstAng.addValueCallback(self.horizonAxis.setAng, cnvFunc=RO.CnvUtil.posFromPVT)
-        self.tccModel.axePos.addCallback(self._axePosCallback)
-        self.tccModel.tccPos.addCallback(self._tccPosCallback)
+        self.tccModel.axePos.addCallback(TUI.Models.ChangeFilter.onChange(self._axePosCallback))
+        self.tccModel.tccPos.addCallback(TUI.Models.ChangeFilter.onChange(self._tccPosCallback))
         self.tccModel.rotLim.addCallback(self._rotLimCallback)
         self.tccModel.iimScale.addCallback(self._iimScaleCallback)
 
@@ -47,17 +47,24 @@ History:
 2012-07-09 ROwen    Modified to use RO.TkUtil.Timer.
 2012-08-31 ROwen    Bug fix: change sr.isExecuting() to sr.isExecuting.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Only call the axePos and tccPos callbacks when the values change
+                    (the TCC outputs them repeatedly); see TUI.Models.ChangeFilter.
+2026-10-18          Compute catalog object positions in one vectorized pass per catalog
+                    (see TUI.TCC.TelTarget.Catalog.getAzAltArr) instead of one object at a time.
 """
 import math
 import Tkinter
+import numpy
 import RO.CanvasUtil
 import RO.CnvUtil
 import RO.MathUtil
+import RO.PhysConst
 from RO.TkUtil import Timer
 import RO.Wdg
 from opscore.actor import ScriptRunner
 import TUI.Base.Wdg
 import TUI.Models
+import TUI.Models.ChangeFilter
 import TUI.TCC.UserModel
 import TUI.TCC.SlewWdg.SlewWindow
 
@@ -202,8 +209,8 @@ class SkyWdg (Tkinter.Frame):
         self._setSize()
         
         # set up automatic update of current and target telescope position
-        self.tccModel.axePos.addCallback(self._axePosCallback)
-        self.tccModel.tccPos.addCallback(self._tccPosCallback)
+        self.tccModel.axePos.addCallback(TUI.Models.ChangeFilter.onChange(self._axePosCallback))
+        self.tccModel.tccPos.addCallback(TUI.Models.ChangeFilter.onChange(self._tccPosCallback))
         self.tccModel.azLim.addCallback(self.setAzLim)
         
         self.userModel.potentialTarget.addCallback(self.setTelPotential)
@@ -379,7 +386,7 @@ class SkyWdg (Tkinter.Frame):
                 self.catColorDict[catName] = color
                 
 #           print "compute %s thread starting" % catName
-            yield sr.waitThread(_UpdateCatalog, catalog.objList, self.center, self.azAltScale)
+            yield sr.waitThread(_UpdateCatalog, catalog, self.center, self.azAltScale)
             pixPosObjList = sr.value
 #           print "compute %s thread done" % catName
 
@@ -652,25 +659,22 @@ class SkyWdg (Tkinter.Frame):
         self._telPotentialAnimTimer.start(_CatRedrawDelay, self._drawTelPotential)
 
 
-def _UpdateCatalog(objList, center, azAltScale):
-    """Returns a list of [pixPos, obj] for the specified catalog.
+def _UpdateCatalog(catalog, center, azAltScale):
+    """Returns a list of [pixPos, obj] for the objects in the specified catalog
+    that are above the horizon.
     Can be run as a background thread.
     """
-    pixPosObjList = []
-    for catObj in objList:
-        azAlt = catObj.getAzAlt()
-        if azAlt[1] < 0:
-            continue
-        
-        xyDeg = xyDegFromAzAlt(azAlt)
-        pixPos = (
-            center[0] - (xyDeg[0] * azAltScale),
-            center[1] - (xyDeg[1] * azAltScale),
-        )
+    azAltArr = catalog.getAzAltArr()
 
-        pixPosObjList.append((pixPos, catObj))
+    # as xyDegFromAzAlt and SkyWdg.pixFromDeg, but for all objects at once
+    thetaRad = (azAltArr[:, 0] - 90.0) * RO.PhysConst.RadPerDeg
+    r = 90.0 - azAltArr[:, 1]
+    xPixList = (center[0] - (r * numpy.cos(thetaRad) * azAltScale)).tolist()
+    yPixList = (center[1] - (r * numpy.sin(thetaRad) * azAltScale)).tolist()
 
-    return pixPosObjList
+    objList = catalog.getObjList()
+    return [((xPixList[ind], yPixList[ind]), objList[ind])
+        for ind in numpy.flatnonzero(azAltArr[:, 1] >= 0)]
 
 if __name__ == '__main__':
     import random
@@ -49,6 +49,8 @@ History:
                     Bug fix: timing of next update was miscomputed.
 2014-10-02 ROwen    Relabelled "MJD" to "SJD" to reduce confusion.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Only call the axePos callback when the value changes (the TCC outputs it repeatedly);
+                    see TUI.Models.ChangeFilter.
 """
 import time
 import Tkinter
@@ -62,6 +64,7 @@ import RO.Wdg
 import TUI.PlaySound
 import TUI.TCC.TelConst
 import TUI.Models
+import TUI.Models.ChangeFilter
 
 # add instrument angles
 
@@ -249,7 +252,7 @@ class MiscWdg (Tkinter.Frame):
         gr.allGridded()
 
         # add callbacks
-        self.tccModel.axePos.addCallback(self._setAxePos)
+        self.tccModel.axePos.addCallback(TUI.Models.ChangeFilter.onChange(self._setAxePos))
         self.mcpModel.instrumentNum.addCallback(self.setCartridgeInfo)
 
         # start clock updates
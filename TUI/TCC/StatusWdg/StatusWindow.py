@@ -14,6 +14,8 @@ History:
 2009-09-09 ROwen    Added this window to the TCC menu.
 2009-11-05 ROwen    Added WindowName.
 2011-02-16 ROwen    Added AxisOffsetWdg and moved MiscWdg above the offsets.
+2026-10-18          Keep this window's keyword callbacks active while hidden (see TUI.Base.WindowSuspender)
+                    to play axis sounds.
 """
 import Tkinter
 import AxisStatus
@@ -23,6 +25,7 @@ import OffsetWdg
 import AxisOffsetWdg
 import RO.Wdg
 import TUI.Base.Wdg
+import TUI.Base.WindowSuspender
 import SlewStatus
 
 WindowName = "TCC.Status"
@@ -37,6 +40,7 @@ def addWindow(tlSet):
         closeMode = RO.Wdg.tl_CloseDisabled,
         wdgFunc = StatusWdg,
     )
+    TUI.Base.WindowSuspender.keepActive(WindowName)
 
 _HelpPrefix = "Telescope/StatusWin.html#"
 
@@ -15,21 +15,36 @@ History:
 2005-06-08 ROwen    Changed TelTarget to a new-style class.
 2005-07-07 ROwen    Modified for moved RO.TkUtil.
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
+2026-10-18          Added getAzAltArr function and Catalog.getAzAltArr method to compute the az/alt
+                    of many objects in one vectorized pass; added ut1 argument to TelTarget.getAzAlt.
 """
 import sys
+import numpy
 import RO.AddCallback
 import RO.SeqUtil
 import RO.StringUtil
 import RO.Astro.Cnv
 import RO.Astro.Sph
+import RO.Astro.Tm
 import RO.CoordSys
 import RO.MathUtil
+import RO.PhysConst
 import RO.TkUtil
 import TelConst
 
 # default color for displaying catalog objects
 _DefColor = 'black'
 
+# mean coordinate systems that getAzAltArr can convert;
+# Catalog.getAzAltArr converts objects in other coordinate systems one at a time
+BatchCSysList = (RO.CoordSys.ICRS, RO.CoordSys.FK5, RO.CoordSys.Galactic)
+
+# constants for getAzAltArr, as in RO.Astro.Sph.ccFromSCPV:
+# objects with a smaller parallax (arcsec) are treated as very far away (at this parallax, with no radial velocity)
+_MinParallax = 1.0e-7
+_RadPerYear_per_ASPerCy = RO.PhysConst.RadPerDeg / (RO.PhysConst.ArcSecPerDeg * 100.0)
+_AUPerYear_per_KMPerSec = RO.PhysConst.SecPerDay * RO.PhysConst.DayPerYear / RO.PhysConst.KmPerAU
+
 class TelTarget(object):
     """A potential target position for the telescope.
     It is primarily used to display that position on an az/alt display.
@@ -46,17 +61,26 @@ class TelTarget(object):
     def __init__(self, valueDict=None):
         self.setValueDict(valueDict)
 
-    def getAzAlt(self):
-        """Returns the current (az, alt) of the object, in degrees"""
+    def getAzAlt(self, ut1=None):
+        """Returns the current (az, alt) of the object, in degrees
+
+        Inputs:
+        - ut1: date at which to compute az, alt (UT1 MJD); if None then now
+        """
         if self.csysConst is None:
             return None
-            
+
+        fromDate = self.dateFloat
+        if fromDate is None and ut1 is not None and not self.csysConst.dateIsYears():
+            # the default date of apparent coordinates is now, i.e. ut1
+            fromDate = ut1
+
         toPos, toPM, toParlax, toRadVel, toDir, scaleChange, atInf, atPole = RO.Astro.Sph.coordConv(
             fromPos = self.posDeg,
             fromSys = self.csysConst.name(),
-            fromDate = self.dateFloat,
+            fromDate = fromDate,
             toSys = self.TopoConst.name(),
-            toDate = None,
+            toDate = ut1,
             obsData = self.ObsData,
             fromPM = self.pm,
             fromParlax = self.parlax,
@@ -187,12 +211,48 @@ class Catalog(RO.AddCallback.BaseMixin):
             raise RuntimeError("objList=%r; must be a sequence" % objList)
         self.objList = objList
 
+        self._batchList = None # cached input for getAzAltArr; see _makeBatchList
+        self._scalarIndList = None # indices of objects getAzAltArr converts one at a time
+
         self.setDoDisplay(doDisplay)
         self.setDispColor(dispColor)
         
         if callFunc:
             self.addCallback(callFunc)
     
+    def getAzAltArr(self, ut1=None):
+        """Returns the current (az, alt) of all objects, in degrees, as an N x 2 array
+        (in the order of the object list)
+
+        Objects in a coordinate system in BatchCSysList are converted using the getAzAltArr function:
+        one vectorized pass per coordinate system and date. Other objects are converted one at a time
+        using their getAzAlt method. The az, alt of an object with no position is NaN, NaN.
+
+        The positions, proper motions, etc. of the objects are read once and cached,
+        so changing an object after the first call has no effect.
+
+        Inputs:
+        - ut1: date at which to compute az, alt (UT1 MJD); if None then now
+        """
+        if ut1 is None:
+            ut1 = RO.Astro.Tm.utcFromPySec()
+        if self._batchList is None:
+            self._makeBatchList()
+
+        azAltArr = numpy.empty((len(self.objList), 2), dtype=float)
+        azAltArr.fill(numpy.nan)
+        for indArr, csys, date, posArr, pmArr, parlaxArr, radVelArr in self._batchList:
+            azAltArr[indArr] = getAzAltArr(posArr, csys, date, pmArr, parlaxArr, radVelArr, ut1=ut1)
+        for ind in self._scalarIndList:
+            obj = self.objList[ind]
+            if isinstance(obj, TelTarget):
+                azAlt = obj.getAzAlt(ut1=ut1)
+            else:
+                azAlt = obj.getAzAlt()
+            if azAlt is not None:
+                azAltArr[ind] = azAlt
+        return azAltArr
+
     def getDispColor(self):
         """Returns the desired display color.
         """
@@ -233,3 +293,137 @@ class Catalog(RO.AddCallback.BaseMixin):
 #       print "setDoDisplay(%r)" % (doDisplay,)
         self._doDisplay = bool(doDisplay)
         self._doCallbacks()
+
+    def _makeBatchList(self):
+        """Set _batchList and _scalarIndList from the object list.
+
+        _batchList is a list of (indArr, csys, date, posArr, pmArr, parlaxArr, radVelArr),
+        one entry per coordinate system and date, where indArr is the indices of the objects
+        and the other items are arguments for getAzAltArr.
+        """
+        indListDict = {} # dict of (coordinate system name, date): list of object indices
+        scalarIndList = []
+        for ind, obj in enumerate(self.objList):
+            csysConst = getattr(obj, "csysConst", None)
+            if csysConst is None or csysConst.name() not in BatchCSysList:
+                scalarIndList.append(ind)
+                continue
+            indListDict.setdefault((csysConst.name(), obj.dateFloat), []).append(ind)
+
+        batchList = []
+        for (csys, date), indList in sorted(indListDict.iteritems()):
+            objList = [self.objList[ind] for ind in indList]
+            batchList.append((
+                numpy.array(indList, dtype=int),
+                csys,
+                date,
+                numpy.array([obj.posDeg for obj in objList], dtype=float),
+                numpy.array([obj.pm for obj in objList], dtype=float),
+                numpy.array([obj.parlax for obj in objList], dtype=float),
+                numpy.array([obj.radVel for obj in objList], dtype=float),
+            ))
+        self._batchList = batchList
+        self._scalarIndList = scalarIndList
+
+
+def getAzAltArr(posArr, csys, date=None, pmArr=None, parlaxArr=None, radVelArr=None, ut1=None):
+    """Compute the current (az, alt) of many objects in one mean coordinate system in one vectorized pass.
+
+    This performs the same conversion as TelTarget.getAzAlt (RO.Astro.Sph.coordConv
+    to Topocentric at TelTarget.ObsData), but for all objects at once, and without
+    converting an offset position (needed only for the unused reference direction).
+    The star-independent data (precession, nutation, aberration and sidereal time)
+    is computed once per call instead of once per object.
+
+    Inputs:
+    - posArr: positions (deg) as an N x 2 array of (equatorial, polar angle), e.g. (RA, Dec)
+    - csys: name of coordinate system; must be in BatchCSysList
+    - date: date of the positions (Julian epoch); if None then the default date for csys
+    - pmArr: proper motions (arcsec/century) as an N x 2 array; if None then 0
+    - parlaxArr: parallaxes (arcsec) as an array of N values; if None then 0
+    - radVelArr: radial velocities (km/sec, positive receding) as an array of N values; if None then 0
+    - ut1: date at which to compute az, alt (UT1 MJD); if None then now
+
+    Returns (az, alt) in degrees as an N x 2 array; az is in the range [0, 360)
+
+    Raise RuntimeError if csys is not in BatchCSysList.
+    """
+    csysConst = RO.CoordSys.getSysConst(csys)
+    csys = csysConst.name()
+    if csys not in BatchCSysList:
+        raise RuntimeError("Cannot convert %s coordinates; must be one of %s" % (csys, ", ".join(BatchCSysList)))
+    if date is None:
+        date = csysConst.currDefaultDate()
+    if ut1 is None:
+        ut1 = RO.Astro.Tm.utcFromPySec()
+
+    posArr = numpy.asarray(posArr, dtype=float).reshape(-1, 2)
+    numObj = len(posArr)
+    pmArr = numpy.zeros((numObj, 2)) if pmArr is None else numpy.asarray(pmArr, dtype=float).reshape(-1, 2)
+    parlaxArr = numpy.zeros(numObj) if parlaxArr is None else numpy.asarray(parlaxArr, dtype=float)
+    radVelArr = numpy.zeros(numObj) if radVelArr is None else numpy.asarray(radVelArr, dtype=float)
+
+    # cartesian position (au) and velocity (au/year), as 3 x N arrays (see RO.Astro.Sph.ccFromSCPV)
+    atInf = parlaxArr < _MinParallax
+    parlaxArr = numpy.where(atInf, _MinParallax, parlaxArr)
+    radVelArr = numpy.where(atInf, 0.0, radVelArr)
+    distAU = RO.PhysConst.AUPerParsec / parlaxArr
+    posRad = posArr * RO.PhysConst.RadPerDeg
+    sinP0 = numpy.sin(posRad[:, 0])
+    cosP0 = numpy.cos(posRad[:, 0])
+    sinP1 = numpy.sin(posRad[:, 1])
+    cosP1 = numpy.cos(posRad[:, 1])
+    meanP = numpy.array((cosP1 * cosP0, cosP1 * sinP0, sinP1)) * distAU
+    pm0AUPerYr = pmArr[:, 0] * distAU * _RadPerYear_per_ASPerCy
+    pm1AUPerYr = pmArr[:, 1] * distAU * _RadPerYear_per_ASPerCy
+    radVelAUPerYr = radVelArr * _AUPerYear_per_KMPerSec
+    meanV = numpy.array((
+        - pm0AUPerYr*cosP1*sinP0 - pm1AUPerYr*sinP1*cosP0 + radVelAUPerYr*cosP1*cosP0,
+          pm0AUPerYr*cosP1*cosP0 - pm1AUPerYr*sinP1*sinP0 + radVelAUPerYr*cosP1*sinP0,
+                                   pm1AUPerYr*cosP1       + radVelAUPerYr*sinP1,
+    ))
+
+    # convert to ICRS at J2000 (these RO.Astro.Cnv functions handle 3 x N arrays)
+    if csys == RO.CoordSys.ICRS:
+        icrsP = meanP + meanV * (2000.0 - date)
+        icrsV = meanV
+    elif csys == RO.CoordSys.FK5:
+        icrsP, icrsV = RO.Astro.Cnv.fk5Prec(meanP, meanV, date, 2000.0)
+    else:
+        icrsP, icrsV = RO.Astro.Cnv.icrsFromGal(meanP, meanV, date)
+
+    # convert to apparent geocentric (see RO.Astro.Cnv.geoFromICRS)
+    agData = RO.Astro.Cnv.AppGeoData(RO.Astro.Tm.epJFromMJD(ut1))
+    bVelC = numpy.asarray(agData.bVelC, dtype=float)
+    p2 = icrsP + icrsV * agData.dtPM - numpy.asarray(agData.bPos, dtype=float)[:, numpy.newaxis]
+    p2Mag = numpy.sqrt(numpy.sum(p2 * p2, axis=0))
+    dot2 = numpy.dot(bVelC, p2) / p2Mag
+    vfac = p2Mag * (1.0 + dot2 / (1.0 + agData.bGamma))
+    p3 = ((p2 * agData.bGamma) + (vfac * bVelC[:, numpy.newaxis])) / (1.0 + dot2)
+    geoP = numpy.dot(agData.pnMat, p3)
+
+    # convert to apparent topocentric (see RO.Astro.Cnv.topoFromGeo)
+    obsData = TelTarget.ObsData
+    last = RO.Astro.Tm.lastFromUT1(ut1, obsData.longitude)
+    sinLAST = RO.MathUtil.sind(last)
+    cosLAST = RO.MathUtil.cosd(last)
+    posB = numpy.array((
+         cosLAST * geoP[0] + sinLAST * geoP[1] - obsData.p[0],
+        -sinLAST * geoP[0] + cosLAST * geoP[1] - obsData.p[1],
+         geoP[2] - obsData.p[2],
+    ))
+    bMag = numpy.sqrt(numpy.sum(posB * posB, axis=0))
+    diurAbScaleCorr = 1.0 - (obsData.diurAbVecMag * posB[1] / bMag)
+    posC = numpy.array((
+         posB[0] * diurAbScaleCorr,
+        (posB[1] + (obsData.diurAbVecMag * bMag)) * diurAbScaleCorr,
+         posB[2] * diurAbScaleCorr,
+    ))
+    topoP = RO.Astro.Cnv.azAltFromHADec(posC, obsData.latitude)
+
+    # convert to spherical coordinates (see RO.Astro.Sph.scFromCC)
+    azArr = numpy.arctan2(topoP[1], topoP[0]) / RO.PhysConst.RadPerDeg
+    azArr = numpy.where(azArr < 0.0, azArr + 360.0, azArr)
+    altArr = numpy.arctan2(topoP[2], numpy.sqrt((topoP[0] * topoP[0]) + (topoP[1] * topoP[1]))) \
+        / RO.PhysConst.RadPerDeg
+    return numpy.column_stack((azArr, altArr))
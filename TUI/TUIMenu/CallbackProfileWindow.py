@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""Callback Profile window: show which keyword variable callbacks use the most time.
+
+Statistics come from the callback profiler of the TUI model (TUI.Models.CallbackProfiler),
+which is disabled until enabled in this window.
+
+History:
+2026-10-18          Initial version.
+"""
+import Tkinter
+import tkFileDialog
+import opscore.utility.timer
+import RO.CnvUtil
+import RO.Constants
+import RO.Wdg
+import TUI.Models
+import TUI.Version
+
+WindowName = "%s.Callback Profile" % (TUI.Version.ApplicationName,)
+_HelpPage = "TUIMenu/CallbackProfileWin.html"
+_UpdateInterval = 5.0 # sec
+_MaxNumShown = 100
+
+# dict of sort menu item: CallbackStats field or property
+_SortKeyDict = {
+    "Total": "totSec",
+    "Max": "maxSec",
+    "Mean": "meanSec",
+    "Calls": "numCalls",
+}
+
+def addWindow(tlSet):
+    tlSet.createToplevel(
+        name = WindowName,
+        defGeom = "760x300+0+722",
+        visible = False,
+        resizable = True,
+        wdgFunc = CallbackProfileWdg,
+    )
+
+class CallbackProfileWdg(Tkinter.Frame):
+    """Display the most costly keyword variable callbacks
+
+    Inputs:
+    - master    parent widget
+    - height    default height of text widget
+    - width     default width of text widget
+    - other keyword arguments are used for the frame
+    """
+    def __init__ (self,
+        master=None,
+        height = 15,
+        width = 100,
+    **kargs):
+        Tkinter.Frame.__init__(self, master, **kargs)
+
+        tuiModel = TUI.Models.getModel("tui")
+        self.profiler = tuiModel.callbackProfiler
+        self.updateTimer = opscore.utility.timer.Timer()
+
+        ctrlFrame = Tkinter.Frame(self)
+        self.enableWdg = RO.Wdg.Checkbutton(
+            master = ctrlFrame,
+            text = "Profile",
+            defValue = self.profiler.isEnabled,
+            callFunc = self._doEnable,
+            helpText = "Profile keyword callbacks?",
+            helpURL = _HelpPage,
+        )
+        self.enableWdg.pack(side="left")
+        RO.Wdg.StrLabel(
+            master = ctrlFrame,
+            text = "Sort by",
+        ).pack(side="left")
+        self.sortWdg = RO.Wdg.OptionMenu(
+            master = ctrlFrame,
+            items = ("Total", "Max", "Mean", "Calls"),
+            defValue = "Total",
+            callFunc = self._doSort,
+            helpText = "Show the callbacks with the largest value of this first",
+            helpURL = _HelpPage,
+        )
+        self.sortWdg.pack(side="left")
+        self.resetWdg = RO.Wdg.Button(
+            master = ctrlFrame,
+            text = "Reset",
+            callFunc = self._doReset,
+            helpText = "Discard all statistics",
+            helpURL = _HelpPage,
+        )
+        self.resetWdg.pack(side="left")
+        self.saveWdg = RO.Wdg.Button(
+            master = ctrlFrame,
+            text = "Save...",
+            callFunc = self._doSave,
+            helpText = "Save statistics for all callbacks to a file",
+            helpURL = _HelpPage,
+        )
+        self.saveWdg.pack(side="left")
+        ctrlFrame.grid(row=0, column=0, columnspan=2, sticky="w")
+
+        self.yscroll = Tkinter.Scrollbar (
+            master = self,
+            orient = "vertical",
+        )
+        self.text = Tkinter.Text (
+            master = self,
+            yscrollcommand = self.yscroll.set,
+            wrap = "none",
+            tabs = "3.5c 8.5c right 11.0c right 13.0c right 15.0c right 17.0c 17.5c",
+            height = height,
+            width = width,
+        )
+        self.yscroll.configure(command=self.text.yview)
+        self.text.grid(row=1, column=0, sticky="nsew")
+        self.yscroll.grid(row=1, column=1, sticky="ns")
+        RO.Wdg.Bindings.makeReadOnly(self.text)
+        RO.Wdg.addCtxMenu(
+            wdg = self.text,
+            helpURL = _HelpPage,
+        )
+        self.text.tag_configure("header", underline=True)
+
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.bind("<Map>", self._mapCallback)
+        self.updDisplay()
+
+    def updDisplay(self):
+        """Display current statistics and schedule the next update (if the window is visible)
+        """
+        self.updateTimer.cancel()
+        if not self.winfo_ismapped():
+            # the <Map> binding will restart updates when the window is shown
+            return
+
+        sortKey = _SortKeyDict[self.sortWdg.getString()]
+        lineList = []
+        for stats in self.profiler.getStats(sortKey=sortKey, maxNum=_MaxNumShown):
+            lineList.append("%s.%s\t%s\t%d\t%0.3f\t%0.1f\t%0.1f\t%s\n" % (stats.actor, stats.keyName,
+                stats.callbackName, stats.numCalls, stats.totSec, stats.meanSec * 1e6, stats.maxSec * 1e6,
+                stats.windowName))
+
+        self.text.delete("1.0", "end")
+        self.text.insert("end", "Keyword\tCallback\tCalls\tTotal sec\tMean usec\tMax usec\tWindow\n", "header")
+        self.text.insert("end", "".join(lineList))
+        if self.profiler.isEnabled:
+            self.updateTimer.start(_UpdateInterval, self.updDisplay)
+
+    def _doEnable(self, wdg=None):
+        if self.enableWdg.getBool():
+            self.profiler.enable()
+        else:
+            self.profiler.disable()
+        self.updDisplay()
+
+    def _doReset(self, wdg=None):
+        self.profiler.reset()
+        self.updDisplay()
+
+    def _doSave(self, wdg=None):
+        filePath = tkFileDialog.asksaveasfilename(
+            initialfile = "callbackProfile.txt",
+            title = "Callback statistics",
+        )
+        if not filePath:
+            return
+        # handle case of filePath being a weird Tcl object
+        filePath = RO.CnvUtil.asStr(filePath)
+        try:
+            self.profiler.dumpStats(filePath)
+        except Exception as e:
+            TUI.Models.getModel("tui").logMsg("Could not save callback statistics: %s" % (e,),
+                severity=RO.Constants.sevError)
+
+    def _doSort(self, wdg=None):
+        self.updDisplay()
+
+    def _mapCallback(self, evt=None):
+        self.updDisplay()
+
+
+if __name__ == "__main__":
+    import TUI.Base.TestDispatcher
+
+    testDispatcher = TUI.Base.TestDispatcher.TestDispatcher("tcc", delay=0.5)
+    tuiModel = testDispatcher.tuiModel
+    root = tuiModel.tkRoot
+
+    testFrame = CallbackProfileWdg(root)
+    testFrame.pack(expand=True, fill="both")
+    testFrame.enableWdg.set(True)
+
+    dataSet = [["AxePos=%0.1f, 45, NaN" % (az,), "TCCPos=%0.1f, 45, NaN" % (az,)] for az in range(100)]
+    testDispatcher.runDataSet(dataSet)
+
+    tuiModel.reactor.run()
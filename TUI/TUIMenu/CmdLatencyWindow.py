@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""Command Latency window: show command latency statistics per actor or per actor and command verb.
+
+Statistics come from the command tracker of the log source (TUI.Models.CmdTracker),
+which times each command from CmdQueued to CmdDone.
+
+History:
+2026-10-18          Initial version.
+"""
+import Tkinter
+import opscore.utility.timer
+import RO.Wdg
+import TUI.Models
+import TUI.Version
+
+WindowName = "%s.Command Latency" % (TUI.Version.ApplicationName,)
+_HelpPage = "TUIMenu/CmdLatencyWin.html"
+_UpdateInterval = 5.0 # sec
+
+def addWindow(tlSet):
+    tlSet.createToplevel(
+        name = WindowName,
+        defGeom = "560x250+0+722",
+        visible = False,
+        resizable = True,
+        wdgFunc = CmdLatencyWdg,
+    )
+
+class CmdLatencyWdg(Tkinter.Frame):
+    """Display command latency statistics, slowest (largest p95) first
+
+    Inputs:
+    - master    parent widget
+    - height    default height of text widget
+    - width     default width of text widget
+    - other keyword arguments are used for the frame
+    """
+    def __init__ (self,
+        master=None,
+        height = 12,
+        width = 70,
+    **kargs):
+        Tkinter.Frame.__init__(self, master, **kargs)
+
+        tuiModel = TUI.Models.getModel("tui")
+        self.cmdTracker = tuiModel.logSource.cmdTracker
+        self.updateTimer = opscore.utility.timer.Timer()
+
+        ctrlFrame = Tkinter.Frame(self)
+        self.byVerbWdg = RO.Wdg.Checkbutton(
+            master = ctrlFrame,
+            text = "By Verb",
+            callFunc = self._doByVerb,
+            helpText = "Show statistics for each command verb?",
+            helpURL = _HelpPage,
+        )
+        self.byVerbWdg.pack(side="left")
+        self.resetWdg = RO.Wdg.Button(
+            master = ctrlFrame,
+            text = "Reset",
+            callFunc = self._doReset,
+            helpText = "Discard all statistics",
+            helpURL = _HelpPage,
+        )
+        self.resetWdg.pack(side="left")
+        self.summaryWdg = RO.Wdg.StrLabel(
+            master = ctrlFrame,
+            helpText = "Number of commands running, done and timed out",
+            helpURL = _HelpPage,
+        )
+        self.summaryWdg.pack(side="left")
+        ctrlFrame.grid(row=0, column=0, columnspan=2, sticky="w")
+
+        self.yscroll = Tkinter.Scrollbar (
+            master = self,
+            orient = "vertical",
+        )
+        self.text = Tkinter.Text (
+            master = self,
+            yscrollcommand = self.yscroll.set,
+            wrap = "none",
+            tabs = "4.0c right 5.3c right 6.6c right 8.0c right 9.6c right 11.2c right 12.8c right 14.4c",
+            height = height,
+            width = width,
+        )
+        self.yscroll.configure(command=self.text.yview)
+        self.text.grid(row=1, column=0, sticky="nsew")
+        self.yscroll.grid(row=1, column=1, sticky="ns")
+        RO.Wdg.Bindings.makeReadOnly(self.text)
+        RO.Wdg.addCtxMenu(
+            wdg = self.text,
+            helpURL = _HelpPage,
+        )
+        self.text.tag_configure("header", underline=True)
+
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.bind("<Map>", self._mapCallback)
+        self.updDisplay()
+
+    def updDisplay(self):
+        """Display current statistics and schedule the next update (if the window is visible)
+        """
+        self.updateTimer.cancel()
+        if not self.winfo_ismapped():
+            # the <Map> binding will restart updates when the window is shown
+            return
+
+        tracker = self.cmdTracker
+        tracker.sweep()
+        self.summaryWdg.set("%d running, %d done, %d timed out" % (len(tracker), tracker.numDone, tracker.numTimedOut))
+
+        byVerb = self.byVerbWdg.getBool()
+        statsList = tracker.getStats(byVerb=byVerb)
+        # slowest first; actors with no completed commands last
+        statsList.sort(key=lambda cmdStats: -(cmdStats.latencyHist.getPercentile(95) or 0))
+
+        lineList = []
+        for cmdStats in statsList:
+            name = cmdStats.actor if cmdStats.verb is None else "%s %s" % (cmdStats.actor, cmdStats.verb)
+            hist = cmdStats.latencyHist
+            latencyStrList = ["%0.2f" % (latency,) if latency is not None else "?"
+                for latency in hist.getPercentiles((50, 95, 99)) + [hist.maxLatency]]
+            lineList.append("%s\t%d\t%d\t%d\t%s\n" % (name, cmdStats.numDone, cmdStats.numFailed,
+                cmdStats.numTimedOut, "\t".join(latencyStrList)))
+
+        self.text.delete("1.0", "end")
+        self.text.insert("end", "%s\tDone\tFailed\tTimeout\tp50\tp95\tp99\tMax (sec)\n" % \
+            ("Actor Verb" if byVerb else "Actor",), "header")
+        self.text.insert("end", "".join(lineList))
+        self.updateTimer.start(_UpdateInterval, self.updDisplay)
+
+    def _doByVerb(self, wdg=None):
+        self.updDisplay()
+
+    def _doReset(self, wdg=None):
+        self.cmdTracker.reset()
+        self.updDisplay()
+
+    def _mapCallback(self, evt=None):
+        self.updDisplay()
+
+
+if __name__ == "__main__":
+    import random
+    import TUI.Base.TestDispatcher
+    import TUI.Models.LogSource
+
+    testDispatcher = TUI.Base.TestDispatcher.TestDispatcher("cmds", delay=1)
+    tuiModel = testDispatcher.tuiModel
+    root = tuiModel.tkRoot
+
+    cmdTracker = tuiModel.logSource.cmdTracker
+    cmdList = (("tcc", "track 10, 20 icrs", 5.0), ("tcc", "offset arc 0.1, 0.0", 1.0),
+        ("boss", "exposure science itime=900", 920.0), ("apogee", "expose time=500 object=object", 510.0))
+    for uniqueCmdID in range(1000):
+        actor, cmdStr, meanLatency = random.choice(cmdList)
+        cmdTracker.cmdQueued(TUI.Models.LogSource.CmdInfo(uniqueCmdID, "me.me", uniqueCmdID, actor, cmdStr, "me.me"),
+            queuedTime=0)
+        cmdTracker.cmdDone(uniqueCmdID, didFail=random.random() < 0.02,
+            doneTime=random.lognormvariate(0, 0.3) * meanLatency)
+
+    testFrame = CmdLatencyWdg(root)
+    testFrame.pack(expand=True, fill="both")
+
+    tuiModel.reactor.run()
@@ -0,0 +1,144 @@
+"""Highlight rules for log windows
+
+A highlight rule decides which parts of a log entry to highlight. Matches are computed in Python
+(using precompiled regular expressions) from the log entry's formatted string (LogEntry.getStr()),
+and the resulting match spans are cached by entry number, so each entry is only examined once per rule
+no matter how many times it is shown (e.g. after changing the filter or scrolling a log window).
+
+This module uses only the standard library.
+
+History:
+2026-10-18          Initial version.
+"""
+import re
+
+__all__ = ["ActorHighlightRule", "RegExpHighlightRule", "getLineColIndices"]
+
+# maximum number of entries in a span cache; when exceeded, spans for discarded entries are removed
+MaxCacheSize = 60000
+
+class BaseHighlightRule(object):
+    """Base class for highlight rules
+
+    Subclasses must override _computeSpans.
+    """
+    def __init__(self, textTag, lineTag, descr):
+        """Create a highlight rule
+
+        Inputs:
+        - textTag: Tk text tag for matching text, or None if only whole lines are highlighted
+        - lineTag: Tk text tag for lines that contain a match
+        - descr: a brief description of the rule, for the status bar
+        """
+        self.textTag = textTag
+        self.lineTag = lineTag
+        self.descr = descr
+        # dict of entry number: tuple of match spans
+        self._spanCache = {}
+        self.numHits = 0 # number of cache hits
+        self.numMisses = 0 # number of cache misses
+
+    def getSpans(self, logEntry):
+        """Return the match spans for a log entry, as a tuple of (start, end) offsets into logEntry.getStr()
+
+        Returns an empty tuple if the entry does not match.
+        """
+        seq = getattr(logEntry, "seq", None)
+        if seq is None:
+            return self._computeSpans(logEntry)
+        spans = self._spanCache.get(seq)
+        if spans is None:
+            self.numMisses += 1
+            spans = self._computeSpans(logEntry)
+            self._spanCache[seq] = spans
+        else:
+            self.numHits += 1
+        return spans
+
+    def trimCache(self, minSeq):
+        """Remove cached spans for entries whose entry number < minSeq, if the cache is large
+        """
+        if len(self._spanCache) <= MaxCacheSize:
+            return
+        self._spanCache = dict((seq, spans) for seq, spans in self._spanCache.iteritems() if seq >= minSeq)
+        if len(self._spanCache) > MaxCacheSize:
+            # still too big; start over
+            self._spanCache = {}
+
+    def _computeSpans(self, logEntry):
+        """Compute match spans for a log entry; see getSpans for details"""
+        raise NotImplementedError("Subclasses must override")
+
+    def __str__(self):
+        return "%s(%r)" % (type(self).__name__, self.descr)
+
+
+class ActorHighlightRule(BaseHighlightRule):
+    """Highlight entire log entries from a set of actors
+    """
+    def __init__(self, actors, lineTag):
+        """Create an actor highlight rule
+
+        Inputs:
+        - actors: a collection of actor names
+        - lineTag: Tk text tag for lines from those actors
+        """
+        actors = sorted(actor.lower() for actor in actors)
+        if len(actors) == 1:
+            descr = "actor %s" % (actors[0],)
+        else:
+            descr = "actors %s" % (" ".join(actors),)
+        BaseHighlightRule.__init__(self, textTag=None, lineTag=lineTag, descr=descr)
+        self.actorSet = frozenset(actors)
+
+    def _computeSpans(self, logEntry):
+        if logEntry.actor and logEntry.actor.lower() in self.actorSet:
+            return ((0, len(logEntry.getStr()) - 1),)
+        return ()
+
+
+class RegExpHighlightRule(BaseHighlightRule):
+    """Highlight text that matches a regular expression
+
+    Matching ignores case and ^ and $ match at the beginning and end of each line.
+    """
+    def __init__(self, regExp, textTag, lineTag, descr=None):
+        """Create a regular expression highlight rule
+
+        Inputs:
+        - regExp: regular expression (a string)
+        - textTag: Tk text tag for matching text, or None if only whole lines are highlighted
+        - lineTag: Tk text tag for lines that contain a match
+        - descr: brief description; if None then "text %r" % (regExp,)
+
+        Raise RuntimeError if regExp is not a valid regular expression.
+        """
+        if descr is None:
+            descr = "text %r" % (regExp,)
+        BaseHighlightRule.__init__(self, textTag=textTag, lineTag=lineTag, descr=descr)
+        self.regExp = regExp
+        try:
+            self.compRegExp = re.compile(regExp, re.IGNORECASE | re.MULTILINE)
+        except re.error:
+            raise RuntimeError("invalid regular expression %r" % (regExp,))
+
+    def _computeSpans(self, logEntry):
+        return tuple(match.span() for match in self.compRegExp.finditer(logEntry.getStr())
+            if match.end() > match.start())
+
+
+def getLineColIndices(text, startLineNum, start, end):
+    """Convert a span of offsets into a string to Tk text indices
+
+    Inputs:
+    - text: the string (which may contain newlines)
+    - startLineNum: Tk line number (1-based) of the first line of text
+    - start, end: offsets of the span
+
+    Returns (startIndex, endIndex, startLineNum, endLineNum) where the indices are strings "line.char"
+    """
+    startLine = startLineNum + text.count("\n", 0, start)
+    startCol = start - (text.rfind("\n", 0, start) + 1)
+    endLine = startLine + text.count("\n", start, end)
+    endCol = end - (text.rfind("\n", 0, end) + 1)
+    return ("%d.%d" % (startLine, startCol), "%d.%d" % (endLine, endCol), startLine, endLine)
@@ -7,8 +7,8 @@ To do:
 Known Issues:
 - This log may hold more data than logSource (because it truncates excess data separately from logSource),
   but that extra data is fragile: you will lose it if you change the filter.
-- Uses Python to check regular expressions for highlighting, even though tcl implements them;
-  thus differences in Python and tcl's implementation of regular expression may result in subtle bugs.
+- In virtual mode (the default for log windows) the highlight Prev/Next buttons
+  only search the matching entries currently paged into the text widget.
 
 History:
 History:
@@ -81,8 +81,25 @@ History:
 2015-11-03 ROwen    Replace "== None" with "is None" and "!= None" with "is not None" to modernize the code.
 2015-11-05 ROwen    Ditched obsolete "except (SystemExit, KeyboardInterrupt): raise" code.
                     Modernized "except" syntax.
+2026-10-18          Filters on actor, commander and severity are answered using LogSource's indexes
+                    instead of testing every log entry; see the getSeqs attribute of filter functions.
+                    New log entries are received in batches from LogSource and each batch is added
+                    to the log with one call to addOutputList and highlighted in one pass.
+                    Added virtual mode (virtualLines argument), now used by log windows: the text widget
+                    only holds a window of matching log entries, which is paged in as you scroll.
+                    Highlighting is computed in Python by highlight rules (TUI.TUIMenu.LogHighlight),
+                    which cache match spans per log entry, instead of by searching the text widget.
+                    Filter results are shared by all log windows using LogSource's filterCache;
+                    see the filterKey attribute of filter functions.
+                    Find uses LogSource's full-text index (see TUI.Models.LogTextIndex for the query syntax)
+                    instead of a tcl regular expression search of the text widget, so it finds matching entries
+                    that are not paged in; see findEntry.
+2026-10-18          Keep log windows' keyword callbacks active while hidden (see TUI.Base.WindowSuspender);
+                    log windows already disconnect from the log source when withdrawn (see mapOrUnmap).
 """
 import bisect
+import collections
+import itertools
 import re
 import Tkinter
 import RO.Alg
@@ -91,13 +108,21 @@ import RO.TkUtil
 import RO.Wdg
 import opscore.actor.keyvar
 import TUI.Base.Wdg
+import TUI.Base.WindowSuspender
 import TUI.Models
+import TUI.Models.LogIndex
 import TUI.PlaySound
 import TUI.Version
+import LogHighlight
 
 HelpURL = "TUIMenu/LogWin.html"
 WindowName = "%s.Log" % (TUI.Version.ApplicationName,)
 
+# number of matching log entries held in the text widget of a log window (virtual mode)
+VirtualLines = 1000
+# number of matching log entries to page in when scrolling past the beginning or end of the text widget
+VirtualPageLines = 250
+
 def addWindow(tlSet):
     xBase = 496
     yBase = 534
@@ -112,9 +137,10 @@ def addWindow(tlSet):
             defGeom = "736x411+%d+%d" % (xPos, yPos),
             resizable = True,
             visible = (i == 0),
-            wdgFunc = TUILogWdg,
+            wdgFunc = RO.Alg.GenericCallback(TUILogWdg, virtualLines=VirtualLines),
             doSaveState = True,
         )
+        TUI.Base.WindowSuspender.keepActive(windowName)
 
 FilterMenuPrefix = "+ "
 HighlightLineColor = "#bdffe0"
@@ -126,25 +152,6 @@ ShowTag = "showtag"
 ActorTagPrefix = "act_"
 CmdrTagPrefix = "cmdr_"
 
-class RegExpInfo(object):
-    """Object holding a regular expression
-    and associated tags.
-
-    Checks the regular expression and raises RuntimeError if invalid.
-    """
-    def __init__(self, regExp, tag, lineTag):
-        self.regExp = regExp
-        self.tag = tag
-        self.lineTag = lineTag
-        try:
-            re.compile(regExp)
-        except re.error:
-            raise RuntimeError("invalid regular expression %r" % (regExp,))
-
-    def __str__(self):
-        return "RegExpInfo(regExp=%r, tag=%r, lineTag=%r)" % \
-            (self.regExp, self.tag, self.lineTag)
-
 class TUILogWdg(Tkinter.Frame):
     """A log widget that displays messages from the hub
 
@@ -156,17 +163,36 @@ class TUILogWdg(Tkinter.Frame):
     and return True if the entry is to be shown, False otherwise.
     The doc string may be None or a brief one-line description of the filter
     (long or multi-line doc strings will result in garbage in the status bar).
+
+    Virtual Mode:
+    If virtualLines > 0 then the text widget only holds a window of virtualLines matching log entries;
+    the scroll bar shows the position of that window in the list of all matching entries (self.matchSeqs)
+    and entries are paged in as you scroll. Thus changing the filter or highlighting only requires
+    rendering the window, no matter how many entries the log source holds.
+
+    A filter function may also have a getSeqs attribute: a function that takes no arguments
+    and returns a sorted list of LogSource entry numbers that includes every entry the filter accepts
+    (it may include others). If both filter functions have getSeqs then applyFilter only tests those entries,
+    else it tests every entry in the log source.
+
+    A filter function may also have a filterKey attribute: a hashable canonical description of the filter,
+    such that filter functions with equal filterKeys accept the same entries. If both filter functions
+    have a filterKey then matching entries are obtained from the log source's filterCache,
+    which is shared by all log windows and only tests each entry once per filter.
     """
     def __init__(self,
         master,
         maxCmds = 50,
         maxLines = 50000,
+        virtualLines = 0,
     **kargs):
         """
         Inputs:
         - master: master widget
         - maxCmds: maximun # of commands
         - maxLines: the max number of lines to display, ignoring wrapping
+        - virtualLines: if > 0 then use virtual mode: hold only this many matching log entries
+            in the text widget and page in others as the user scrolls; see class doc string
         - height: height of text area, in lines
         - width: width of text area, in characters
         - **kargs: additional keyword arguments for Frame
@@ -176,9 +202,11 @@ class TUILogWdg(Tkinter.Frame):
         tuiModel = TUI.Models.getModel("tui")
         self.dispatcher = tuiModel.dispatcher
         self.logSource = tuiModel.logSource
-        self.highlightRegExpInfo = None
         self.highlightTag = None
         self.isConnected = False
+        # entry number of the newest log entry that has been filtered for display;
+        # used to avoid showing entries twice if applyFilter runs while a batch is pending
+        self.lastSeq = -1
         self._stateTracker = RO.Wdg.StateTracker(logFunc = tuiModel.logFunc)
 
         # severity filter function: return True if severity filter criteria are met
@@ -186,10 +214,8 @@ class TUILogWdg(Tkinter.Frame):
         self.sevFilterFunc = lambda x: False
         # miscellaneous filter function: return True if non-severity filter criteria are met
         self.miscFilterFunc = lambda x: False
-        # highlightAllFunc(): clear existing highlighting and apply desired highlighting to all existing text
-        self.highlightAllFunc = lambda: None
-        # highlightLastFunc(): apply highlighting to last line of text and play sound if appropriate
-        self.highlightLastFunc = lambda: None
+        # highlight rule (a TUI.TUIMenu.LogHighlight rule), or None if no highlighting
+        self.highlightRule = None
 
         row = 0
 
@@ -303,7 +329,7 @@ class TUILogWdg(Tkinter.Frame):
             master = self.ctrlFrame1,
             text = "Find:",
             command = self.doSearchBackwards,
-            helpText = "press or type <return> to search backwards; type <ctrl-return> to search forwards",
+            helpText = "press or type <return> to find previous match; type <ctrl-return> to find next match",
             helpURL = HelpURL,
         )
         self.findButton.grid(row=0, column=ctrlCol1)
@@ -312,9 +338,12 @@ class TUILogWdg(Tkinter.Frame):
         self.findEntry = RO.Wdg.StrEntry(
             master = self.ctrlFrame1,
             width = 15,
-            helpText = "search regular expression; <return> to search backwards, <ctrl-return> forwards",
+            helpText = "search query, e.g. actor:tcc AxisErr; <return> to find previous, <ctrl-return> next",
             helpURL = HelpURL,
         )
+        # query and entry number of the most recent match found using findEntry
+        self._findQueryStr = None
+        self._findSeq = None
         self.findEntry.bind('<KeyPress-Return>', self.doSearchBackwards)
         self.findEntry.bind('<Control-Return>', self.doSearchForwards)
         self.findEntry.grid(row=0, column=ctrlCol1)
@@ -435,6 +464,22 @@ class TUILogWdg(Tkinter.Frame):
         )
         self.logWdg.grid(row=row, column=0, sticky="nwes")
         self.grid_rowconfigure(row, weight=1)
+
+        # the "window" of log entries displayed in the text widget, oldest first:
+        # entry numbers and the number of lines of text for each entry
+        self.winSeqs = collections.deque()
+        self.winLineCounts = collections.deque()
+        self._winNumLines = 0 # sum of winLineCounts
+
+        # virtual mode data
+        self.virtualLines = int(virtualLines)
+        # entry numbers of all log entries that match the current filter (virtual mode only)
+        self.matchSeqs = []
+        # index in matchSeqs of the first entry in the text widget (virtual mode only)
+        self.winStart = 0
+        self._virtualPagePending = False
+        if self.virtualLines > 0:
+            self._setupVirtualMode()
         self.grid_columnconfigure(0, weight=1)
         row += 1
 
@@ -499,9 +544,22 @@ class TUILogWdg(Tkinter.Frame):
         self.bind("<Map>", self.mapOrUnmap)
 
     def appendLogEntry(self, logEntry):
-        outStr = logEntry.getStr()
-        self.logWdg.addOutput(outStr, tags=logEntry.tags, severity=logEntry.severity)
-        self.highlightLastFunc()
+        self.appendLogEntries([logEntry])
+
+    def appendLogEntries(self, logEntries):
+        """Append a list of log entries to the log and highlight them
+        """
+        if not logEntries:
+            return
+        if self.virtualLines > 0:
+            self._virtualAppend(logEntries)
+            return
+        strTagsSevList = [(logEntry.getStr(), logEntry.tags, logEntry.severity) for logEntry in logEntries]
+        self.logWdg.addOutputList(strTagsSevList)
+        self._extendWindow(logEntries, strTagsSevList)
+        # the log widget may have discarded old lines
+        self._trimWindowToText()
+        self.highlightNew(len(logEntries))
 
     def applyFilter(self, wdg=None):
         """Apply current filter settings.
@@ -525,6 +583,10 @@ class TUILogWdg(Tkinter.Frame):
             TUI.PlaySound.cmdFailed()
         self.miscFilterFunc = miscFilterFunc
 
+        if self.virtualLines > 0:
+            self._virtualApplyFilter()
+            return
+
         retainScrollPos = not self.logWdg.isScrolledToEnd()
         if retainScrollPos:
             # "linestart" helps a problem wereby if the text widget has not been selected
@@ -535,12 +597,15 @@ class TUILogWdg(Tkinter.Frame):
 #             print "retainScrollPos: midLineIndex=%s, midLineDateStr=%s" % (midLineIndex, midLineDateStr)
 
         self.logWdg.clearOutput()
+        self.lastSeq = self.logSource.entryList.nextSeq - 1
         # this is inefficient; logWdg does a lot of processing that is unnecessary
         # when inserting a lot of lines at once; add an insertMany method to avoid this
-        strTagsSevList = [(logEntry.getStr(), logEntry.tags, logEntry.severity)
-            for logEntry in self.logSource.entryList
-            if self.sevFilterFunc(logEntry) or self.miscFilterFunc(logEntry)]
+        logEntries = self.logSource.getEntries(self.getMatchingSeqs())
+        strTagsSevList = [(logEntry.getStr(), logEntry.tags, logEntry.severity) for logEntry in logEntries]
         self.logWdg.addOutputList(strTagsSevList)
+        self._clearWindow()
+        self._extendWindow(logEntries, strTagsSevList)
+        self._trimWindowToText()
 
         if retainScrollPos:
             strList = [strTagsSev[0] for strTagsSev in strTagsSevList]
@@ -550,7 +615,7 @@ class TUILogWdg(Tkinter.Frame):
             linesFromEnd = len(strList) - ind
             self.logWdg.text.see("end - %d lines" % (linesFromEnd,))
 
-        self.highlightAllFunc()
+        self.highlightAll()
 
     def clearHighlight(self, showMsg=True):
         """Remove all highlighting"""
@@ -594,6 +659,10 @@ class TUILogWdg(Tkinter.Frame):
 
         def nullFunc(logEntry):
             return False
+        nullFunc.getSeqs = lambda: []
+        nullFunc.filterKey = ("none",)
+
+        logIndex = self.logSource.index
 
         if not filterEnabled:
             return nullFunc
@@ -609,6 +678,8 @@ class TUILogWdg(Tkinter.Frame):
                 return (logEntry.actor == actor) \
                     or (logEntry.cmdInfo and (logEntry.cmdInfo.actor == actor))
             filterFunc.__doc__ = "actor=%s" % (actor,)
+            filterFunc.getSeqs = lambda: logIndex.getSeqsByActors([actor])
+            filterFunc.filterKey = ("actors", (actor,))
             return filterFunc
 
         elif filterCat == "Actors":
@@ -621,6 +692,8 @@ class TUILogWdg(Tkinter.Frame):
                 return (logEntry.actor in actorSet) \
                     or (logEntry.cmdInfo and (logEntry.cmdInfo.actor in actorSet))
             filterFunc.__doc__ = "actor in %s" % (actorSet,)
+            filterFunc.getSeqs = lambda: logIndex.getSeqsByActors(actorSet)
+            filterFunc.filterKey = ("actors", tuple(sorted(actorSet)))
             return filterFunc
 
         elif filterCat == "Text":
@@ -635,6 +708,7 @@ class TUILogWdg(Tkinter.Frame):
             def filterFunc(logEntry, compiledRegEx=compiledRegEx):
                 return compiledRegEx.search(logEntry.msgStr)
             filterFunc.__doc__ = "text contains %s" % (regExp)
+            filterFunc.filterKey = ("text", regExp)
             return filterFunc
 
         elif filterCat == "Commands":
@@ -644,6 +718,8 @@ class TUILogWdg(Tkinter.Frame):
                     and logEntry.cmdInfo \
                     and not logEntry.isKeys
             filterFunc.__doc__ = "most commands"
+            filterFunc.getSeqs = self._getCmdrSeqsFunc()
+            filterFunc.filterKey = ("commands",)
             return filterFunc
 
         elif filterCat == "Commands and Replies":
@@ -652,6 +728,8 @@ class TUILogWdg(Tkinter.Frame):
                     and (logEntry.severity > RO.Constants.sevDebug) \
                     and not logEntry.isKeys
             filterFunc.__doc__ = "most commands and replies"
+            filterFunc.getSeqs = self._getCmdrSeqsFunc()
+            filterFunc.filterKey = ("commandsAndReplies",)
             return filterFunc
 
         elif filterCat == "My Commands and Replies":
@@ -663,6 +741,8 @@ class TUILogWdg(Tkinter.Frame):
                     and not logEntry.isKeys \
                     and ((logEntry.cmdInfo is None) or (logEntry.cmdInfo.isMine))
             filterFunc.__doc__ = "my commands and replies"
+            filterFunc.getSeqs = self._getCmdrSeqsFunc(cmdr)
+            filterFunc.filterKey = ("myCommandsAndReplies", cmdr)
             return filterFunc
 
         elif filterCat == "Custom":
@@ -673,6 +753,7 @@ class TUILogWdg(Tkinter.Frame):
             if not callable(filterFunc):
                 raise RuntimeError("not a function: %s" % (funcStr,))
             filterFunc.__doc__ = funcStr
+            filterFunc.filterKey = ("custom", funcStr)
             return filterFunc
 
         else:
@@ -722,6 +803,8 @@ class TUILogWdg(Tkinter.Frame):
         Note that dispatching the command automatically logs it.
         """
         self.dispatchCmd(cmdStr)
+        if self.virtualLines > 0 and self.winStart + len(self.winLineCounts) < len(self.matchSeqs):
+            self._virtualLoadWindow(len(self.matchSeqs))
         self.logWdg.text.see("end")
 
         defActor = self.defActorWdg.getString()
@@ -778,8 +861,7 @@ class TUILogWdg(Tkinter.Frame):
     def doHighlight(self, wdg=None):
         """Show appropriate highlight widgets and apply appropriate function
         """
-        self.highlightAllFunc = lambda: None
-        self.highlightLastFunc = lambda: None
+        self.highlightRule = None
         highlightCat = self.highlightMenu.getString()
         highlightEnabled = self.highlightOnOffWdg.getBool()
         #print "doHighlight; cat=%r; enabled=%r" % (highlightCat, highlightEnabled)
@@ -834,7 +916,8 @@ class TUILogWdg(Tkinter.Frame):
 
         regExp = r"^\d\d:\d\d:\d\d( +%s)? +(%s) " % (cmdr, orCmds)
         try:
-            regExpInfo = RegExpInfo(regExp, None, HighlightTag)
+            highlightRule = LogHighlight.RegExpHighlightRule(regExp, None, HighlightTag,
+                descr="commands %s" % (" ".join(cmds),))
         except RuntimeError:
             self.statusBar.setMsg(
                 "Invalid command list %s" % (" ".join(cmds)),
@@ -855,7 +938,7 @@ class TUILogWdg(Tkinter.Frame):
                 isTemp = True,
             )
 
-        self.highlightRegExp(regExpInfo)
+        self.setHighlightRule(highlightRule)
 
     def doHighlightText(self, wdg=None):
         self.clearHighlight()
@@ -864,7 +947,7 @@ class TUILogWdg(Tkinter.Frame):
             return
 
         try:
-            regExpInfo = RegExpInfo(regExp, HighlightTextTag, HighlightTag)
+            highlightRule = LogHighlight.RegExpHighlightRule(regExp, HighlightTextTag, HighlightTag)
         except RuntimeError:
             self.statusBar.setMsg(
                 "Invalid regular expression %r" % (regExp,),
@@ -878,21 +961,21 @@ class TUILogWdg(Tkinter.Frame):
             "Highlighting text %r" % (regExp,),
             isTemp = True,
         )
-        self.highlightRegExp(regExpInfo)
+        self.setHighlightRule(highlightRule)
 
     def doPlayHighlightSound(self):
         """Return True if the highlight sound is enabled and the window is visible"""
         return self.highlightPlaySoundWdg.getBool() and self.winfo_ismapped()
 
     def doSearchBackwards(self, evt=None):
-        """Search backwards for search string"""
-        searchStr = self.findEntry.get()
-        self.logWdg.search(searchStr, backwards=True, noCase=True, regExp=True)
+        """Find the previous entry that matches the query in findEntry"""
+        self.findEntry.focus_set()
+        self.findQuery(self.findEntry.get(), backwards=True)
 
     def doSearchForwards(self, evt=None):
-        """Search backwards for search string"""
-        searchStr = self.findEntry.get()
-        self.logWdg.search(searchStr, backwards=False, noCase=True, regExp=True)
+        """Find the next entry that matches the query in findEntry"""
+        self.findEntry.focus_set()
+        self.findQuery(self.findEntry.get(), backwards=False)
 
     def doShowHideAdvanced(self, wdg=None):
         if self.highlightOnOffWdg.getBool():
@@ -908,27 +991,63 @@ class TUILogWdg(Tkinter.Frame):
     def doShowPrevHighlight(self, wdg=None):
         self.logWdg.findTag(HighlightTag, backwards=True, doWrap=False)
 
-    def findRegExp(self, regExpInfo, removeTags=True, elide=False, startInd="1.0"):
-        """Find and tag all lines containing text that matches regExp.
+    def findQuery(self, queryStr, backwards=True):
+        """Find and select the previous or next entry shown by this log window that matches a query
 
-        Returns the number of matches.
+        Inputs:
+        - queryStr: query string; see TUI.Models.LogTextIndex for the syntax
+        - backwards: if True find the previous match (before the last match found for this query),
+            else the next match; wraps around if no more matches are found
 
-        This is just self.text.findAll with a particular set of options.
+        Uses the log source's text index, so all matching entries are found, even in virtual mode.
         """
-        #print "findRegExp(regExpInfo=%r, removeTags=%r, elide=%r, startInd=%r)" % (regExpInfo, removeTags, elide, startInd)
-
-        # Warning: you must modify this to call findAll from "after"
-        # if this function is called from a variable trace (e.g. an Entry callFunc).
-        # Otherwise the count variable is not updated
-        # and the routine raises RuntimeError.
-        return self.logWdg.findAll(
-            searchStr = regExpInfo.regExp,
-            tag = regExpInfo.tag,
-            lineTag = regExpInfo.lineTag,
-            removeTags = removeTags,
-            noCase = True,
-            regExp = True,
-            startInd = startInd,
+        queryStr = queryStr.strip()
+        if not queryStr:
+            return
+        try:
+            hitSeqs = self.logSource.search(queryStr)
+        except RuntimeError as e:
+            self.statusBar.setMsg(RO.StringUtil.strFromException(e), severity = RO.Constants.sevError, isTemp = True)
+            TUI.PlaySound.cmdFailed()
+            return
+
+        if self.virtualLines > 0:
+            shownSeqs = self.matchSeqs
+        else:
+            shownSeqs = list(self.winSeqs)
+        shownHitSeqs = TUI.Models.LogIndex.intersectSeqs(hitSeqs, shownSeqs)
+        numHidden = len(hitSeqs) - len(shownHitSeqs)
+        hiddenStr = " (%d hidden by filter)" % (numHidden,) if numHidden else ""
+        if not shownHitSeqs:
+            self.statusBar.setMsg("No match for %r%s" % (queryStr, hiddenStr), isTemp = True)
+            return
+
+        if queryStr != self._findQueryStr:
+            self._findQueryStr = queryStr
+            self._findSeq = None
+        didWrap = False
+        if backwards:
+            if self._findSeq is None:
+                ind = len(shownHitSeqs) - 1
+            else:
+                ind = bisect.bisect_left(shownHitSeqs, self._findSeq) - 1
+                if ind < 0:
+                    ind = len(shownHitSeqs) - 1
+                    didWrap = True
+        else:
+            if self._findSeq is None:
+                ind = 0
+            else:
+                ind = bisect.bisect_right(shownHitSeqs, self._findSeq)
+                if ind >= len(shownHitSeqs):
+                    ind = 0
+                    didWrap = True
+        self._findSeq = shownHitSeqs[ind]
+        self._selectEntry(self._findSeq)
+        self.statusBar.setMsg(
+            "Match %d of %d for %r%s%s" % (ind + 1, len(shownHitSeqs), queryStr, hiddenStr,
+                " (wrapped)" if didWrap else ""),
+            isTemp = True,
         )
 
     def getActors(self, regExpList):
@@ -968,6 +1087,47 @@ class TUILogWdg(Tkinter.Frame):
         actors.sort()
         return actors
 
+    def getCandidateEntries(self):
+        """Return the log entries that may match the current filter functions
+
+        Uses the log source's indexes if both filter functions support them
+        (see the class doc string), else returns all entries.
+        """
+        getCandidateSeqs = self._getCandidateSeqsFunc()
+        if getCandidateSeqs is None:
+            return self.logSource.entryList
+        return self.logSource.getEntries(getCandidateSeqs())
+
+    def getMatchingSeqs(self, minSeq=None):
+        """Return a sorted list of entry numbers of the log entries that match the current filter functions
+
+        Inputs:
+        - minSeq: if not None then only return entry numbers >= minSeq
+
+        Uses the log source's shared filter cache if both filter functions have a filterKey
+        (see the class doc string), else tests the candidate entries.
+        """
+        sevFilterFunc = self.sevFilterFunc
+        miscFilterFunc = self.miscFilterFunc
+        sevKey = getattr(sevFilterFunc, "filterKey", None)
+        miscKey = getattr(miscFilterFunc, "filterKey", None)
+        if sevKey is None or miscKey is None:
+            if minSeq is None:
+                logEntries = self.getCandidateEntries()
+            else:
+                logEntries = self.logSource.getEntries(xrange(minSeq, self.logSource.entryList.nextSeq))
+            return [logEntry.seq for logEntry in logEntries
+                if sevFilterFunc(logEntry) or miscFilterFunc(logEntry)]
+
+        def filterFunc(logEntry, sevFilterFunc=sevFilterFunc, miscFilterFunc=miscFilterFunc):
+            return sevFilterFunc(logEntry) or miscFilterFunc(logEntry)
+        return self.logSource.filterCache.getSeqs(
+            filterKey = (sevKey, miscKey),
+            filterFunc = filterFunc,
+            getCandidateSeqs = self._getCandidateSeqsFunc(),
+            minSeq = minSeq,
+        )
+
     def getFilterSeverityDescr(self, appendAnd=True):
         """Return a description of the currently selected filter severity
 
@@ -997,8 +1157,7 @@ class TUILogWdg(Tkinter.Frame):
         return self._stateTracker
 
     def highlightActors(self, actors):
-        """Create highlight functions to highlight the supplied actors
-        and apply highlighting to all existing text.
+        """Highlight the supplied actors in all existing and new text
         """
         if len(actors) == 1:
             self.statusBar.setMsg(
@@ -1011,56 +1170,39 @@ class TUILogWdg(Tkinter.Frame):
                 isTemp = True,
             )
 
-        tags = [ActorTagPrefix + actor.lower() for actor in actors]
+        self.setHighlightRule(LogHighlight.ActorHighlightRule(actors, HighlightTag))
 
-        def highlightAllFunc(tags=tags):
-            self.clearHighlight()
-            for tag in tags:
-                tagRanges = self.logWdg.text.tag_ranges(tag)
-                if len(tagRanges) > 1:
-                    self.logWdg.text.tag_add(HighlightTag, *tagRanges)
-
-        def highlightLastFunc(tags=tags):
-            for tag in tags:
-                tagRanges = self.logWdg.text.tag_prevrange(tag, "end")
-                if tagRanges:
-                    self.logWdg.text.tag_add(HighlightTag, *tagRanges)
-                    if self.doPlayHighlightSound():
-                        TUI.PlaySound.logHighlightedText()
-                    return # no need to test more tags and must not play the sound again
-
-        self.highlightAllFunc = highlightAllFunc
-        self.highlightLastFunc = highlightLastFunc
-        self.highlightAllFunc()
-
-    def highlightRegExp(self, regExpInfo):
-        """Create highlight functions based on a RegExpInfo object
-        and apply highlighting to all existing text.
+    def highlightAll(self):
+        """Clear existing highlighting and apply self.highlightRule to all entries in the text widget
         """
-        def highlightAllFunc(regExpInfo=regExpInfo):
-            self.clearHighlight()
-            self.findRegExp(regExpInfo, removeTags=False)
-
-        def highlightLastFunc(regExpInfo=regExpInfo):
-            nFound = self.findRegExp(regExpInfo, removeTags = False, startInd = "end - 2 lines")
-            if nFound > 0 and self.doPlayHighlightSound():
-                TUI.PlaySound.logHighlightedText()
+        self.clearHighlight(showMsg=False)
+        if not self.highlightRule:
+            return
+        self.highlightRule.trimCache(self.logSource.entryList.firstSeq)
+        self._highlightWindow(0)
 
-        self.highlightAllFunc = highlightAllFunc
-        self.highlightLastFunc = highlightLastFunc
-        self.highlightAllFunc()
+    def highlightNew(self, numEntries):
+        """Apply self.highlightRule to the last numEntries entries in the text widget
+        and play a sound if any match and the sound is wanted
+        """
+        if not self.highlightRule or numEntries < 1:
+            return
+        numFound = self._highlightWindow(max(0, len(self.winSeqs) - numEntries))
+        if numFound > 0 and self.doPlayHighlightSound():
+            TUI.PlaySound.logHighlightedText()
 
-    def logSourceCallback(self, logSource):
-        """Log a message from the log source
+    def logSourceCallback(self, logEntries):
+        """Log new messages from the log source (a LogSource batch callback)
 
         Inputs:
-        - logEntry: a TUI.Models.LogSource.LogEntry object
+        - logEntries: a list of new log entries (TUI.Models.LogStore.LogEntryView objects)
         """
-        logEntry = logSource.lastEntry
-        if not logEntry:
-            return
-        if self.sevFilterFunc(logEntry) or self.miscFilterFunc(logEntry):
-            self.appendLogEntry(logEntry)
+        lastSeq = self.lastSeq
+        self.lastSeq = max(lastSeq, logEntries[-1].seq)
+        # use the shared filter cache, so each new entry is only tested once per filter
+        # no matter how many log windows use that filter
+        matchSeqSet = set(self.getMatchingSeqs(minSeq=max(lastSeq + 1, logEntries[0].seq)))
+        self.appendLogEntries([logEntry for logEntry in logEntries if logEntry.seq in matchSeqSet])
 
     def mapOrUnmap(self, evt=None):
         """Called when the window is mapped or unmapped
@@ -1070,14 +1212,23 @@ class TUILogWdg(Tkinter.Frame):
         wantConnection = self.winfo_toplevel().wm_state() != "withdrawn"
 #        print "mapOrUnmap: wantConnect=%s; isConnected=%s" % (wantConnection, self.isConnected)
         if self.isConnected and not wantConnection:
-            self.logSource.removeCallback(self.logSourceCallback)
+            self.logSource.removeBatchCallback(self.logSourceCallback)
             self.isConnected=False
             self.logWdg.clearOutput()
+            self.matchSeqs = []
+            self.winStart = 0
+            self._clearWindow()
         elif wantConnection and not self.isConnected:
-            self.logSource.addCallback(self.logSourceCallback)
+            self.logSource.addBatchCallback(self.logSourceCallback)
             self.isConnected=True
             self.applyFilter()
 
+    def setHighlightRule(self, highlightRule):
+        """Set the highlight rule (a TUI.TUIMenu.LogHighlight rule) and apply it to all existing text
+        """
+        self.highlightRule = highlightRule
+        self.highlightAll()
+
     def updHighlightColor(self, newColor, colorPrefVar=None):
         """Update highlight color and highlight line color"""
 
@@ -1092,11 +1243,16 @@ class TUILogWdg(Tkinter.Frame):
         if sevName == "none":
             def filterFunc(logEntry):
                 return False
+            filterFunc.getSeqs = lambda: []
+            filterFunc.filterKey = ("severity", None)
         else:
             minSeverity = RO.Constants.NameSevDict[sevName]
             def filterFunc(logEntry, minSeverity=minSeverity):
                 return logEntry.severity >= minSeverity
             filterFunc.__doc__ = "severity >= %s" % (sevName,)
+            logIndex = self.logSource.index
+            filterFunc.getSeqs = lambda: logIndex.getSeqsByMinSeverity(minSeverity)
+            filterFunc.filterKey = ("severity", minSeverity)
         self.sevFilterFunc = filterFunc
         self.applyFilter()
 
@@ -1117,6 +1273,323 @@ class TUILogWdg(Tkinter.Frame):
         self.filterActorWdg.setItems(blankAndActors, isCurrent = isCurrent)
         self.highlightActorWdg.setItems(blankAndActors, isCurrent = isCurrent)
 
+    def _getCandidateSeqsFunc(self):
+        """Return a function that returns a sorted list of entry numbers that may match
+        the current filter functions, or None if either filter function has no getSeqs attribute
+        """
+        sevSeqsFunc = getattr(self.sevFilterFunc, "getSeqs", None)
+        miscSeqsFunc = getattr(self.miscFilterFunc, "getSeqs", None)
+        if sevSeqsFunc is None or miscSeqsFunc is None:
+            return None
+        def getCandidateSeqs(sevSeqsFunc=sevSeqsFunc, miscSeqsFunc=miscSeqsFunc):
+            return TUI.Models.LogIndex.unionSeqs((sevSeqsFunc(), miscSeqsFunc()))
+        return getCandidateSeqs
+
+    def _getCmdrSeqsFunc(self, cmdr=None):
+        """Return a getSeqs function for filters that show commands and replies
+        with severity > debug from one commander or from most commanders
+
+        Inputs:
+        - cmdr: the commander; if None then all commanders except those whose name starts with "."
+            (e.g. the hub) and "apo.apo" (which sends "set weather" commands)
+        """
+        logIndex = self.logSource.index
+        def getSeqs(cmdr=cmdr):
+            if cmdr is None:
+                cmdrs = [logCmdr for logCmdr in logIndex.getCmdrs()
+                    if logCmdr and logCmdr[0] != "." and logCmdr != "apo.apo"]
+            else:
+                cmdrs = [cmdr]
+            # severity > sevDebug is the same as severity >= sevNormal
+            return TUI.Models.LogIndex.intersectSeqs(
+                logIndex.getSeqsByCmdrs(cmdrs),
+                logIndex.getSeqsByMinSeverity(RO.Constants.sevNormal),
+            )
+        return getSeqs
+
+    def _clearWindow(self):
+        """Clear the record of entries displayed in the text widget"""
+        self.winSeqs.clear()
+        self.winLineCounts.clear()
+        self._winNumLines = 0
+
+    def _extendWindow(self, logEntries, strTagsSevList):
+        """Record that log entries have been appended to the text widget
+
+        Inputs:
+        - logEntries: the log entries
+        - strTagsSevList: the corresponding list of (string, tags, severity) that was displayed
+        """
+        lineCounts = [strTagsSev[0].count("\n") for strTagsSev in strTagsSevList]
+        self.winSeqs.extend(logEntry.seq for logEntry in logEntries)
+        self.winLineCounts.extend(lineCounts)
+        self._winNumLines += sum(lineCounts)
+
+    def _getNumTextLines(self):
+        """Return the number of lines of text in the text widget"""
+        return int(self.logWdg.text.index("end - 1 chars").split(".")[0]) - 1
+
+    def _highlightWindow(self, winInd):
+        """Apply self.highlightRule to entries in the text widget, starting from winSeqs[winInd]
+
+        Return the number of entries that match.
+        """
+        highlightRule = self.highlightRule
+        entryList = self.logSource.entryList
+        # the text widget may hold a few lines from a partially discarded entry before the window,
+        # so compute line numbers from the end
+        lineNum = self._getNumTextLines() - self._winNumLines + 1
+        lineNum += sum(itertools.islice(self.winLineCounts, winInd))
+        textIndList = []
+        lineIndList = []
+        numFound = 0
+        for seq, lineCount in itertools.islice(itertools.izip(self.winSeqs, self.winLineCounts), winInd, None):
+            if seq >= entryList.firstSeq:
+                logEntry = entryList.getEntry(seq)
+                spans = highlightRule.getSpans(logEntry)
+                if spans:
+                    numFound += 1
+                    entryStr = logEntry.getStr()
+                    for start, end in spans:
+                        startInd, endInd, startLine, endLine = LogHighlight.getLineColIndices(
+                            entryStr, lineNum, start, end)
+                        textIndList += [startInd, endInd]
+                        lineIndList += ["%d.0" % (startLine,), "%d.0" % (endLine + 1,)]
+            lineNum += lineCount
+        for tag, indList in ((highlightRule.textTag, textIndList), (highlightRule.lineTag, lineIndList)):
+            if not tag:
+                continue
+            # add the tag to many ranges at once, but limit the size of each Tk command
+            for i in range(0, len(indList), 2000):
+                self.logWdg.text.tag_add(tag, *indList[i:i+2000])
+        return numFound
+
+    def _trimWindow(self, numEntries):
+        """Remove the oldest numEntries entries from the record of entries in the text widget
+
+        Return the number of text lines used by those entries.
+        """
+        numLines = 0
+        for i in range(min(numEntries, len(self.winSeqs))):
+            self.winSeqs.popleft()
+            numLines += self.winLineCounts.popleft()
+        self._winNumLines -= numLines
+        return numLines
+
+    def _trimWindowToText(self):
+        """Remove entries from the record of entries in the text widget
+        that the log widget discarded (because it had more than maxLines lines)
+        """
+        numTextLines = self._getNumTextLines()
+        while self._winNumLines > numTextLines and self.winSeqs:
+            self._trimWindow(1)
+
+    def _selectEntry(self, seq):
+        """Select and show a log entry, paging it in if necessary (in virtual mode)
+
+        Inputs:
+        - seq: entry number of an entry in matchSeqs (in virtual mode) or winSeqs (otherwise)
+        """
+        if self.virtualLines > 0:
+            matchInd = bisect.bisect_left(self.matchSeqs, seq)
+            if not (self.winStart <= matchInd < self.winStart + len(self.winSeqs)):
+                self._virtualLoadWindow(matchInd - (self.virtualLines // 2))
+        winSeqList = list(self.winSeqs)
+        winInd = bisect.bisect_left(winSeqList, seq)
+        if winInd >= len(winSeqList) or winSeqList[winInd] != seq:
+            return
+        lineNum = self._getNumTextLines() - self._winNumLines + 1 \
+            + sum(itertools.islice(self.winLineCounts, winInd))
+        text = self.logWdg.text
+        text.tag_remove("sel", "1.0", "end")
+        text.tag_add("sel", "%d.0" % (lineNum,), "%d.0" % (lineNum + self.winLineCounts[winInd],))
+        text.mark_set("insert", "%d.0" % (lineNum,))
+        text.see("%d.0" % (lineNum,))
+
+    def _setupVirtualMode(self):
+        """Take over the log widget's scroll bar for virtual mode
+
+        The text widget reports its scroll position to _virtualYScrollSet,
+        which maps it onto the list of all matching entries before updating the scroll bar,
+        and the scroll bar sends its commands to _virtualYView.
+        """
+        self.logWdg.text.configure(yscrollcommand=self._virtualYScrollSet)
+        self.logWdg.yscroll.configure(command=self._virtualYView)
+
+    def _virtualAppend(self, logEntries):
+        """Append new matching log entries in virtual mode
+
+        If the window of entries in the text widget is at the end of the matching entries
+        then show the new entries (trimming old ones from the text widget as needed),
+        else just note that they match.
+        """
+        wasAtEnd = self.winStart + len(self.winLineCounts) >= len(self.matchSeqs)
+        self.matchSeqs += [logEntry.seq for logEntry in logEntries]
+        if not wasAtEnd:
+            self._virtualYScrollSet(*self.logWdg.text.yview())
+            return
+
+        strTagsSevList = [(logEntry.getStr(), logEntry.tags, logEntry.severity) for logEntry in logEntries]
+        self.logWdg.addOutputList(strTagsSevList)
+        self._extendWindow(logEntries, strTagsSevList)
+        self.highlightNew(len(logEntries))
+
+        # trim old entries from the text widget; if the user is looking at older entries
+        # then allow the window to grow (to avoid moving what they are looking at), but not without limit
+        numExcess = len(self.winLineCounts) - self.virtualLines
+        if numExcess > 0 and (self.logWdg.isScrolledToEnd() or numExcess > self.virtualLines):
+            numLines = self._trimWindow(numExcess)
+            self.logWdg.text.delete("1.0", "%d.0" % (numLines + 1,))
+            self.winStart += numExcess
+
+        # forget matches for entries that the log source has discarded (and are not in the text widget);
+        # this is done in chunks to reduce the cost of deleting from the front of matchSeqs
+        numDiscarded = bisect.bisect_left(self.matchSeqs, self.logSource.entryList.firstSeq)
+        numToForget = min(numDiscarded, self.winStart)
+        if numToForget > self.virtualLines:
+            del self.matchSeqs[0:numToForget]
+            self.winStart -= numToForget
+
+    def _virtualApplyFilter(self):
+        """Apply current filter settings in virtual mode
+
+        Compute the entry numbers of all matching entries (without formatting them)
+        and render only a window of them.
+        """
+        # find the entry in the middle of the display, if not showing the newest entries
+        retainSeq = None
+        isAtEnd = self.winStart + len(self.winLineCounts) >= len(self.matchSeqs)
+        if self.winLineCounts and not (isAtEnd and self.logWdg.isScrolledToEnd()):
+            midLineIndex = self.logWdg.text.index("@0,%d linestart" % (self.logWdg.winfo_height() / 2))
+            midLineNum = int(midLineIndex.split(".")[0])
+            winInd = self._virtualWinIndFromLineNum(midLineNum)
+            if self.winStart + winInd < len(self.matchSeqs):
+                retainSeq = self.matchSeqs[self.winStart + winInd]
+
+        self.lastSeq = self.logSource.entryList.nextSeq - 1
+        self.matchSeqs = self.getMatchingSeqs()
+
+        if retainSeq is None:
+            self._virtualLoadWindow(len(self.matchSeqs))
+            self.logWdg.text.see("end")
+        else:
+            matchInd = bisect.bisect_left(self.matchSeqs, retainSeq)
+            self._virtualLoadWindow(matchInd - (self.virtualLines // 2))
+            self._virtualSee(matchInd)
+
+    def _virtualLineNumFromMatchInd(self, matchInd):
+        """Return the text widget line number (1-based) of the entry at matchSeqs[matchInd]
+
+        matchInd is clipped to the window of entries in the text widget.
+        """
+        winInd = max(0, min(matchInd - self.winStart, len(self.winLineCounts)))
+        return 1 + sum(itertools.islice(self.winLineCounts, winInd))
+
+    def _virtualLoadWindow(self, startInd):
+        """Render a window of up to virtualLines matching entries into the text widget
+
+        Inputs:
+        - startInd: index in matchSeqs of the first entry to show; clipped to the valid range
+        """
+        # forget matches for entries that the log source has discarded
+        numDiscarded = bisect.bisect_left(self.matchSeqs, self.logSource.entryList.firstSeq)
+        if numDiscarded > 0:
+            del self.matchSeqs[0:numDiscarded]
+            startInd -= numDiscarded
+
+        numMatches = len(self.matchSeqs)
+        startInd = max(0, min(startInd, numMatches - self.virtualLines))
+        endInd = min(numMatches, startInd + self.virtualLines)
+        logEntries = self.logSource.getEntries(self.matchSeqs[startInd:endInd])
+        strTagsSevList = [(logEntry.getStr(), logEntry.tags, logEntry.severity) for logEntry in logEntries]
+
+        self.logWdg.clearOutput()
+        self.logWdg.addOutputList(strTagsSevList)
+        self.winStart = startInd
+        self._clearWindow()
+        self._extendWindow(logEntries, strTagsSevList)
+        self.highlightAll()
+
+    def _virtualPage(self):
+        """Page in more entries if the text widget is scrolled to its beginning or end
+
+        The entry that was at the top (or bottom) stays in view. It is found again by entry number,
+        because loading may forget discarded entries from the front of matchSeqs.
+        """
+        self._virtualPagePending = False
+        first, last = self.logWdg.text.yview()
+        numShown = len(self.winLineCounts)
+        if first <= 0 and self.winStart > 0:
+            topSeq = self.matchSeqs[self.winStart]
+            self._virtualLoadWindow(self.winStart - VirtualPageLines)
+            topInd = bisect.bisect_left(self.matchSeqs, topSeq)
+            self.logWdg.text.yview("%d.0" % (self._virtualLineNumFromMatchInd(topInd),))
+        elif last >= 1 and self.winStart + numShown < len(self.matchSeqs):
+            bottomSeq = self.matchSeqs[self.winStart + numShown - 1]
+            self._virtualLoadWindow(self.winStart + VirtualPageLines)
+            self._virtualSee(bisect.bisect_left(self.matchSeqs, bottomSeq))
+
+    def _virtualSee(self, matchInd):
+        """Make sure the entry at matchSeqs[matchInd] is visible"""
+        self.logWdg.text.see("%d.0" % (self._virtualLineNumFromMatchInd(matchInd),))
+
+    def _virtualWinIndFromLineNum(self, lineNum):
+        """Return the index in the window of entries of the entry displayed on a given text line (1-based)
+        """
+        lineSum = 0
+        for winInd, lineCount in enumerate(self.winLineCounts):
+            lineSum += lineCount
+            if lineSum >= lineNum:
+                return winInd
+        return max(0, len(self.winLineCounts) - 1)
+
+    def _virtualYScrollSet(self, first, last):
+        """Text widget yscrollcommand for virtual mode
+
+        Update the scroll bar to show the position of the visible entries among all matching entries,
+        and page in more entries if the text widget has been scrolled to its beginning or end.
+        """
+        first = float(first)
+        last = float(last)
+        numMatches = len(self.matchSeqs)
+        numShown = len(self.winLineCounts)
+        if numMatches > 0 and numShown > 0:
+            scrollFirst = (self.winStart + (first * numShown)) / float(numMatches)
+            scrollLast = (self.winStart + (last * numShown)) / float(numMatches)
+        else:
+            scrollFirst, scrollLast = first, last
+        self.logWdg.yscroll.set(scrollFirst, scrollLast)
+
+        needPage = (first <= 0 and self.winStart > 0) \
+            or (last >= 1 and self.winStart + numShown < numMatches)
+        if needPage and not self._virtualPagePending:
+            self._virtualPagePending = True
+            self.after_idle(self._virtualPage)
+
+    def _virtualYView(self, *args):
+        """Scroll bar command for virtual mode
+
+        Scrolling by units or pages scrolls the text widget (which pages in more entries as needed);
+        dragging the scroll bar (moveto) shows the corresponding part of all matching entries.
+        """
+        if not args or args[0] != "moveto":
+            self.logWdg.text.yview(*args)
+            return
+
+        numMatches = len(self.matchSeqs)
+        numShown = len(self.winLineCounts)
+        if numMatches == 0 or numShown == 0:
+            self.logWdg.text.yview(*args)
+            return
+        frac = max(0.0, min(1.0, float(args[1])))
+        matchInd = int(frac * numMatches)
+        if not (self.winStart <= matchInd < self.winStart + numShown):
+            self._virtualLoadWindow(matchInd - (self.virtualLines // 2))
+        if frac >= 1.0:
+            self.logWdg.text.see("end")
+        else:
+            self.logWdg.text.yview("%d.0" % (self._virtualLineNumFromMatchInd(matchInd),))
+
     def _cmdCallback(self, cmdVar):
         """Command callback; called when a command finishes.
         """
@@ -1128,7 +1601,7 @@ class TUILogWdg(Tkinter.Frame):
     def __del__ (self, *args):
         """Going away; remove myself as the dispatcher's logger.
         """
-        self.logSource.removeCallback(self.logSourceCallback)
+        self.logSource.removeBatchCallback(self.logSourceCallback, doRaise=False)
 
 
 if __name__ == '__main__':
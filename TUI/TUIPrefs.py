@@ -49,6 +49,10 @@ History:
                     where menu items showed up in the "Misc Font"..
 2015-11-05 ROwen    Modernized "except" syntax.
 2016-06-01 EM       Added httpHost and httpPort to connection preferences. 
+2026-10-18          Added "Archive Log", "Log Archive Dir" and "Log Archive Nights" preferences.
+                    Added "Record Hub Traffic" preference.
+                    Added "Record Key History" preference.
+                    Added "Batch Log Updates" preference.
 """
 import os
 import sys
@@ -64,6 +68,7 @@ import RO.Wdg
 _HelpURL = "TUIMenu/PreferencesWin.html"
 _ExposuresHelpURL = _HelpURL + "#Exposures"
 _SoundHelpURL = _HelpURL + "#Sounds"
+_LogHelpURL = _HelpURL + "#Log"
 
 _SoundsDir = RO.OS.getResourceDir(TUI, "Sounds")
 
@@ -165,6 +170,50 @@ class TUIPrefs(PrefVar.PrefSet):
             	helpURL = _ExposuresHelpURL,
             ),
 
+            PrefVar.BoolPrefVar(
+                name = "Archive Log",
+                category = "Log",
+                defValue = False,
+                helpText = "Save all log messages to disk?",
+                helpURL = _LogHelpURL,
+            ),
+            PrefVar.DirectoryPrefVar(
+                name = "Log Archive Dir",
+                category = "Log",
+                defValue = RO.OS.getDocsDir(),
+                helpText = "Directory in which to save log messages",
+                helpURL = _LogHelpURL,
+            ),
+            PrefVar.IntPrefVar(
+                name = "Log Archive Nights",
+                category = "Log",
+                defValue = 30,
+                minValue = 1,
+                helpText = "Number of nights of log messages to keep",
+                helpURL = _LogHelpURL,
+            ),
+            PrefVar.BoolPrefVar(
+                name = "Record Hub Traffic",
+                category = "Log",
+                defValue = False,
+                helpText = "Record all replies from the hub, for replay?",
+                helpURL = _LogHelpURL,
+            ),
+            PrefVar.BoolPrefVar(
+                name = "Record Key History",
+                category = "Log",
+                defValue = False,
+                helpText = "Save the history of values shown in strip charts?",
+                helpURL = _LogHelpURL,
+            ),
+            PrefVar.BoolPrefVar(
+                name = "Batch Log Updates",
+                category = "Log",
+                defValue = False,
+                helpText = "Update log windows in batches (for heavy hub traffic)?",
+                helpURL = _LogHelpURL,
+            ),
+
             PrefVar.FontPrefVar(
                 name = "Misc Font",
                 category = "Fonts",
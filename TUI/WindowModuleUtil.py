@@ -8,12 +8,18 @@
                     Modified to restore working directory.
                     Modified to run paths through normpath to make the code more robust.
 2015-11-05 ROwen    Modernized "except" syntax.
+2026-10-18          Added addLazyWindow and LazyWdg: create a window at startup but only import its module
+                    and build its widget when the window is first shown.
+2026-10-18          Record loading lazy windows in the startup profile (see TUI.StartupProfiler).
 """
 import os
 import sys
 import traceback
+import Tkinter
+import RO.Alg
 import RO.Constants
 import RO.OS
+import TUI.StartupProfiler
 
 def findWindowsModules(
     path,
@@ -112,3 +118,96 @@ def loadWindows(
                 logFunc(errMsg, severity=RO.Constants.sevError)
             sys.stderr.write(errMsg + "\n")
             traceback.print_exc(file=sys.stderr)
+
+
+def addLazyWindow(
+    tlSet,
+    moduleName,
+    windowName,
+    logFunc = None,
+**kargs):
+    """Create a window whose module is imported, and whose widget is built, when the window is first shown.
+
+    The toplevel is created now, so the window appears in menus and its geometry and visibility
+    are restored from the geometry file and saved as usual; its widget is a LazyWdg placeholder.
+
+    Inputs:
+    - tlSet     toplevel set (see RO.Wdg.Toplevel)
+    - moduleName name of window module; its addWindow function must create a toplevel named windowName
+    - windowName name of window
+    - logFunc   function for logging messages, as for loadWindows
+    - **kargs   keyword arguments for tlSet.createToplevel other than name and wdgFunc,
+                e.g. defGeom, visible and resizable; these should match the module's addWindow
+                (except doSaveState, which is not supported)
+    """
+    tlSet.createToplevel(
+        name = windowName,
+        wdgFunc = RO.Alg.GenericCallback(LazyWdg, moduleName=moduleName, windowName=windowName, logFunc=logFunc),
+    **kargs)
+
+
+class _CaptureTLSet(object):
+    """A stand-in for a toplevel set that records the arguments to createToplevel
+    """
+    def __init__(self):
+        self.kargsDict = dict() # dict of window name: createToplevel keyword arguments
+
+    def createToplevel(self, name, **kargs):
+        self.kargsDict[name] = kargs
+
+
+class LazyWdg(Tkinter.Frame):
+    """Placeholder widget for a window created by addLazyWindow
+
+    When first mapped (or when load is called), imports the window module, calls its addWindow function
+    with a stand-in toplevel set to obtain the widget function for the window and builds the widget
+    inside this frame.
+    """
+    def __init__(self, master, moduleName, windowName, logFunc=None):
+        Tkinter.Frame.__init__(self, master)
+        self.moduleName = moduleName
+        self.windowName = windowName
+        self.logFunc = logFunc
+        self.wdg = None
+        self._mapBindID = self.bind("<Map>", self._mapCallback)
+
+    @property
+    def isLoaded(self):
+        """True if the real widget has been built"""
+        return self.wdg is not None
+
+    def load(self):
+        """Import the window module and build the widget, if not already done; return the widget
+        """
+        if self.wdg is not None:
+            return self.wdg
+        with TUI.StartupProfiler.span(self.windowName, "window"):
+            return self._load()
+
+    def _load(self):
+        if self._mapBindID:
+            self.unbind("<Map>", self._mapBindID)
+            self._mapBindID = None
+        module = __import__(self.moduleName, globals(), locals(), "addWindow")
+        captureTLSet = _CaptureTLSet()
+        module.addWindow(captureTLSet)
+        kargs = captureTLSet.kargsDict.get(self.windowName)
+        if kargs is None:
+            raise RuntimeError("%s.addWindow did not create window %r" % (self.moduleName, self.windowName))
+        resizable = kargs.get("resizable", True)
+        if not hasattr(resizable, "__iter__"):
+            resizable = (resizable, resizable)
+        self.winfo_toplevel().resizable(*resizable)
+        self.wdg = kargs["wdgFunc"](self)
+        self.wdg.pack(fill="both", expand=True)
+        return self.wdg
+
+    def _mapCallback(self, evt=None):
+        try:
+            self.load()
+        except Exception as e:
+            errMsg = "Could not load window %r from %s: %s" % (self.windowName, self.moduleName, e)
+            if self.logFunc:
+                self.logFunc(errMsg, severity=RO.Constants.sevError)
+            sys.stderr.write(errMsg + "\n")
+            traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Benchmark log window highlighting of many lines:
+the former approach (RO.Wdg.LogWdg.findAll, which searches the Tk text widget using tcl regular expressions)
+versus TUI.TUIMenu.LogHighlight rules (Python regular expressions, with match spans cached per entry
+and tags added with a few large tag_add commands).
+
+Requires a display (e.g. run under Xvfb). Run from anywhere; the parent directory of this script
+is added to sys.path so the TUI package is found (RO and opscore must already be on the path).
+
+Usage: benchLogHighlight.py [numLines [regExp]]
+
+History:
+2026-10-18          Initial version.
+"""
+import os
+import sys
+import time
+import Tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import RO.Wdg
+import TUI.Models.LogStore
+import TUI.TUIMenu.LogHighlight as LogHighlight
+from TUI.Models.LogSource import getTAISec
+from benchLogSource import makeReplies
+
+DefNumLines = 50000
+DefRegExp = "AzStat"
+
+HighlightTag = "highlighttag"
+HighlightTextTag = "highlighttexttag"
+
+def makeStore(numLines):
+    """Return a LogStore containing numLines synthetic hub replies"""
+    store = TUI.Models.LogStore.LogStore(numLines)
+    for replyStr, actor, cmdr, cmdID, severity in makeReplies(numLines):
+        unixTime = time.time()
+        store.append(
+            msgStr = replyStr,
+            severity = severity,
+            actor = actor,
+            cmdr = cmdr,
+            cmdID = cmdID,
+            unixTime = unixTime,
+            taiSec = getTAISec(unixTime),
+        )
+    return store
+
+def benchFindAll(logWdg, regExp):
+    """Highlight using the log widget's findAll; return (seconds, number of matches)"""
+    startTime = time.time()
+    numFound = logWdg.findAll(
+        searchStr = regExp,
+        tag = HighlightTextTag,
+        lineTag = HighlightTag,
+        removeTags = True,
+        noCase = True,
+        regExp = True,
+    )
+    logWdg.update_idletasks()
+    return time.time() - startTime, numFound
+
+def benchRule(logWdg, store, highlightRule):
+    """Highlight using a highlight rule; return (seconds, number of matching entries)"""
+    text = logWdg.text
+    startTime = time.time()
+    text.tag_remove(HighlightTag, "1.0", "end")
+    text.tag_remove(HighlightTextTag, "1.0", "end")
+    lineNum = 1
+    textIndList = []
+    lineIndList = []
+    numFound = 0
+    for logEntry in store:
+        entryStr = logEntry.getStr()
+        spans = highlightRule.getSpans(logEntry)
+        if spans:
+            numFound += 1
+            for start, end in spans:
+                startInd, endInd, startLine, endLine = LogHighlight.getLineColIndices(entryStr, lineNum, start, end)
+                textIndList += [startInd, endInd]
+                lineIndList += ["%d.0" % (startLine,), "%d.0" % (endLine + 1,)]
+        lineNum += entryStr.count("\n")
+    for tag, indList in ((HighlightTextTag, textIndList), (HighlightTag, lineIndList)):
+        for i in range(0, len(indList), 2000):
+            text.tag_add(tag, *indList[i:i+2000])
+    logWdg.update_idletasks()
+    return time.time() - startTime, numFound
+
+def reportResult(name, numLines, duration, numFound):
+    print "%-22s %8.3f sec  %10.0f lines/sec  %6d matches" % (name, duration, numLines / duration, numFound)
+
+if __name__ == "__main__":
+    numLines = int(sys.argv[1]) if len(sys.argv) > 1 else DefNumLines
+    regExp = sys.argv[2] if len(sys.argv) > 2 else DefRegExp
+
+    root = Tkinter.Tk()
+    logWdg = RO.Wdg.LogWdg(root, maxLines=numLines)
+    logWdg.pack(expand=True, fill="both")
+    logWdg.text.tag_configure(HighlightTag, background="yellow")
+    logWdg.text.tag_configure(HighlightTextTag, font="bold")
+
+    print "Generating and displaying %d synthetic replies; highlighting %r" % (numLines, regExp)
+    store = makeStore(numLines)
+    logWdg.addOutputList([(logEntry.getStr(), logEntry.tags, logEntry.severity) for logEntry in store])
+    root.update()
+
+    duration, numFound = benchFindAll(logWdg, regExp)
+    reportResult("findAll (tcl)", numLines, duration, numFound)
+
+    highlightRule = LogHighlight.RegExpHighlightRule(regExp, HighlightTextTag, HighlightTag)
+    duration, numFound = benchRule(logWdg, store, highlightRule)
+    reportResult("rule (first pass)", numLines, duration, numFound)
+    duration, numFound = benchRule(logWdg, store, highlightRule)
+    reportResult("rule (cached spans)", numLines, duration, numFound)
+    print "span cache: %d hits, %d misses" % (highlightRule.numHits, highlightRule.numMisses)
+    root.destroy()
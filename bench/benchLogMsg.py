@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Benchmark LogSource.logMsg, including timestamping:
+- the cost of timestamping each entry the old way (clock correction, gmtime and strftime per entry)
+    versus the new way (cached clock correction; formatting deferred and memoized per second)
+- the maximum logMsg rate
+- logMsg at a steady 10k messages/second: the fraction of each second spent in logMsg
+
+No connection to the hub is made; messages are logged directly.
+Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (RO and opscore must already be on the path).
+
+Usage: benchLogMsg.py [numMessages [rate]]
+
+History:
+2026-10-18          Initial version.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import opscore.actor.cmdkeydispatcher
+import opscore.actor.model
+import RO.Astro.Tm
+import RO.Comm.HubConnection
+import TUI.Models.LogSource
+import TUI.Models.LogStore
+from benchLogSource import makeReplies
+
+DefNumMessages = 100000
+DefRate = 10000 # messages/second
+
+def makeLogSource():
+    """Return a LogSource whose dispatcher has a null connection"""
+    dispatcher = opscore.actor.cmdkeydispatcher.CmdKeyVarDispatcher(
+        name = "bench",
+        connection = RO.Comm.HubConnection.NullConnection(),
+        includeName = False,
+    )
+    opscore.actor.model.Model.setDispatcher(dispatcher)
+    return TUI.Models.LogSource.LogSource(dispatcher)
+
+def benchTimestamps(numMessages):
+    """Time timestamping numMessages entries (at 10k messages/second) old and new ways;
+    return (old duration, new duration) in seconds
+    """
+    unixTimes = [time.time() + (ind / float(DefRate)) for ind in xrange(numMessages)]
+
+    startTime = time.time()
+    for unixTime in unixTimes:
+        taiSec = RO.Astro.Tm.getCurrPySec(unixTime) - RO.Astro.Tm.getUTCMinusTAI()
+        time.strftime("%H:%M:%S", time.gmtime(taiSec))
+    oldDuration = time.time() - startTime
+
+    # formatting is normally deferred until an entry is displayed; include it here anyway
+    # to show the benefit of memoization
+    startTime = time.time()
+    for unixTime in unixTimes:
+        TUI.Models.LogStore.getTimeStr(TUI.Models.LogSource.getTAISec(unixTime))
+    newDuration = time.time() - startTime
+    return oldDuration, newDuration
+
+def benchMaxRate(logSource, replyList):
+    """Log replies as fast as possible; return the duration (sec)"""
+    startTime = time.time()
+    for replyStr, actor, cmdr, cmdID, severity in replyList:
+        logSource.logMsg(msgStr=replyStr, severity=severity, actor=actor, cmdr=cmdr, cmdID=cmdID)
+    return time.time() - startTime
+
+def benchSteadyRate(logSource, replyList, rate):
+    """Log replies at a steady rate; return (busy duration, total duration) in seconds
+    """
+    interval = 1.0 / rate
+    busyDuration = 0.0
+    startTime = time.time()
+    for ind, (replyStr, actor, cmdr, cmdID, severity) in enumerate(replyList):
+        sleepTime = startTime + (ind * interval) - time.time()
+        if sleepTime > 0.001:
+            time.sleep(sleepTime)
+        logStartTime = time.time()
+        logSource.logMsg(msgStr=replyStr, severity=severity, actor=actor, cmdr=cmdr, cmdID=cmdID)
+        busyDuration += time.time() - logStartTime
+    return busyDuration, time.time() - startTime
+
+if __name__ == "__main__":
+    numMessages = int(sys.argv[1]) if len(sys.argv) > 1 else DefNumMessages
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else DefRate
+
+    oldDuration, newDuration = benchTimestamps(numMessages)
+    print "timestamps: old %0.2f usec/entry; new %0.2f usec/entry" % \
+        (oldDuration * 1e6 / numMessages, newDuration * 1e6 / numMessages)
+
+    replyList = makeReplies(numMessages)
+    logSource = makeLogSource()
+    duration = benchMaxRate(logSource, replyList)
+    print "logMsg maximum rate: %0.0f messages/sec (%0.1f usec/message)" % \
+        (numMessages / duration, duration * 1e6 / numMessages)
+
+    busyDuration, totDuration = benchSteadyRate(logSource, replyList, rate)
+    print "logMsg at %0.0f messages/sec: achieved %0.0f messages/sec; logMsg used %0.1f%% of the time" % \
+        (rate, numMessages / totDuration, 100.0 * busyDuration / totDuration)
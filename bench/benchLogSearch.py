@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Benchmark the full-text log index (TUI.Models.LogTextIndex):
+the cost of indexing entries and the time to answer typical queries,
+compared to testing every entry (as a scan of the log would).
+
+Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (RO must already be on the path).
+
+Usage: benchLogSearch.py [numEntries]
+
+History:
+2026-10-18          Initial version.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TUI.Models.LogIndex
+import TUI.Models.LogStore
+import TUI.Models.LogTextIndex
+from benchLogSource import makeReplies
+
+# a night of traffic is roughly 10-20 messages/second for 10 hours
+DefNumEntries = 500000
+
+Queries = (
+    "actor:tcc AND AxePos",
+    "actor:tcc AND AzStat=180",
+    "entry OR AxePos",
+    "Axe*",
+    "actor:boss -AzStat sev:warning",
+    '"Text=\\"entry 12345\\""',
+)
+
+def makeLog(replyList):
+    """Return (entryList, logIndex, textIndex, seconds to index) for a list of replies"""
+    entryList = TUI.Models.LogStore.LogStore(len(replyList))
+    logIndex = TUI.Models.LogIndex.LogIndex()
+    textIndex = TUI.Models.LogTextIndex.TextIndex()
+    indexDuration = 0.0
+    for replyStr, actor, cmdr, cmdID, severity in replyList:
+        seq = entryList.append(replyStr, severity, actor, cmdr, cmdID, 0.0, 0.0)
+        logIndex.addEntry(seq, actor, cmdr, severity, cmdID)
+        startTime = time.time()
+        textIndex.addEntry(seq, replyStr)
+        indexDuration += time.time() - startTime
+    return entryList, logIndex, textIndex, indexDuration
+
+if __name__ == "__main__":
+    numEntries = int(sys.argv[1]) if len(sys.argv) > 1 else DefNumEntries
+    print "Generating and indexing %d synthetic replies" % (numEntries,)
+    entryList, logIndex, textIndex, indexDuration = makeLog(makeReplies(numEntries))
+    print "indexed %0.0f entries/sec; %d distinct tokens" % (numEntries / indexDuration, len(textIndex))
+
+    print "%-40s %8s %10s %10s" % ("query", "hits", "index ms", "scan ms")
+    for queryStr in Queries:
+        query = TUI.Models.LogTextIndex.LogQuery(queryStr)
+        startTime = time.time()
+        seqList = query.getSeqs(entryList, logIndex, textIndex)
+        indexDuration = time.time() - startTime
+        startTime = time.time()
+        scanSeqList = [entry.seq for entry in entryList if query.matches(entry)]
+        scanDuration = time.time() - startTime
+        if scanSeqList != seqList:
+            print "Error: index and scan disagree for query %r" % (queryStr,)
+        print "%-40s %8d %10.1f %10.1f" % (queryStr, len(seqList), indexDuration * 1000, scanDuration * 1000)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""Benchmark memory use and append throughput of log entry storage:
+the columnar TUI.Models.LogStore versus the former deque of LogEntry objects.
+
+Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (RO and opscore must already be on the path).
+
+Usage: benchLogSource.py [numEntries]
+
+History:
+2026-10-18          Initial version.
+"""
+import collections
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import opscore.protocols.parser
+import TUI.Models.LogStore
+from TUI.Models.LogSource import LogEntry, getTAISec
+
+DefNumEntries = 50000
+
+Actors = ("tcc", "mcp", "apogee", "boss", "guider", "hub", "cmds", "keys_tcc")
+Cmdrs = ("apo.joe", "apo.ann", ".hub", "apo.apo")
+
+def makeReplies(numEntries):
+    """Return a list of (replyStr, actor, cmdr, cmdID, severity) for synthetic hub replies"""
+    rand = random.Random(0)
+    replyList = []
+    for ind in xrange(numEntries):
+        actor = rand.choice(Actors)
+        cmdr = rand.choice(Cmdrs)
+        cmdID = rand.randint(0, 5000)
+        severity = rand.choice((-1, 0, 0, 0, 1, 2))
+        replyStr = "%s %d %s i AxePos=%0.4f, %0.4f, %0.4f; AzStat=%0.4f, 0.0, %d, 0x801; Text=\"entry %d\"" % \
+            (cmdr, cmdID, actor, rand.uniform(-180, 180), rand.uniform(15, 90), rand.uniform(-180, 180),
+            rand.uniform(-180, 180), ind, ind)
+        replyList.append((replyStr, actor, cmdr, cmdID, severity))
+    return replyList
+
+def deepSizeOf(obj, seenIDs=None):
+    """Return an estimate of the memory used by obj and everything it references (bytes)
+    """
+    if seenIDs is None:
+        seenIDs = set()
+    objID = id(obj)
+    if objID in seenIDs:
+        return 0
+    seenIDs.add(objID)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, unicode, int, long, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        for key, val in obj.iteritems():
+            size += deepSizeOf(key, seenIDs) + deepSizeOf(val, seenIDs)
+    elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+        for item in obj:
+            size += deepSizeOf(item, seenIDs)
+    if hasattr(obj, "__dict__"):
+        size += deepSizeOf(obj.__dict__, seenIDs)
+    return size
+
+def benchDeque(replyList, keywordsList, maxEntries):
+    """Store entries the old way: a deque of LogEntry objects; return (seconds, bytes)"""
+    gc.collect()
+    entryList = collections.deque()
+    startTime = time.time()
+    for (replyStr, actor, cmdr, cmdID, severity), keywords in zip(replyList, keywordsList):
+        entry = LogEntry(
+            msgStr = replyStr,
+            severity = severity,
+            actor = actor,
+            cmdr = cmdr,
+            cmdID = cmdID,
+            keywords = keywords,
+            tags = ["cmdr_" + cmdr.lower(), "act_" + actor.lower()],
+        )
+        entryList.append(entry)
+        if len(entryList) > maxEntries:
+            entryList.popleft()
+    duration = time.time() - startTime
+    return duration, deepSizeOf(entryList)
+
+def benchStore(replyList, maxEntries):
+    """Store entries the new way: a LogStore; return (seconds, bytes)"""
+    gc.collect()
+    store = TUI.Models.LogStore.LogStore(maxEntries)
+    startTime = time.time()
+    for replyStr, actor, cmdr, cmdID, severity in replyList:
+        unixTime = time.time()
+        store.append(
+            msgStr = replyStr,
+            severity = severity,
+            actor = actor,
+            cmdr = cmdr,
+            cmdID = cmdID,
+            unixTime = unixTime,
+            taiSec = getTAISec(unixTime),
+        )
+    duration = time.time() - startTime
+    return duration, store.getMemoryUsage()
+
+def reportResult(name, numEntries, duration, numBytes):
+    print "%-10s %8.0f entries/sec  %8.1f MB  %6.0f bytes/entry" % \
+        (name, numEntries / duration, numBytes / 1.0e6, numBytes / float(numEntries))
+
+if __name__ == "__main__":
+    numEntries = int(sys.argv[1]) if len(sys.argv) > 1 else DefNumEntries
+    print "Generating and parsing %d synthetic replies" % (numEntries,)
+    replyList = makeReplies(numEntries)
+    parser = opscore.protocols.parser.ReplyParser()
+    keywordsList = [parser.parse(reply[0]).keywords for reply in replyList]
+
+    dequeDuration, dequeBytes = benchDeque(replyList, keywordsList, maxEntries=numEntries)
+    reportResult("deque", numEntries, dequeDuration, dequeBytes)
+    storeDuration, storeBytes = benchStore(replyList, maxEntries=numEntries)
+    reportResult("LogStore", numEntries, storeDuration, storeBytes)
+    print "LogStore uses %0.1f%% of the memory of the deque" % (100.0 * storeBytes / dequeBytes,)
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+"""End-to-end benchmark of the dispatch-to-widget pipeline: how much hub traffic STUI can absorb.
+
+Starts the TUI model in test mode with the standard windows (TUI.LoadStdModules.loadAll), all shown
+(unless --hidden), then replays each scenario through the keyword dispatcher (using TUI.Base.ReplayDispatcher)
+and reports, for each scenario:
+- replies/sec: number of replies divided by the time to dispatch them (including the Tk event loop,
+    which runs between batches of replies)
+- Tk event loop latency: how late a probe scheduled every few milliseconds with Tk "after" actually runs
+    (p50, p95, p99 and max, in msec)
+- callback cost per window: time spent in keyword callbacks (measured by TUI.Models.CallbackProfiler),
+    grouped by the window of the widget that owns the callback, or by callback for callbacks
+    that are not widget methods; the most costly individual callbacks are also saved in the JSON output
+- redraws: number of redraws requested and done by widgets that use TUI.Base.FrameScheduler
+    (the difference is the number of redraws saved by coalescing)
+- elided: number of keyword callbacks skipped because the value was unchanged (see TUI.Models.ChangeFilter)
+- suspended: number of keyword callbacks suspended because their window was hidden
+    (see TUI.Base.WindowSuspender; only nonzero with --hidden, unless --noSuspend)
+
+Scenarios:
+- tccSlewBurst: TCC status at 10 Hz during a long slew (axis positions, axis status, object position)
+- apogeeUTRFlood: APOGEE up-the-ramp read state for many exposures
+- refreshStorm: refreshAllVar(resetAll=True), as done on reconnect, followed by a flood of replies
+    with the current value of every keyword used by the other scenarios;
+    refreshSec is the time taken by refreshAllVar itself
+- recording: a recording of real hub traffic (see TUI.Models.HubRecording), if --recording is specified
+
+By default replies are replayed as fast as possible (to measure maximum throughput);
+use --speed to replay at a multiple of the recorded pace (to measure latency under realistic load).
+
+Runs headless: if $DISPLAY is not set then an Xvfb server (which must be installed) is started
+on a free display for the duration of the run. Results are printed as a table and may also be saved
+as JSON (--json path, or --json - for stdout).
+
+Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (RO, opscore, twisted and actorkeys must already be on the path).
+
+Usage: benchPipeline.py [--scenario name]... [--numReplies N] [--speed N] [--recording path] [--hidden] [--noSuspend]
+    [--json path]
+
+History:
+2026-10-18          Initial version.
+2026-10-18          Measure callback cost using TUI.Models.CallbackProfiler.
+2026-10-18          Report redraws saved by TUI.Base.FrameScheduler.
+2026-10-18          Report callbacks elided by TUI.Models.ChangeFilter.
+2026-10-18          Report callbacks suspended by TUI.Base.WindowSuspender; added --noSuspend.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DefNumReplies = 20000
+ProbeIntervalMS = 5 # interval between Tk event loop latency probes (msec)
+SettleSec = 1.0 # time to let the GUI settle before and between scenarios (sec)
+NumTopWindows = 10 # number of most costly windows to print for each scenario
+NumTopCallbacks = 25 # number of most costly callbacks to save for each scenario
+ScenarioNames = ("tccSlewBurst", "apogeeUTRFlood", "refreshStorm")
+
+def startXvfb():
+    """Start an Xvfb server on a free display, set $DISPLAY and arrange to stop the server on exit
+    """
+    for displayNum in range(99, 199):
+        if not os.path.exists("/tmp/.X%d-lock" % (displayNum,)):
+            break
+    else:
+        raise RuntimeError("Could not find a free X display for Xvfb")
+    xvfbProc = subprocess.Popen(["Xvfb", ":%d" % (displayNum,), "-screen", "0", "1920x1200x24", "-nolisten", "tcp"])
+    atexit.register(xvfbProc.terminate)
+    socketPath = "/tmp/.X11-unix/X%d" % (displayNum,)
+    for i in range(100):
+        if os.path.exists(socketPath):
+            break
+        if xvfbProc.poll() is not None:
+            raise RuntimeError("Xvfb failed with exit code %s" % (xvfbProc.returncode,))
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = ":%d" % (displayNum,)
+    print "Started Xvfb on display %s" % (os.environ["DISPLAY"],)
+
+def makeTCCSlewBurst(numReplies):
+    """Return a list of (receive time, reply) for TCC status output during a long slew at 10 Hz
+    """
+    prefix = "tcc.tcc 0 tcc i "
+    replyList = [
+        prefix + "ObjName='bench object'; ObjSys=ICRS, 2000.0; RotType=Obj",
+        prefix + "SlewDuration=%0.1f; AxisCmdState=Slewing, Slewing, Slewing" % (numReplies / 30.0,),
+    ]
+    az, alt, rot = -340.0, 45.0, 10.0
+    tick = 0
+    while len(replyList) < numReplies - 2:
+        az += 0.05
+        alt += 0.01
+        rot -= 0.02
+        replyList.append(prefix + "AxePos=%0.4f, %0.4f, %0.4f; TCCPos=%0.4f, %0.4f, %0.4f" % (az, alt, rot, az, alt, rot))
+        replyList.append(prefix + "AzStat=%0.4f, 0.5, %d, 0; AltStat=%0.4f, 0.1, %d, 0; RotStat=%0.4f, -0.2, %d, 0" % \
+            (az, tick, alt, tick, rot, tick))
+        if tick % 10 == 0:
+            replyList.append(prefix + "ObjNetPos=120.123450, 0.000000, 4494436859.66000, -2.345670, 0.000000, 4494436859.66000")
+        tick += 1
+    replyList += [
+        prefix + "SlewEnd",
+        prefix + "AxisCmdState=Tracking, Tracking, Tracking; AxisErrCode='', '', ''",
+    ]
+    # output for one tick is spread over 0.1 sec
+    return [(ind * 0.1 / 3, replyStr) for ind, replyStr in enumerate(replyList)]
+
+def makeAPOGEEUTRFlood(numReplies):
+    """Return a list of (receive time, reply) for APOGEE up-the-ramp reads (60 reads per exposure)
+    """
+    prefix = "apogee.apogee 0 apogee i "
+    numReads = 60
+    readTime = 10.6
+    replyList = []
+    currTime = 0.0
+    expNum = 120000
+    while len(replyList) < numReplies:
+        expName = "%08d" % (expNum,)
+        replyList.append((currTime, prefix + "exposureState=Exposing, Object, %d, %s; utrReadTime=%0.1f" % \
+            (numReads, expName, readTime)))
+        for readNum in range(1, numReads + 1):
+            replyList.append((currTime, prefix + "utrReadState=%s, Reading, %d, %d" % (expName, readNum, numReads)))
+            currTime += readTime
+            replyList.append((currTime, prefix + "utrReadState=%s, Saving, %d, %d" % (expName, readNum, numReads)))
+            replyList.append((currTime + 0.5, prefix + "utrReadState=%s, Done, %d, %d" % (expName, readNum, numReads)))
+        replyList.append((currTime + 1.0, prefix + "exposureState=Done, Object, %d, %s" % (numReads, expName)))
+        currTime += 5.0
+        expNum += 1
+    return replyList[0:numReplies]
+
+def makeRefreshFlood(numReplies):
+    """Return a list of (receive time, reply) with the current value of each keyword used by the other scenarios,
+    repeated as needed to make numReplies replies, all at the same time (as after refreshAllVar)
+    """
+    keyValDict = dict()
+    for recvTime, replyStr in makeTCCSlewBurst(1000) + makeAPOGEEUTRFlood(1000):
+        prefix, keyValStr = replyStr.split(" i ", 1)
+        for keyVal in keyValStr.split("; "):
+            keyValDict[(prefix, keyVal.split("=", 1)[0])] = keyVal
+    refreshList = ["%s : %s" % (keyPrefix, keyVal) for (keyPrefix, keyName), keyVal in sorted(keyValDict.iteritems())]
+    return [(0.0, refreshList[ind % len(refreshList)]) for ind in xrange(numReplies)]
+
+def writeRecording(filePath, replyList):
+    """Write a list of (receive time, reply) to a hub recording"""
+    import TUI.Models.HubRecording
+    writer = TUI.Models.HubRecording.HubRecordingWriter(filePath)
+    for recvTime, replyStr in replyList:
+        writer.append(replyStr, recvTime=recvTime)
+    writer.close()
+
+
+class PipelineBench(object):
+    """Run scenarios in sequence in the Tk event loop and collect results
+    """
+    def __init__(self, tuiModel, scenarioList, speed):
+        """Inputs:
+        - tuiModel: the TUI model
+        - scenarioList: list of (name, recording path)
+        - speed: replay speed as a multiple of real time; None for as fast as possible
+        """
+        import TUI.Base.FrameScheduler
+        import TUI.Base.WindowSuspender
+        import TUI.Models.ChangeFilter
+        import TUI.Models.CmdTracker
+        self.tuiModel = tuiModel
+        self.tkRoot = tuiModel.tkRoot
+        self.scenarioList = list(scenarioList)
+        self.speed = speed
+        self.resultList = []
+        self.profiler = tuiModel.callbackProfiler
+        self.frameScheduler = TUI.Base.FrameScheduler.FrameScheduler()
+        self.changeFilter = TUI.Models.ChangeFilter
+        self.windowSuspender = TUI.Base.WindowSuspender.WindowSuspender(tuiModel)
+        self.latencyHist = TUI.Models.CmdTracker.LatencyHistogram()
+        self._probeTime = None
+        self._scenarioStartTime = None
+        self._scenarioData = None
+
+    def run(self):
+        """Run all scenarios; return a list of results (one dict per scenario)"""
+        self.tkRoot.after(int(SettleSec * 1000), self._startNextScenario)
+        self.tkRoot.after(ProbeIntervalMS, self._probe)
+        self.tuiModel.reactor.run()
+        return self.resultList
+
+    def _probe(self):
+        """Measure Tk event loop latency"""
+        currTime = time.time()
+        if self._probeTime is not None and self._scenarioStartTime is not None:
+            self.latencyHist.add(currTime - self._probeTime - (ProbeIntervalMS / 1000.0))
+        self._probeTime = currTime
+        self.tkRoot.after(ProbeIntervalMS, self._probe)
+
+    def _startNextScenario(self):
+        import TUI.Base.ReplayDispatcher
+        if not self.scenarioList:
+            self.tuiModel.reactor.stop()
+            return
+        name, filePath = self.scenarioList.pop(0)
+        print "Running scenario %s" % (name,)
+        self.profiler.enable()
+        self.profiler.reset()
+        self.frameScheduler.reset()
+        self.changeFilter.resetStats()
+        self.windowSuspender.reset()
+        self.latencyHist.reset()
+        self._scenarioData = dict(name=name)
+        self._scenarioStartTime = time.time()
+        if name == "refreshStorm":
+            self.tuiModel.dispatcher.refreshAllVar(resetAll=True)
+            self._scenarioData["refreshSec"] = time.time() - self._scenarioStartTime
+        replayDispatcher = TUI.Base.ReplayDispatcher.ReplayDispatcher(filePath, speed=self.speed,
+            doneFunc=self._scenarioDone)
+        replayDispatcher.start()
+
+    def _scenarioDone(self, replayDispatcher):
+        duration = time.time() - self._scenarioStartTime
+        self._scenarioStartTime = None
+        replayDispatcher.reader.close()
+        latencyList = [latency * 1000.0 for latency in
+            self.latencyHist.getPercentiles((50, 95, 99)) + [self.latencyHist.maxLatency]]
+        statsList = self.profiler.getStats()
+        windowDict = dict() # dict of window name (or callback name if not in a window): [number of calls, total sec]
+        for stats in statsList:
+            windowStats = windowDict.setdefault(stats.windowName or stats.callbackName, [0, 0.0])
+            windowStats[0] += stats.numCalls
+            windowStats[1] += stats.totSec
+        windowList = [dict(window=windowName, numCalls=numCalls, totSec=totSec)
+            for windowName, (numCalls, totSec) in windowDict.iteritems()]
+        windowList.sort(key=lambda windowData: -windowData["totSec"])
+        callbackList = [dict(keyword="%s.%s" % (stats.actor, stats.keyName), callback=stats.callbackName,
+            window=stats.windowName, numCalls=stats.numCalls, totSec=stats.totSec, maxSec=stats.maxSec)
+            for stats in statsList[0:NumTopCallbacks]]
+        self._scenarioData.update(
+            numReplies = replayDispatcher.numDispatched,
+            durationSec = duration,
+            repliesPerSec = replayDispatcher.numDispatched / duration,
+            maxReplayLagSec = replayDispatcher.maxLag,
+            eventLoopLatencyMS = dict(zip(("p50", "p95", "p99", "max"), latencyList)),
+            callbackSec = sum(windowData["totSec"] for windowData in windowList),
+            windows = windowList,
+            callbacks = callbackList,
+            redrawMarks = self.frameScheduler.numMarks,
+            redraws = self.frameScheduler.numRedraws,
+            redrawFrames = self.frameScheduler.numFrames,
+            elidedCallbacks = self.changeFilter.getNumElided(),
+            suspendedCallbacks = self.windowSuspender.getNumSuspended(),
+        )
+        self.resultList.append(self._scenarioData)
+        self.tkRoot.after(int(SettleSec * 1000), self._startNextScenario)
+
+
+def printResults(resultList):
+    """Print results as a table"""
+    print
+    print "%-16s %8s %10s %8s %8s %8s %8s %10s %8s %8s %8s %9s" % \
+        ("scenario", "replies", "replies/s", "p50 ms", "p95 ms", "p99 ms", "max ms", "callback s", "redraws", "saved",
+        "elided", "suspended")
+    for result in resultList:
+        latencyDict = result["eventLoopLatencyMS"]
+        print "%-16s %8d %10.0f %8.1f %8.1f %8.1f %8.1f %10.2f %8d %8d %8d %9d" % (result["name"], result["numReplies"],
+            result["repliesPerSec"], latencyDict["p50"], latencyDict["p95"], latencyDict["p99"], latencyDict["max"],
+            result["callbackSec"], result["redraws"], max(0, result["redrawMarks"] - result["redraws"]),
+            result["elidedCallbacks"], result["suspendedCallbacks"])
+    for result in resultList:
+        print
+        print "%s: most costly windows%s" % (result["name"],
+            "; refreshAllVar took %0.3f sec" % (result["refreshSec"],) if "refreshSec" in result else "")
+        for windowData in result["windows"][0:NumTopWindows]:
+            print "  %-40s %8d calls %8.3f sec %8.1f usec/call" % (windowData["window"], windowData["numCalls"],
+                windowData["totSec"], windowData["totSec"] * 1e6 / max(1, windowData["numCalls"]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the STUI dispatch-to-widget pipeline")
+    parser.add_argument("--scenario", action="append", choices=ScenarioNames,
+        help="scenario to run (may be repeated); default: all synthetic scenarios")
+    parser.add_argument("--numReplies", type=int, default=DefNumReplies, help="number of replies per synthetic scenario")
+    parser.add_argument("--speed", type=float, default=0,
+        help="replay speed as a multiple of the recorded pace; 0 (the default) for as fast as possible")
+    parser.add_argument("--recording", help="also replay this hub recording")
+    parser.add_argument("--hidden", action="store_true", help="do not show the windows")
+    parser.add_argument("--noSuspend", action="store_true",
+        help="do not suspend callbacks of hidden windows (see TUI.Base.WindowSuspender)")
+    parser.add_argument("--json", help="save results as JSON to this path (- for stdout)")
+    args = parser.parse_args()
+
+    if not os.environ.get("DISPLAY"):
+        startXvfb()
+
+    import TUI.LoadStdModules
+    import TUI.Models.TUIModel
+
+    tuiModel = TUI.Models.TUIModel.Model(testMode=True)
+    tuiModel.logSource.removeCallback(TUI.Models.TUIModel.logToStdOut)
+    TUI.LoadStdModules.loadAll()
+    if not args.hidden:
+        for tlName in tuiModel.tlSet.getNames(""):
+            tuiModel.tlSet.makeVisible(tlName)
+    if not args.noSuspend:
+        import TUI.Base.WindowSuspender
+        tuiModel.tkRoot.update()
+        TUI.Base.WindowSuspender.WindowSuspender(tuiModel).enable()
+
+    random.seed(0)
+    tempDir = tempfile.mkdtemp()
+    try:
+        scenarioList = []
+        makeFuncDict = dict(
+            tccSlewBurst = makeTCCSlewBurst,
+            apogeeUTRFlood = makeAPOGEEUTRFlood,
+            refreshStorm = makeRefreshFlood,
+        )
+        for name in args.scenario or ScenarioNames:
+            filePath = os.path.join(tempDir, name + ".hubrec")
+            writeRecording(filePath, makeFuncDict[name](args.numReplies))
+            scenarioList.append((name, filePath))
+        if args.recording:
+            scenarioList.append(("recording", args.recording))
+
+        resultList = PipelineBench(tuiModel, scenarioList, speed=args.speed or None).run()
+    finally:
+        shutil.rmtree(tempDir)
+
+    printResults(resultList)
+    if args.json:
+        results = dict(
+            benchmark = "pipeline",
+            time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            platform = platform.platform(),
+            python = platform.python_version(),
+            numReplies = args.numReplies,
+            speed = args.speed or None,
+            windowsShown = not args.hidden,
+            suspendHidden = not args.noSuspend,
+            scenarios = resultList,
+        )
+        if args.json == "-":
+            json.dump(results, sys.stdout, indent=2, sort_keys=True)
+            print
+        else:
+            with open(args.json, "w") as outFile:
+                json.dump(results, outFile, indent=2, sort_keys=True)
+            print "Saved results to %s" % (args.json,)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""Benchmark computing the current az/alt of every object in a sky window catalog:
+one object at a time (TUI.TCC.TelTarget.TelTarget.getAzAlt, which calls RO.Astro.Sph.coordConv,
+as TUI.TCC.SkyWindow did) versus one vectorized pass per coordinate system and date
+(TUI.TCC.TelTarget.Catalog.getAzAltArr).
+
+For each catalog size a catalog of random objects is made, cycling through ICRS, FK5 (equinox 1975)
+and Galactic coordinates, with random proper motions, parallaxes and radial velocities. Reports:
+- scalar: mean time per object of getAzAlt (usec), measured on the first --sample objects,
+    and the estimated time for the whole catalog (sec)
+- batch first: time of the first call to Catalog.getAzAltArr (msec), which also reads the objects
+- batch: mean time of later calls (msec)
+- max err: maximum angular separation between the scalar and batch az/alt (arcsec),
+    over the sampled objects (both are computed for the same date)
+
+Does not need a display. Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (numpy and RO must be installed).
+
+Usage: benchSkyCatalog.py [--size N]... [--sample N] [--repeat N] [--json path]
+
+History:
+2026-10-18          Initial version.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+import RO.Astro.Sph
+import RO.Astro.Tm
+import TUI.TCC.TelTarget
+
+DefSizes = (1000, 10000, 100000) # number of objects in catalog
+DefSample = 1000 # maximum number of objects to convert one at a time
+DefRepeat = 5 # number of later calls to Catalog.getAzAltArr to time
+
+CSysDateList = (("ICRS", "2000"), ("FK5", "1975"), ("Galactic", ""))
+
+def makeCatalog(numObj):
+    """Return a TUI.TCC.TelTarget.Catalog of numObj random objects"""
+    randState = numpy.random.RandomState(0)
+    eqArr = randState.uniform(0, 360, numObj)
+    polArr = numpy.degrees(numpy.arcsin(randState.uniform(-1, 1, numObj)))
+    pmArr = randState.normal(0, 20, (numObj, 2))
+    parlaxArr = numpy.abs(randState.normal(0, 0.05, numObj))
+    radVelArr = randState.normal(0, 30, numObj)
+    objList = []
+    for ind in xrange(numObj):
+        csys, date = CSysDateList[ind % len(CSysDateList)]
+        eqDisp = eqArr[ind] / 15.0 if csys != "Galactic" else eqArr[ind]
+        objList.append(TUI.TCC.TelTarget.TelTarget(dict(
+            Name = "obj%d" % (ind,),
+            ObjPos = (repr(eqDisp), repr(polArr[ind])),
+            CSys = csys,
+            Date = date,
+            PM = (repr(pmArr[ind, 0]), repr(pmArr[ind, 1])),
+            Px = repr(parlaxArr[ind]),
+            Rv = repr(radVelArr[ind]),
+        )))
+    return TUI.TCC.TelTarget.Catalog("bench%d" % (numObj,), objList)
+
+def runSize(numObj, numSample, numRepeat):
+    """Run the benchmark for one catalog size; return a dict of results"""
+    catalog = makeCatalog(numObj)
+    objList = catalog.getObjList()
+    ut1 = RO.Astro.Tm.utcFromPySec()
+    sampleList = objList[0:numSample]
+
+    gc.collect()
+    startTime = time.time()
+    scalarAzAltList = [obj.getAzAlt(ut1=ut1) for obj in sampleList]
+    scalarSec = time.time() - startTime
+
+    gc.collect()
+    startTime = time.time()
+    azAltArr = catalog.getAzAltArr(ut1=ut1)
+    firstSec = time.time() - startTime
+
+    startTime = time.time()
+    for i in xrange(numRepeat):
+        catalog.getAzAltArr(ut1=ut1)
+    batchSec = (time.time() - startTime) / float(max(1, numRepeat))
+
+    maxErrDeg = max(RO.Astro.Sph.angSep(scalarAzAlt, azAltArr[ind])
+        for ind, scalarAzAlt in enumerate(scalarAzAltList))
+    scalarUSec = scalarSec * 1e6 / len(sampleList)
+    return dict(
+        numObj = numObj,
+        numSample = len(sampleList),
+        scalarUSec = scalarUSec,
+        scalarEstSec = scalarUSec * numObj / 1e6,
+        batchFirstMSec = firstSec * 1e3,
+        batchMSec = batchSec * 1e3,
+        speedup = (scalarUSec * numObj / 1e6) / batchSec if batchSec > 0 else None,
+        maxErrArcSec = maxErrDeg * 3600.0,
+    )
+
+def printResults(resultList):
+    print "%8s %10s %10s %10s %10s %9s %9s" % ("objects", "scalar", "scalar", "batch", "batch", "speedup", "max err")
+    print "%8s %10s %10s %10s %10s %9s %9s" % ("", "(usec/obj)", "est (sec)", "1st (msec)", "(msec)", "", "(arcsec)")
+    for result in resultList:
+        print "%8d %10.1f %10.2f %10.1f %10.1f %9.0f %9.2g" % (result["numObj"], result["scalarUSec"],
+            result["scalarEstSec"], result["batchFirstMSec"], result["batchMSec"], result["speedup"] or 0,
+            result["maxErrArcSec"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark computing the az/alt of sky window catalog objects")
+    parser.add_argument("--size", type=int, action="append",
+        help="number of objects in catalog (may be repeated); default: %s" % (", ".join(str(s) for s in DefSizes),))
+    parser.add_argument("--sample", type=int, default=DefSample,
+        help="maximum number of objects to convert one at a time (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DefRepeat,
+        help="number of later batch conversions to time (default %(default)s)")
+    parser.add_argument("--json", help="save results as JSON to this path (- for stdout)")
+    args = parser.parse_args()
+
+    resultList = [runSize(numObj, args.sample, args.repeat) for numObj in args.size or DefSizes]
+
+    printResults(resultList)
+    if args.json:
+        results = dict(
+            benchmark = "skyCatalog",
+            time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            platform = platform.platform(),
+            python = platform.python_version(),
+            numpy = numpy.__version__,
+            sizes = resultList,
+        )
+        if args.json == "-":
+            json.dump(results, sys.stdout, indent=2, sort_keys=True)
+            print
+        else:
+            with open(args.json, "w") as outFile:
+                json.dump(results, outFile, indent=2, sort_keys=True)
+            print "Saved results to %s" % (args.json,)
+
+if __name__ == "__main__":
+    main()
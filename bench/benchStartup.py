@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""Benchmark STUI startup: time to first interactive, with and without lazy window loading
+
+Runs STUI startup in a fresh Python process (so module imports are included), several times
+with all windows loaded at startup (TUI.LoadStdModules.loadAll(lazy=False), the old behavior)
+and several times with lazy window loading (loadAll(lazy=True)), alternating between the two.
+Each run does what TUI.Main does to start up (except for downloading actorkeys, loading additional windows
+and connecting): configure matplotlib and RO, create the TUI model (in test mode), load the standard windows
+and create the menu bar. It then waits until the Tk event loop is first idle, with all pending events processed
+(including building any lazy windows that are initially shown).
+
+Reports, for each mode, the median and minimum of:
+- time to first interactive: from launching the process to the first idle event loop (sec)
+- load time: the time taken by loadAll, creating the menu bar and getting to the first idle event loop (sec)
+and the number of modules imported and of windows whose widgets were built.
+
+Runs headless: if $DISPLAY is not set then an Xvfb server (which must be installed) is started.
+Results may also be saved as JSON (--json path, or --json - for stdout).
+
+Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (RO, opscore, twisted and actorkeys must already be on the path).
+
+Usage: benchStartup.py [--numRuns N] [--json path]
+
+History:
+2026-10-18          Initial version.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+PkgDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PkgDir)
+
+DefNumRuns = 5
+
+def runChild(lazy, launchTime):
+    """Start STUI, print results as JSON on one line and exit
+
+    Inputs:
+    - lazy: load windows lazily?
+    - launchTime: time at which the parent launched this process (unix sec)
+    """
+    import Tkinter
+    import matplotlib
+    matplotlib.use("Agg")
+    import RO.Comm.Generic
+    RO.Comm.Generic.setFramework("tk")
+
+    tkRoot = Tkinter.Tk()
+    tkRoot.withdraw()
+
+    import TUI.LoadStdModules
+    import TUI.MenuBar
+    import TUI.Models.TUIModel
+    import TUI.WindowModuleUtil
+
+    tuiModel = TUI.Models.TUIModel.Model(testMode=True)
+    tuiModel.logSource.removeCallback(TUI.Models.TUIModel.logToStdOut)
+    loadStartTime = time.time()
+    TUI.LoadStdModules.loadAll(lazy=lazy)
+    TUI.MenuBar.MenuBar()
+
+    def firstIdle():
+        tkRoot.update()
+        readyTime = time.time()
+        numWindows = 0
+        numBuilt = 0
+        for tlName in tuiModel.tlSet.getNames(""):
+            numWindows += 1
+            wdg = tuiModel.tlSet.getToplevel(tlName).getWdg()
+            if not isinstance(wdg, TUI.WindowModuleUtil.LazyWdg) or wdg.isLoaded:
+                numBuilt += 1
+        result = dict(
+            lazy = lazy,
+            startupSec = readyTime - launchTime,
+            loadSec = readyTime - loadStartTime,
+            numModules = len(sys.modules),
+            numWindows = numWindows,
+            numBuilt = numBuilt,
+        )
+        sys.stdout.write("RESULT %s\n" % (json.dumps(result),))
+        sys.stdout.flush()
+        tkRoot.quit()
+
+    tkRoot.after_idle(firstIdle)
+    tkRoot.mainloop()
+
+def runOnce(lazy):
+    """Run STUI startup in a new process; return the result dict"""
+    launchTime = time.time()
+    childProc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--child", "lazy" if lazy else "eager", repr(launchTime)],
+        stdout = subprocess.PIPE,
+    )
+    outStr = childProc.communicate()[0]
+    for line in outStr.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    raise RuntimeError("Startup failed with exit code %s" % (childProc.returncode,))
+
+def median(valList):
+    valList = sorted(valList)
+    midInd = len(valList) // 2
+    if len(valList) % 2 == 1:
+        return valList[midInd]
+    return (valList[midInd - 1] + valList[midInd]) / 2.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STUI startup with and without lazy window loading")
+    parser.add_argument("--numRuns", type=int, default=DefNumRuns, help="number of runs of each mode")
+    parser.add_argument("--json", help="save results as JSON to this path (- for stdout)")
+    parser.add_argument("--child", choices=("eager", "lazy"), help=argparse.SUPPRESS)
+    parser.add_argument("launchTime", nargs="?", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        runChild(lazy=(args.child == "lazy"), launchTime=args.launchTime)
+        return
+
+    if not os.environ.get("DISPLAY"):
+        from benchPipeline import startXvfb
+        startXvfb()
+
+    runListDict = dict(eager=[], lazy=[])
+    for runInd in range(args.numRuns):
+        for modeName in ("eager", "lazy"):
+            result = runOnce(lazy=(modeName == "lazy"))
+            print "Run %d %-5s: first interactive after %0.3f sec" % (runInd + 1, modeName, result["startupSec"])
+            runListDict[modeName].append(result)
+
+    summaryDict = dict()
+    print
+    print "%-6s %12s %12s %10s %10s %8s %8s" % ("mode", "median sec", "min sec", "load sec", "modules", "windows", "built")
+    for modeName in ("eager", "lazy"):
+        runList = runListDict[modeName]
+        startupList = [run["startupSec"] for run in runList]
+        summary = dict(
+            medianStartupSec = median(startupList),
+            minStartupSec = min(startupList),
+            medianLoadSec = median([run["loadSec"] for run in runList]),
+            numModules = runList[-1]["numModules"],
+            numWindows = runList[-1]["numWindows"],
+            numBuilt = runList[-1]["numBuilt"],
+            runs = runList,
+        )
+        summaryDict[modeName] = summary
+        print "%-6s %12.3f %12.3f %10.3f %10d %8d %8d" % (modeName, summary["medianStartupSec"],
+            summary["minStartupSec"], summary["medianLoadSec"], summary["numModules"], summary["numWindows"],
+            summary["numBuilt"])
+    speedup = summaryDict["eager"]["medianStartupSec"] - summaryDict["lazy"]["medianStartupSec"]
+    print "Lazy loading saves %0.3f sec (median)" % (speedup,)
+
+    if args.json:
+        results = dict(
+            benchmark = "startup",
+            time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            platform = platform.platform(),
+            python = platform.python_version(),
+            numRuns = args.numRuns,
+            modes = summaryDict,
+        )
+        if args.json == "-":
+            json.dump(results, sys.stdout, indent=2, sort_keys=True)
+            print
+        else:
+            with open(args.json, "w") as outFile:
+                json.dump(results, outFile, indent=2, sort_keys=True)
+            print "Saved results to %s" % (args.json,)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""Benchmark memory use and append cost of strip chart line storage over a night of data:
+TUI.Base.TimeSeriesBuffer (preallocated NumPy ring buffers, as used by TUI.Base.StripChartWdg.plotKeyVar)
+versus Python lists of times and values trimmed with bisect (as used by RO.Wdg.StripChartWdg lines).
+
+For each rate (points/sec per line) a 12 hour night is simulated (e.g. 43,200 points at 1 Hz,
+432,000 points at 10 Hz). Points are appended one at a time and points older than the time range
+are trimmed once per second of simulated time. Reports, for each storage:
+- append: mean time per append, including trimming (usec)
+- extend: time to add the whole night in one call (msec), e.g. to backfill history;
+    lists use list.extend and the buffer uses TimeSeriesBuffer.extend
+- memory: bytes used at the end of the night (MB); lists are measured with sys.getsizeof
+    of the lists and the float objects they hold, the buffer with TimeSeriesBuffer.nbytes
+Also reports the cost of min/max decimation (TUI.Base.MinMaxDecimator, as used by TUI.Base.StripChartWdg)
+of the night's data for a plot --pixels wide: the time of the first (full) update (msec),
+the mean time of later updates, each after appending one second of data (usec),
+and the number of points drawn.
+Also reports the cost of backfilling a line from the key history (TUI.Models.KeyHistory, as used by
+TUI.Base.StripChartWdg.plotKeyVar): the night is written to a temporary key history directory,
+then the time range is read and added to a TimeSeriesBuffer (msec).
+
+Does not need a display. Run from anywhere; the parent directory of this script is added to sys.path
+so the TUI package is found (numpy and RO must be installed).
+
+Usage: benchStripChart.py [--rate N]... [--hours N] [--timeRange N] [--pixels N] [--json path]
+
+History:
+2026-10-18          Initial version.
+2026-10-18          Report the cost of min/max decimation; added --pixels.
+2026-10-18          Report the cost of backfilling from the key history.
+"""
+import argparse
+import bisect
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+import TUI.Base.MinMaxDecimator
+import TUI.Base.TimeSeriesBuffer
+import TUI.Models.KeyHistory
+
+DefRates = (1.0, 10.0) # points/sec per line
+DefHours = 12.0
+DefTimeRange = DefHours * 3600.0 # sec; by default keep the whole night
+DefPixels = 800 # width of plot (pixels)
+NumDecimateUpdates = 1000
+
+class ListLine(object):
+    """Line storage as in RO.Wdg.StripChartWdg: lists of times and values, trimmed using bisect
+    """
+    def __init__(self):
+        self.tList = []
+        self.yList = []
+
+    def append(self, t, y):
+        self.tList.append(t)
+        self.yList.append(y)
+
+    def extend(self, tArr, yArr):
+        self.tList.extend(tArr)
+        self.yList.extend(yArr)
+
+    def trimBefore(self, minTime):
+        numToRemove = bisect.bisect_left(self.tList, minTime)
+        if numToRemove > 0:
+            del self.tList[0:numToRemove]
+            del self.yList[0:numToRemove]
+        return numToRemove
+
+    @property
+    def nbytes(self):
+        nbytes = 0
+        for dataList in (self.tList, self.yList):
+            nbytes += sys.getsizeof(dataList)
+            if dataList:
+                nbytes += len(dataList) * sys.getsizeof(dataList[0])
+        return nbytes
+
+    def __len__(self):
+        return len(self.tList)
+
+
+def makeNight(rate, hours):
+    """Return (tArr, yArr) for one line over a night: times (unix sec) and values (a noisy sine)"""
+    numPoints = int(round(rate * hours * 3600.0))
+    tArr = 1.7e9 + numpy.arange(numPoints, dtype=numpy.float64) / rate
+    yArr = numpy.sin(tArr / 600.0) + numpy.random.RandomState(0).normal(0, 0.01, numPoints)
+    return tArr, yArr
+
+def timeAppend(line, tList, yList, rate, timeRange):
+    """Append points one at a time, trimming once per second of data; return seconds elapsed"""
+    pointsPerTrim = max(1, int(round(rate)))
+    append = line.append
+    gc.collect()
+    startTime = time.time()
+    for ind in xrange(len(tList)):
+        t = tList[ind]
+        append(t, yList[ind])
+        if ind % pointsPerTrim == 0:
+            line.trimBefore(t - timeRange)
+    return time.time() - startTime
+
+def timeDecimate(tArr, yArr, rate, timeRange, numPixels):
+    """Time min/max decimation of the data for a plot numPixels wide; return a dict of results
+
+    The first update decimates all but the last NumDecimateUpdates seconds of data;
+    each later update follows appending one second of data.
+    """
+    pointsPerUpdate = max(1, int(round(rate)))
+    numInitial = max(0, len(tArr) - NumDecimateUpdates * pointsPerUpdate)
+    tsBuffer = TUI.Base.TimeSeriesBuffer.TimeSeriesBuffer()
+    tsBuffer.extend(tArr[0:numInitial], yArr[0:numInitial])
+    decimator = TUI.Base.MinMaxDecimator.MinMaxDecimator(tsBuffer)
+    bucketWidth = timeRange / float(numPixels)
+    gc.collect()
+    startTime = time.time()
+    decimator.update(bucketWidth)
+    decimator.getData()
+    firstSec = time.time() - startTime
+
+    numUpdates = 0
+    startTime = time.time()
+    for startInd in xrange(numInitial, len(tArr), pointsPerUpdate):
+        endInd = startInd + pointsPerUpdate
+        tsBuffer.extend(tArr[startInd:endInd], yArr[startInd:endInd])
+        tsBuffer.trimBefore(tArr[endInd - 1] - timeRange)
+        decimator.update(bucketWidth)
+        decimator.getData()
+        numUpdates += 1
+    updateSec = time.time() - startTime
+    return dict(
+        firstMSec = firstSec * 1e3,
+        updateUSec = updateSec * 1e6 / max(1, numUpdates),
+        numPoints = len(decimator),
+    )
+
+def timeBackfill(tArr, yArr, timeRange):
+    """Time backfilling a line from a key history holding the data; return a dict of results
+    """
+    seriesName = TUI.Models.KeyHistory.getSeriesName("bench", "value")
+    historyDir = tempfile.mkdtemp(prefix="benchStripChart")
+    try:
+        writer = TUI.Models.KeyHistory.KeyHistoryWriter(historyDir, flushInterval=60.0)
+        for t, y in zip(tArr.tolist(), yArr.tolist()):
+            writer.append(seriesName, t, y)
+        writer.close()
+
+        reader = TUI.Models.KeyHistory.KeyHistoryReader(historyDir)
+        gc.collect()
+        startTime = time.time()
+        histT, histY = reader.read(seriesName, startTime=tArr[-1] - timeRange)
+        tsBuffer = TUI.Base.TimeSeriesBuffer.TimeSeriesBuffer()
+        tsBuffer.extend(histT, histY)
+        backfillSec = time.time() - startTime
+    finally:
+        shutil.rmtree(historyDir)
+    return dict(
+        backfillMSec = backfillSec * 1e3,
+        numPoints = len(tsBuffer),
+    )
+
+def runRate(rate, hours, timeRange, numPixels):
+    """Run the benchmark for one rate; return a dict of results"""
+    tArr, yArr = makeNight(rate, hours)
+    tList = tArr.tolist()
+    yList = yArr.tolist()
+    result = dict(rate=rate, numPoints=len(tList))
+    for name, makeLine in (
+        ("list", ListLine),
+        ("buffer", TUI.Base.TimeSeriesBuffer.TimeSeriesBuffer),
+    ):
+        line = makeLine()
+        appendSec = timeAppend(line, tList, yList, rate, timeRange)
+        numKept = len(line)
+        nbytes = line.nbytes
+        del line
+
+        line = makeLine()
+        gc.collect()
+        startTime = time.time()
+        if name == "list":
+            line.extend(tList, yList)
+        else:
+            line.extend(tArr, yArr)
+        extendSec = time.time() - startTime
+        del line
+
+        result[name] = dict(
+            appendUSec = appendSec * 1e6 / len(tList),
+            extendMSec = extendSec * 1e3,
+            numKept = numKept,
+            memoryMB = nbytes / 1.0e6,
+        )
+    result["decimate"] = timeDecimate(tArr, yArr, rate, timeRange, numPixels)
+    result["backfill"] = timeBackfill(tArr, yArr, timeRange)
+    return result
+
+def printResults(resultList):
+    print "%8s %9s %8s %10s %10s %10s" % ("rate", "points", "storage", "append", "extend", "memory")
+    print "%8s %9s %8s %10s %10s %10s" % ("(Hz)", "kept", "", "(usec)", "(msec)", "(MB)")
+    for result in resultList:
+        for name in ("list", "buffer"):
+            data = result[name]
+            print "%8.1f %9d %8s %10.3f %10.2f %10.2f" % (result["rate"], data["numKept"], name,
+                data["appendUSec"], data["extendMSec"], data["memoryMB"])
+    print
+    print "%8s %9s %10s %10s" % ("rate", "points", "first", "update")
+    print "%8s %9s %10s %10s" % ("(Hz)", "drawn", "(msec)", "(usec)")
+    for result in resultList:
+        data = result["decimate"]
+        print "%8.1f %9d %10.2f %10.1f" % (result["rate"], data["numPoints"], data["firstMSec"], data["updateUSec"])
+    print
+    print "%8s %9s %10s" % ("rate", "points", "backfill")
+    print "%8s %9s %10s" % ("(Hz)", "read", "(msec)")
+    for result in resultList:
+        data = result["backfill"]
+        print "%8.1f %9d %10.2f" % (result["rate"], data["numPoints"], data["backfillMSec"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strip chart line storage over a night of data")
+    parser.add_argument("--rate", type=float, action="append",
+        help="points/sec per line (may be repeated); default: %s" % (", ".join(str(r) for r in DefRates),))
+    parser.add_argument("--hours", type=float, default=DefHours, help="length of night (hours)")
+    parser.add_argument("--timeRange", type=float, default=DefTimeRange,
+        help="time range of data kept (sec); default: the whole night")
+    parser.add_argument("--pixels", type=int, default=DefPixels,
+        help="width of plot, for decimation (pixels; default %(default)s)")
+    parser.add_argument("--json", help="save results as JSON to this path (- for stdout)")
+    args = parser.parse_args()
+
+    resultList = [runRate(rate, args.hours, args.timeRange, args.pixels) for rate in args.rate or DefRates]
+
+    printResults(resultList)
+    if args.json:
+        results = dict(
+            benchmark = "stripChart",
+            time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            platform = platform.platform(),
+            python = platform.python_version(),
+            numpy = numpy.__version__,
+            hours = args.hours,
+            timeRange = args.timeRange,
+            pixels = args.pixels,
+            rates = resultList,
+        )
+        if args.json == "-":
+            json.dump(results, sys.stdout, indent=2, sort_keys=True)
+            print
+        else:
+            with open(args.json, "w") as outFile:
+                json.dump(results, outFile, indent=2, sort_keys=True)
+            print "Saved results to %s" % (args.json,)
+
+if __name__ == "__main__":
+    main()
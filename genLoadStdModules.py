@@ -12,39 +12,171 @@ to be run from a zip file.
 
 On the down side, one must remember to run this file
 and thus regenerate LoadStdModules whenever the list
-of TUI's standard windows modules changes.
+of TUI's standard windows modules changes
+(or the name or createToplevel arguments of a window in LazyModuleNames change).
 
 History:
 2005-08-01 ROwen
 2005-08-08 ROwen    Modified to use TUI.WindowModuleUtil
 2005-09-22 ROwen    Modified to not use TUI.TUIPaths.
+2026-10-18          Generate loadAll(lazy=False): windows of modules in LazyModuleNames may be loaded
+                    when first shown; their names and createToplevel arguments are captured
+                    from the modules' addWindow functions. Modules in ExcludeModuleNames are not loaded.
 """
 import os
 import TUI
+import TUI.Base.WindowSuspender
 import TUI.WindowModuleUtil
 
-# get location to look for standard windows
-tuiPath = os.path.dirname(TUI.__file__)
+# window modules that are not loaded (they are listed in LoadStdModules as comments)
+ExcludeModuleNames = set((
+    "TUI.Inst.APOGEEQL.APOGEEQLWindow",
+))
 
-modNames = list(TUI.WindowModuleUtil.findWindowsModules(
-    path = tuiPath,
-    isPackage = True,
-    loadFirst="TUIMenu",
+# window modules whose window may be loaded when first shown (see TUI.WindowModuleUtil.addLazyWindow);
+# do not list windows that must do work while hidden (e.g. play sounds, accumulate history or save state)
+LazyModuleNames = set((
+    "TUI.TUIMenu.AboutWindow",
+    "TUI.TUIMenu.CallbackProfileWindow",
+    "TUI.TUIMenu.CmdLatencyWindow",
+    "TUI.TUIMenu.PythonWindow",
+    "TUI.TUIMenu.UsersWindow",
+    "TUI.Misc.Interlocks.InterlocksWindow",
+    "TUI.Misc.MCP.MCPWindow",
+    "TUI.TCC.FocalPlaneWindow",
+    "TUI.TCC.FocusWindow",
+    "TUI.TCC.MirrorStatusWindow",
+    "TUI.TCC.NudgerWindow",
+    "TUI.TCC.SkyWindow",
 ))
-modFilePath = os.path.join(tuiPath, "LoadStdModules.py")
-modFile = file(modFilePath, "w")
-try:
+
+DocString = '''"""Load the standard windows
+
+Generated by genLoadStdModules.py; do not edit.
+
+loadAll(lazy=True) creates the windows listed in _LazyWindowList without importing their modules:
+each module is imported, and its widget built, when its window is first shown
+(see TUI.WindowModuleUtil.addLazyWindow). This speeds up startup (see bench/benchStartup.py).
+Windows that must do work while hidden (e.g. play sounds, accumulate history or save state)
+are always loaded at startup.
+
+History:
+2026-10-18          Added lazy loading of windows.
+"""
+'''
+
+def getLazyWindow(modName):
+    """Return (window name, createToplevel keyword arguments other than name and wdgFunc)
+    for the window created by a window module's addWindow function.
+
+    Raise RuntimeError if the window cannot be loaded lazily.
+    """
+    module = __import__(modName, globals(), locals(), "addWindow")
+    captureTLSet = TUI.WindowModuleUtil._CaptureTLSet()
+    module.addWindow(captureTLSet)
+    if len(captureTLSet.kargsDict) != 1:
+        raise RuntimeError("%s.addWindow creates %d windows; lazy loading requires 1" % \
+            (modName, len(captureTLSet.kargsDict)))
+    windowName, kargs = captureTLSet.kargsDict.items()[0]
+    if windowName in TUI.Base.WindowSuspender._keepActiveNames:
+        raise RuntimeError("%s keeps window %r active while hidden" % (modName, windowName))
+    kargs = dict(kargs)
+    del kargs["wdgFunc"]
+    if "doSaveState" in kargs:
+        raise RuntimeError("%s: doSaveState is not supported for lazy windows" % (modName,))
+    for key, value in kargs.iteritems():
+        if eval(repr(value)) != value:
+            raise RuntimeError("%s: createToplevel argument %s=%r cannot be saved" % (modName, key, value))
+    return windowName, kargs
+
+def formatValue(value):
+    """Format a value as python code, using double quotes for strings"""
+    if isinstance(value, str) and '"' not in value and "\\" not in value:
+        return '"%s"' % (value,)
+    return repr(value)
+
+def writeLoadStdModules(modFile, modNames, lazyWindowDict):
+    """Write the code of TUI.LoadStdModules
+
+    Inputs:
+    - modFile: file to which to write
+    - modNames: names of window modules, in the order to load them
+    - lazyWindowDict: dict of module name: (window name, createToplevel keyword arguments)
+        for windows that may be loaded lazily
+    """
+    eagerModNames = [modName for modName in modNames if modName not in lazyWindowDict]
+    lazyModNames = [modName for modName in modNames if modName in lazyWindowDict]
+
+    def getPrefix(modName):
+        return "# " if modName in ExcludeModuleNames else ""
+
+    modFile.write(DocString)
     modFile.write("import TUI.Models.TUIModel\n")
-    for modName in modNames:
-        modFile.write("import %s\n" % modName)
+    for modName in eagerModNames:
+        modFile.write("%simport %s\n" % (getPrefix(modName), modName))
+    modFile.write("import TUI.WindowModuleUtil\n")
 
     modFile.write("""
-def loadAll():
+# windows that may be loaded lazily: a list of (module name, window name, createToplevel keyword arguments),
+# captured from the modules' addWindow functions by genLoadStdModules.py
+_LazyWindowList = (
+""")
+    for modName in lazyModNames:
+        windowName, kargs = lazyWindowDict[modName]
+        kargsStr = ", ".join("%s=%s" % (key, formatValue(kargs[key])) for key in sorted(kargs))
+        modFile.write("    (%s, %s,\n        dict(%s)),\n" % (formatValue(modName), formatValue(windowName), kargsStr))
+    modFile.write(""")
+_LazyWindowDict = dict((moduleName, (windowName, kargs)) for moduleName, windowName, kargs in _LazyWindowList)
+
+def loadAll(lazy=False):
+    \"\"\"Load the standard windows
+
+    Inputs:
+    - lazy: if True, windows in _LazyWindowList are loaded when first shown
+    \"\"\"
     tuiModel = TUI.Models.TUIModel.Model()
     tlSet = tuiModel.tlSet
+
+    def addWindow(moduleName):
+        if lazy:
+            windowName, kargs = _LazyWindowDict[moduleName]
+            TUI.WindowModuleUtil.addLazyWindow(
+                tlSet = tlSet,
+                moduleName = moduleName,
+                windowName = windowName,
+                logFunc = tuiModel.logMsg,
+            **kargs)
+        else:
+            module = __import__(moduleName, globals(), locals(), "addWindow")
+            module.addWindow(tlSet)
+
 """)
     for modName in modNames:
-        modFile.write("    %s.addWindow(tlSet)\n" % modName)
-    
-finally:
-    modFile.close()
\ No newline at end of file
+        if modName in lazyWindowDict:
+            modFile.write("    addWindow(%s)\n" % (formatValue(modName),))
+        else:
+            modFile.write("    %s%s.addWindow(tlSet)\n" % (getPrefix(modName), modName))
+
+
+if __name__ == "__main__":
+    # get location to look for standard windows
+    tuiPath = os.path.dirname(TUI.__file__)
+
+    modNames = list(TUI.WindowModuleUtil.findWindowsModules(
+        path = tuiPath,
+        isPackage = True,
+        loadFirst="TUIMenu",
+    ))
+    lazyWindowDict = dict()
+    for modName in modNames:
+        if modName in LazyModuleNames and modName not in ExcludeModuleNames:
+            try:
+                lazyWindowDict[modName] = getLazyWindow(modName)
+            except RuntimeError as e:
+                print "Loading %s at startup: %s" % (modName, e)
+    modFilePath = os.path.join(tuiPath, "LoadStdModules.py")
+    modFile = file(modFilePath, "w")
+    try:
+        writeLoadStdModules(modFile, modNames, lazyWindowDict)
+    finally:
+        modFile.close()
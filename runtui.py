@@ -11,6 +11,9 @@ History:
                     because execution was part of importing.
                     Fixed by first importing TUI.Main and then running the app.
 2007-01-23 ROwen    Changed #!/usr/local/bin/python to #!/usr/bin/env python
+2026-10-18          Added --profile-startup[=path] to record a startup timeline (see TUI.StartupProfiler).
 """
+import TUI.StartupProfiler
+TUI.StartupProfiler.startFromArgv()
 import TUI.Main
 TUI.Main.runTUI()
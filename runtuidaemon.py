@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+"""Launch headless STUI: connect to the hub and watch, log, archive and record keywords without a GUI.
+
+Run with --help for options; see TUI.Daemon for details.
+
+Location is everything:
+This script's directory is automatically added to sys.path,
+so having this script in the same directory as RO and TUI
+makes those packages available without setting PYTHONPATH.
+
+History:
+2026-10-18          Initial version.
+"""
+import TUI.Daemon
+TUI.Daemon.main()